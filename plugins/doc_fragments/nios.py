@@ -106,8 +106,68 @@ options:
           - Insert description here
         type: bool
         default: true
+      ref_cache:
+        description:
+          - Path of a file on the controller used to cache the references of
+            the objects the modules look up by name, for example zones, DTC
+            pools, VLAN views or the grid. The cache is shared by every task
+            that uses the same file, grid and username, so these lookups are
+            not repeated across tasks and plays.
+          - Cached references are dropped when a module updates or deletes the
+            object. The cached network views of DNS views are all dropped when
+            a module updates or deletes a network view. The number of cache hits and misses is returned in
+            C(ref_cache).
+          - The cache is disabled when not set.
+          - Value can also be specified using C(INFOBLOX_REF_CACHE) environment
+            variable.
+        type: path
+        version_added: "1.10.0"
+      ref_cache_ttl:
+        description:
+          - Number of seconds a cached reference is used for.
+          - Value can also be specified using C(INFOBLOX_REF_CACHE_TTL)
+            environment variable.
+        type: int
+        default: 300
+        version_added: "1.10.0"
 notes:
   - "This module must be run locally, which can be achieved by specifying C(connection: local)."
+  - When run with C(ansible_connection=ansible.netcommon.httpapi) and
+    C(ansible_network_os=infoblox.nios_modules.nios) and I(provider.host) is not set, the module reuses
+    the persistent WAPI session of the connection instead of opening its own.
+  - In check mode, a module managing one object decides the change from the
+    lookup of the existing object and returns the planned C(action) with a
+    before/after C(diff), without building the write payload nor resolving
+    I(nios_next_ip) addresses.
   - Please read the :ref:`nios_guide` for more detailed information on how to use Infoblox with Ansible.
 
+'''
+
+    # Bulk mode documentation fragment
+    BULK = r'''
+options:
+  items:
+    description:
+      - Manages several objects in one task. Each entry is a dict that
+        accepts the same options as the module itself, including C(state).
+        Options set at the top level of the task act as defaults for the
+        values an entry omits.
+      - All existing objects are resolved with a single WAPI multi-request
+        and the resulting changes are applied in chunked multi-requests,
+        instead of several round trips per object.
+      - Renames and the other dict valued forms of the lookup options are not
+        supported in bulk mode, except I(nios_next_ip) for the address of A
+        records. The addresses of the A records to create are then allocated
+        with one C(next_available_ip) call per network. When another client
+        takes one of them before the records are written, the addresses are
+        allocated again and the write is retried.
+      - The per-item outcome is returned in C(results).
+    type: list
+    elements: dict
+notes:
+  - In check mode, the entries of I(items) are planned from the single WAPI
+    read of the existing objects. Every entry of C(results) returns its
+    planned C(action) and a before/after C(diff). I(nios_next_ip) addresses
+    are shown unresolved and the network view of their DNS view is not
+    looked up.
 '''
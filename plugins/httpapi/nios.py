@@ -0,0 +1,114 @@
+# Copyright (c) 2020 Infoblox, Inc.
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+DOCUMENTATION = '''
+---
+name: nios
+short_description: HttpApi plugin for Infoblox NIOS WAPI
+version_added: "1.10.0"
+description:
+  - Provides a persistent connection to the Infoblox NIOS WAPI. A single
+    authenticated session, and the C(ibapauth) cookie issued by the grid
+    master, is reused by every task of the play instead of every module
+    opening its own TCP/TLS connection and authenticating again.
+  - Use it with C(ansible_connection=ansible.netcommon.httpapi) and
+    C(ansible_network_os=infoblox.nios_modules.nios). Modules that do not
+    set C(provider.host) then route their WAPI calls through this connection.
+requirements:
+  - ansible.netcommon
+options:
+  wapi_version:
+    description:
+      - Specifies the version of WAPI to use.
+    type: str
+    default: '2.12.3'
+    env:
+      - name: INFOBLOX_WAPI_VERSION
+    vars:
+      - name: ansible_httpapi_nios_wapi_version
+'''
+
+EXAMPLES = '''
+# inventory
+# [nios]
+# nios01 ansible_host=192.0.2.10
+#
+# [nios:vars]
+# ansible_connection=ansible.netcommon.httpapi
+# ansible_network_os=infoblox.nios_modules.nios
+# ansible_httpapi_use_ssl=true
+# ansible_httpapi_validate_certs=false
+# ansible_user=admin
+# ansible_password=admin
+
+- name: Configure an A record over the persistent connection
+  infoblox.nios_modules.nios_a_record:
+    name: a.ansible.com
+    ipv4: 192.168.10.1
+    state: present
+'''
+
+import json
+from urllib.parse import quote, urlencode
+
+from ansible.module_utils.common.text.converters import to_text
+from ansible.plugins.httpapi import HttpApiBase
+
+BASE_HEADERS = {
+    'Content-Type': 'application/json',
+    'Accept': 'application/json',
+}
+
+
+class HttpApi(HttpApiBase):
+
+    def _wapi_path(self, path, params=None):
+        ''' Builds the WAPI URL path for an object type, reference or
+        function call, appending the encoded query string if any '''
+        url = '/wapi/v%s/%s' % (self.get_option('wapi_version'), quote(path))
+        if params:
+            url += '?' + urlencode(params, doseq=True)
+        return url
+
+    def send_request(self, data, path, method='GET', params=None):
+        ''' Sends a single WAPI request over the persistent connection
+        :args data: the JSON serializable request body or None
+        :args path: the WAPI object type, object reference or endpoint
+        :args method: the HTTP verb
+        :args params: dict of WAPI query arguments
+        :returns: tuple of HTTP status code and the decoded response body
+        '''
+        if data is not None:
+            data = json.dumps(data)
+        response, response_data = self.connection.send(
+            self._wapi_path(path, params), data, method=method, headers=BASE_HEADERS)
+        return response.getcode(), self._response_to_json(response_data)
+
+    def logout(self):
+        ''' Invalidates the ibapauth session cookie on the grid master '''
+        if self.connection._auth:
+            self.send_request(None, 'logout', method='POST')
+
+    def handle_httperror(self, exc):
+        ''' Lets the module side see the WAPI error body
+        Authentication failures are still handled by the base class so that
+        an expired ibapauth cookie is transparently replaced. Every other
+        HTTP error is returned as the response so that the JSON error
+        document WAPI sends back reaches the caller instead of a bare
+        HTTPError.
+        '''
+        if exc.code == 401:
+            return super(HttpApi, self).handle_httperror(exc)
+        return exc
+
+    def _response_to_json(self, response_data):
+        response_text = to_text(response_data.getvalue())
+        if not response_text:
+            return None
+        try:
+            return json.loads(response_text)
+        except ValueError:
+            return {'text': response_text}
@@ -55,6 +55,74 @@ DOCUMENTATION = r'''
                 host records to be returned.
             default: {}
             type: dict
+        page_size:
+            description:
+              - Number of host records requested per WAPI page. Host records
+                are fetched with WAPI paging, so the inventory is not limited
+                to the C(max_results) of a single request.
+            default: 1000
+            type: int
+            version_added: "1.10.0"
+        incremental_refresh:
+            description:
+              - When a cached inventory is found, bring it up to date instead
+                of using it as is. Only the host records changed since the last
+                synchronization, according to the NIOS database change log
+                (C(db_objects)), are fetched again. Deleted host records are
+                pruned using a listing of host record references only.
+              - Requires I(cache). A full refresh is made when there is no
+                cached inventory, when C(--flush-cache) is used or when too
+                many records changed.
+              - The user needs permission to read C(db_objects).
+            default: false
+            type: bool
+            version_added: "1.10.0"
+        shard_by:
+            description:
+              - Splits the host record query into one query per DNS view
+                (C(view)), per forward authoritative zone (C(zone)) or per
+                value of the extensible attribute named by I(shard_extattr)
+                (C(extattr)). The shards are fetched concurrently and merged
+                as they complete.
+              - With C(view), host records that are not configured for DNS,
+                whose view is a single space, are fetched by one more shard.
+                With C(zone), host records that are not configured for DNS
+                are not returned. With C(extattr), only host records with one
+                of the listed values of the attribute definition are returned.
+            type: str
+            choices:
+              - view
+              - zone
+              - extattr
+            version_added: "1.10.0"
+        shard_extattr:
+            description:
+              - Name of the list type extensible attribute whose values define
+                the shards when I(shard_by=extattr).
+            type: str
+            version_added: "1.10.0"
+        shard_workers:
+            description:
+              - Maximum number of shards fetched at the same time, which
+                bounds the load put on the grid master. Every worker opens its
+                own WAPI connection.
+            default: 4
+            type: int
+            version_added: "1.10.0"
+        return_fields:
+            description:
+              - Additional host record fields to fetch. Every field is set as
+                a host variable of the same name, for use in I(compose),
+                I(groups) and I(keyed_groups) without any further WAPI call.
+              - C(name), C(view), C(extattrs) and C(ipv4addrs) are always
+                fetched.
+            type: list
+            elements: str
+            default: []
+            version_added: "1.10.0"
+    extends_documentation_fragment:
+        - constructed
+        - inventory_cache
     requirements:
         - python >= 3.4
         - infoblox-client
@@ -64,11 +132,40 @@ EXAMPLES = r'''
 plugin: infoblox.nios_modules.nios_inventory
 host: blox.example.com
 username: admin
+
+# reuse the host records fetched by a previous run for one hour
+cache: true
+cache_plugin: ansible.builtin.jsonfile
+cache_connection: /tmp/nios_inventory
+cache_timeout: 3600
+# and only fetch the host records changed since that run
+incremental_refresh: true
+# fetch the host records of each DNS view concurrently
+shard_by: view
+shard_workers: 4
+# group by zone and by the Site extensible attribute
+return_fields:
+  - zone
+  - comment
+keyed_groups:
+  - key: zone
+    prefix: zone
+  - key: Site
+    prefix: site
+groups:
+  production: "'prod' in (comment | default(''))"
+compose:
+  ansible_host: ipv4addrs[0]
 '''
 
 
-from ansible.plugins.inventory import BaseInventoryPlugin
-from ..module_utils.api import WapiInventory
+import hashlib
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from ansible.plugins.inventory import BaseInventoryPlugin, Cacheable, Constructable
+from ..module_utils.api import WapiInventory, wapi_request
 from ..module_utils.api import normalize_extattrs, flatten_extattrs
 from ansible.errors import AnsibleError
 from ansible.module_utils.common.text.converters import to_native
@@ -86,7 +183,10 @@ except ImportError:
         pass
 
 
-class InventoryModule(BaseInventoryPlugin):
+HOST_RETURN_FIELDS = ['name', 'view', 'extattrs', 'ipv4addrs']
+
+
+class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
     NAME = 'nios_inventory'
 
     def parse(self, inventory, loader, path, cache=True):  # Plugin interface (2)
@@ -96,14 +196,77 @@ class InventoryModule(BaseInventoryPlugin):
         provider = {'host': self.get_option('host'),
                     'username': self.get_option('username'),
                     'password': self.get_option('password')}
+        self._provider = provider
 
-        host_filter = self.get_option('hostfilter')
-        extattrs = normalize_extattrs(self.get_option('extattrs'))
-        return_fields = ['name', 'view', 'extattrs', 'ipv4addrs']
+        # honour the cache only when enabled by the user and not bypassed by
+        # --flush-cache, and refresh it whenever WAPI has been queried
+        cache_key = self._get_nios_cache_key()
+        user_cache_setting = self.get_option('cache')
+        attempt_to_read_cache = user_cache_setting and cache
+        cache_needs_update = user_cache_setting and not cache
+
+        snapshot = None
+        if attempt_to_read_cache:
+            try:
+                snapshot = self._cache[cache_key]
+            except KeyError:
+                cache_needs_update = True
+            else:
+                if self.get_option('incremental_refresh') and snapshot.get('sequence_id') is not None:
+                    snapshot = self._query(provider, self._refresh_snapshot, snapshot)
+                    cache_needs_update = True
+
+        if snapshot is None:
+            snapshot = self._query(provider, self._fetch_snapshot)
+
+        if cache_needs_update:
+            self._cache[cache_key] = snapshot
+
+        hosts = snapshot['hosts']
+        if not hosts:
+            raise AnsibleError("host record is not present")
+
+        strict = self.get_option('strict')
+        for host in hosts:
+            group_name = self.inventory.add_group(host['view'])
+            host_name = self.inventory.add_host(host['name'])
+            self.inventory.add_child(group_name, host_name)
 
+            host_vars = dict((field, host[field]) for field in self.get_option('return_fields')
+                             if field in host and field not in HOST_RETURN_FIELDS)
+            host_vars['view'] = host['view']
+            host_vars['ipv4addrs'] = [item['ipv4addr'] for item in host['ipv4addrs']]
+            host_vars.update(flatten_extattrs(host['extattrs']))
+            for key, value in host_vars.items():
+                self.inventory.set_variable(host_name, key, value)
+
+            # constructed groups and variables only use the fetched records
+            self._set_composite_vars(self.get_option('compose'), host_vars, host_name, strict=strict)
+            self._add_host_to_composed_groups(self.get_option('groups'), host_vars, host_name, strict=strict)
+            self._add_host_to_keyed_groups(self.get_option('keyed_groups'), host_vars, host_name, strict=strict)
+
+    def _get_nios_cache_key(self):
+        ''' Returns a cache key unique to the grid and the host record
+        filters, so that inventories querying different grids or filters
+        never share cached host records.
+        '''
+        key_data = {'host': self.get_option('host'),
+                    'hostfilter': self.get_option('hostfilter'),
+                    'extattrs': self.get_option('extattrs'),
+                    'return_fields': self._get_return_fields(),
+                    'shard_by': self.get_option('shard_by'),
+                    'shard_extattr': self.get_option('shard_extattr')}
+        digest = hashlib.sha256(json.dumps(key_data, sort_keys=True).encode('utf-8')).hexdigest()
+        return '%s_%s' % (self.NAME, digest[:16])
+
+    def _get_return_fields(self):
+        return HOST_RETURN_FIELDS + sorted(set(self.get_option('return_fields')) - set(HOST_RETURN_FIELDS))
+
+    def _query(self, provider, func, *args):
+        ''' Runs func(wapi, *args) and reports WAPI failures as AnsibleError '''
         try:
             wapi = WapiInventory(provider)
-            hosts = wapi.get_object('record:host', host_filter, extattrs=extattrs, return_fields=return_fields) or []
+            return func(wapi, *args)
         except AnsibleError:
             raise
         except (InfobloxConnectionError, InfobloxException) as exc:
@@ -124,16 +287,104 @@ class InventoryModule(BaseInventoryPlugin):
                 % (provider['host'], to_native(exc))
             ) from exc
 
-        if not hosts:
-            raise AnsibleError("host record is not present")
+    def _fetch_snapshot(self, wapi):
+        ''' Fetches every host record. With incremental_refresh the database
+        sequence id is read first, so that changes made while the records
+        are listed are picked up again by the next refresh.
+        '''
+        sequence_id = None
+        if self.get_option('incremental_refresh'):
+            sequence_id = wapi.get_last_sequence_id()
+        return {'hosts': self._fetch_hosts(wapi), 'sequence_id': sequence_id}
 
-        for host in hosts:
-            group_name = self.inventory.add_group(host['view'])
-            host_name = self.inventory.add_host(host['name'])
-            self.inventory.add_child(group_name, host_name)
+    def _fetch_hosts(self, wapi):
+        host_filter = self.get_option('hostfilter')
+        extattrs = normalize_extattrs(self.get_option('extattrs'))
+        shards = self._get_shards(wapi, host_filter, extattrs)
+        if not shards:
+            return list(wapi.iter_objects('record:host', host_filter, extattrs=extattrs,
+                                          return_fields=self._get_return_fields(),
+                                          page_size=self.get_option('page_size')))
 
-            self.inventory.set_variable(host_name, 'view', host['view'])
-            self.inventory.set_variable(host_name, 'ipv4addrs', [item['ipv4addr'] for item in host['ipv4addrs']])
+        # a requests session is not thread safe, every worker thread opens
+        # its own connection to the grid
+        workers = threading.local()
 
-            for key, value in flatten_extattrs(host['extattrs']).items():
-                self.inventory.set_variable(host_name, key, value)
+        def fetch_shard(shard):
+            shard_filter, shard_extattrs = shard
+            if not hasattr(workers, 'wapi'):
+                workers.wapi = WapiInventory(self._provider)
+            return list(workers.wapi.iter_objects('record:host', shard_filter, extattrs=shard_extattrs,
+                                                  return_fields=self._get_return_fields(),
+                                                  page_size=self.get_option('page_size')))
+
+        hosts = []
+        with ThreadPoolExecutor(max_workers=max(self.get_option('shard_workers'), 1)) as executor:
+            futures = [executor.submit(fetch_shard, shard) for shard in shards]
+            for future in as_completed(futures):
+                hosts.extend(future.result())
+        return hosts
+
+    def _get_shards(self, wapi, host_filter, extattrs):
+        ''' Returns the list of (filter, extattrs) host record searches that
+        together cover the inventory, or None when it is not sharded
+        '''
+        shard_by = self.get_option('shard_by')
+        if shard_by == 'view':
+            if 'view' in host_filter:
+                return None
+            views = [view['name'] for view in wapi.iter_objects('view', return_fields=['name'])]
+            # host records not configured for DNS belong to no DNS view
+            views.append(' ')
+            return [(dict(host_filter, view=view), extattrs) for view in views]
+
+        if shard_by == 'zone':
+            if 'zone' in host_filter:
+                return None
+            zone_filter = {'zone_format': 'FORWARD'}
+            if 'view' in host_filter:
+                zone_filter['view'] = host_filter['view']
+            zones = wapi.iter_objects('zone_auth', zone_filter, return_fields=['fqdn', 'view'])
+            return [(dict(host_filter, zone=zone['fqdn'], view=zone['view']), extattrs) for zone in zones]
+
+        if shard_by == 'extattr':
+            name = self.get_option('shard_extattr')
+            if not name:
+                raise AnsibleError('shard_extattr is required when shard_by is extattr')
+            if name in (extattrs or {}):
+                return None
+            definitions = wapi.get_object('extensibleattributedef', {'name': name}, return_fields=['list_values'])
+            if not definitions or not definitions[0].get('list_values'):
+                raise AnsibleError("extensible attribute '%s' has no list values to shard on" % name)
+            return [(host_filter, dict(extattrs or {}, **{name: {'value': item['value']}}))
+                    for item in definitions[0]['list_values']]
+
+        return None
+
+    def _refresh_snapshot(self, wapi, snapshot):
+        ''' Brings a cached snapshot up to date. Host records changed since
+        the cached sequence id, and references not cached yet (new records
+        or records that now match the filters) are fetched again with one
+        multi-request. Cached records missing from the reference listing
+        were deleted or no longer match the filters and are dropped.
+        '''
+        changed, sequence_id = wapi.get_changed_refs('record:host', snapshot['sequence_id'])
+        if changed is None:
+            return self._fetch_snapshot(wapi)
+
+        cached = dict((host['_ref'], host) for host in snapshot['hosts'])
+        refs = [obj['_ref'] for obj in wapi.iter_objects('record:host', self.get_option('hostfilter'),
+                                                         extattrs=normalize_extattrs(self.get_option('extattrs')),
+                                                         return_fields=[],
+                                                         page_size=self.get_option('page_size'))]
+        stale = [ref for ref in refs if ref in changed or ref not in cached]
+        if stale:
+            args = {'_return_fields': ','.join(self._get_return_fields())}
+            fetched = wapi.multi_request([wapi_request('GET', ref, args=args) for ref in stale])
+            for ref, host in zip(stale, fetched):
+                if isinstance(host, list):
+                    host = host[0] if host else None
+                cached[ref] = host
+
+        hosts = [cached[ref] for ref in refs if cached.get(ref)]
+        return {'hosts': hosts, 'sequence_id': sequence_id}
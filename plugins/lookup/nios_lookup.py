@@ -35,6 +35,22 @@ options:
     extattrs:
       description: A dict object that is used to filter based on extensible attributes.
       type: dict
+    page_size:
+      description:
+        - Fetch the objects with WAPI paging, requesting this many objects per
+          page. Results are then not limited by the C(max_results) provider
+          option and extensible attributes are flattened one page at a time.
+      type: int
+      version_added: "1.10.0"
+    output_file:
+      description:
+        - Path of a file on the controller to write the objects to, one JSON
+          document per line, instead of returning them. Objects are written
+          page by page as they are received. The lookup then only returns the
+          path and the number of objects written.
+        - Implies paging, using I(page_size) or 1000 objects per page.
+      type: path
+      version_added: "1.10.0"
 '''
 
 EXAMPLES = """
@@ -68,6 +84,15 @@ EXAMPLES = """
 - name: get the authoritative zone from a non default dns view
   ansible.builtin.set_fact:
     host: "{{ lookup('infoblox.nios_modules.nios_lookup', 'zone_auth', filter={'fqdn': 'ansible.com', 'view': 'ansible-dns'}) }}"
+
+- name: fetch every host record of a large grid, 5000 per WAPI page
+  ansible.builtin.set_fact:
+    host_records: "{{ lookup('infoblox.nios_modules.nios_lookup', 'record:host', page_size=5000) }}"
+
+- name: dump every host record to a JSON lines file on the controller
+  ansible.builtin.set_fact:
+    host_dump: "{{ lookup('infoblox.nios_modules.nios_lookup', 'record:host', return_fields=['name', 'ipv4addrs', 'extattrs'],
+                   output_file='/tmp/host_records.jsonl') }}"
 """
 
 RETURN = """
@@ -81,11 +106,25 @@ obj_type:
       description:
       - One or more obj_type fields as specified by return_fields argument or
         the default set of fields as per the object type
+output_file:
+  description:
+    - The path the objects were written to.
+  returned: when I(output_file) is set
+  type: str
+count:
+  description:
+    - The number of objects written to I(output_file).
+  returned: when I(output_file) is set
+  type: int
 """
 
+import json
+import os
+
 from ansible.plugins.lookup import LookupBase
 from ansible.errors import AnsibleError
-from ..module_utils.api import WapiLookup
+from ansible.module_utils.common.text.converters import to_bytes, to_native
+from ..module_utils.api import WapiLookup, NIOS_PAGE_SIZE
 from ..module_utils.api import normalize_extattrs, flatten_extattrs
 
 
@@ -101,7 +140,20 @@ class LookupModule(LookupBase):
         filter_data = kwargs.pop('filter', {})
         extattrs = normalize_extattrs(kwargs.pop('extattrs', {}))
         provider = kwargs.pop('provider', {})
+        page_size = kwargs.pop('page_size', None)
+        output_file = kwargs.pop('output_file', None)
         wapi = WapiLookup(provider)
+
+        if output_file or page_size:
+            pages = wapi.get_flattened_pages(obj_type, filter_data, return_fields=return_fields,
+                                             extattrs=extattrs, page_size=page_size or NIOS_PAGE_SIZE)
+            if output_file:
+                return [self._write_jsonl(output_file, pages)]
+            res = []
+            for page in pages:
+                res.extend(page)
+            return res
+
         res = wapi.get_object(obj_type, filter_data, return_fields=return_fields, extattrs=extattrs)
         if res is not None:
             for obj in res:
@@ -110,3 +162,20 @@ class LookupModule(LookupBase):
         else:
             res = []
         return res
+
+    def _write_jsonl(self, output_file, pages):
+        ''' Writes the objects of every page to output_file as JSON lines
+        :returns: dict with the path and the number of objects written
+        '''
+        path = os.path.expanduser(output_file)
+        count = 0
+        try:
+            with open(to_bytes(path, errors='surrogate_or_strict'), 'w') as f:
+                for page in pages:
+                    for obj in page:
+                        f.write(json.dumps(obj, sort_keys=True))
+                        f.write('\n')
+                        count += 1
+        except (IOError, OSError) as exc:
+            raise AnsibleError('unable to write %s: %s' % (path, to_native(exc)))
+        return {'output_file': path, 'count': count}
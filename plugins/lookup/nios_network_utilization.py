@@ -0,0 +1,137 @@
+# Copyright (c) 2020 Infoblox, Inc.
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+DOCUMENTATION = '''
+---
+name: nios_network_utilization
+short_description: Return the free address space of the IPv4 networks of a network view
+version_added: "1.10.0"
+description:
+  - Fetches the IPv4 networks, DHCP ranges, fixed addresses and host record
+    addresses of a network view with four paged WAPI searches and indexes them
+    locally. Free space and overlap questions about any number of networks are
+    then answered without further WAPI calls.
+  - Addresses of DHCP ranges, fixed addresses and host records count as used,
+    as do the network and broadcast addresses.
+requirements:
+  - infoblox-client
+
+options:
+    _terms:
+      description:
+        - Optional list of CIDR networks. Only the networks overlapping one of
+          them are returned. All the networks of the view are returned when
+          omitted.
+      required: false
+      type: list
+      elements: str
+    network_view:
+      description: The network view to index.
+      required: false
+      default: default
+      type: str
+    min_free:
+      description: Only return the networks with at least this many free addresses.
+      required: false
+      default: 0
+      type: int
+    page_size:
+      description: Number of objects requested per WAPI page.
+      required: false
+      default: 1000
+      type: int
+'''
+
+EXAMPLES = """
+- name: return the networks of the default network view with more than 50 free addresses
+  ansible.builtin.set_fact:
+    networks: "{{ lookup('infoblox.nios_modules.nios_network_utilization', min_free=51,
+                  provider={'host': 'nios01', 'username': 'admin', 'password': 'password'}) }}"
+
+- name: return the usage of the networks overlapping 10.10.0.0/16 in a non-default network view
+  ansible.builtin.set_fact:
+    networks: "{{ lookup('infoblox.nios_modules.nios_network_utilization', '10.10.0.0/16', network_view='ansible',
+                  provider={'host': 'nios01', 'username': 'admin', 'password': 'password'}) }}"
+"""
+
+RETURN = """
+_list:
+  description:
+    - One dict per network, ordered by address.
+  returned: always
+  type: list
+  contains:
+    network:
+      description: The network in CIDR notation.
+      type: str
+    total:
+      description: The number of assignable addresses of the network.
+      type: int
+    used:
+      description: The number of addresses used by ranges, fixed addresses and host records.
+      type: int
+    free:
+      description: The number of free addresses.
+      type: int
+"""
+
+import ipaddress
+
+from ansible.plugins.lookup import LookupBase
+from ansible.errors import AnsibleError
+from ansible.module_utils.common.text.converters import to_text
+from ..module_utils.api import WapiLookup, NIOS_PAGE_SIZE
+from ..module_utils.api import NIOS_IPV4_NETWORK, NIOS_RANGE, NIOS_IPV4_FIXED_ADDRESS, NIOS_HOST_RECORD
+from ..module_utils.network import IpamIndex
+
+
+class LookupModule(LookupBase):
+
+    def run(self, terms, variables=None, **kwargs):
+        within = []
+        for term in terms:
+            try:
+                network = ipaddress.ip_network(term, strict=False)
+            except (ValueError, TypeError) as error:
+                raise AnsibleError('network argument is invalid %s' % error)
+            if network.version != 4:
+                raise AnsibleError('only IPv4 networks are supported, got %s' % term)
+            within.append(network)
+
+        provider = kwargs.pop('provider', {})
+        network_view = kwargs.get('network_view', 'default')
+        min_free = int(kwargs.get('min_free', 0))
+        page_size = kwargs.get('page_size') or NIOS_PAGE_SIZE
+        wapi = WapiLookup(provider)
+
+        try:
+            index = self.build_index(wapi, network_view, page_size)
+        except Exception as exc:
+            raise AnsibleError(to_text(exc))
+        return index.free_networks(min_free, within)
+
+    @staticmethod
+    def build_index(wapi, network_view, page_size=NIOS_PAGE_SIZE):
+        ''' Indexes the IPv4 networks and used addresses of a network view
+        :args wapi: the WapiLookup instance to search with
+        :args network_view: the network view to index
+        :args page_size: number of objects requested per WAPI page
+        :returns: IpamIndex instance
+        '''
+        view_filter = {'network_view': network_view}
+
+        def search(obj_type, return_fields):
+            return wapi.iter_objects(obj_type, view_filter, return_fields=return_fields, page_size=page_size)
+
+        networks = [obj['network'] for obj in search(NIOS_IPV4_NETWORK, ['network'])]
+        used = [(obj['start_addr'], obj['end_addr']) for obj in search(NIOS_RANGE, ['start_addr', 'end_addr'])]
+        used.extend((obj['ipv4addr'], obj['ipv4addr']) for obj in search(NIOS_IPV4_FIXED_ADDRESS, ['ipv4addr']))
+        for host in search(NIOS_HOST_RECORD, ['ipv4addrs']):
+            used.extend((addr['ipv4addr'], addr['ipv4addr']) for addr in host.get('ipv4addrs') or []
+                        if addr.get('ipv4addr'))
+        return IpamIndex(networks, used)
@@ -20,7 +20,9 @@ requirements:
 
 options:
     _terms:
-      description: The CIDR network to retrieve the next address(es) from.
+      description:
+        - The CIDR network to retrieve the next address(es) from.
+        - Several networks can be given. They are tried in order.
       required: true
       type: str
     use_range:
@@ -43,6 +45,31 @@ options:
       required: false
       default: default
       type: str
+    workers:
+      description:
+        - Number of candidate networks or ranges probed concurrently.
+        - With the default of 1 the candidates are probed one after the other
+          and the search stops at the first one with I(num) free addresses.
+      required: false
+      default: 1
+      type: int
+      version_added: "1.10.0"
+    aggregate:
+      description:
+        - When no single network or range has I(num) free addresses, return
+          free addresses taken from several of them, in candidate order.
+      required: false
+      default: false
+      type: bool
+      version_added: "1.10.0"
+    details:
+      description:
+        - Return a dict per address with the network or range it was taken
+          from instead of the bare address.
+      required: false
+      default: false
+      type: bool
+      version_added: "1.10.0"
 '''
 
 EXAMPLES = """
@@ -73,6 +100,12 @@ EXAMPLES = """
                 exclude=['192.168.10.1', '192.168.10.2'],
                 provider={'host': 'nios01', 'username': 'admin', 'password': 'password'}) }}"
 
+- name: return 20 free IP addresses from the DHCP ranges of two networks, probing 4 ranges at a time
+  ansible.builtin.set_fact:
+    ipaddr: "{{ lookup('infoblox.nios_modules.nios_next_ip', '192.168.10.0/24', '192.168.11.0/24', num=20,
+                use_range=true, workers=4, aggregate=true, details=true,
+                provider={'host': 'nios01', 'username': 'admin', 'password': 'password'}) }}"
+
 - name: return next available IP address for network fd30:f52:2:12::/64
   ansible.builtin.set_fact:
     ipaddr: "{{ lookup('infoblox.nios_modules.nios_next_ip', 'fd30:f52:2:12::/64',
@@ -83,51 +116,127 @@ RETURN = """
 _list:
   description:
     - The list of next IP addresses available
+    - With I(details), one dict per address with the keys C(ip), C(ref),
+      C(network), C(network_view) and, for ranges, C(start_addr) and C(end_addr).
   returned: always
   type: list
 """
 
 from ansible.plugins.lookup import LookupBase
 from ansible.errors import AnsibleError
-from ..module_utils.api import WapiLookup
+from ..module_utils.api import InfobloxException, WapiLookup
+from ..module_utils.api import NIOS_NEXT_IP_EXHAUSTED_ERRORS, wapi_error_matches
+from concurrent.futures import ThreadPoolExecutor
 import ipaddress
 
 
 class LookupModule(LookupBase):
 
     def run(self, terms, variables=None, **kwargs):
-        try:
-            network = terms[0]
-        except IndexError:
+        if not terms:
             raise AnsibleError('missing argument in the form of A.B.C.D/E')
 
-        provider = kwargs.pop('provider', {})
+        provider = dict(kwargs.pop('provider', {}))
+        workers = max(kwargs.get('workers', 1), 1)
+        if workers > 1:
+            # every probe borrows a connection of the shared pool
+            provider.setdefault('http_pool_connections', workers)
+            provider.setdefault('http_pool_maxsize', workers)
         wapi = WapiLookup(provider)
         network_view = kwargs.get('network_view', 'default')
 
-        if isinstance(ipaddress.ip_network(network), ipaddress.IPv6Network):
-            object_type = 'ipv6range' if kwargs.get('use_range', False) else 'ipv6network'
-        else:
-            object_type = 'range' if kwargs.get('use_range', False) else 'network'
+        candidates = []
+        for network in terms:
+            if isinstance(ipaddress.ip_network(network), ipaddress.IPv6Network):
+                object_type = 'ipv6range' if kwargs.get('use_range', False) else 'ipv6network'
+            else:
+                object_type = 'range' if kwargs.get('use_range', False) else 'network'
+
+            network_obj = wapi.get_object(object_type, {'network': network, 'network_view': network_view})
 
-        network_obj = wapi.get_object(object_type, {'network': network, 'network_view': network_view})
+            if network_obj is None:
+                raise AnsibleError('unable to find network object %s' % network)
 
-        if network_obj is None:
-            raise AnsibleError('unable to find network object %s' % network)
+            candidates.extend(obj for obj in network_obj if obj['network_view'] == network_view)
 
         num = kwargs.get('num', 1)
         exclude_ip = kwargs.get('exclude', [])
 
-        ref_list = [network['_ref'] for network in network_obj if network['network_view'] == network_view]
-        if not ref_list:
+        if not candidates:
             raise AnsibleError('no records found')
 
-        for ref in ref_list:
+        def probe(candidate, count=num):
+            # WAPI fails the call when fewer than count addresses are free,
+            # which only means the candidate is too small
             try:
-                avail_ips = wapi.call_func('next_available_ip', ref, {'num': num, 'exclude': exclude_ip})
-                if len(avail_ips['ips']) >= num:
-                    return [avail_ips['ips']]
-            except Exception:
-                continue
+                return wapi.connector.call_func('next_available_ip', candidate['_ref'],
+                                                {'num': count, 'exclude': exclude_ip})['ips']
+            except InfobloxException as exc:
+                if wapi_error_matches(exc, NIOS_NEXT_IP_EXHAUSTED_ERRORS):
+                    return []
+                wapi.handle_exception('call_func', exc)
+
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                probes = list(executor.map(probe, candidates))
+        else:
+            probes = []
+            for candidate in candidates:
+                probes.append(probe(candidate))
+                if len(probes[-1]) >= num:
+                    break
+
+        details = kwargs.get('details', False)
+        for candidate, ips in zip(candidates, probes):
+            if len(ips) >= num:
+                return [self._format(ips, [candidate] * len(ips), details)]
+
+        if kwargs.get('aggregate', False):
+            # no candidate has num free addresses: take the most every
+            # candidate can give, in order, until num are found
+            ips, sources = [], []
+            for candidate in candidates:
+                needed = num - len(ips)
+                found = self._largest_probe(probe, candidate, needed, failed=needed == num)
+                ips.extend(found)
+                sources.extend([candidate] * len(found))
+                if len(ips) >= num:
+                    return [self._format(ips, sources, details)]
 
         raise AnsibleError('unable to find the required number of IPs')
+
+    @staticmethod
+    def _largest_probe(probe, candidate, count, failed=False):
+        ''' Returns the most free addresses of a candidate, up to count.
+        WAPI gives no partial result when fewer than count addresses are
+        free, so the count is bisected.
+        :args failed: whether count is already known to exceed the free
+            addresses
+        '''
+        best = [] if failed else probe(candidate, count)
+        if best:
+            return best
+        low, high = 0, count
+        while high - low > 1:
+            middle = (low + high) // 2
+            ips = probe(candidate, middle)
+            if ips:
+                low, best = middle, ips
+            else:
+                high = middle
+        return best
+
+    @staticmethod
+    def _format(ips, sources, details):
+        ''' Returns the addresses, or with details one dict per address
+        naming the network or range it was taken from '''
+        if not details:
+            return ips
+        result = []
+        for ip, source in zip(ips, sources):
+            entry = {'ip': ip, 'ref': source['_ref']}
+            for key in ('network', 'network_view', 'start_addr', 'end_addr'):
+                if key in source:
+                    entry[key] = source[key]
+            result.append(entry)
+        return result
@@ -28,7 +28,7 @@ options:
       description:
         - The CIDR of the network to retrieve the next network from next available network within the
           specified container. Also, Requested CIDR must be specified and greater than the parent CIDR.
-      required: true
+        - Required unless I(plan) is given.
       type: int
     num:
       description: The number of network addresses to return from network-container.
@@ -46,6 +46,28 @@ options:
       required: false
       default: default
       type: str
+    plan:
+      description:
+        - List of the prefix lengths of several networks to carve from the network-container.
+        - The existing child networks and network-containers are fetched once, with paged searches, and
+          the networks are allocated locally, best fit and largest first. The result is then verified by listing
+          the children again, or reserved in one WAPI multi-request when I(reserve=true).
+        - When set, I(cidr) and I(num) are ignored and one network is returned per entry, in order.
+      required: false
+      type: list
+      elements: int
+      version_added: "1.10.0"
+    reserve:
+      description:
+        - When I(plan) is given, creates the planned networks in one atomic multi-request so that no
+          other client can take them. Nothing is created if any of them is no longer free.
+        - This is not idempotent. Ansible may evaluate a lookup lazily, every time the variable holding it is
+          used, or not at all, and each evaluation creates new networks. Assign the result with
+          M(ansible.builtin.set_fact) once, or create the networks with M(infoblox.nios_modules.nios_network).
+      required: false
+      default: false
+      type: bool
+      version_added: "1.10.0"
 '''
 
 EXAMPLES = """
@@ -69,6 +91,11 @@ EXAMPLES = """
     networkaddr: "{{ lookup('infoblox.nios_modules.nios_next_network', '192.168.10.0/24', cidr=25, exclude=['192.168.10.0/25'],
                         provider={'host': 'nios01', 'username': 'admin', 'password': 'password'}) }}"
 
+- name: plan a /25 and two /27 networks in network-container 192.168.10.0/24 and reserve them
+  ansible.builtin.set_fact:
+    networkaddr: "{{ lookup('infoblox.nios_modules.nios_next_network', '192.168.10.0/24', plan=[25, 27, 27], reserve=true,
+                        provider={'host': 'nios01', 'username': 'admin', 'password': 'password'}) }}"
+
 - name: return the available ipv6 network addresses for network-container 2001:1:111:1::0/64
   set_fact:
     networkaddr: "{{ lookup('infoblox.nios_modules.nios_next_network', '2001:1:111:1::0/64', cidr=126,
@@ -86,8 +113,10 @@ _list:
 from ansible.plugins.lookup import LookupBase
 from ansible.module_utils.common.text.converters import to_text
 from ansible.errors import AnsibleError
-from ..module_utils.api import WapiLookup
+from ..module_utils.api import WapiLookup, wapi_request
+from ..module_utils.api import NIOS_IPV4_NETWORK, NIOS_IPV6_NETWORK
 from ..module_utils.api import NIOS_IPV4_NETWORK_CONTAINER, NIOS_IPV6_NETWORK_CONTAINER
+from ..module_utils.network import SubnetAllocator
 import ipaddress
 
 
@@ -100,42 +129,40 @@ class LookupModule(LookupBase):
             raise AnsibleError('network argument is missing')
         except (ValueError, TypeError) as error:
             raise AnsibleError('network argument is invalid %s' % error)
-        cidr = kwargs.get('cidr')
-        if cidr is None:
-            raise AnsibleError('missing required argument: cidr')
-        # Reject bool and float explicitly: bool is a subclass of int, and
-        # int(25.7) would silently truncate to 25, masking a user error.
-        if isinstance(cidr, (bool, float)):
-            raise AnsibleError('cidr must be an integer, got %r' % (cidr,))
-        try:
-            cidr = int(cidr)
-        except (TypeError, ValueError):
-            raise AnsibleError('cidr must be an integer, got %r' % (cidr,))
-
-        container_type = None
-        network_objects = None
+        plan = kwargs.get('plan')
+        if plan:
+            if not isinstance(plan, (list, tuple)):
+                plan = [plan]
+            prefixlens = [self._validate_cidr(network, cidr) for cidr in plan]
+        else:
+            prefixlens = None
+            cidr = kwargs.get('cidr')
+            if cidr is None:
+                raise AnsibleError('missing required argument: cidr')
+            cidr = self._validate_cidr(network, cidr)
 
         # check for ip version 4 or 6 else die
         if network.version == 4:
             container_type = NIOS_IPV4_NETWORK_CONTAINER
-            if cidr not in range(1, 33):
-                raise AnsibleError('cidr %s must be in range 1 to 32' % cidr)
+            network_type = NIOS_IPV4_NETWORK
         elif network.version == 6:
             container_type = NIOS_IPV6_NETWORK_CONTAINER
-            if cidr not in range(1, 129):
-                raise AnsibleError('cidr %s must be in range 1 to 128' % cidr)
+            network_type = NIOS_IPV6_NETWORK
         else:
             raise AnsibleError('not a valid ipv4 or ipv6 network definition %s' % terms[0])
 
-        # check for valid subnetting cidr
-        if network.prefixlen >= cidr:
-            raise AnsibleError('cidr %s must be greater than parent network cidr %s' % (cidr, network.prefixlen))
-
         provider = kwargs.pop('provider', {})
         wapi = WapiLookup(provider)
 
-        if container_type is None:
-            raise AnsibleError('unable to identify network-container type')
+        if prefixlens:
+            try:
+                return [self._plan(wapi, network, prefixlens, container_type, network_type,
+                                   kwargs.get('exclude') or [], kwargs.get('network_view', 'default'),
+                                   kwargs.get('reserve', False))]
+            except AnsibleError:
+                raise
+            except Exception as exc:
+                raise AnsibleError(to_text(exc))
 
         network_objects = wapi.get_object(container_type, {'network': network.with_prefixlen})
 
@@ -156,3 +183,62 @@ class LookupModule(LookupBase):
             return [avail_nets['networks']]
         except Exception as exc:
             raise AnsibleError(to_text(exc))
+
+    @staticmethod
+    def _validate_cidr(network, cidr):
+        # Reject bool and float explicitly: bool is a subclass of int, and
+        # int(25.7) would silently truncate to 25, masking a user error.
+        if isinstance(cidr, (bool, float)):
+            raise AnsibleError('cidr must be an integer, got %r' % (cidr,))
+        try:
+            cidr = int(cidr)
+        except (TypeError, ValueError):
+            raise AnsibleError('cidr must be an integer, got %r' % (cidr,))
+
+        if cidr not in range(1, network.max_prefixlen + 1):
+            raise AnsibleError('cidr %s must be in range 1 to %s' % (cidr, network.max_prefixlen))
+        # check for valid subnetting cidr
+        if network.prefixlen >= cidr:
+            raise AnsibleError('cidr %s must be greater than parent network cidr %s' % (cidr, network.prefixlen))
+        return cidr
+
+    @staticmethod
+    def _plan(wapi, network, prefixlens, container_type, network_type, exclude, network_view, reserve):
+        ''' Carves several networks from a network-container: its direct
+        children are listed with paged searches returning only their network.
+        The plan is then atomically created in one multi-request, or verified
+        by listing the children again
+        '''
+        container = network.with_prefixlen
+        if not wapi.get_object(container_type, {'network': container, 'network_view': network_view},
+                               return_fields=['network']):
+            raise AnsibleError('unable to find network-container object %s' % container)
+
+        object_types = (network_type, container_type)
+        child_filter = {'network_container': container, 'network_view': network_view}
+        used = [obj['network'] for obj_type in object_types
+                for obj in wapi.iter_objects(obj_type, dict(child_filter), return_fields=['network'])]
+        try:
+            planned = SubnetAllocator(network, used + list(exclude)).plan(prefixlens)
+        except ValueError as exc:
+            raise AnsibleError(to_text(exc))
+
+        if reserve:
+            wapi.multi_request([wapi_request('POST', network_type, {'network': net.with_prefixlen, 'network_view': network_view})
+                                for net in planned])
+            return [net.with_prefixlen for net in planned]
+
+        # another client may have created a network or a network-container
+        # inside or around one of the planned networks since the children
+        # were listed: list them again and look for any overlap
+        known = set(used)
+        for obj_type in object_types:
+            for obj in wapi.iter_objects(obj_type, dict(child_filter), return_fields=['network']):
+                if obj['network'] in known:
+                    continue
+                child = ipaddress.ip_network(to_text(obj['network']), strict=False)
+                for net in planned:
+                    if net.overlaps(child):
+                        raise AnsibleError('planned network %s is already in use by %s %s'
+                                           % (net.with_prefixlen, obj_type, obj['network']))
+        return [net.with_prefixlen for net in planned]
@@ -32,11 +32,16 @@ __metaclass__ = type
 import json
 import os
 import copy
+import tempfile
+import time
+from collections import deque
 from functools import partial
 from ansible.module_utils.common.text.converters import to_native
 from ansible.module_utils.common.text.converters import to_text
 from ansible.module_utils.basic import env_fallback
+from ansible.module_utils.connection import Connection
 from ansible.module_utils.common.validation import check_type_dict
+from ansible.module_utils.common.arg_spec import ArgumentSpecValidator
 from ast import literal_eval as safe_eval
 
 try:
@@ -46,6 +51,16 @@ try:
 except ImportError:
     HAS_INFOBLOX_CLIENT = False
 
+    # infoblox-client is not needed when the module talks to WAPI through the
+    # persistent httpapi connection. Define a compatible placeholder so that
+    # the error handling in WapiBase keeps working in that case.
+    class InfobloxException(Exception):
+        message = 'An unknown exception occurred.'
+
+        def __init__(self, response, **kwargs):
+            self.response = response
+            super(InfobloxException, self).__init__(self.message % kwargs)
+
 # defining nios constants
 NIOS_DNS_VIEW = 'view'
 NIOS_NETWORK_VIEW = 'networkview'
@@ -86,9 +101,10 @@ NIOS_DTC_TOPOLOGY = 'dtc:topology'
 NIOS_EXTENSIBLE_ATTRIBUTE = 'extensibleattributedef'
 NIOS_VLAN = 'vlan'
 NIOS_ADMINUSER = 'adminuser'
+NIOS_DB_OBJECTS = 'db_objects'
 
-# Object types that intentionally do NOT participate in the post-write
-# re-fetch performed at the end of WapiModule.run() (issue #305).
+# Object types that intentionally do NOT request return fields on their
+# create/update calls in WapiModule.run() (issue #305).
 # NIOS_MEMBER's create_token path already returns its payload under
 # result['api_results'] and there is no canonical 'member' object to re-read
 # in that flow.
@@ -98,8 +114,8 @@ NIOS_RETURN_OBJECT_EXCLUDE = frozenset({
 
 # ib_spec keys that are module-side helpers / write-only inputs and are NOT
 # valid WAPI return fields. They are stripped from the return_fields set
-# passed to the post-write re-fetch in WapiModule.run() (issue #305) so the
-# GET succeeds on the first try. Mirrors the per-type sanitization already
+# sent with the create/update calls in WapiModule.run() (issue #305) so the
+# write is not rejected. Mirrors the per-type sanitization already
 # performed by get_object_ref() before its own GETs.
 NIOS_RETURN_FIELDS_EXCLUDE = frozenset({
     'restart_if_needed',   # nios_zone
@@ -112,6 +128,47 @@ NIOS_RETURN_FIELDS_EXCLUDE = frozenset({
     'vlans',               # nios_network, nios_vlan - WAPI rejects GET return_fields+=vlans
 })
 
+# Maximum number of requests sent in one WAPI multi-request (`request`
+# object) round trip. Larger batches are split into several round trips.
+NIOS_MULTI_REQUEST_CHUNK_SIZE = 500
+
+# Number of times a bulk multi-request creating records with addresses from
+# next_available_ip is retried with freshly allocated addresses, when another
+# client took one of the addresses in the meantime.
+NIOS_NEXT_IP_RETRIES = 3
+
+# Fragments of the WAPI error texts of a next_available_ip call asking for
+# more addresses than are free, and of a write using an address that is
+# already taken
+NIOS_NEXT_IP_EXHAUSTED_ERRORS = ('available ip address', 'available ipv6 address')
+NIOS_NEXT_IP_CONFLICT_ERRORS = ('already in use', 'already used', 'is in use')
+
+# Fragments of the WAPI error texts of a request naming a field that the
+# object type, or the WAPI version, cannot return
+NIOS_RETURN_FIELD_ERRORS = ('unknown argument/field', 'unknown field', 'not readable', 'invalid field')
+
+# Object types whose existing object is looked up by a subset of the ib_req
+# fields only, mirroring the filters used by get_object_ref().
+NIOS_BULK_FILTER_FIELDS = {
+    NIOS_CNAME_RECORD: ('name', 'view'),
+}
+
+# Fields always returned by the lookup of an existing object, whatever the
+# state, because get_object_ref() and run() use them to pick among several
+# matches (IPAM-only host records, networks outside the default view).
+NIOS_LOOKUP_RETURN_FIELDS = {
+    NIOS_HOST_RECORD: ('view', 'configure_for_dns'),
+    NIOS_IPV4_NETWORK: ('network_view',),
+    NIOS_IPV6_NETWORK: ('network_view',),
+}
+
+# Upper bound of the change log entries read by an incremental inventory
+# refresh. Above it a full refresh is both cheaper and safer.
+NIOS_DB_OBJECTS_MAX_RESULTS = 10000
+
+# Default number of objects requested per page by WapiBase.get_object_pages()
+NIOS_PAGE_SIZE = 1000
+
 NIOS_PROVIDER_SPEC = {
     'host': dict(fallback=(env_fallback, ['INFOBLOX_HOST'])),
     'username': dict(fallback=(env_fallback, ['INFOBLOX_USERNAME'])),
@@ -125,7 +182,9 @@ NIOS_PROVIDER_SPEC = {
     'http_pool_maxsize': dict(type='int', default=10),
     'max_retries': dict(type='int', default=3, fallback=(env_fallback, ['INFOBLOX_MAX_RETRIES'])),
     'wapi_version': dict(default='2.12.3', fallback=(env_fallback, ['INFOBLOX_WAPI_VERSION'])),
-    'max_results': dict(type='int', default=1000, fallback=(env_fallback, ['INFOBLOX_MAX_RESULTS']))
+    'max_results': dict(type='int', default=1000, fallback=(env_fallback, ['INFOBLOX_MAX_RESULTS'])),
+    'ref_cache': dict(type='path', fallback=(env_fallback, ['INFOBLOX_REF_CACHE'])),
+    'ref_cache_ttl': dict(type='int', default=300, fallback=(env_fallback, ['INFOBLOX_REF_CACHE_TTL']))
 }
 
 
@@ -167,6 +226,179 @@ def get_connector(*args, **kwargs):
     return Connector(kwargs)
 
 
+class WapiHttpApiError(InfobloxException):
+    message = "WAPI request '%(method)s %(path)s' failed: %(content)s [code %(code)s]"
+
+
+class WapiMultiRequestError(InfobloxException):
+    message = "WAPI multi-request failed: %(content)s [code %(code)s]"
+
+
+class WapiPagingError(InfobloxException):
+    message = "WAPI paged search failed: %(content)s [code %(code)s]"
+
+
+def wapi_error_matches(exc, fragments):
+    ''' Tells whether the error text of a WAPI exception holds one of the
+    given lower case fragments
+    :args exc: instance of InfobloxException
+    :args fragments: tuple of lower case strings
+    :returns: True when one of fragments is found
+    '''
+    response = getattr(exc, 'response', None) or {}
+    if isinstance(response, dict):
+        text = ' '.join(to_text(response.get(key) or '') for key in ('text', 'Error'))
+    else:
+        text = to_text(response)
+    text = (text.strip() or to_text(exc)).lower()
+    return any(fragment in text for fragment in fragments)
+
+
+def wapi_request(method, obj, data=None, args=None):
+    ''' Builds one entry of a WAPI multi-request payload
+    :args method: the HTTP verb of the request
+    :args obj: the object type or object reference to operate against
+    :args data: the search filter (GET) or request body (POST/PUT)
+    :args args: dict of WAPI query arguments such as _return_fields
+    :returns: dict suitable for the WAPI `request` object
+    '''
+    request = {'method': method, 'object': obj}
+    if data:
+        request['data'] = data
+    if args:
+        request['args'] = args
+    return request
+
+
+def _connector_send(connector, method, url, data=None, error=WapiMultiRequestError):
+    ''' Sends one raw request using the session, authentication cookie and
+    request options of an infoblox_client Connector. Non 2xx replies and
+    transport failures are raised as `error`.
+    '''
+    opts = connector._get_request_options(data=data)
+    if connector.session.cookies:
+        connector._validate_cookie()
+    try:
+        r = getattr(connector.session, method)(url, **opts)
+    except IOError as exc:
+        raise error(response={}, content=to_native(exc), code=None)
+    connector._validate_authorized(r)
+    if r.status_code not in (200, 201):
+        try:
+            response = json.loads(r.content)
+        except ValueError:
+            response = {'text': to_text(r.content)}
+        raise error(response=response, content=to_text(r.content), code=r.status_code)
+    return connector._parse_reply(r)
+
+
+def connector_multi_request(connector, requests):
+    ''' Posts a list of requests to the WAPI `request` object using the
+    session of an infoblox_client Connector, which has no API of its own for
+    multi-requests. Returns the list of per-request results.
+    '''
+    return _connector_send(connector, 'post', connector._construct_url('request'), data=requests)
+
+
+def connector_get_page(connector, obj_type, query_params, extattrs=None):
+    ''' Fetches a single page of a WAPI paged search using the session of an
+    infoblox_client Connector. Connector.get_object() always walks every
+    page before returning, so it cannot be used to consume pages lazily.
+    '''
+    url = connector._construct_url(obj_type, dict(query_params), extattrs)
+    return _connector_send(connector, 'get', url, error=WapiPagingError)
+
+
+class WapiHttpApiConnector(object):
+    ''' Connector compatible interface on top of the persistent httpapi
+    connection. The httpapi plugin keeps one authenticated session (and the
+    ibapauth cookie) alive for the whole play, so WAPI calls made through
+    this class do not pay a new TCP/TLS handshake and basic-auth per task.
+    Only the subset of the infoblox_client Connector API used by this
+    collection is implemented.
+    '''
+
+    def __init__(self, connection, max_results=None):
+        self.connection = connection
+        self.max_results = max_results
+
+    @staticmethod
+    def _build_query_params(payload=None, return_fields=None, max_results=None, paging=False):
+        query_params = dict(payload or {})
+        if return_fields:
+            return_fields = list(return_fields)
+            if 'default' in return_fields:
+                return_fields.remove('default')
+                query_params['_return_fields+'] = ','.join(return_fields)
+            else:
+                query_params['_return_fields'] = ','.join(return_fields)
+        if max_results:
+            query_params['_max_results'] = max_results
+        if paging:
+            query_params['_paging'] = 1
+            query_params['_return_as_object'] = 1
+        return query_params
+
+    def _request(self, path, method='GET', data=None, params=None):
+        code, response = self.connection.send_request(data, path=path, method=method, params=params)
+        if code >= 400:
+            if not isinstance(response, dict):
+                response = {'text': to_text(response)}
+            raise WapiHttpApiError(response=response, method=method, path=path,
+                                   content=response.get('text', response), code=code)
+        return response
+
+    def get_object(self, obj_type, payload=None, return_fields=None, extattrs=None,
+                   force_proxy=False, max_results=None, paging=None):
+        if max_results is None and self.max_results:
+            max_results = self.max_results
+        query_params = self._build_query_params(payload, return_fields, max_results, paging)
+        for key, value in (extattrs or {}).items():
+            query_params['*%s' % key] = value['value']
+        if force_proxy:
+            query_params['_proxy_search'] = 'GM'
+
+        if not paging:
+            return self._request(obj_type, params=query_params)
+
+        if query_params.get('_max_results', 0) < 0:
+            query_params['_max_results'] = 1000
+        result = []
+        while True:
+            response = self._request(obj_type, params=query_params)
+            if not response:
+                return None
+            result.extend(response['result'])
+            if 'next_page_id' not in response:
+                return result
+            query_params['_page_id'] = response['next_page_id']
+
+    def get_page(self, obj_type, query_params, extattrs=None):
+        query_params = dict(query_params)
+        for key, value in (extattrs or {}).items():
+            query_params['*%s' % key] = value['value']
+        return self._request(obj_type, params=query_params)
+
+    def create_object(self, obj_type, payload, return_fields=None):
+        return self._request(obj_type, method='POST', data=payload,
+                             params=self._build_query_params(return_fields=return_fields))
+
+    def update_object(self, ref, payload, return_fields=None):
+        return self._request(ref, method='PUT', data=payload,
+                             params=self._build_query_params(return_fields=return_fields))
+
+    def delete_object(self, ref, delete_arguments=None):
+        return self._request(ref, method='DELETE', params=delete_arguments)
+
+    def call_func(self, func_name, ref, payload, return_fields=None):
+        query_params = self._build_query_params(return_fields=return_fields)
+        query_params['_function'] = func_name
+        return self._request(ref, method='POST', data=payload, params=query_params)
+
+    def multi_request(self, requests):
+        return self._request('request', method='POST', data=requests)
+
+
 def normalize_extattrs(value):
     ''' Normalize extattrs field to expected format
     The module accepts extattrs as key/value pairs.  This method will
@@ -276,11 +508,225 @@ def normalize_ib_spec(ib_spec):
     return result
 
 
+def freeze_value(value):
+    ''' Returns a hashable, canonical form of a WAPI value
+    Dicts become a frozenset of their (key, frozen value) pairs and lists a
+    tuple of frozen values, so that two values compare equal as frozen keys
+    exactly when they compare equal as decoded JSON.
+    '''
+    if isinstance(value, dict):
+        return frozenset((k, freeze_value(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze_value(v) for v in value)
+    if isinstance(value, set):
+        return frozenset(freeze_value(v) for v in value)
+    return value
+
+
+def normalize_list_item(item):
+    ''' Normalizes the MAC address or DUID of a proposed list item in place
+    so that it compares equal to the form NIOS returns
+    '''
+    if isinstance(item, dict):
+        if isinstance(item.get('mac'), str):
+            item['mac'] = item['mac'].replace('-', ':').lower()
+        elif isinstance(item.get('duid'), str):
+            item['duid'] = item['duid'].replace('-', ':').lower()
+    return item
+
+
+class ListMatcher(object):
+    ''' Index over a list of current WAPI items used to compare proposed
+    list items against it without a nested scan.
+
+    A proposed dict matches a current dict when all its key/value pairs are
+    present in the current one, any other value matches when it is equal.
+    Current items are projected onto the key set of the proposed dict and
+    hashed once per distinct key set, so matching n proposed items against
+    m current items costs O(n + m) instead of O(n * m).
+    '''
+
+    def __init__(self, items):
+        self.items = list(items)
+        self._indexes = {}
+        self._values = None
+        self._used = set()
+
+    def _index(self, keys):
+        index = self._indexes.get(keys)
+        if index is None:
+            index = {}
+            for idx, current in enumerate(self.items):
+                if isinstance(current, dict) and all(k in current for k in keys):
+                    index.setdefault(tuple(freeze_value(current[k]) for k in keys), deque()).append(idx)
+            self._indexes[keys] = index
+        return index
+
+    def _candidates(self, item):
+        if isinstance(item, dict):
+            keys = tuple(sorted(item, key=str))
+            return self._index(keys).get(tuple(freeze_value(item[k]) for k in keys))
+        if self._values is None:
+            self._values = {}
+            for idx, current in enumerate(self.items):
+                try:
+                    self._values.setdefault(freeze_value(current), deque()).append(idx)
+                except TypeError:
+                    continue
+        try:
+            return self._values.get(freeze_value(item))
+        except TypeError:
+            return None
+
+    def contains(self, item):
+        ''' Checks if item matches any current item
+        :args item: the proposed list item
+        :returns: True if a matching current item exists
+        '''
+        return bool(self._candidates(item))
+
+    def take(self, item):
+        ''' Consumes the first current item matching item that has not been
+        consumed yet, in list order
+        :args item: the proposed list item
+        :returns: True if such an item was found
+        '''
+        candidates = self._candidates(item)
+        while candidates:
+            idx = candidates.popleft()
+            if idx not in self._used:
+                self._used.add(idx)
+                return True
+        return False
+
+
+def bulk_argument_spec(ib_spec):
+    ''' Returns the argument spec of a module that supports bulk mode.
+    Top level options are no longer required since every entry of the
+    `items` list carries its own values. Use together with
+    bulk_required_one_of() so single object calls still require them.
+    '''
+    result = normalize_ib_spec(ib_spec)
+    for arg in result:
+        result[arg].pop('required', None)
+    result['items'] = dict(type='list', elements='dict')
+    return result
+
+
+def bulk_required_one_of(ib_spec):
+    ''' Returns the required_one_of rules matching bulk_argument_spec() '''
+    return [['items', k] for k, v in ib_spec.items() if v.get('required')]
+
+
+class NiosRefCache(object):
+    ''' Controller side, on-disk cache of name-to-_ref mappings shared by the
+    module invocations of a play (and of later plays) against the same grid.
+    Entries expire after `ttl` seconds and are dropped as soon as a module
+    deletes or updates the object they point to. Only positive lookups are
+    stored, since an object that is missing now may be created by a later
+    task. The file is rewritten atomically, merging the changes made by
+    concurrent module invocations.
+    '''
+
+    def __init__(self, path, ttl, namespace):
+        self.path = os.path.expanduser(path)
+        self.ttl = ttl
+        self.namespace = namespace
+        self.hits = 0
+        self.misses = 0
+        self._entries = self._load().get(namespace, {})
+        self._updated = {}
+        self._removed = set()
+
+    @classmethod
+    def from_provider(cls, provider):
+        ''' Returns a NiosRefCache when the provider enables one, else None '''
+        provider = provider or {}
+        if not provider.get('ref_cache'):
+            return None
+        ttl = provider.get('ref_cache_ttl')
+        if ttl is None:
+            ttl = NIOS_PROVIDER_SPEC['ref_cache_ttl']['default']
+        # users with different permissions may not see the same objects
+        namespace = '%s@%s/%s' % (provider.get('username') or '', provider.get('host') or 'httpapi',
+                                  provider.get('wapi_version') or NIOS_PROVIDER_SPEC['wapi_version']['default'])
+        return cls(provider['ref_cache'], ttl, namespace)
+
+    @staticmethod
+    def key(*parts):
+        return json.dumps(parts, sort_keys=True)
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (IOError, OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry and entry.get('expires', 0) > time.time():
+            self.hits += 1
+            return entry['value']
+        self.misses += 1
+        return None
+
+    def set(self, key, value, ref):
+        entry = {'value': value, 'ref': ref, 'expires': time.time() + self.ttl}
+        self._entries[key] = self._updated[key] = entry
+        self._removed.discard(key)
+
+    def _drop(self, match):
+        for key in [k for k, entry in self._entries.items() if match(k, entry)]:
+            del self._entries[key]
+            self._updated.pop(key, None)
+            self._removed.add(key)
+
+    def invalidate(self, ref):
+        ''' Drops every entry that points to the object reference `ref`.
+        The network views cached by get_network_view() point to their DNS
+        view, so they are all dropped when a network view changes.
+        '''
+        self._drop(lambda key, entry: entry.get('ref') == ref)
+        if ref and ref.startswith(NIOS_NETWORK_VIEW + '/'):
+            self._drop(lambda key, entry: json.loads(key)[-1:] == ['network_view'])
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses}
+
+    def save(self):
+        ''' Merges the local changes into the cache file '''
+        if not self._updated and not self._removed:
+            return
+        data = self._load()
+        now = time.time()
+        entries = dict((k, v) for k, v in data.get(self.namespace, {}).items()
+                       if isinstance(v, dict) and v.get('expires', 0) > now and k not in self._removed)
+        entries.update(self._updated)
+        data[self.namespace] = entries
+
+        directory = os.path.dirname(self.path) or '.'
+        try:
+            if not os.path.isdir(directory):
+                os.makedirs(directory, 0o700)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.nios_ref_cache')
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except (IOError, OSError):
+            # the cache is an optimization only, never fail the task for it
+            return
+        self._updated = {}
+        self._removed = set()
+
+
 class WapiBase(object):
     ''' Base class for implementing Infoblox WAPI API '''
     provider_spec = {'provider': dict(type='dict', options=NIOS_PROVIDER_SPEC)}
 
     def __init__(self, provider):
+        self.provider = provider or {}
         self.connector = get_connector(**(provider or {}))
 
     def __getattr__(self, name):
@@ -291,6 +737,16 @@ class WapiBase(object):
                 raise AttributeError("'%s' object has no attribute '%s'" % (self.__class__.__name__, name))
             return partial(self._invoke_method, name)
 
+    def new_connector(self):
+        ''' Returns a connector of its own to the same grid, for use by
+        another thread, as a requests session is not thread safe. The
+        httpapi connector holds no session and is returned as is.
+        '''
+        provider = self.__dict__.get('provider')
+        if provider is None:
+            return self.connector
+        return get_connector(**provider)
+
     def _invoke_method(self, name, *args, **kwargs):
         try:
             method = getattr(self.connector, name)
@@ -301,9 +757,161 @@ class WapiBase(object):
             else:
                 raise
 
+    def multi_request(self, requests, chunk_size=NIOS_MULTI_REQUEST_CHUNK_SIZE):
+        ''' Sends requests through the WAPI `request` object so that many
+        reads or writes share one round trip
+        :args requests: list of request dicts as built by wapi_request()
+        :args chunk_size: maximum number of requests per round trip
+        :returns: list of the per-request results, in request order
+        '''
+        results = []
+        for start in range(0, len(requests), chunk_size):
+            chunk = requests[start:start + chunk_size]
+            try:
+                results.extend(self._send_multi_request(chunk))
+            except InfobloxException as exc:
+                if hasattr(self, 'handle_exception'):
+                    self.handle_exception('multi_request', exc)
+                else:
+                    raise
+        return results
+
+    def _send_multi_request(self, requests):
+        if isinstance(self.connector, WapiHttpApiConnector):
+            return self.connector.multi_request(requests)
+        return connector_multi_request(self.connector, requests)
+
+    def get_object_pages(self, obj_type, payload=None, return_fields=None, extattrs=None,
+                         page_size=NIOS_PAGE_SIZE):
+        ''' Lazily walks a WAPI paged search (`_paging`, `_max_results`,
+        `_page_id`). The next page is only requested once the caller has
+        consumed the previous one, so large result sets are never held in
+        memory as a whole and are not truncated at `max_results`.
+        :args obj_type: the WAPI object type to search for
+        :args payload: dict of search filters
+        :args return_fields: list of fields to return for every object, an
+            empty list returns the object references only
+        :args extattrs: normalized extensible attribute search filters
+        :args page_size: number of objects requested per page
+        :returns: generator yielding one list of objects per page
+        '''
+        query_params = dict(payload or {})
+        if return_fields is not None:
+            # an empty list asks WAPI for the object references only
+            return_fields = list(return_fields)
+            if 'default' in return_fields:
+                return_fields.remove('default')
+                query_params['_return_fields+'] = ','.join(return_fields)
+            else:
+                query_params['_return_fields'] = ','.join(return_fields)
+        query_params['_paging'] = 1
+        query_params['_return_as_object'] = 1
+        query_params['_max_results'] = abs(page_size or NIOS_PAGE_SIZE)
+
+        while True:
+            try:
+                if isinstance(self.connector, WapiHttpApiConnector):
+                    response = self.connector.get_page(obj_type, query_params, extattrs)
+                else:
+                    response = connector_get_page(self.connector, obj_type, query_params, extattrs)
+            except InfobloxException as exc:
+                if hasattr(self, 'handle_exception'):
+                    self.handle_exception('get_object_pages', exc)
+                    return
+                raise
+            if not response:
+                return
+            yield response.get('result', [])
+            if not response.get('next_page_id'):
+                return
+            query_params['_page_id'] = response['next_page_id']
+
+    def iter_objects(self, obj_type, payload=None, return_fields=None, extattrs=None,
+                     page_size=NIOS_PAGE_SIZE):
+        ''' Same as get_object_pages() but yields the objects one by one '''
+        for page in self.get_object_pages(obj_type, payload, return_fields=return_fields,
+                                          extattrs=extattrs, page_size=page_size):
+            for obj in page:
+                yield obj
+
+    def get_objects(self, obj_type, filters, return_fields=None):
+        ''' Runs several searches of the same object type in one round trip
+        A single search is sent as a plain GET, several are sent as one WAPI
+        multi-request so that fallback lookups do not cost a round trip each.
+        :args obj_type: the WAPI object type to search for
+        :args filters: list of search filter dicts
+        :args return_fields: list of fields to return for every object
+        :returns: list with the matching objects of every filter, in order
+        '''
+        if len(filters) == 1:
+            return [self.get_object(obj_type, filters[0].copy(), return_fields=return_fields)]
+        args = {'_return_fields': ','.join(return_fields)} if return_fields else None
+        return self.multi_request([wapi_request('GET', obj_type, data=dict(obj_filter), args=args)
+                                   for obj_filter in filters])
+
+    def resolve_refs(self, queries):
+        ''' Resolves (obj_type, filter) pairs to the reference of the first
+        matching object. Results are memoized for the lifetime of this
+        instance, so a name used several times is only looked up once, and
+        all the lookups still unknown are sent in a single round trip.
+        When the provider enables the on-disk ref_cache, references found
+        there are reused across module invocations until they expire.
+        :args queries: list of (obj_type, filter dict) tuples
+        :returns: list of object references, None where nothing matched
+        '''
+        cache = self.__dict__.setdefault('_ref_cache', {})
+        ref_cache = self.__dict__.get('ref_cache')
+        keys = [(obj_type, tuple(sorted(obj_filter.items()))) for obj_type, obj_filter in queries]
+        missing = {}
+        for key, query in zip(keys, queries):
+            if key in cache or key in missing:
+                continue
+            if ref_cache:
+                ref = ref_cache.get(NiosRefCache.key(*query))
+                if ref:
+                    cache[key] = ref
+                    continue
+            missing[key] = query
+        missing = list(missing.items())
+
+        if len(missing) == 1:
+            key, (obj_type, obj_filter) = missing[0]
+            missing_results = [self.get_object(obj_type, dict(obj_filter))]
+        elif missing:
+            missing_results = self.multi_request([wapi_request('GET', obj_type, data=dict(obj_filter))
+                                                  for key, (obj_type, obj_filter) in missing])
+        else:
+            missing_results = []
+
+        for (key, query), result in zip(missing, missing_results):
+            cache[key] = result[0]['_ref'] if result else None
+            if ref_cache and cache[key]:
+                ref_cache.set(NiosRefCache.key(*query), cache[key], cache[key])
+        if ref_cache:
+            ref_cache.save()
+        return [cache[key] for key in keys]
+
+    def resolve_ref(self, obj_type, obj_filter):
+        ''' Same as resolve_refs() for a single object '''
+        return self.resolve_refs([(obj_type, obj_filter)])[0]
+
 
 class WapiLookup(WapiBase):
     ''' Implements WapiBase for lookup plugins '''
+    def get_flattened_pages(self, obj_type, payload=None, return_fields=None, extattrs=None,
+                            page_size=NIOS_PAGE_SIZE):
+        ''' Streams a WAPI paged search one page at a time with the
+        extensible attributes of every object already flattened to
+        key/value pairs, so only a single page is held in memory.
+        :returns: generator yielding one list of objects per page
+        '''
+        for page in self.get_object_pages(obj_type, payload, return_fields=return_fields,
+                                          extattrs=extattrs, page_size=page_size):
+            for obj in page:
+                if 'extattrs' in obj:
+                    obj['extattrs'] = flatten_extattrs(obj['extattrs'])
+            yield page
+
     def handle_exception(self, method_name, exc):
         response = getattr(exc, 'response', None) or {}
         if 'text' in response:
@@ -330,17 +938,75 @@ class WapiInventory(WapiBase):
             raise Exception(response['text']) from exc
         raise Exception(exc) from exc
 
+    def get_last_sequence_id(self):
+        ''' Returns the current sequence id of the NIOS database change log.
+        Searching db_objects without a start_sequence_id only reports the
+        last sequence id, which later marks the starting point of
+        get_changed_refs().
+        '''
+        res = self.get_object(NIOS_DB_OBJECTS, return_fields=['last_sequence_id']) or []
+        return res[0]['last_sequence_id'] if res else None
+
+    def get_changed_refs(self, obj_type, sequence_id, max_results=NIOS_DB_OBJECTS_MAX_RESULTS):
+        ''' Lists the objects of a type changed since a database sequence id
+        :args obj_type: the WAPI object type to track
+        :args sequence_id: the sequence id of the previous synchronization
+        :args max_results: maximum number of changes to retrieve
+        :returns: tuple of the set of changed object references and the new
+            last sequence id, or (None, None) when more than max_results
+            changes happened and a full refresh is cheaper
+        '''
+        changes = self.get_object(NIOS_DB_OBJECTS,
+                                  {'start_sequence_id': sequence_id, 'object_types': obj_type, 'all_events': False},
+                                  return_fields=['last_sequence_id', 'object'],
+                                  max_results=max_results) or []
+        if len(changes) >= max_results:
+            return None, None
+
+        refs = set()
+        last_sequence_id = sequence_id
+        for change in changes:
+            obj = change.get('object')
+            if isinstance(obj, dict):
+                obj = obj.get('_ref')
+            if obj:
+                refs.add(obj)
+            last_sequence_id = change.get('last_sequence_id', last_sequence_id)
+        return refs, last_sequence_id
+
 
 class AnsibleError(Exception):
     '''Implements raising exceptions'''
     pass
 
 
+class BulkItemModule(object):
+    ''' Stands for the module while one bulk item is planned: `params` are
+    the params of the item, everything else is read from the module, so the
+    ib_spec transforms see the values of the item
+    '''
+    def __init__(self, module, params):
+        self.module = module
+        self.params = params
+
+    def __getattr__(self, name):
+        return getattr(self.module, name)
+
+
 class WapiModule(WapiBase):
     ''' Implements WapiBase for executing a NIOS module '''
     def __init__(self, module):
         self.module = module
         provider = module.params['provider']
+        self.ref_cache = NiosRefCache.from_provider(provider)
+        # Route through the persistent httpapi connection when the task runs
+        # with ansible_connection=httpapi and no explicit provider host.
+        socket_path = getattr(module, '_socket_path', None)
+        if isinstance(socket_path, str) and socket_path and not (provider or {}).get('host'):
+            self.connector = WapiHttpApiConnector(
+                Connection(socket_path),
+                max_results=(provider or {}).get('max_results') or NIOS_PROVIDER_SPEC['max_results']['default'])
+            return
         try:
             super(WapiModule, self).__init__(provider)
         except Exception as exc:
@@ -373,6 +1039,32 @@ class WapiModule(WapiBase):
         else:
             self.module.fail_json(msg=to_native(exc))
 
+    def create_object(self, obj_type, payload, return_fields=None):
+        return self._write_object('create_object', obj_type, payload, return_fields)
+
+    def update_object(self, ref, payload, return_fields=None):
+        return self._write_object('update_object', ref, payload, return_fields)
+
+    def _write_object(self, method_name, target, payload, return_fields):
+        ''' Creates or updates an object, asking WAPI to return the written
+        object. A write rejected because of one of the return fields is sent
+        again without them, run() then reads the object back.
+        :args method_name: create_object or update_object
+        :args target: the object type to create or the reference to update
+        :returns: the written object, or its reference
+        '''
+        method = getattr(self.connector, method_name)
+        try:
+            return method(target, payload, return_fields=return_fields)
+        except InfobloxException as exc:
+            if not return_fields or not wapi_error_matches(exc, NIOS_RETURN_FIELD_ERRORS):
+                self.handle_exception(method_name, exc)
+                return None
+        try:
+            return method(target, payload)
+        except InfobloxException as exc:
+            self.handle_exception(method_name, exc)
+
     def clean_empty_keys(self, current_object, proposed_object):
         """
         Removes keys from the proposed_object that are empty and do not exist in current_object.
@@ -401,6 +1093,8 @@ class WapiModule(WapiBase):
         :args ib_spec: the specification for the WAPI object as a dict
         :returns:  result dict
         '''
+        if self.module.params.get('items'):
+            return self.run_bulk(ib_obj_type, ib_spec)
 
         update = new_name = None
         state = self.module.params['state']
@@ -413,59 +1107,7 @@ class WapiModule(WapiBase):
         # get object reference
         ib_obj_ref, update, new_name = self.get_object_ref(self.module, ib_obj_type, obj_filter, ib_spec)
 
-        # Issue #300: IPAM-only host records carry view=' ' in WAPI. If the user
-        # calls state=absent (or update) without specifying a view, our search
-        # uses view='default' and returns 0 results, so we silently no-op and
-        # leave the record on the grid. Retry the search without the view
-        # filter to find IPAM-only hosts before declaring the object absent.
-        #
-        # To avoid acting on host records that live in unrelated DNS views,
-        # restrict the retry results to IPAM-only host records (view is blank
-        # or whitespace). If the retry still returns multiple eligible
-        # matches, fail with a clear error rather than picking one arbitrarily.
-        if (ib_obj_type == NIOS_HOST_RECORD and not ib_obj_ref
-                and obj_filter.get('view') == 'default'):
-            retry_filter = dict(obj_filter)
-            retry_filter.pop('view', None)
-            retry_obj_ref, retry_update, retry_new_name = self.get_object_ref(
-                self.module, ib_obj_type, retry_filter, ib_spec)
-            if retry_obj_ref:
-                ipam_only = [
-                    rec for rec in retry_obj_ref
-                    if isinstance(rec, dict)
-                    and ((isinstance(rec.get('view'), str) and not rec.get('view').strip())
-                         or rec.get('configure_for_dns') is False)
-                ]
-                if len(ipam_only) > 1:
-                    self.module.fail_json(
-                        msg=("multiple IPAM-only host records named '%s' were found "
-                             "and could not be disambiguated"
-                             % obj_filter.get('name')))
-                if ipam_only:
-                    ib_obj_ref, update, new_name = ipam_only, retry_update, retry_new_name
-
-        # When a range update is defined, check for a range that matches the target range definition as well
-        # to allows for idempotence
-        if ib_obj_type == NIOS_RANGE and len(ib_obj_ref) == 0 and \
-                (True for v in ('new_start_addr', 'new_end_addr') if v in ib_spec.keys()):
-            if self.module.params.get('new_start_addr'):
-                obj_filter['start_addr'] = self.module.params.get('new_start_addr')
-            if self.module.params.get('new_end_addr'):
-                obj_filter['end_addr'] = self.module.params.get('new_end_addr')
-            ib_obj_ref, update, new_name = self.get_object_ref(self.module, ib_obj_type, obj_filter, ib_spec)
-
-        proposed_object = {}
-        for key, value in ib_spec.items():
-            if self.module.params[key] is not None:
-                if 'transform' in value:
-                    proposed_object[key] = value['transform'](self.module)
-                else:
-                    proposed_object[key] = self.module.params[key]
-            elif 'transform' in value:
-                # Call transform even if param is None, in case it returns a default value
-                transformed_value = value['transform'](self.module)
-                if transformed_value is not None:
-                    proposed_object[key] = transformed_value
+        proposed_object = self.build_proposed_object(ib_spec, self.module)
 
         # Issue #300: IPAM-only (non-DNS) host records carry view=' ' in WAPI.
         # Drop `view` from proposed_object when:
@@ -477,23 +1119,11 @@ class WapiModule(WapiBase):
                     or (isinstance(view_val, str) and not view_val.strip()):
                 proposed_object.pop('view', None)
         if ib_obj_ref:
-            if len(ib_obj_ref) > 1:
-                for each in ib_obj_ref:
-                    # To check for existing A_record with same name with input A_record by IP
-                    if each.get('ipv4addr') and each.get('ipv4addr') == proposed_object.get('ipv4addr'):
-                        current_object = each
-                        break
-                    # To check for existing Host_record with same name with input Host_record by IP
-                    elif each.get('ipv4addrs') and each.get('ipv4addrs')[0].get('ipv4addr') \
-                            == proposed_object.get('ipv4addrs')[0].get('ipv4addr'):
-                        current_object = each
-                        break
-                    # No IP match found: treat as a new record, do not overwrite existing
-                    else:
-                        current_object = obj_filter
-                        ref = None
-            else:
-                current_object = ib_obj_ref[0]
+            ref = None
+            current_object = self.select_current_object(ib_obj_ref, proposed_object)
+            if current_object is None:
+                # No IP match found: treat as a new record, do not overwrite existing
+                current_object = obj_filter
             if 'extattrs' in current_object:
                 current_object['extattrs'] = flatten_extattrs(current_object['extattrs'])
             if current_object.get('_ref'):
@@ -603,16 +1233,23 @@ class WapiModule(WapiBase):
         else:
             proposed_for_compare = proposed_object
         modified = not self.compare_objects(current_object, proposed_for_compare, ib_obj_type)
+        if self.module.check_mode:
+            # the decision is known, the write payload is not needed
+            return self.plan_run(ib_obj_type, state, ref, current_object, proposed_object, modified)
         if 'extattrs' in proposed_object:
             proposed_object['extattrs'] = normalize_extattrs(proposed_object['extattrs'])
 
         # Checks if nios_next_ip param is passed in ipv4addrs/ipv4addr args
         proposed_object = self.check_if_nios_next_ip_exists(proposed_object)
 
+        # Fields echoed back by the create/update call itself so that the
+        # written object can be returned without reading it back
+        return_fields = self.get_write_return_fields(ib_obj_type, ib_spec)
+
         if state == 'present':
             if ref is None:
                 if not self.module.check_mode:
-                    res = self.create_object(ib_obj_type, proposed_object)
+                    res = self.create_object(ib_obj_type, proposed_object, return_fields=return_fields)
                 result['changed'] = True
             # Check if NIOS_MEMBER and the flag to call function create_token is set
             elif (ib_obj_type == NIOS_MEMBER) and (proposed_object.get("create_token") is True):
@@ -643,7 +1280,7 @@ class WapiModule(WapiBase):
                                 run_update, proposed_object = self.check_if_add_remove_ip_arg_exists(proposed_object)
                                 if run_update:
                                     if not self.module.check_mode:
-                                        res = self.update_object(ref, proposed_object)
+                                        res = self.update_object(ref, proposed_object, return_fields=return_fields)
                                     result['changed'] = True
                                 else:
                                     res = ref
@@ -653,14 +1290,14 @@ class WapiModule(WapiBase):
                     proposed_object = self.on_update(proposed_object, ib_spec)
                     del proposed_object['view']
                     if not self.module.check_mode:
-                        res = self.update_object(ref, proposed_object)
+                        res = self.update_object(ref, proposed_object, return_fields=return_fields)
                     result['changed'] = True
                 if (ib_obj_type in (NIOS_ZONE)):
                     # popping 'zone_format' key as update of 'zone_format' is not supported with respect to zone_auth
                     proposed_object = self.on_update(proposed_object, ib_spec)
                     del proposed_object['zone_format']
                     if not self.module.check_mode:
-                        res = self.update_object(ref, proposed_object)
+                        res = self.update_object(ref, proposed_object, return_fields=return_fields)
                     else:
                         res = ref
                     result['changed'] = True
@@ -678,24 +1315,40 @@ class WapiModule(WapiBase):
                             {k: v for k, v in addr.items() if k != 'use_for_ea_inheritance'}
                             for addr in proposed_object['ipv4addrs']
                         ]
-                        res = self.update_object(ref, update_proposed)
+                        res = self.update_object(ref, update_proposed, return_fields=return_fields)
                     else:
-                        res = self.update_object(ref, proposed_object)
+                        res = self.update_object(ref, proposed_object, return_fields=return_fields)
                     result['changed'] = True
 
                     if ib_obj_type == NIOS_HOST_RECORD and res:
                         # WAPI always reset the use_for_ea_inheritance for each update operation
                         # Handle use_for_ea_inheritance flag changes for IPv4addr in a host record
-                        # Fetch the updated reference of host to avoid drift.
-                        host_ref = self.connector.get_object(obj_type=str(res), return_fields=['ipv4addrs'])
+                        # The update returned the host addresses already, only
+                        # fetch them when it did not.
+                        if isinstance(res, dict) and 'ipv4addrs' in res:
+                            host_ref = res
+                        else:
+                            host_ref = self.connector.get_object(obj_type=self.get_ref(res), return_fields=['ipv4addrs'])
                         if host_ref and 'ipv4addrs' in host_ref:
                             # Create a dictionary for quick lookups
-                            ref_dict = {obj['ipv4addr']: obj['_ref'] for obj in host_ref['ipv4addrs']}
+                            addr_dict = {obj['ipv4addr']: obj for obj in host_ref['ipv4addrs']}
+                            # The flags are cleared before one is set, and all
+                            # addresses are updated in a single multi-request
+                            # which WAPI applies in order.
                             sorted_ipv4addrs = sorted(proposed_object['ipv4addrs'], key=lambda x: x.get('use_for_ea_inheritance', False))
-                            for proposed in sorted_ipv4addrs:
-                                ipv4addr = proposed['ipv4addr']
-                                if ipv4addr in ref_dict and 'use_for_ea_inheritance' in proposed:
-                                    self.update_object(ref_dict[ipv4addr], {'use_for_ea_inheritance': proposed['use_for_ea_inheritance']})
+                            ea_updates = [
+                                proposed for proposed in sorted_ipv4addrs
+                                if proposed['ipv4addr'] in addr_dict and 'use_for_ea_inheritance' in proposed
+                            ]
+                            if ea_updates:
+                                self.multi_request([
+                                    wapi_request('PUT', addr_dict[proposed['ipv4addr']]['_ref'],
+                                                 {'use_for_ea_inheritance': proposed['use_for_ea_inheritance']})
+                                    for proposed in ea_updates
+                                ])
+                                # keep the returned host object in line with the flags just set
+                                for proposed in ea_updates:
+                                    addr_dict[proposed['ipv4addr']]['use_for_ea_inheritance'] = proposed['use_for_ea_inheritance']
         elif state == 'absent':
             if ref is not None:
                 if 'ipv4addrs' in proposed_object:
@@ -708,48 +1361,389 @@ class WapiModule(WapiBase):
                     self.delete_object(ref)
                     result['changed'] = True
 
+        # the object was updated (possibly renamed) or deleted, so names
+        # cached for its reference may no longer be accurate
+        ref_cache = self.__dict__.get('ref_cache')
+        if ref_cache:
+            if ref and result['changed'] and not self.module.check_mode:
+                ref_cache.invalidate(ref)
+                ref_cache.save()
+            result['ref_cache'] = ref_cache.stats()
+
         # ------------------------------------------------------------------
         # Fix for issue #305 (generalized):
-        # After a successful present-state write, re-fetch the canonical
-        # object so the caller's `register:` variable exposes WAPI-resolved
-        # values (notably IPs produced by func:nextavailableip and networks
-        # produced by func:nextavailablenetwork). The fields requested are
-        # derived from the calling module's ib_spec so this works for every
-        # WAPI object type without a per-type table that would need to be
-        # maintained as the schema evolves.
+        # After a successful present-state write, expose the canonical object
+        # so the caller's `register:` variable holds WAPI-resolved values
+        # (notably IPs produced by func:nextavailableip and networks produced
+        # by func:nextavailablenetwork). The create/update call requests the
+        # fields derived from the calling module's ib_spec through
+        # _return_fields, so WAPI echoes the written object back and no extra
+        # GET is needed. A read back is only done when the write returned a
+        # bare reference.
         # ------------------------------------------------------------------
         if (state == 'present'
                 and result.get('changed')
                 and not self.module.check_mode
-                and ib_obj_type not in NIOS_RETURN_OBJECT_EXCLUDE):
-            target_ref = res if res else ref
-            if target_ref:
-                return_fields = sorted({
-                    k for k in ib_spec.keys()
-                    if not k.startswith('_')
-                    and k not in ('provider', 'state')
-                    and k not in NIOS_RETURN_FIELDS_EXCLUDE
-                })
-                try:
-                    fetched = self.connector.get_object(
-                        obj_type=str(target_ref),
-                        return_fields=return_fields or None,
-                    )
-                    if fetched:
-                        # get_object on a _ref returns a dict; on a search it
-                        # returns a list. Handle both defensively.
-                        result['object'] = (
-                            fetched[0] if isinstance(fetched, list) else fetched
+                and return_fields is not None):
+            if isinstance(res, dict):
+                result['object'] = res
+            else:
+                target_ref = res if res else ref
+                if target_ref:
+                    try:
+                        fetched = self.connector.get_object(
+                            obj_type=str(target_ref),
+                            return_fields=return_fields or None,
                         )
-                except Exception as exc:
-                    # Never fail the task because the post-fetch failed; the
-                    # create/update itself already succeeded server-side.
-                    self.module.warn(
-                        'nios post-fetch failed (object was written successfully): %s' % str(exc)
-                    )
+                        if fetched:
+                            # get_object on a _ref returns a dict; on a search it
+                            # returns a list. Handle both defensively.
+                            result['object'] = (
+                                fetched[0] if isinstance(fetched, list) else fetched
+                            )
+                    except Exception as exc:
+                        # Never fail the task because the post-fetch failed; the
+                        # create/update itself already succeeded server-side.
+                        self.module.warn(
+                            'nios post-fetch failed (object was written successfully): %s' % str(exc)
+                        )
+
+        return result
 
+    def plan_run(self, ib_obj_type, state, ref, current_object, proposed_object, modified):
+        ''' Decides what run() would write, for check mode, from the object
+        found by get_object_ref() and the normalized proposed object. The
+        write payload, the nios_next_ip allocation and the host address
+        copies of the write path are skipped.
+        :args ref: the reference of the existing object, None if not found
+        :args modified: whether the existing object differs from the
+            proposed one
+        :returns: result dict with the planned `action` and, when changed,
+            a before/after `diff`
+        '''
+        action = None
+        addr = (proposed_object.get('ipv4addrs') or [{}])[0]
+        if state == 'present':
+            if ref is None:
+                action = 'create'
+            elif ib_obj_type == NIOS_MEMBER and proposed_object.get('create_token') is True:
+                action = 'create_token'
+            elif modified:
+                action = 'update'
+                if ib_obj_type == NIOS_HOST_RECORD and ('add' in addr or 'remove' in addr):
+                    # add and remove only change the record when the address
+                    # is missing, or present
+                    current_ips = [a.get('ipv4addr') for a in current_object.get('ipv4addrs', [])]
+                    if addr.get('add') is True:
+                        action = 'update' if addr.get('ipv4addr') not in current_ips else None
+                    elif addr.get('remove') is True:
+                        action = 'update' if addr.get('ipv4addr') in current_ips else None
+                    else:
+                        action = None
+        elif ref is not None:
+            if 'ipv4addrs' not in proposed_object:
+                action = 'delete'
+            elif 'remove' in addr:
+                action = 'update'
+
+        result = {'changed': action is not None, 'action': action or 'none'}
+        if ref is not None:
+            result['ref'] = ref
+        if action:
+            result['diff'] = {'before': current_object if ref is not None else {},
+                              'after': {} if action == 'delete' else proposed_object}
+        ref_cache = self.__dict__.get('ref_cache')
+        if ref_cache:
+            result['ref_cache'] = ref_cache.stats()
         return result
 
+    @staticmethod
+    def build_proposed_object(ib_spec, module):
+        ''' Builds the proposed object from the module params, running the
+        ib_spec transforms
+        :args ib_spec: the specification for the WAPI object
+        :args module: the module, or the BulkItemModule of a bulk item
+        :returns: dict of the proposed WAPI fields
+        '''
+        proposed_object = {}
+        for key, value in ib_spec.items():
+            if module.params.get(key) is not None:
+                if 'transform' in value:
+                    proposed_object[key] = value['transform'](module)
+                else:
+                    proposed_object[key] = module.params[key]
+            elif 'transform' in value:
+                # Call transform even if param is None, in case it returns a default value
+                transformed_value = value['transform'](module)
+                if transformed_value is not None:
+                    proposed_object[key] = transformed_value
+        return proposed_object
+
+    @staticmethod
+    def select_current_object(ib_objs, proposed_object):
+        ''' Picks the existing object a task manages among the objects found
+        by its lookup. When several share the name, the one with the proposed
+        address is picked.
+        :args ib_objs: the objects found, not empty
+        :returns: the object, or None when several were found and none has
+            the proposed address
+        '''
+        if len(ib_objs) == 1:
+            return ib_objs[0]
+        proposed_addrs = proposed_object.get('ipv4addrs') or [{}]
+        for each in ib_objs:
+            # To check for existing A_record with same name with input A_record by IP
+            if each.get('ipv4addr') and each.get('ipv4addr') == proposed_object.get('ipv4addr'):
+                return each
+            # To check for existing Host_record with same name with input Host_record by IP
+            if each.get('ipv4addrs') and each.get('ipv4addrs')[0].get('ipv4addr') == proposed_addrs[0].get('ipv4addr'):
+                return each
+        return None
+
+    def get_write_return_fields(self, ib_obj_type, ib_spec):
+        ''' Returns the fields requested from WAPI on create and update
+        The fields are derived from the module ib_spec, minus the module-side
+        helpers and write-only inputs that WAPI does not accept as return
+        fields.
+        :args ib_obj_type: the WAPI object type to operate against
+        :args ib_spec: the specification for the WAPI object
+        :returns: sorted list of field names, or None for object types that
+            do not return the written object
+        '''
+        if ib_obj_type in NIOS_RETURN_OBJECT_EXCLUDE:
+            return None
+        return sorted({
+            k for k in ib_spec.keys()
+            if not k.startswith('_')
+            and k not in ('provider', 'state')
+            and k not in NIOS_RETURN_FIELDS_EXCLUDE
+        })
+
+    @staticmethod
+    def get_ref(obj):
+        ''' Returns the reference of a WAPI write result, which is either the
+        reference itself or the object returned through _return_fields '''
+        if isinstance(obj, dict):
+            return obj.get('_ref')
+        return obj
+
+    def run_bulk(self, ib_obj_type, ib_spec):
+        ''' Runs the module for every entry of the `items` option
+        All existing objects are resolved with one WAPI multi-request and
+        the resulting creates, updates and deletes are applied in chunked
+        multi-requests, instead of several round trips per object.
+        :args ib_obj_type: the WAPI object type to operate against
+        :args ib_spec: the specification for the WAPI object as a dict
+        :returns: result dict with the per-item results under `results`
+        '''
+        items = self._bulk_items(ib_obj_type, ib_spec)
+        return_fields = [k for k in ib_spec if k not in NIOS_RETURN_FIELDS_EXCLUDE]
+
+        # Records asking for nios_next_ip are looked up without their address
+        # and, when created, get one from a single next_available_ip call per
+        # network instead of one allocation per record.
+        next_ip_networks = []
+        for params in items:
+            network = self._bulk_next_ip(ib_obj_type, params.get('ipv4addr'))
+            if network:
+                params.pop('ipv4addr')
+                # the network view only matters to the allocation, which
+                # check mode does not make
+                network_view = None if self.module.check_mode else self.get_network_view(params)
+                network = (network, network_view)
+            next_ip_networks.append(network)
+
+        found = self.multi_request([
+            wapi_request('GET', ib_obj_type, data=self._bulk_filter(ib_obj_type, ib_spec, params),
+                         args={'_return_fields': ','.join(return_fields)})
+            for params in items
+        ])
+
+        results = []
+        writes = []
+        allocations = []
+        for params, network, ib_obj in zip(items, next_ip_networks, found):
+            item_result, write = self._plan_bulk_item(ib_obj_type, ib_spec, params, ib_obj)
+            results.append(item_result)
+            if write:
+                writes.append((item_result, write))
+                if network and write['method'] == 'POST':
+                    allocations.append((network, item_result, write))
+
+        if writes and not self.module.check_mode:
+            refs = self._bulk_write([write for item_result, write in writes], allocations)
+            for (item_result, write), ref in zip(writes, refs):
+                item_result['ref'] = ref
+
+        result = {'changed': any(item['changed'] for item in results), 'results': results}
+        ref_cache = self.__dict__.get('ref_cache')
+        if ref_cache:
+            if not self.module.check_mode:
+                for item_result, write in writes:
+                    if write['method'] != 'POST':
+                        ref_cache.invalidate(write['object'])
+                ref_cache.save()
+            result['ref_cache'] = ref_cache.stats()
+        return result
+
+    def _bulk_write(self, writes, allocations):
+        ''' Applies the writes of run_bulk() in chunked multi-requests
+        A multi-request is applied as a whole or not at all. When a chunk
+        holding records with allocated addresses fails, for instance because
+        another client used one of the addresses first, the addresses of that
+        chunk are allocated again, excluding the ones already tried, and the
+        chunk is retried.
+        :args writes: list of request dicts as built by wapi_request()
+        :args allocations: list of (network, item result, write) tuples of
+            the records that need an address
+        :returns: list of the per-request results, in request order
+        '''
+        exclude = []
+        if allocations:
+            self._allocate_next_ips(allocations, exclude)
+        results = []
+        for start in range(0, len(writes), NIOS_MULTI_REQUEST_CHUNK_SIZE):
+            chunk = writes[start:start + NIOS_MULTI_REQUEST_CHUNK_SIZE]
+            retry = [allocation for allocation in allocations if any(allocation[2] is write for write in chunk)]
+            attempt = 0
+            while True:
+                try:
+                    results.extend(self._send_multi_request(chunk))
+                    break
+                except InfobloxException as exc:
+                    # only an address taken by another client in the
+                    # meantime is worth a new allocation
+                    if not retry or attempt >= NIOS_NEXT_IP_RETRIES \
+                            or not wapi_error_matches(exc, NIOS_NEXT_IP_CONFLICT_ERRORS):
+                        self.handle_exception('multi_request', exc)
+                        break
+                    attempt += 1
+                    self._allocate_next_ips(retry, exclude)
+        return results
+
+    def _allocate_next_ips(self, allocations, exclude):
+        ''' Gets addresses for the records of a bulk run with one
+        next_available_ip call per network, and writes them into the create
+        requests and item results
+        :args allocations: list of (network, item result, write) tuples
+        :args exclude: addresses not to hand out, extended with the
+            addresses handed out by this call
+        '''
+        groups = {}
+        for allocation in allocations:
+            groups.setdefault(allocation[0], []).append(allocation)
+        refs = self.resolve_refs([(NIOS_IPV4_NETWORK, {'network': cidr, 'network_view': network_view})
+                                  for cidr, network_view in groups])
+        for ((cidr, network_view), group), ref in zip(groups.items(), refs):
+            if not ref:
+                self.module.fail_json(msg='network %s not found in network view %s' % (cidr, network_view))
+            payload = {'num': len(group)}
+            if exclude:
+                payload['exclude'] = list(exclude)
+            ips = (self.call_func('next_available_ip', ref, payload) or {}).get('ips', [])
+            if len(ips) < len(group):
+                self.module.fail_json(msg='only %d of the %d addresses requested are available in network %s'
+                                          % (len(ips), len(group), cidr))
+            for (network, item_result, write), ip in zip(group, ips):
+                write['data']['ipv4addr'] = ip
+                item_result['item']['ipv4addr'] = ip
+            exclude.extend(ips[:len(group)])
+
+    @staticmethod
+    def _bulk_next_ip(ib_obj_type, value):
+        ''' Returns the network to allocate the address of a bulk A record
+        from, or None when the item sets a static address '''
+        if ib_obj_type != NIOS_A_RECORD or not isinstance(value, str) or 'nios_next_ip' not in value:
+            return None
+        next_ip = check_type_dict(value)
+        if 'old_ipv4addr' in next_ip:
+            return None
+        return next_ip['nios_next_ip']
+
+    def _bulk_items(self, ib_obj_type, ib_spec):
+        ''' Validates the `items` option and returns one params dict per item.
+        Top level options act as defaults for the values an item omits.
+        '''
+        item_spec = normalize_ib_spec(ib_spec)
+        for value in item_spec.values():
+            value.pop('required', None)
+            value.pop('default', None)
+        item_spec['state'] = dict(choices=['present', 'absent'])
+        validator = ArgumentSpecValidator(item_spec)
+
+        items = []
+        for index, item in enumerate(self.module.params['items']):
+            validated = validator.validate(item)
+            if validated.error_messages:
+                self.module.fail_json(msg='items[%d]: %s' % (index, ', '.join(validated.error_messages)))
+            params = dict((k, self.module.params.get(k)) for k in ib_spec)
+            params.update((k, v) for k, v in validated.validated_parameters.items() if v is not None)
+            params['state'] = params.get('state') or self.module.params['state']
+
+            missing = [k for k, v in ib_spec.items() if v.get('required') and params.get(k) is None]
+            if missing:
+                self.module.fail_json(msg='items[%d]: missing required arguments: %s' % (index, ', '.join(missing)))
+            # old/new style dicts (renames, new_text) need the per-object
+            # lookups of run() and are not supported in bulk mode, A record
+            # addresses from nios_next_ip are allocated by run_bulk()
+            for key, value in params.items():
+                if ib_spec.get(key, {}).get('ib_req') and isinstance(value, str) and value.strip().startswith('{'):
+                    if key == 'ipv4addr' and self._bulk_next_ip(ib_obj_type, value):
+                        continue
+                    self.module.fail_json(msg='items[%d]: %s=%s is not supported in bulk mode' % (index, key, value))
+            items.append(params)
+        return items
+
+    def _bulk_filter(self, ib_obj_type, ib_spec, params):
+        ''' Returns the search filter identifying the object of one item '''
+        fields = NIOS_BULK_FILTER_FIELDS.get(ib_obj_type) or [k for k, v in ib_spec.items() if v.get('ib_req')]
+        obj_filter = dict((k, params[k]) for k in fields if params.get(k) is not None)
+        if ib_obj_type == NIOS_A_RECORD and 'name' in obj_filter:
+            # WAPI stores A record names in lower case
+            obj_filter['name'] = obj_filter['name'].lower()
+        return obj_filter
+
+    def _plan_bulk_item(self, ib_obj_type, ib_spec, params, ib_obj):
+        ''' Decides the action for one bulk item using the same ib_spec
+        transforms, choice among several matches and comparison as run()
+        :returns: tuple of the item result and the write request (or None)
+        '''
+        proposed_object = self.build_proposed_object(ib_spec, BulkItemModule(self.module, params))
+        item_result = {'item': proposed_object, 'changed': False}
+
+        current_object = ref = None
+        if ib_obj:
+            current_object = copy.deepcopy(self.select_current_object(ib_obj, proposed_object))
+        if current_object:
+            ref = current_object.pop('_ref')
+            if 'extattrs' in current_object:
+                current_object['extattrs'] = flatten_extattrs(current_object['extattrs'])
+            item_result['ref'] = ref
+
+        write = None
+        if params['state'] == 'absent':
+            if ref:
+                write = wapi_request('DELETE', ref)
+                item_result.update(action='delete', diff={'before': current_object, 'after': {}})
+        elif ref is None:
+            payload = dict(proposed_object)
+            if 'extattrs' in payload:
+                payload['extattrs'] = normalize_extattrs(payload['extattrs'])
+            write = wapi_request('POST', ib_obj_type, data=payload)
+            item_result.update(action='create', diff={'before': {}, 'after': proposed_object})
+        elif not self.compare_objects(current_object, copy.deepcopy(proposed_object), ib_obj_type):
+            payload = self.on_update(proposed_object, ib_spec)
+            if ib_obj_type in (NIOS_A_RECORD, NIOS_AAAA_RECORD, NIOS_PTR_RECORD, NIOS_SRV_RECORD, NIOS_NAPTR_RECORD):
+                # update of 'view' is not supported for these record types
+                payload.pop('view', None)
+            if 'extattrs' in payload:
+                payload['extattrs'] = normalize_extattrs(payload['extattrs'])
+            write = wapi_request('PUT', ref, data=payload)
+            item_result.update(action='update', diff={'before': current_object, 'after': proposed_object})
+
+        item_result['changed'] = write is not None
+        return item_result, write
+
     def check_if_recordname_exists(self, obj_filter, ib_obj_ref, ib_obj_type, current_object, proposed_object):
         ''' Validate that a host record update with a different IP is not silently
             routed through create_object (which causes a NIOS conflict error).
@@ -762,10 +1756,19 @@ class WapiModule(WapiBase):
     def get_network_view(self, proposed_object):
         ''' Check for the associated network view with
             the given dns_view'''
+        ref_cache = self.__dict__.get('ref_cache')
+        cache_key = NiosRefCache.key('view', {'name': proposed_object['view']}, 'network_view')
+        if ref_cache:
+            network_view = ref_cache.get(cache_key)
+            if network_view:
+                return network_view
         try:
             network_view_ref = self.get_object('view', {"name": proposed_object['view']}, return_fields=['network_view'])
             if network_view_ref:
                 network_view = network_view_ref[0].get('network_view')
+                if ref_cache and network_view:
+                    ref_cache.set(cache_key, network_view, network_view_ref[0]['_ref'])
+                    ref_cache.save()
                 return network_view
         except Exception:
             raise Exception("object with dns_view: %s not found" % (proposed_object['view']))
@@ -841,16 +1844,11 @@ class WapiModule(WapiBase):
         :returns: True if item is a subset of one entry in objects otherwise
             this method will return None
         '''
-        for obj in objects:
-            if isinstance(item, dict):
-                # Normalize MAC address for comparison
-                if 'mac' in item:
-                    item['mac'] = item['mac'].replace('-', ':').lower()
-                elif 'duid' in item:
-                    item['duid'] = item['duid'].replace('-', ':').lower()
-                if all(entry in obj.items() for entry in item.items()):
-                    return True
-            else:
+        if isinstance(item, dict):
+            if ListMatcher(objects).contains(normalize_list_item(item)):
+                return True
+        else:
+            for obj in objects:
                 if item in obj:
                     return True
 
@@ -871,22 +1869,14 @@ class WapiModule(WapiBase):
         return len(proposed_data) == len(current_data) and all(a == b for a, b in zip(proposed_data, current_data))
 
     def verify_list_content_equality(self, proposed_data, current_data):
-        '''Verify proposed list items are present in current list regardless of order.'''
+        ''' Verify proposed list items are present in current list regardless of order.
+        Each current item can match only one proposed item, dict items match
+        when they are a subset of the current item.
+        '''
         if len(proposed_data) != len(current_data):
             return False
-        unmatched = list(current_data)
-        for proposed_item in proposed_data:
-            for idx, current_item in enumerate(unmatched):
-                if isinstance(proposed_item, dict):
-                    if isinstance(current_item, dict) and all(entry in current_item.items() for entry in proposed_item.items()):
-                        unmatched.pop(idx)
-                        break
-                elif proposed_item == current_item:
-                    unmatched.pop(idx)
-                    break
-            else:
-                return False
-        return True
+        matcher = ListMatcher(current_data)
+        return all(matcher.take(proposed_item) for proposed_item in proposed_data)
 
     def compare_objects(self, current_object, proposed_object, ib_obj_type=None):
         for key, proposed_item in proposed_object.items():
@@ -918,6 +1908,9 @@ class WapiModule(WapiBase):
                 if key in ('pools', 'servers', 'external_servers', 'list_values') and not self.verify_list_order(proposed_item, current_item):
                     return False
 
+                # Index the current list once instead of rescanning it for
+                # every proposed subitem
+                matcher = ListMatcher(current_item) if isinstance(current_item, list) else None
                 for subitem in proposed_item:
                     if not isinstance(subitem, dict):
                         continue  # Skip non-dict items
@@ -961,7 +1954,10 @@ class WapiModule(WapiBase):
                             except KeyError:
                                 pass
 
-                    if not self.issubset(subitem, current_item):
+                    if matcher is None:
+                        if not self.issubset(subitem, current_item):
+                            return False
+                    elif not matcher.contains(normalize_list_item(subitem)):
                         return False
 
                 if key == 'logic_filter_rules' and proposed_item != current_item:
@@ -996,6 +1992,7 @@ class WapiModule(WapiBase):
         old_name = new_name = None
         old_ipv4addr_exists = old_text_exists = False
         next_ip_exists = False
+        fallback_filters = []
 
         if ib_obj_type == NIOS_VLAN:
             obj_filter.update({'parent': ib_spec['parent']['transform'](self.module)})
@@ -1014,7 +2011,7 @@ class WapiModule(WapiBase):
             except TypeError:
                 name = obj_filter['name']
 
-            return_fields = list(ib_spec.keys())
+            return_fields = self.get_lookup_return_fields(ib_obj_type, ib_spec)
 
             if (ib_obj_type == NIOS_ADMINUSER):
                 if 'password' in return_fields:
@@ -1094,6 +2091,12 @@ class WapiModule(WapiBase):
                     test_obj_filter = dict([('name', name)])
                 else:
                     test_obj_filter = dict([('name', name), ('view', _view)])
+                    # Issue #300: IPAM-only host records carry view=' ' in
+                    # WAPI. If the user did not specify a view, the search in
+                    # view='default' misses them, so a search without the
+                    # view filter is sent along in the same round trip.
+                    if _view == 'default':
+                        fallback_filters.append(dict([('name', name)]))
             elif (ib_obj_type == NIOS_IPV4_FIXED_ADDRESS and 'mac' in obj_filter):
                 # Include both mac and ipv4addr to uniquely identify the fixed address.
                 # Searching by mac alone returns all fixed addresses with that mac across
@@ -1173,10 +2176,13 @@ class WapiModule(WapiBase):
                 ipv6addrs_return = [
                     'ipv6addrs.ipv6addr', 'ipv6addrs.duid', 'ipv6addrs.configure_for_dhcp', 'ipv6addrs.host'
                 ]
-                return_fields.extend(ipv4addrs_return)
-                return_fields.extend(ipv6addrs_return)
+                if 'ipv4addrs' in return_fields:
+                    return_fields.extend(ipv4addrs_return)
+                if 'ipv6addrs' in return_fields:
+                    return_fields.extend(ipv6addrs_return)
 
-            ib_obj = self.get_object(ib_obj_type, test_obj_filter.copy(), return_fields=return_fields)
+            results = self.get_objects(ib_obj_type, [test_obj_filter] + fallback_filters, return_fields=return_fields)
+            ib_obj = results[0]
 
             # Issue #300: when the host-record lookup falls back to name-only
             # search (because the view was blank/whitespace, absent on the
@@ -1203,6 +2209,24 @@ class WapiModule(WapiBase):
                                  "and could not be disambiguated"
                                  % obj_filter.get('name')))
                     ib_obj = ipam_only or None
+            # The search without view only counts when the search in the
+            # default view found nothing, and only for IPAM-only records, so
+            # we never act on a host record that lives in an unrelated DNS
+            # view. Fail if the disambiguation is impossible.
+            if ib_obj_type == NIOS_HOST_RECORD and not ib_obj and fallback_filters and results[1]:
+                ipam_only = [
+                    rec for rec in results[1]
+                    if isinstance(rec, dict)
+                    and ((isinstance(rec.get('view'), str) and not rec.get('view').strip())
+                         or rec.get('configure_for_dns') is False)
+                ]
+                if len(ipam_only) > 1:
+                    self.module.fail_json(
+                        msg=("multiple IPAM-only host records named '%s' were found "
+                             "and could not be disambiguated"
+                             % obj_filter.get('name')))
+                if ipam_only:
+                    ib_obj = ipam_only
 
             # Fixed-address fallback disambiguation: when the lookup fell back to
             # a mac-only (IPv4) or duid-only (IPv6) filter because no
@@ -1241,7 +2265,7 @@ class WapiModule(WapiBase):
             except TypeError:
                 ipaddr = obj_filter['ipv4addr']
             test_obj_filter['ipv4addr'] = ipaddr
-            ib_obj = self.get_object(ib_obj_type, test_obj_filter.copy(), return_fields=list(ib_spec.keys()))
+            ib_obj = self.get_object(ib_obj_type, test_obj_filter.copy(), return_fields=self.get_lookup_return_fields(ib_obj_type, ib_spec))
             # prevents creation of a new A record with 'new_ipv4addr' when A record with a particular 'old_ipv4addr' is not found
             if old_ipv4addr_exists and ib_obj is None:
                 raise Exception("A Record with ipv4addr: '%s' is not found" % (ipaddr))
@@ -1269,7 +2293,7 @@ class WapiModule(WapiBase):
             except TypeError:
                 txt = obj_filter['text']
             test_obj_filter['text'] = txt
-            ib_obj = self.get_object(ib_obj_type, test_obj_filter.copy(), return_fields=list(ib_spec.keys()))
+            ib_obj = self.get_object(ib_obj_type, test_obj_filter.copy(), return_fields=self.get_lookup_return_fields(ib_obj_type, ib_spec))
             # prevents creation of a new TXT record with 'new_text' when TXT record with a particular 'old_text' is not found
             if old_text_exists and ib_obj is None:
                 raise Exception("TXT Record with text: '%s' is not found" % (txt))
@@ -1277,7 +2301,7 @@ class WapiModule(WapiBase):
             # del key 'restart_if_needed' as nios_zone get_object fails with the key present
             temp = ib_spec['restart_if_needed']
             del ib_spec['restart_if_needed']
-            ib_obj = self.get_object(ib_obj_type, obj_filter.copy(), return_fields=list(ib_spec.keys()))
+            ib_obj = self.get_object(ib_obj_type, obj_filter.copy(), return_fields=self.get_lookup_return_fields(ib_obj_type, ib_spec))
             # reinstate restart_if_needed if ib_obj is none, meaning there's no existing nios_zone ref
             if not ib_obj:
                 ib_spec['restart_if_needed'] = temp
@@ -1295,7 +2319,7 @@ class WapiModule(WapiBase):
                 test_obj_filter['host_name'] = old_name
                 temp = ib_spec['create_token']
                 del ib_spec['create_token']
-                ib_obj = self.get_object(ib_obj_type, test_obj_filter.copy(), return_fields=list(ib_spec.keys()))
+                ib_obj = self.get_object(ib_obj_type, test_obj_filter.copy(), return_fields=self.get_lookup_return_fields(ib_obj_type, ib_spec))
                 if temp:
                     # reinstate 'create_token' key
                     ib_spec['create_token'] = temp
@@ -1308,7 +2332,7 @@ class WapiModule(WapiBase):
                 # del key 'create_token' as nios_member get_object fails with the key present
                 temp = ib_spec['create_token']
                 del ib_spec['create_token']
-                ib_obj = self.get_object(ib_obj_type, obj_filter.copy(), return_fields=list(ib_spec.keys()))
+                ib_obj = self.get_object(ib_obj_type, obj_filter.copy(), return_fields=self.get_lookup_return_fields(ib_obj_type, ib_spec))
                 if temp:
                     # reinstate 'create_token' key
                     ib_spec['create_token'] = temp
@@ -1323,22 +2347,26 @@ class WapiModule(WapiBase):
                 del ib_spec['members']
                 del ib_spec['vlans']
 
-            ib_obj = self.get_object(ib_obj_type, obj_filter.copy(), return_fields=list(ib_spec.keys()))
-
             # Issue #135: For delete operations, fall back to lookup without
             # network_view when the default view does not resolve an object.
             # NIOS may not store/return network_view for objects in the default
             # view, so the filtered query can miss them. Users working solely in
             # the default view should not need to set network_view explicitly
-            # for deletes. Safety: if the viewless lookup finds the same CIDR in
-            # multiple views, we raise an error requiring the user to be
-            # explicit.
-            if (not ib_obj and self.module.params.get('state') == 'absent' and
+            # for deletes. Both lookups are sent in the same round trip.
+            # Safety: if the viewless lookup finds the same CIDR in multiple
+            # views, we raise an error requiring the user to be explicit.
+            if (self.module.params.get('state') == 'absent' and
                     obj_filter.get('network_view') == 'default' and
                     ib_obj_type in (NIOS_IPV4_NETWORK, NIOS_IPV6_NETWORK)):
                 fallback_filter = obj_filter.copy()
                 fallback_filter.pop('network_view', None)
-                ib_obj = self.get_object(ib_obj_type, fallback_filter, return_fields=list(ib_spec.keys()))
+                fallback_filters.append(fallback_filter)
+
+            results = self.get_objects(ib_obj_type, [obj_filter] + fallback_filters, return_fields=self.get_lookup_return_fields(ib_obj_type, ib_spec))
+            ib_obj = results[0]
+
+            if not ib_obj and fallback_filters:
+                ib_obj = results[1]
                 if ib_obj and len(ib_obj) > 1:
                     views = sorted(set(obj.get('network_view', 'unknown') for obj in ib_obj))
                     self.module.fail_json(
@@ -1359,7 +2387,18 @@ class WapiModule(WapiBase):
             del ib_spec['new_end_addr']
             new_start_arg = self.module.params.get('new_start_addr')
             new_end_arg = self.module.params.get('new_end_addr')
-            ib_obj = self.get_object(ib_obj_type, obj_filter.copy(), return_fields=list(ib_spec.keys()))
+            # When a range update is defined, check for a range that matches
+            # the target range definition as well to allow for idempotence.
+            # Both lookups are sent in the same round trip.
+            target_filter = obj_filter.copy()
+            if new_start_arg:
+                target_filter['start_addr'] = new_start_arg
+            if new_end_arg:
+                target_filter['end_addr'] = new_end_arg
+            if target_filter != obj_filter:
+                fallback_filters.append(target_filter)
+            results = self.get_objects(ib_obj_type, [obj_filter] + fallback_filters, return_fields=self.get_lookup_return_fields(ib_obj_type, ib_spec))
+            ib_obj = results[0]
             # Restore the keys to the object.
             if new_start:
                 ib_spec['new_start_addr'] = new_start
@@ -1368,13 +2407,43 @@ class WapiModule(WapiBase):
 
             # throws exception if start_addr and end_addr doesn't exists for updating range
             if (new_start_arg and new_end_arg):
-                if not ib_obj:
+                if not ib_obj and not results[-1]:
                     raise Exception(
                         'Specified range %s-%s not found' % (obj_filter['start_addr'], obj_filter['end_addr']))
+            if not ib_obj and fallback_filters:
+                obj_filter.update(target_filter)
+                ib_obj = results[1]
         else:
-            ib_obj = self.get_object(ib_obj_type, obj_filter.copy(), return_fields=list(ib_spec.keys()))
+            ib_obj = self.get_object(ib_obj_type, obj_filter.copy(), return_fields=self.get_lookup_return_fields(ib_obj_type, ib_spec))
         return ib_obj, update, new_name
 
+    def get_lookup_return_fields(self, ib_obj_type, ib_spec):
+        ''' Returns the fields requested when looking up the existing object
+        Deletes only need the reference, so besides the search fields only
+        the fields used to pick among several matches are requested. For
+        present state the fields the task actually sets are requested too,
+        as those are the only ones compared against the proposed object.
+        Large fields the task does not manage, such as options, members or
+        extattrs, are therefore not transferred.
+        :args ib_obj_type: the WAPI object type to operate against
+        :args ib_spec: the specification for the WAPI object
+        :returns: list of field names, in ib_spec order
+        '''
+        params = self.module.params
+        absent = params.get('state') == 'absent'
+        lookup_fields = NIOS_LOOKUP_RETURN_FIELDS.get(ib_obj_type, ())
+        return_fields = []
+        for key, spec in ib_spec.items():
+            if spec.get('ib_req') or key in lookup_fields:
+                return_fields.append(key)
+            elif params.get(key) is not None:
+                # the addresses tell records sharing a name apart
+                if not absent or key in ('ipv4addr', 'ipv4addrs'):
+                    return_fields.append(key)
+            elif not absent and 'transform' in spec:
+                return_fields.append(key)
+        return return_fields
+
     def on_update(self, proposed_object, ib_spec):
         ''' Event called before the update is sent to the API endpoing
         This method will allow the final proposed object to be changed
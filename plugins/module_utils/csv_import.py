@@ -0,0 +1,307 @@
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+# Copyright (c) 2020 Infoblox, Inc.
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+import csv
+import io
+import ipaddress
+import time
+
+from ansible.module_utils.common.arg_spec import ArgumentSpecValidator
+from ansible.module_utils.common.text.converters import to_bytes, to_text
+
+NIOS_FILEOP = 'fileop'
+NIOS_CSV_IMPORT_TASK = 'csvimporttask'
+
+CSV_IMPORT_OPERATIONS = ('INSERT', 'MERGE', 'OVERRIDE', 'UPDATE', 'DELETE')
+CSV_IMPORT_TASK_FIELDS = ['import_id', 'status', 'operation', 'on_error', 'lines_processed',
+                          'lines_failed', 'lines_warning', 'start_time', 'end_time']
+# csvimporttask states after which the task makes no more progress
+CSV_IMPORT_DONE = frozenset(('COMPLETED', 'FAILED', 'STOPPED'))
+
+# Same option names and aliases as nios_host_record and nios_fixed_address,
+# so that their parameters can be passed to nios_csv_import unchanged
+CSV_HOST_RECORD_SPEC = dict(
+    name=dict(required=True),
+    view=dict(default='default', aliases=['dns_view']),
+    ipv4addrs=dict(type='list', aliases=['ipv4'], elements='dict', options=dict(
+        ipv4addr=dict(required=True, aliases=['address']),
+        configure_for_dhcp=dict(type='bool', aliases=['dhcp']),
+        mac=dict(),
+        add=dict(type='bool'),
+        use_nextserver=dict(type='bool', aliases=['use_pxe']),
+        nextserver=dict(aliases=['pxe']),
+        use_for_ea_inheritance=dict(type='bool'),
+        remove=dict(type='bool'),
+    )),
+    ipv6addrs=dict(type='list', aliases=['ipv6'], elements='dict', options=dict(
+        ipv6addr=dict(required=True, aliases=['address']),
+        configure_for_dhcp=dict(type='bool', aliases=['dhcp']),
+        duid=dict(),
+    )),
+    configure_for_dns=dict(type='bool', default=True, aliases=['dns']),
+    use_dns_ea_inheritance=dict(type='bool'),
+    aliases=dict(type='list', elements='str'),
+    ttl=dict(type='int'),
+    extattrs=dict(type='dict'),
+    comment=dict(),
+    state=dict(default='present', choices=['present']),
+)
+
+CSV_FIXED_ADDRESS_SPEC = dict(
+    name=dict(required=True),
+    ipaddr=dict(required=True),
+    mac=dict(),
+    duid=dict(),
+    network=dict(),
+    network_view=dict(default='default'),
+    options=dict(type='list', elements='dict'),
+    extattrs=dict(type='dict'),
+    comment=dict(),
+    state=dict(default='present', choices=['present']),
+)
+
+# CSV object types: the columns written before the EA-* columns. The key
+# columns, which identify the object of a row in the error log, come first.
+CSV_OBJECT_COLUMNS = {
+    'hostrecord': ('fqdn*', 'view', 'addresses', 'ipv6_addresses', 'aliases', 'configure_for_dns', 'comment', 'ttl'),
+    'fixedaddress': ('ip_address*', 'network_view', 'mac_address', 'match_option', 'name', 'comment'),
+    'ipv6fixedaddress': ('address*', 'network_view', 'duid', 'name', 'comment'),
+}
+
+# Address level settings of nios_host_record that have no column on the
+# hostrecord CSV object
+CSV_UNSUPPORTED_ADDRESS_OPTIONS = ('configure_for_dhcp', 'mac', 'duid', 'add', 'remove', 'use_nextserver', 'nextserver')
+
+
+def _csv_bool(value):
+    return 'True' if value else 'False'
+
+
+def _csv_address(value, field):
+    value = to_text(value).strip()
+    if value.startswith(('{', 'func:')):
+        raise ValueError('%s: next available addresses are not supported by CSV import' % field)
+    return value
+
+
+def host_record_row(item):
+    ''' Converts the parameters of one nios_host_record task into a row of
+    the hostrecord CSV object
+    :returns: tuple of the CSV object type and the dict of column values
+    '''
+    addresses = dict(ipv4addrs=[], ipv6addrs=[])
+    for field, address_field in (('ipv4addrs', 'ipv4addr'), ('ipv6addrs', 'ipv6addr')):
+        for addr in item.get(field) or []:
+            unsupported = [k for k in CSV_UNSUPPORTED_ADDRESS_OPTIONS if addr.get(k)]
+            if unsupported:
+                raise ValueError('%s: %s not supported by CSV import' % (field, ', '.join(unsupported)))
+            addresses[field].append(_csv_address(addr[address_field], field))
+    if not addresses['ipv4addrs'] and not addresses['ipv6addrs']:
+        raise ValueError('one of ipv4addrs or ipv6addrs is required')
+
+    row = {
+        'fqdn*': item['name'].strip().lower().rstrip('.'),
+        'view': item.get('view') or 'default',
+        'addresses': ','.join(addresses['ipv4addrs']),
+        'ipv6_addresses': ','.join(addresses['ipv6addrs']),
+        'aliases': ','.join(item.get('aliases') or []),
+        'configure_for_dns': _csv_bool(item.get('configure_for_dns', True)),
+        'comment': item.get('comment'),
+        'ttl': item.get('ttl'),
+    }
+    return 'hostrecord', row
+
+
+def fixed_address_row(item):
+    ''' Converts the parameters of one nios_fixed_address task into a row of
+    the fixedaddress or ipv6fixedaddress CSV object
+    :returns: tuple of the CSV object type and the dict of column values
+    '''
+    if item.get('options'):
+        raise ValueError('options: DHCP options are not supported by CSV import')
+    ipaddr = _csv_address(item['ipaddr'], 'ipaddr')
+    try:
+        address = ipaddress.ip_address(ipaddr)
+    except ValueError:
+        raise ValueError('ipaddr: %s is not a valid IP address' % ipaddr)
+    version = address.version
+    # the CSV objects have no network column, NIOS puts the fixed address
+    # in the network holding it
+    if item.get('network'):
+        try:
+            network = ipaddress.ip_network(to_text(item['network']).strip(), strict=False)
+        except ValueError:
+            raise ValueError('network: %s is not a valid network' % item['network'])
+        if address not in network:
+            raise ValueError('network: %s is not in network %s' % (ipaddr, item['network']))
+
+    row = {
+        'network_view': item.get('network_view') or 'default',
+        'name': item.get('name'),
+        'comment': item.get('comment'),
+    }
+    if version == 6:
+        if not item.get('duid'):
+            raise ValueError("the 'duid' of an IPv6 fixed address must be specified")
+        row.update({'address*': ipaddr, 'duid': item['duid'].lower()})
+        return 'ipv6fixedaddress', row
+
+    if not item.get('mac'):
+        raise ValueError("the 'mac' of an IPv4 fixed address must be specified")
+    row.update({'ip_address*': ipaddr, 'mac_address': item['mac'].lower(), 'match_option': 'MAC'})
+    return 'fixedaddress', row
+
+
+CSV_ITEM_TYPES = {
+    'host_records': (CSV_HOST_RECORD_SPEC, host_record_row),
+    'fixed_addresses': (CSV_FIXED_ADDRESS_SPEC, fixed_address_row),
+}
+
+
+def extattr_columns(extattrs):
+    ''' Converts the extattrs of an item into EA-* columns. A column holds
+    one value, so a list of several values is rejected.
+    :returns: dict of the EA-* column values
+    '''
+    columns = {}
+    for key, value in (extattrs or {}).items():
+        if isinstance(value, (list, tuple)):
+            if len(value) > 1:
+                raise ValueError('extattrs: %s has several values, which are not supported by CSV import' % key)
+            value = value[0] if value else None
+        columns['EA-%s' % key] = value
+    return columns
+
+
+def row_key(csv_type, row):
+    ''' Returns the key columns of a row, normalized so that rows read back
+    from the error log compare equal to the rows written
+    '''
+    columns = [c for c in CSV_OBJECT_COLUMNS[csv_type] if c.endswith('*') or c in ('view', 'network_view')]
+    return (csv_type,) + tuple(to_text(row.get(c) or '').strip().lower() for c in columns)
+
+
+def build_csv_rows(params):
+    ''' Validates the items of every option of CSV_ITEM_TYPES and converts
+    them into CSV rows
+    :args params: dict of the module options, keyed like CSV_ITEM_TYPES
+    :returns: list of tuples of the option name, the item index, the CSV
+        object type and the dict of column values
+    '''
+    rows = []
+    for option, (spec, convert) in CSV_ITEM_TYPES.items():
+        validator = ArgumentSpecValidator(spec)
+        for index, item in enumerate(params.get(option) or []):
+            validated = validator.validate(item)
+            if validated.error_messages:
+                raise ValueError('%s[%d]: %s' % (option, index, ', '.join(validated.error_messages)))
+            try:
+                csv_type, row = convert(validated.validated_parameters)
+            except ValueError as exc:
+                raise ValueError('%s[%d]: %s' % (option, index, to_text(exc)))
+            try:
+                row.update(extattr_columns(validated.validated_parameters.get('extattrs')))
+            except ValueError as exc:
+                raise ValueError('%s[%d]: %s' % (option, index, to_text(exc)))
+            rows.append((option, index, csv_type, row))
+    return rows
+
+
+def write_csv(rows):
+    ''' Writes rows in the NIOS CSV import format, one header line per CSV
+    object type followed by the rows of that type
+    :returns: the CSV document as text
+    '''
+    by_type = {}
+    for dummy, dummy, csv_type, row in rows:
+        by_type.setdefault(csv_type, []).append(row)
+
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator='\n')
+    for csv_type in sorted(by_type):
+        type_rows = by_type[csv_type]
+        ea_columns = sorted(set(c for row in type_rows for c in row if c.startswith('EA-')))
+        columns = list(CSV_OBJECT_COLUMNS[csv_type]) + ea_columns
+        writer.writerow(['header-%s' % csv_type] + columns)
+        for row in type_rows:
+            writer.writerow([csv_type] + [to_text(row[c]) if row.get(c) is not None else '' for c in columns])
+    return out.getvalue()
+
+
+def parse_csv_error_log(content, rows):
+    ''' Maps the rows of a csv_error_log file back to the input items.
+    The error log repeats the header and the failed rows as uploaded, with
+    the error message in the columns following the row values.
+    :args content: the error log, as text
+    :args rows: the rows as returned by build_csv_rows()
+    :returns: list of dicts of the option, index and error message of every
+        failed row, index is None for a row that matches no input item
+    '''
+    items = {}
+    for option, index, csv_type, row in rows:
+        items.setdefault(row_key(csv_type, row), []).append((option, index))
+
+    errors = []
+    columns = None
+    for line in csv.reader(io.StringIO(content)):
+        if not line or not line[0].strip():
+            continue
+        if line[0].strip().lower().startswith('header-'):
+            columns = [c.strip() for c in line]
+            continue
+        csv_type = line[0].strip().lower()
+        if columns is None or csv_type not in CSV_OBJECT_COLUMNS:
+            errors.append({'option': None, 'index': None, 'msg': ','.join(line)})
+            continue
+        values = dict((c.lower(), v) for c, v in zip(columns[1:], line[1:]))
+        msg = ' '.join(v.strip() for v in line[len(columns):] if v.strip()) or 'import failed'
+        matches = items.get(row_key(csv_type, values)) or [(None, None)]
+        for option, index in matches:
+            errors.append({'option': option, 'index': index, 'msg': msg})
+    return errors
+
+
+def csv_import(wapi, content, operation='INSERT', on_error='CONTINUE', filename='nios_csv_import.csv'):
+    ''' Uploads a CSV document and starts a csv_import task of it
+    :args wapi: a WapiBase instance connected through infoblox_client
+    :returns: the csvimporttask started
+    '''
+    upload = wapi.call_func('uploadinit', NIOS_FILEOP, {'filename': filename})
+    wapi.upload_file(upload['url'], {'file': (filename, to_bytes(content))})
+    result = wapi.call_func('csv_import', NIOS_FILEOP, {
+        'token': upload['token'],
+        'action': 'START',
+        'doimport': True,
+        'operation': operation,
+        'on_error': on_error,
+    })
+    return result['csv_import_task']
+
+
+def wait_csv_import(wapi, task, timeout, interval):
+    ''' Polls a csvimporttask until it is done or timeout seconds passed
+    :returns: tuple of the last csvimporttask read and whether it is done
+    '''
+    deadline = time.time() + timeout
+    while task.get('status') not in CSV_IMPORT_DONE:
+        if time.time() >= deadline:
+            return task, False
+        time.sleep(interval)
+        tasks = wapi.get_object(NIOS_CSV_IMPORT_TASK, {'import_id': task['import_id']},
+                                return_fields=CSV_IMPORT_TASK_FIELDS)
+        if tasks:
+            task = tasks[0]
+    return task, True
+
+
+def fetch_csv_error_log(wapi, import_id):
+    ''' Downloads the error log of a csvimporttask
+    :returns: the error log, as text
+    '''
+    download = wapi.call_func('csv_error_log', NIOS_FILEOP, {'import_id': import_id})
+    try:
+        return to_text(wapi.download_file(download['url']).content)
+    finally:
+        wapi.call_func('downloadcomplete', NIOS_FILEOP, {'token': download['token']})
@@ -0,0 +1,228 @@
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+# Copyright (c) 2020 Infoblox, Inc.
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+import copy
+
+from ansible.module_utils.common.text.converters import to_text
+from .api import NIOS_A_RECORD, NIOS_AAAA_RECORD, NIOS_CNAME_RECORD, NIOS_DNS_VIEW
+from .api import NIOS_HOST_RECORD, NIOS_IPV4_FIXED_ADDRESS, NIOS_IPV4_NETWORK
+from .api import NIOS_IPV4_NETWORK_CONTAINER, NIOS_IPV6_FIXED_ADDRESS, NIOS_IPV6_NETWORK
+from .api import NIOS_IPV6_NETWORK_CONTAINER, NIOS_MX_RECORD, NIOS_NAPTR_RECORD, NIOS_NETWORK_VIEW
+from .api import NIOS_PAGE_SIZE, NIOS_PTR_RECORD, NIOS_RANGE, NIOS_SRV_RECORD, NIOS_TXT_RECORD, NIOS_ZONE
+from .api import WapiModule, convert_members_to_struct, convert_vlans_to_struct, flatten_extattrs
+
+# The WAPI fields identifying an object of every object type, mirroring the
+# ib_req options of the nios_* modules. Other object types are identified by
+# their name.
+NIOS_DRIFT_KEYS = {
+    NIOS_A_RECORD: ('name', 'view', 'ipv4addr'),
+    NIOS_AAAA_RECORD: ('name', 'view', 'ipv6addr'),
+    NIOS_CNAME_RECORD: ('name', 'view'),
+    NIOS_HOST_RECORD: ('name', 'view'),
+    NIOS_MX_RECORD: ('name', 'view', 'mail_exchanger', 'preference'),
+    NIOS_NAPTR_RECORD: ('name', 'view', 'order', 'preference', 'replacement'),
+    NIOS_PTR_RECORD: ('ptrdname', 'view', 'ipv4addr', 'ipv6addr'),
+    NIOS_SRV_RECORD: ('name', 'view', 'port', 'priority', 'target', 'weight'),
+    NIOS_TXT_RECORD: ('name', 'view', 'text'),
+    NIOS_ZONE: ('fqdn', 'view'),
+    NIOS_DNS_VIEW: ('name',),
+    NIOS_NETWORK_VIEW: ('name',),
+    NIOS_IPV4_NETWORK: ('network', 'network_view'),
+    NIOS_IPV6_NETWORK: ('network', 'network_view'),
+    NIOS_IPV4_NETWORK_CONTAINER: ('network', 'network_view'),
+    NIOS_IPV6_NETWORK_CONTAINER: ('network', 'network_view'),
+    NIOS_RANGE: ('network_view', 'start_addr', 'end_addr'),
+    NIOS_IPV4_FIXED_ADDRESS: ('ipv4addr', 'network_view'),
+    NIOS_IPV6_FIXED_ADDRESS: ('ipv6addr', 'network_view'),
+}
+NIOS_DRIFT_DEFAULT_KEYS = ('name',)
+
+# Key fields WAPI always fills in, taken as default when an object omits them
+NIOS_DRIFT_KEY_DEFAULTS = {'view': 'default', 'network_view': 'default'}
+
+NIOS_DRIFT_NETWORK_TYPES = frozenset((NIOS_IPV4_NETWORK, NIOS_IPV6_NETWORK))
+NIOS_DRIFT_OPTION_TYPES = frozenset((NIOS_IPV4_NETWORK_CONTAINER, NIOS_IPV6_NETWORK_CONTAINER,
+                                     NIOS_IPV4_NETWORK, NIOS_IPV6_NETWORK, NIOS_RANGE))
+
+
+class ObjectComparator(WapiModule):
+    ''' The object comparison of WapiModule, without a module nor a WAPI
+    connection, so that objects can be compared offline exactly like the
+    nios_* modules compare them.
+    '''
+    def __init__(self):
+        self.module = None
+
+
+def drift_key(obj, fields):
+    ''' Returns the identity of an object, normalized so that the desired
+    object and the object read from WAPI give the same key
+    '''
+    key = []
+    for field in fields:
+        value = obj.get(field)
+        if value is None:
+            value = NIOS_DRIFT_KEY_DEFAULTS.get(field, '')
+        key.append(to_text(value).strip().lower().rstrip('.'))
+    return tuple(key)
+
+
+def normalize_drift_object(obj_type, obj):
+    ''' Applies the normalization of WapiModule.run() to a copy of a desired
+    object or of an object read from WAPI
+    :returns: the normalized object, without its type and reference
+    '''
+    obj = copy.deepcopy(obj)
+    obj.pop('type', None)
+    obj.pop('_ref', None)
+    extattrs = obj.get('extattrs')
+    if extattrs and all(isinstance(v, dict) and 'value' in v for v in extattrs.values()):
+        obj['extattrs'] = flatten_extattrs(extattrs)
+    if obj_type in NIOS_DRIFT_NETWORK_TYPES:
+        obj = convert_vlans_to_struct(convert_members_to_struct(obj))
+    if obj_type in NIOS_DRIFT_OPTION_TYPES and obj.get('options'):
+        obj['options'] = [option for option in obj['options'] if option.get('use_option', True)]
+    return obj
+
+
+def object_drift(comparator, obj_type, current, desired):
+    ''' Compares a normalized desired object to the normalized current one
+    :returns: dict of the current and desired value of every drifted field,
+        empty when the objects match
+    '''
+    if comparator.compare_objects(copy.deepcopy(current), copy.deepcopy(desired), obj_type):
+        return {}
+    diff = {}
+    for field, value in desired.items():
+        if not comparator.compare_objects(copy.deepcopy(current), {field: copy.deepcopy(value)}, obj_type):
+            diff[field] = {'current': current.get(field), 'desired': value}
+    return diff
+
+
+class DriftReport(object):
+    ''' Compares desired objects to a snapshot of the grid in one pass.
+    The snapshot objects of the desired object types are indexed by their
+    key, every desired object is then matched and compared locally.
+    '''
+
+    def __init__(self, desired, keys=None):
+        '''
+        :args desired: list of dicts with the object `type` and its WAPI fields
+        :args keys: dict of the key fields per object type, overriding
+            NIOS_DRIFT_KEYS
+        '''
+        self.keys = dict(NIOS_DRIFT_KEYS)
+        self.keys.update((obj_type, tuple(fields)) for obj_type, fields in (keys or {}).items())
+        self.desired = []
+        for index, obj in enumerate(desired):
+            obj_type = obj.get('type')
+            if not obj_type:
+                raise ValueError('desired[%d]: type is required' % index)
+            fields = self.key_fields(obj_type)
+            required = [f for f in fields if f not in NIOS_DRIFT_KEY_DEFAULTS]
+            if required and all(obj.get(f) is None for f in required):
+                raise ValueError('desired[%d]: missing key fields: %s' % (index, ', '.join(required)))
+            self.desired.append((index, obj_type, drift_key(obj, fields), obj))
+
+    def key_fields(self, obj_type):
+        return self.keys.get(obj_type, NIOS_DRIFT_DEFAULT_KEYS)
+
+    def object_types(self):
+        ''' Returns the desired object types, in order of first use '''
+        types = []
+        for dummy, obj_type, dummy, dummy in self.desired:
+            if obj_type not in types:
+                types.append(obj_type)
+        return types
+
+    def return_fields(self, obj_type):
+        ''' Returns the fields to read from WAPI to compare the objects of a
+        desired object type
+        '''
+        fields = set(self.key_fields(obj_type))
+        for dummy, desired_type, dummy, obj in self.desired:
+            if desired_type == obj_type:
+                fields.update(obj)
+        fields.discard('type')
+        return sorted(fields)
+
+    def run(self, snapshot, report_unmanaged=False, partial=False):
+        ''' Compares the desired objects to a snapshot
+        :args snapshot: iterable of tuples of the object type and the object,
+            as yielded by iter_export() or fetch_snapshot()
+        :args report_unmanaged: also report the snapshot objects of the
+            desired object types that no desired object matches
+        :args partial: the snapshot objects may lack some of the desired
+            fields, as an export only holds the fields it was asked for.
+            Missing fields are then unverified rather than drifted.
+        :returns: dict with the `summary` count per status and the `drift`
+            list of every object not in sync
+        '''
+        types = set(self.object_types())
+        index = {}
+        for obj_type, obj in snapshot:
+            if obj_type in types:
+                index.setdefault((obj_type, drift_key(obj, self.key_fields(obj_type))), []).append(obj)
+
+        comparator = ObjectComparator()
+        summary = dict(in_sync=0, drifted=0, unverified=0, missing=0, unmanaged=0)
+        drift = []
+        matched = set()
+        for position, obj_type, key, obj in self.desired:
+            entry = {'index': position, 'type': obj_type, 'key': dict(zip(self.key_fields(obj_type), key))}
+            candidates = index.get((obj_type, key))
+            if not candidates:
+                summary['missing'] += 1
+                entry['status'] = 'missing'
+                drift.append(entry)
+                continue
+            matched.add((obj_type, key))
+
+            # the key fields matched already, in their normalized form
+            desired = normalize_drift_object(obj_type, obj)
+            for field in self.key_fields(obj_type):
+                desired.pop(field, None)
+            diffs = []
+            for candidate in candidates:
+                current = normalize_drift_object(obj_type, candidate)
+                unverified = sorted(f for f in desired if f not in current) if partial else []
+                compared = dict((f, v) for f, v in desired.items() if f not in unverified)
+                diff = object_drift(comparator, obj_type, current, compared)
+                diffs.append((len(diff), len(unverified), candidate.get('_ref'), diff, unverified))
+                if not diff and not unverified:
+                    break
+            count, dummy, ref, diff, unverified = min(diffs, key=lambda d: d[:2])
+            if not count and not unverified:
+                summary['in_sync'] += 1
+                continue
+            if count:
+                summary['drifted'] += 1
+                entry.update(status='drifted', ref=ref, diff=diff)
+            else:
+                summary['unverified'] += 1
+                entry.update(status='unverified', ref=ref)
+            if unverified:
+                entry['unverified'] = unverified
+            drift.append(entry)
+
+        if report_unmanaged:
+            for (obj_type, key), objects in index.items():
+                if (obj_type, key) in matched:
+                    continue
+                for obj in objects:
+                    summary['unmanaged'] += 1
+                    drift.append({'type': obj_type, 'key': dict(zip(self.key_fields(obj_type), key)),
+                                  'status': 'unmanaged', 'ref': obj.get('_ref')})
+        return dict(summary=summary, drift=drift)
+
+
+def fetch_snapshot(wapi, report, page_size=NIOS_PAGE_SIZE):
+    ''' Reads the objects of the desired object types from WAPI, with one
+    paged search per object type returning only the compared fields
+    :returns: generator yielding tuples of the object type and the object
+    '''
+    for obj_type in report.object_types():
+        for obj in wapi.iter_objects(obj_type, return_fields=report.return_fields(obj_type), page_size=page_size):
+            yield obj_type, obj
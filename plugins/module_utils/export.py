@@ -0,0 +1,145 @@
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+# Copyright (c) 2020 Infoblox, Inc.
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from ansible.module_utils.common.text.converters import to_bytes, to_text
+from .api import NIOS_A_RECORD, NIOS_AAAA_RECORD, NIOS_CNAME_RECORD, NIOS_DNS_VIEW
+from .api import NIOS_HOST_RECORD, NIOS_IPV4_FIXED_ADDRESS, NIOS_IPV4_NETWORK
+from .api import NIOS_IPV4_NETWORK_CONTAINER, NIOS_IPV6_FIXED_ADDRESS, NIOS_IPV6_NETWORK
+from .api import NIOS_IPV6_NETWORK_CONTAINER, NIOS_MX_RECORD, NIOS_NETWORK_VIEW, NIOS_PAGE_SIZE
+from .api import NIOS_PTR_RECORD, NIOS_RANGE, NIOS_SRV_RECORD, NIOS_TXT_RECORD, NIOS_ZONE
+from .api import WapiBase
+
+# Object types exported when none are given, with their default fields
+# and extensible attributes
+NIOS_EXPORT_OBJECT_TYPES = (
+    NIOS_NETWORK_VIEW, NIOS_DNS_VIEW,
+    NIOS_IPV4_NETWORK_CONTAINER, NIOS_IPV4_NETWORK, NIOS_IPV6_NETWORK_CONTAINER, NIOS_IPV6_NETWORK,
+    NIOS_RANGE, NIOS_IPV4_FIXED_ADDRESS, NIOS_IPV6_FIXED_ADDRESS,
+    NIOS_ZONE, NIOS_HOST_RECORD, NIOS_A_RECORD, NIOS_AAAA_RECORD, NIOS_CNAME_RECORD,
+    NIOS_MX_RECORD, NIOS_PTR_RECORD, NIOS_SRV_RECORD, NIOS_TXT_RECORD,
+)
+NIOS_EXPORT_RETURN_FIELDS = ['default', 'extattrs']
+
+
+class ExportError(Exception):
+    ''' Raised when a search of export_objects() fails, with the object
+    type of the search and the exception raised by its worker
+    '''
+    def __init__(self, obj_type, exc):
+        response = getattr(exc, 'response', None)
+        text = response.get('text') if isinstance(response, dict) else None
+        super(ExportError, self).__init__('%s: %s' % (obj_type, text or to_text(exc)))
+        self.obj_type = obj_type
+        self.error = exc
+
+
+class WapiPageReader(WapiBase):
+    ''' Pages through searches on a connector of its own.
+    WAPI errors are raised to the caller: the worker threads of
+    export_objects() never fail a module themselves, the error is handled
+    once the worker result is collected.
+    '''
+    def __init__(self, connector):
+        self.connector = connector
+
+    def handle_exception(self, method_name, exc):
+        raise exc
+
+
+def export_line(obj_type, obj):
+    ''' Returns the JSON line of one exported object '''
+    return to_bytes(json.dumps({'type': obj_type, 'object': obj}, sort_keys=True, separators=(',', ':')) + '\n')
+
+
+def export_search(reader, search, path, page_size=NIOS_PAGE_SIZE):
+    ''' Writes the objects of one paged search to a gzip file, one page at
+    a time. The gzip header holds no name nor time, so that the same
+    objects always give the same bytes.
+    :args reader: a WapiBase instance running the search
+    :args search: dict with the object `type`, `return_fields` and `filters`
+    :args path: the file to write
+    :returns: the number of objects written
+    '''
+    obj_type = search['type']
+    return_fields = search.get('return_fields')
+    if return_fields is None:
+        return_fields = NIOS_EXPORT_RETURN_FIELDS
+    count = 0
+    with open(path, 'wb') as f:
+        with gzip.GzipFile(filename='', mode='wb', fileobj=f, mtime=0) as gz:
+            for page in reader.get_object_pages(obj_type, search.get('filters'), return_fields=return_fields,
+                                                page_size=page_size):
+                gz.write(b''.join(export_line(obj_type, obj) for obj in page))
+                count += len(page)
+    return count
+
+
+def export_objects(wapi, searches, stream, workers=1, page_size=NIOS_PAGE_SIZE, tmpdir=None):
+    ''' Exports several paged searches to one gzip compressed JSON lines
+    stream. Up to `workers` searches run concurrently, each writing its
+    own gzip member to a temporary file, so that memory holds at most one
+    page per worker. The members are then appended to stream in the order
+    of searches, which makes a valid multi-member gzip file.
+    :args wapi: a WapiBase instance
+    :args searches: list of dicts with the object `type`, `return_fields`
+        and `filters` of every search
+    :args stream: binary file object the export is written to
+    :returns: dict of the number of objects exported per object type
+    :raises ExportError: when a search fails
+    '''
+    # a requests session is not thread safe, every worker thread pages
+    # through its own connection
+    readers = threading.local()
+
+    def run_search(search, path):
+        try:
+            if not hasattr(readers, 'reader'):
+                readers.reader = WapiPageReader(wapi.new_connector())
+            return export_search(readers.reader, search, path, page_size)
+        except Exception as exc:
+            raise ExportError(search['type'], exc)
+
+    tmpdir = tempfile.mkdtemp(prefix='.nios_export.', dir=tmpdir)
+    try:
+        paths = [os.path.join(tmpdir, '%d.jsonl.gz' % index) for index in range(len(searches))]
+        with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+            futures = [executor.submit(run_search, search, path)
+                       for search, path in zip(searches, paths)]
+            try:
+                results = [future.result() for future in futures]
+            except Exception:
+                # do not start the searches still queued
+                for future in futures:
+                    future.cancel()
+                raise
+
+        counts = {}
+        for search, path, count in zip(searches, paths, results):
+            counts[search['type']] = counts.get(search['type'], 0) + count
+            with open(path, 'rb') as f:
+                shutil.copyfileobj(f, stream)
+        return counts
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+def iter_export(path):
+    ''' Reads back a file written by export_objects()
+    :returns: generator yielding a tuple of the object type and the object
+        of every exported object
+    '''
+    with gzip.open(path, 'rb') as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                yield entry['type'], entry['object']
@@ -1,5 +1,8 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
+import bisect
+import heapq
+import ipaddress
 import socket
 
 
@@ -17,3 +20,140 @@ def validate_ip_v6_address(address):
     except socket.error:
         return False
     return True
+
+
+class SubnetAllocator(object):
+    ''' Plans subnets of a network container locally
+    The free space of the container is kept as aligned CIDR blocks bucketed
+    by prefix length, the way a buddy allocator does. Every request takes
+    the smallest free block it fits in (best fit), lowest address first, and
+    the unused halves of a split block go back to the free buckets.
+    '''
+
+    def __init__(self, container, used=()):
+        self.container = ipaddress.ip_network(container)
+        self.max_prefixlen = self.container.max_prefixlen
+        self.free = {}
+        used = [ipaddress.ip_network(net) for net in used]
+        used = [net for net in used if net.version == self.container.version and net.overlaps(self.container)]
+
+        start = int(self.container.network_address)
+        last = int(self.container.broadcast_address)
+        for net in ipaddress.collapse_addresses(used):
+            if int(net.network_address) > start:
+                self._add_range(start, int(net.network_address) - 1)
+            start = max(start, int(net.broadcast_address) + 1)
+        if start <= last:
+            self._add_range(start, last)
+
+    def _address(self, value):
+        if self.container.version == 4:
+            return ipaddress.IPv4Address(value)
+        return ipaddress.IPv6Address(value)
+
+    def _add_range(self, first, last):
+        for block in ipaddress.summarize_address_range(self._address(first), self._address(last)):
+            heapq.heappush(self.free.setdefault(block.prefixlen, []), int(block.network_address))
+
+    def allocate(self, prefixlen):
+        ''' Takes the best fitting free block for one subnet
+        :args prefixlen: the prefix length of the subnet to carve
+        :returns: the allocated ip_network
+        '''
+        fits = [length for length, blocks in self.free.items() if blocks and length <= prefixlen]
+        if not fits:
+            raise ValueError('no free /%s network left in %s' % (prefixlen, self.container.with_prefixlen))
+        length = max(fits)
+        start = heapq.heappop(self.free[length])
+        # split the block, keeping the upper half of every split free
+        for split in range(length + 1, prefixlen + 1):
+            heapq.heappush(self.free.setdefault(split, []), start + 2 ** (self.max_prefixlen - split))
+        return ipaddress.ip_network('%s/%s' % (self._address(start), prefixlen))
+
+    def plan(self, prefixlens):
+        ''' Allocates several subnets, largest first to limit fragmentation
+        :args prefixlens: list of the requested prefix lengths
+        :returns: list of the allocated ip_network, in request order
+        '''
+        order = sorted(range(len(prefixlens)), key=lambda index: prefixlens[index])
+        result = [None] * len(prefixlens)
+        for index in order:
+            result[index] = self.allocate(prefixlens[index])
+        return result
+
+
+class IpamIndex(object):
+    ''' In-memory index of the networks and used addresses of a network view
+    Networks and merged used intervals are kept as integer bounds in sorted
+    arrays, with a running total of the used addresses, so free space and
+    overlap queries are answered with a few bisections instead of WAPI
+    round trips. Networks of one network view never overlap in NIOS.
+    An index holds the networks and addresses of a single IP version.
+    '''
+
+    def __init__(self, networks=(), used=()):
+        networks = sorted(ipaddress.ip_network(net) for net in networks)
+        self.networks = networks
+        self._net_starts = [int(net.network_address) for net in networks]
+        self._net_ends = [int(net.broadcast_address) for net in networks]
+
+        intervals = sorted((int(ipaddress.ip_address(first)), int(ipaddress.ip_address(last))) for first, last in used)
+        self._used_starts = []
+        self._used_ends = []
+        for first, last in intervals:
+            if self._used_ends and first <= self._used_ends[-1] + 1:
+                self._used_ends[-1] = max(self._used_ends[-1], last)
+            else:
+                self._used_starts.append(first)
+                self._used_ends.append(last)
+        # self._used_before[i] is the number of used addresses in the
+        # intervals preceding interval i
+        self._used_before = [0]
+        for first, last in zip(self._used_starts, self._used_ends):
+            self._used_before.append(self._used_before[-1] + last - first + 1)
+
+    @staticmethod
+    def usable_bounds(network):
+        ''' Returns the first and last assignable address of a network as
+        integers, skipping the network and broadcast addresses of IPv4 '''
+        first = int(network.network_address)
+        last = int(network.broadcast_address)
+        if network.version == 4 and network.prefixlen < 31:
+            return first + 1, last - 1
+        return first, last
+
+    def used_count(self, first, last):
+        ''' Counts the used addresses between two integer bounds '''
+        end = bisect.bisect_right(self._used_starts, last)
+        start = bisect.bisect_left(self._used_ends, first)
+        if start >= end:
+            return 0
+        count = self._used_before[end] - self._used_before[start]
+        count -= max(0, first - self._used_starts[start])
+        count -= max(0, self._used_ends[end - 1] - last)
+        return count
+
+    def usage(self, network):
+        ''' Returns a dict with the total, used and free addresses of a network '''
+        network = ipaddress.ip_network(network)
+        first, last = self.usable_bounds(network)
+        total = max(0, last - first + 1)
+        used = self.used_count(first, last) if total else 0
+        return {'network': network.with_prefixlen, 'total': total, 'used': used, 'free': total - used}
+
+    def overlapping(self, network):
+        ''' Returns the indexed networks overlapping a network, in order '''
+        network = ipaddress.ip_network(network, strict=False)
+        start = bisect.bisect_left(self._net_ends, int(network.network_address))
+        end = bisect.bisect_right(self._net_starts, int(network.broadcast_address))
+        return self.networks[start:end]
+
+    def free_networks(self, min_free=1, within=None):
+        ''' Returns the usage of every indexed network with at least min_free
+        free addresses, optionally limited to the networks overlapping one of
+        the networks listed in within '''
+        if within:
+            networks = sorted(set(net for query in within for net in self.overlapping(query)))
+        else:
+            networks = self.networks
+        return [usage for usage in (self.usage(net) for net in networks) if usage['free'] >= min_free]
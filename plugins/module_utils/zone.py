@@ -0,0 +1,526 @@
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+# Copyright (c) 2020 Infoblox, Inc.
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+import ipaddress
+
+from ansible.module_utils.common.text.converters import to_text
+from .api import InfobloxException, NIOS_MULTI_REQUEST_CHUNK_SIZE
+from .api import NIOS_A_RECORD, NIOS_AAAA_RECORD, NIOS_CNAME_RECORD, NIOS_MX_RECORD
+from .api import NIOS_NAPTR_RECORD, NIOS_PTR_RECORD, NIOS_SRV_RECORD, NIOS_TXT_RECORD
+from .api import NIOS_PAGE_SIZE, wapi_request
+
+# Record types managed by nios_zone_records: the WAPI object type, the fields
+# identifying a record besides its name, and the fields that can be updated
+# in place. A name holds a single CNAME, so its target is updatable.
+ZONE_RECORD_TYPES = {
+    'A': (NIOS_A_RECORD, ('ipv4addr',), ()),
+    'AAAA': (NIOS_AAAA_RECORD, ('ipv6addr',), ()),
+    'CNAME': (NIOS_CNAME_RECORD, (), ('canonical',)),
+    'MX': (NIOS_MX_RECORD, ('mail_exchanger', 'preference'), ()),
+    'NAPTR': (NIOS_NAPTR_RECORD, ('order', 'preference', 'flags', 'services', 'regexp', 'replacement'), ()),
+    'PTR': (NIOS_PTR_RECORD, ('ptrdname',), ()),
+    'SRV': (NIOS_SRV_RECORD, ('target', 'port', 'priority'), ('weight',)),
+    'TXT': (NIOS_TXT_RECORD, ('text',), ()),
+}
+
+# Fields every record type can update in place
+ZONE_RECORD_ATTRS = ('ttl', 'comment')
+
+ZONE_HOSTNAME_FIELDS = frozenset(('name', 'canonical', 'mail_exchanger', 'ptrdname', 'target', 'replacement'))
+ZONE_INT_FIELDS = frozenset(('order', 'preference', 'port', 'priority', 'weight', 'ttl'))
+
+
+def normalize_fqdn(value):
+    value = value.strip().lower()
+    # the root name is only meaningful as a NAPTR replacement
+    return value if value == '.' else value.rstrip('.')
+
+
+def qualify_name(name, zone):
+    ''' Returns the fully qualified owner name of a record of zone
+    `@` stands for the zone apex, names ending with a dot are absolute and
+    any other name not already inside the zone is taken relative to it.
+    '''
+    name = name.strip()
+    if name in ('', '@'):
+        return zone
+    if name.endswith('.'):
+        return normalize_fqdn(name)
+    name = name.lower()
+    if name == zone or name.endswith('.' + zone):
+        return name
+    return '%s.%s' % (name, zone)
+
+
+def record_fields(record_type):
+    obj_type, key_fields, update_fields = ZONE_RECORD_TYPES[record_type]
+    return ('name',) + key_fields + update_fields
+
+
+def normalize_record(record, zone):
+    ''' Validates one desired record and returns it with WAPI field names
+    and canonical values
+    :args record: dict with a `type` and the fields of that record type
+    :args zone: the normalized zone name
+    :returns: tuple of the record type and the normalized record dict
+    '''
+    record_type = str(record.get('type', '')).upper()
+    if record_type not in ZONE_RECORD_TYPES:
+        raise ValueError('unsupported record type %r, expected one of %s'
+                         % (record.get('type'), ', '.join(sorted(ZONE_RECORD_TYPES))))
+    fields = record_fields(record_type)
+    unknown = set(record) - set(fields) - set(ZONE_RECORD_ATTRS) - set(['type'])
+    if unknown:
+        raise ValueError('unsupported %s record fields: %s' % (record_type, ', '.join(sorted(unknown))))
+
+    normalized = {'name': qualify_name(str(record.get('name') or '@'), zone)}
+    for field in fields[1:] + ZONE_RECORD_ATTRS:
+        value = record.get(field)
+        if value is None:
+            if field not in ZONE_RECORD_ATTRS:
+                raise ValueError('%s record %s is missing %s' % (record_type, normalized['name'], field))
+            continue
+        normalized[field] = normalize_value(field, value)
+    return record_type, normalized
+
+
+def normalize_value(field, value):
+    if field in ZONE_INT_FIELDS:
+        return int(value)
+    if field in ZONE_HOSTNAME_FIELDS:
+        return normalize_fqdn(str(value))
+    if field == 'ipv4addr':
+        return str(ipaddress.IPv4Address(str(value).strip()))
+    if field == 'ipv6addr':
+        return str(ipaddress.IPv6Address(str(value).strip()))
+    return str(value)
+
+
+def record_key(record_type, record):
+    ''' Returns the hashable identity of a record '''
+    obj_type, key_fields, update_fields = ZONE_RECORD_TYPES[record_type]
+    return (record_type, normalize_fqdn(record['name'])) + tuple(
+        normalize_value(field, record[field]) for field in key_fields)
+
+
+def record_changes(record_type, current, desired):
+    ''' Returns the fields to write so that current matches desired '''
+    obj_type, key_fields, update_fields = ZONE_RECORD_TYPES[record_type]
+    changes = {}
+    for field in update_fields:
+        if normalize_value(field, current.get(field)) != desired[field]:
+            changes[field] = desired[field]
+    if 'ttl' in desired and (not current.get('use_ttl') or current.get('ttl') != desired['ttl']):
+        changes['ttl'] = desired['ttl']
+        changes['use_ttl'] = True
+    if 'comment' in desired and (current.get('comment') or '') != desired['comment']:
+        changes['comment'] = desired['comment']
+    return changes
+
+
+def plan_zone_records(desired, existing, purge=False):
+    ''' Computes the changes reconciling the records of a zone
+    Existing records are indexed by their identity once, so the plan costs
+    one hash lookup per desired record.
+    :args desired: list of (record type, normalized record) tuples
+    :args existing: list of (record type, WAPI object) tuples
+    :args purge: also delete the existing records that are not desired
+    :returns: dict with the `create`, `update` and `delete` lists
+    '''
+    index = {}
+    duplicates = []
+    for record_type, obj in existing:
+        key = record_key(record_type, obj)
+        if key in index:
+            duplicates.append((record_type, obj))
+        else:
+            index[key] = (record_type, obj)
+
+    plan = {'create': [], 'update': [], 'delete': []}
+    seen = set()
+    for record_type, record in desired:
+        key = record_key(record_type, record)
+        if key in seen:
+            raise ValueError('%s record %s is listed more than once' % (record_type, record['name']))
+        seen.add(key)
+        current = index.get(key)
+        if current is None:
+            plan['create'].append((record_type, record))
+            continue
+        changes = record_changes(record_type, current[1], record)
+        if changes:
+            plan['update'].append((record_type, current[1], changes))
+
+    if purge:
+        plan['delete'] = [current for key, current in index.items() if key not in seen] + duplicates
+    return plan
+
+
+def iter_zone_records(wapi, zone, view, record_types, page_size=NIOS_PAGE_SIZE):
+    ''' Streams the records of the given types of a zone, one paged search
+    per record type, so only one page is held in memory at a time
+    :returns: generator of (record type, WAPI object) tuples
+    '''
+    for record_type in sorted(record_types):
+        obj_type = ZONE_RECORD_TYPES[record_type][0]
+        return_fields = list(record_fields(record_type)) + ['ttl', 'use_ttl', 'comment']
+        for obj in wapi.iter_objects(obj_type, {'zone': zone, 'view': view}, return_fields=return_fields,
+                                     page_size=page_size):
+            yield record_type, obj
+
+
+def fetch_zone_records(wapi, zone, view, record_types):
+    ''' Same as iter_zone_records() but returns a list '''
+    return list(iter_zone_records(wapi, zone, view, record_types))
+
+
+class ZoneSyncError(Exception):
+    ''' Raised when a chunk of the changes of a zone failed, with the
+    changes applied by the chunks before it
+    '''
+    def __init__(self, msg, applied):
+        super(ZoneSyncError, self).__init__(msg)
+        self.applied = applied
+
+
+def zone_plan_changes(plan):
+    ''' Returns the changes of a plan as reported by the module '''
+    return {
+        'create': [dict(record, type=record_type) for record_type, record in plan['create']],
+        'update': [dict(changes, type=record_type, name=obj['name'], ref=obj['_ref'])
+                   for record_type, obj, changes in plan['update']],
+        'delete': [dict(obj, type=record_type) for record_type, obj in plan['delete']],
+    }
+
+
+def zone_plan_requests(plan, view):
+    ''' Returns the WAPI requests applying a plan, grouped by the requests
+    that must be applied in the same transaction. The deletes of a name
+    share the group of the creates of that name and go first, so that a
+    name can change from one record type to another (CNAME) in one run
+    without losing its old records before the new ones are written.
+    :returns: list of groups, every group a list of tuples of the kind of
+        change (create, update or delete), the reported change and the
+        request
+    '''
+    changes = zone_plan_changes(plan)
+    names = {}
+    for (record_type, obj), change in zip(plan['delete'], changes['delete']):
+        names.setdefault(normalize_fqdn(obj['name']), []).append(
+            ('delete', change, wapi_request('DELETE', obj['_ref'])))
+    for (record_type, record), change in zip(plan['create'], changes['create']):
+        data = dict(record, view=view)
+        if 'ttl' in data:
+            data['use_ttl'] = True
+        names.setdefault(normalize_fqdn(record['name']), []).append(
+            ('create', change, wapi_request('POST', ZONE_RECORD_TYPES[record_type][0], data)))
+    groups = list(names.values())
+    groups.extend([('update', change, wapi_request('PUT', obj['_ref'], obj_changes))]
+                  for (record_type, obj, obj_changes), change in zip(plan['update'], changes['update']))
+    return groups
+
+
+def chunk_request_groups(groups, chunk_size=NIOS_MULTI_REQUEST_CHUNK_SIZE):
+    ''' Packs groups of requests into chunks of at most chunk_size
+    requests without splitting a group. A group larger than chunk_size is
+    a chunk of its own.
+    :returns: list of chunks, every chunk a list of the group entries
+    '''
+    chunks = []
+    chunk = []
+    for group in groups:
+        if chunk and len(chunk) + len(group) > chunk_size:
+            chunks.append(chunk)
+            chunk = []
+        chunk.extend(group)
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def apply_zone_requests(wapi, groups):
+    ''' Sends the groups of requests of a plan, one multi-request per
+    chunk. Every chunk is a WAPI transaction of its own, so a failure leaves
+    the chunks sent before it applied.
+    :raises ZoneSyncError: when a chunk fails, with the changes applied
+    '''
+    applied = {'create': [], 'update': [], 'delete': []}
+    for chunk in chunk_request_groups(groups, NIOS_MULTI_REQUEST_CHUNK_SIZE):
+        try:
+            wapi._send_multi_request([request for kind, change, request in chunk])
+        except InfobloxException as exc:
+            response = getattr(exc, 'response', None) or {}
+            text = response.get('text') if isinstance(response, dict) else None
+            raise ZoneSyncError('%s (applied before the failure: %d created, %d updated, %d deleted)' % (
+                text or to_text(exc), len(applied['create']), len(applied['update']), len(applied['delete'])), applied)
+        for kind, change, request in chunk:
+            applied[kind].append(change)
+    return applied
+
+
+def sync_zone_records(wapi, zone, view, records, purge=False, check_mode=False):
+    ''' Reconciles the records of a zone_auth with a desired record set
+    :args wapi: the WapiModule instance
+    :args zone: the zone name
+    :args view: the DNS view of the zone
+    :args records: list of desired record dicts, each with a `type`
+    :args purge: delete the records of the managed types not in records
+    :args check_mode: compute the changes without applying them
+    :returns: result dict
+    :raises ZoneSyncError: when the changes were only partly applied
+    '''
+    zone = normalize_fqdn(zone)
+    desired = []
+    for index, record in enumerate(records):
+        try:
+            desired.append(normalize_record(record, zone))
+        except (ValueError, TypeError) as exc:
+            raise ValueError('records[%d]: %s' % (index, exc))
+
+    record_types = set(ZONE_RECORD_TYPES) if purge else set(record_type for record_type, record in desired)
+    plan = plan_zone_records(desired, fetch_zone_records(wapi, zone, view, record_types), purge)
+
+    groups = zone_plan_requests(plan, view)
+    if groups and not check_mode:
+        apply_zone_requests(wapi, groups)
+    return {'changed': bool(groups), 'changes': zone_plan_changes(plan)}
+
+
+ZONE_FILE_CLASSES = frozenset(('IN', 'CH', 'HS', 'CS'))
+ZONE_FILE_TTL_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 604800}
+
+# rdata layout of the supported record types in a master file, names being
+# relative to $ORIGIN unless they end with a dot
+ZONE_FILE_RDATA = {
+    'A': ('ipv4addr',),
+    'AAAA': ('ipv6addr',),
+    'CNAME': ('canonical',),
+    'MX': ('preference', 'mail_exchanger'),
+    'NAPTR': ('order', 'preference', 'flags', 'services', 'regexp', 'replacement'),
+    'PTR': ('ptrdname',),
+    'SRV': ('priority', 'weight', 'port', 'target'),
+}
+
+
+def parse_ttl(value):
+    ''' Parses a TTL given in seconds or with BIND units (1h30m), returns
+    None when value is not a TTL '''
+    value = value.lower()
+    if value.isdigit():
+        return int(value)
+    total = 0
+    number = ''
+    for char in value:
+        if char.isdigit():
+            number += char
+        elif char in ZONE_FILE_TTL_UNITS and number:
+            total += int(number) * ZONE_FILE_TTL_UNITS[char]
+            number = ''
+        else:
+            return None
+    return None if number else total
+
+
+def tokenize_zone_line(line):
+    ''' Splits one master file line into tokens
+    :returns: tuple of the tokens, the quoted flag of every token and the
+        change of the parenthesis depth
+    '''
+    if '"' not in line and '(' not in line and ')' not in line:
+        # most lines need no character level scan
+        tokens = line.split(';', 1)[0].split()
+        return tokens, [False] * len(tokens), 0
+    tokens = []
+    quoted = []
+    depth = 0
+    index = 0
+    length = len(line)
+    while index < length:
+        char = line[index]
+        if char in ' \t\r\n':
+            index += 1
+        elif char == ';':
+            break
+        elif char in '()':
+            depth += 1 if char == '(' else -1
+            index += 1
+        elif char == '"':
+            value = []
+            index += 1
+            while index < length and line[index] != '"':
+                if line[index] == '\\' and index + 1 < length:
+                    index += 1
+                value.append(line[index])
+                index += 1
+            index += 1
+            tokens.append(''.join(value))
+            quoted.append(True)
+        else:
+            start = index
+            while index < length and line[index] not in ' \t\r\n;()"':
+                index += 1
+            tokens.append(line[start:index])
+            quoted.append(False)
+    return tokens, quoted, depth
+
+
+def iter_zone_entries(lines):
+    ''' Groups the lines of a master file into entries, joining the lines
+    of parenthesized entries
+    :returns: generator of (owner given, tokens, quoted flags, line number)
+    '''
+    tokens = quoted = None
+    depth = 0
+    for number, line in enumerate(lines, 1):
+        line_tokens, line_quoted, line_depth = tokenize_zone_line(line)
+        if tokens is None:
+            if not line_tokens:
+                continue
+            tokens, quoted, start = [], [], number
+            owner_given = line[:1] not in (' ', '\t')
+        tokens.extend(line_tokens)
+        quoted.extend(line_quoted)
+        depth += line_depth
+        if depth <= 0:
+            yield owner_given, tokens, quoted, start
+            tokens = None
+            depth = 0
+    if tokens:
+        raise ValueError('line %d: unbalanced parentheses' % start)
+
+
+def iter_zone_file(lines, origin, skipped=None):
+    ''' Stream-parses an RFC 1035 master file into zone records
+    Entries are parsed one at a time, so a zone of any size is read with
+    bounded memory. $ORIGIN is honored. Only the records with an explicit
+    TTL get a `ttl`: $TTL is the default TTL of the zone, which the other
+    records inherit on NIOS. Record types not handled by ZONE_FILE_RDATA or
+    TXT (SOA, NS...) are skipped and counted.
+    :args lines: iterable of the lines of the file
+    :args origin: the origin of relative names, usually the zone name
+    :args skipped: optional dict receiving the count of skipped entries
+        per record type
+    :returns: generator of record dicts in the nios_zone_records format,
+        with absolute names
+    '''
+    origin = normalize_fqdn(origin)
+    owner = None
+
+    def absolute(name):
+        if name == '@':
+            return origin + '.'
+        if name.endswith('.'):
+            return name
+        return '%s.%s.' % (name, origin)
+
+    for owner_given, tokens, quoted, number in iter_zone_entries(lines):
+        if owner_given and tokens[0].startswith('$') and not quoted[0]:
+            directive = tokens[0].upper()
+            if directive == '$ORIGIN' and len(tokens) > 1:
+                origin = normalize_fqdn(absolute(tokens[1]))
+            elif not (directive == '$TTL' and len(tokens) > 1 and parse_ttl(tokens[1]) is not None):
+                # a valid $TTL only sets the zone TTL, the records inherit it
+                raise ValueError('line %d: unsupported directive %s' % (number, ' '.join(tokens)))
+            continue
+
+        position = 0
+        if owner_given:
+            owner = absolute(tokens[0])
+            position = 1
+        if owner is None:
+            raise ValueError('line %d: no owner name' % number)
+
+        ttl = None
+        for dummy in range(2):
+            if position < len(tokens) and not quoted[position]:
+                if tokens[position].upper() in ZONE_FILE_CLASSES:
+                    position += 1
+                    continue
+                if parse_ttl(tokens[position]) is not None:
+                    ttl = parse_ttl(tokens[position])
+                    position += 1
+        if position >= len(tokens):
+            raise ValueError('line %d: missing record type' % number)
+        record_type = tokens[position].upper()
+        rdata = tokens[position + 1:]
+        rdata_quoted = quoted[position + 1:]
+
+        if record_type == 'TXT':
+            if not rdata:
+                raise ValueError('line %d: TXT record without text' % number)
+            fields = {'text': rdata[0] if len(rdata) == 1 else ' '.join(quote_txt(part) for part in rdata)}
+        elif record_type in ZONE_FILE_RDATA:
+            layout = ZONE_FILE_RDATA[record_type]
+            if len(rdata) != len(layout):
+                raise ValueError('line %d: %s record needs %d values, got %d' % (number, record_type, len(layout), len(rdata)))
+            fields = {}
+            for field, value, is_quoted in zip(layout, rdata, rdata_quoted):
+                if field in ZONE_HOSTNAME_FIELDS and not is_quoted and value != '.':
+                    value = absolute(value)
+                fields[field] = value
+        else:
+            if skipped is not None:
+                skipped[record_type] = skipped.get(record_type, 0) + 1
+            continue
+
+        record = dict(fields, type=record_type, name=owner)
+        if ttl is not None:
+            record['ttl'] = ttl
+        yield record
+
+
+def quote_txt(value):
+    return '"%s"' % value.replace('\\', '\\\\').replace('"', '\\"')
+
+
+def format_zone_record(record_type, obj, origin=None):
+    ''' Formats a WAPI record object as one master file line
+    :args record_type: the zone record type of obj
+    :args obj: the WAPI object, as fetched by fetch_zone_records()
+    :args origin: the zone name, the owner name is written relative to
+        it when given
+    :returns: the line, without the line break
+    '''
+    name = normalize_fqdn(obj['name'])
+    if origin and name == origin:
+        owner = '@'
+    elif origin and name.endswith('.' + origin):
+        owner = name[:-len(origin) - 1]
+    else:
+        owner = name + '.'
+
+    if record_type == 'TXT':
+        text = obj['text']
+        rdata = [text if text.startswith('"') else quote_txt(text)]
+    else:
+        rdata = []
+        for field in ZONE_FILE_RDATA[record_type]:
+            value = obj[field]
+            if field in ('flags', 'services', 'regexp'):
+                value = quote_txt(value)
+            elif field in ZONE_HOSTNAME_FIELDS and value != '.':
+                value = value.rstrip('.') + '.'
+            rdata.append(str(value))
+
+    ttl = str(obj['ttl']) if obj.get('use_ttl') and obj.get('ttl') is not None else ''
+    return '\t'.join([owner, ttl, 'IN', record_type, ' '.join(rdata)])
+
+
+def export_zone_file(wapi, zone, view, stream, record_types=None, relative=True, page_size=NIOS_PAGE_SIZE):
+    ''' Writes the records of a zone to a master file as they are fetched
+    :args stream: the file object to write to
+    :args record_types: the record types to export, all of ZONE_RECORD_TYPES
+        by default
+    :args relative: write owner names relative to the zone
+    :returns: dict with the number of records written per record type
+    '''
+    zone = normalize_fqdn(zone)
+    counts = dict((record_type, 0) for record_type in record_types or ZONE_RECORD_TYPES)
+    stream.write('$ORIGIN %s.\n' % zone)
+    for record_type, obj in iter_zone_records(wapi, zone, view, counts, page_size=page_size):
+        stream.write(format_zone_record(record_type, obj, zone if relative else None))
+        stream.write('\n')
+        counts[record_type] += 1
+    return counts
@@ -18,7 +18,9 @@ description:
     using the Infoblox WAPI interface over REST.
 requirements:
   - infoblox-client
-extends_documentation_fragment: infoblox.nios_modules.nios
+extends_documentation_fragment:
+  - infoblox.nios_modules.nios
+  - infoblox.nios_modules.nios.bulk
 notes:
     - This module supports C(check_mode).
 options:
@@ -27,7 +29,7 @@ options:
       - Specifies the fully qualified hostname to add or remove from
         the system. Users can also update the name as it is possible
         to pass a dict containing I(new_name), I(old_name). See examples.
-    required: true
+      - Required unless I(items) is given.
     type: str
   view:
     description:
@@ -44,9 +46,9 @@ options:
         I(nios_next_ip) and I(CIDR network range). Also update ipv4 address
         statically to A record by passing dictionary containing, I(old_ipv4addr)
         and I(new_ipv4addr). See example.
+      - Required unless I(items) is given.
     aliases:
       - ipv4
-    required: true
     type: str
   ttl:
     description:
@@ -159,6 +161,28 @@ EXAMPLES = '''
       username: admin
       password: admin
   connection: local
+
+- name: Configure several A records in one task
+  infoblox.nios_modules.nios_a_record:
+    comment: managed by ansible
+    items:
+      - name: a1.ansible.com
+        ipv4: 192.168.10.11
+      - name: a2.ansible.com
+        ipv4: 192.168.10.12
+        ttl: 300
+      - name: old.ansible.com
+        ipv4: 192.168.10.13
+        state: absent
+      - name: vm1.ansible.com
+        ipv4: {nios_next_ip: 192.168.10.0/24}
+      - name: vm2.ansible.com
+        ipv4: {nios_next_ip: 192.168.10.0/24}
+    provider:
+      host: "{{ inventory_hostname_short }}"
+      username: admin
+      password: admin
+  connection: local
 '''
 
 RETURN = ''' # '''
@@ -166,7 +190,7 @@ RETURN = ''' # '''
 from ansible.module_utils.basic import AnsibleModule
 from ..module_utils.api import WapiModule
 from ..module_utils.api import NIOS_A_RECORD
-from ..module_utils.api import normalize_ib_spec
+from ..module_utils.api import bulk_argument_spec, bulk_required_one_of
 
 
 def main():
@@ -190,10 +214,11 @@ def main():
         state=dict(default='present', choices=['present', 'absent'])
     )
 
-    argument_spec.update(normalize_ib_spec(ib_spec))
+    argument_spec.update(bulk_argument_spec(ib_spec))
     argument_spec.update(WapiModule.provider_spec)
 
     module = AnsibleModule(argument_spec=argument_spec,
+                           required_one_of=bulk_required_one_of(ib_spec),
                            supports_check_mode=True)
 
     wapi = WapiModule(module)
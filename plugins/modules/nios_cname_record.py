@@ -18,7 +18,9 @@ description:
     using the Infoblox WAPI interface over REST.
 requirements:
   - infoblox-client
-extends_documentation_fragment: infoblox.nios_modules.nios
+extends_documentation_fragment:
+  - infoblox.nios_modules.nios
+  - infoblox.nios_modules.nios.bulk
 notes:
     - This module supports C(check_mode).
 options:
@@ -27,7 +29,7 @@ options:
       - Specifies the fully qualified hostname to add or remove from
         the system. User can also update the name as it is possible
         to pass a dict containing I(new_name), I(old_name). See examples
-    required: true
+      - Required unless I(items) is given.
     type: str
   view:
     description:
@@ -40,9 +42,9 @@ options:
   canonical:
     description:
       - Configures the canonical name for this CNAME record.
+      - Required unless I(items) is given.
     aliases:
       - cname
-    required: true
     type: str
   ttl:
     description:
@@ -125,7 +127,7 @@ RETURN = ''' # '''
 from ansible.module_utils.basic import AnsibleModule
 from ..module_utils.api import WapiModule
 from ..module_utils.api import NIOS_CNAME_RECORD
-from ..module_utils.api import normalize_ib_spec
+from ..module_utils.api import bulk_argument_spec, bulk_required_one_of
 
 
 def main():
@@ -149,10 +151,11 @@ def main():
         state=dict(default='present', choices=['present', 'absent'])
     )
 
-    argument_spec.update(normalize_ib_spec(ib_spec))
+    argument_spec.update(bulk_argument_spec(ib_spec))
     argument_spec.update(WapiModule.provider_spec)
 
     module = AnsibleModule(argument_spec=argument_spec,
+                           required_one_of=bulk_required_one_of(ib_spec),
                            supports_check_mode=True)
 
     wapi = WapiModule(module)
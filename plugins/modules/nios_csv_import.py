@@ -0,0 +1,231 @@
+#!/usr/bin/python
+# Copyright (c) 2020 Infoblox, Inc.
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+DOCUMENTATION = '''
+---
+module: nios_csv_import
+author: "Infoblox Inc. (@infobloxopen)"
+short_description: Load host records and fixed addresses through a NIOS CSV import
+version_added: "1.10.0"
+description:
+  - Converts host records and fixed addresses, given with the options of
+    M(infoblox.nios_modules.nios_host_record) and
+    M(infoblox.nios_modules.nios_fixed_address), into a NIOS CSV file,
+    uploads it and runs a CSV import task on the grid master.
+  - The whole file is imported by one task on the appliance instead of one
+    WAPI request per object, which makes initial loads of many thousands of
+    objects much faster.
+  - The rows rejected by the import are read back from the error log of the
+    task and reported against the input items.
+requirements:
+  - infoblox-client
+extends_documentation_fragment: infoblox.nios_modules.nios
+notes:
+    - This module supports C(check_mode). In check mode the items are
+      validated and converted, nothing is uploaded.
+    - The file is uploaded with the infoblox-client session, so I(provider)
+      must hold the connection details, the httpapi connection is not
+      supported.
+    - A CSV import is not idempotent, with I(operation=insert) the rows of
+      objects that already exist are rejected.
+    - Host record addresses are imported without their DHCP settings, and
+      fixed addresses without their DHCP options. Items setting them are
+      rejected.
+options:
+  host_records:
+    description:
+      - The host records to import. Each item takes the options of
+        M(infoblox.nios_modules.nios_host_record), I(name), I(view),
+        I(ipv4addrs), I(ipv6addrs), I(aliases), I(configure_for_dns),
+        I(ttl), I(comment) and I(extattrs).
+      - An extensible attribute takes a single value, a list of several
+        values is rejected.
+    type: list
+    elements: dict
+  fixed_addresses:
+    description:
+      - The fixed addresses to import. Each item takes the options of
+        M(infoblox.nios_modules.nios_fixed_address), I(name), I(ipaddr),
+        I(mac) or I(duid), I(network_view), I(comment) and I(extattrs).
+      - I(network) is accepted, and only checked to hold I(ipaddr). NIOS
+        puts a fixed address in the network holding its address.
+      - An extensible attribute takes a single value, a list of several
+        values is rejected.
+    type: list
+    elements: dict
+  operation:
+    description:
+      - The CSV import operation. C(insert) only adds new objects,
+        C(merge) and C(override) also update the existing ones, C(update)
+        only updates existing objects and C(delete) removes them.
+    type: str
+    choices:
+      - insert
+      - merge
+      - override
+      - update
+      - delete
+    default: insert
+  on_error:
+    description:
+      - Whether the import skips the rows it cannot import or stops at the
+        first one.
+    type: str
+    choices:
+      - continue
+      - stop
+    default: continue
+  wait:
+    description:
+      - Wait for the import task to finish. When false, the module returns
+        as soon as the task is started.
+    type: bool
+    default: true
+  timeout:
+    description:
+      - Number of seconds to wait for the import task to finish.
+    type: int
+    default: 3600
+  poll_interval:
+    description:
+      - Number of seconds between two reads of the import task progress.
+    type: int
+    default: 5
+'''
+
+EXAMPLES = '''
+- name: Load host records and DHCP reservations in one import
+  infoblox.nios_modules.nios_csv_import:
+    host_records:
+      - name: host1.ansible.com
+        ipv4addrs:
+          - ipv4addr: 192.168.10.1
+        extattrs:
+          Site: east
+      - name: host2.ansible.com
+        view: internal
+        ipv4addrs:
+          - ipv4addr: 192.168.10.2
+        aliases:
+          - www.ansible.com
+    fixed_addresses:
+      - name: printer1
+        ipaddr: 192.168.10.50
+        mac: 08:6d:41:e8:fd:e8
+    provider:
+      host: "{{ inventory_hostname_short }}"
+      username: admin
+      password: admin
+  connection: local
+
+- name: Merge host records read from a variable file, without waiting
+  infoblox.nios_modules.nios_csv_import:
+    host_records: "{{ inventory_hosts }}"
+    operation: merge
+    wait: false
+    provider:
+      host: "{{ inventory_hostname_short }}"
+      username: admin
+      password: admin
+  connection: local
+'''
+
+RETURN = '''
+rows:
+  description: The number of CSV rows written per CSV object type.
+  returned: always
+  type: dict
+task:
+  description: The C(csvimporttask) of the import, with its status and the
+    number of lines processed and failed.
+  returned: when not in check mode
+  type: dict
+errors:
+  description: The rows rejected by the import.
+  returned: when the import rejected rows
+  type: list
+  elements: dict
+  contains:
+    option:
+      description: The option of the rejected item, C(host_records) or C(fixed_addresses).
+      type: str
+    index:
+      description: The position of the rejected item in its option.
+      type: int
+    msg:
+      description: The error reported by the import.
+      type: str
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.common.text.converters import to_text
+from ..module_utils.api import WapiModule
+from ..module_utils.api import normalize_ib_spec
+from ..module_utils.csv_import import CSV_IMPORT_OPERATIONS, build_csv_rows, write_csv
+from ..module_utils.csv_import import csv_import, wait_csv_import, fetch_csv_error_log, parse_csv_error_log
+
+
+def main():
+    ''' Main entry point for module execution
+    '''
+
+    ib_spec = dict(
+        host_records=dict(type='list', elements='dict'),
+        fixed_addresses=dict(type='list', elements='dict'),
+        operation=dict(default='insert', choices=[o.lower() for o in CSV_IMPORT_OPERATIONS]),
+        on_error=dict(default='continue', choices=['continue', 'stop']),
+        wait=dict(type='bool', default=True),
+        timeout=dict(type='int', default=3600),
+        poll_interval=dict(type='int', default=5),
+    )
+
+    argument_spec = dict(
+        provider=dict(required=True),
+    )
+
+    argument_spec.update(normalize_ib_spec(ib_spec))
+    argument_spec.update(WapiModule.provider_spec)
+
+    module = AnsibleModule(argument_spec=argument_spec,
+                           required_one_of=[['host_records', 'fixed_addresses']],
+                           supports_check_mode=True)
+
+    try:
+        rows = build_csv_rows(module.params)
+    except ValueError as exc:
+        module.fail_json(msg=to_text(exc))
+
+    counts = {}
+    for dummy, dummy, csv_type, dummy in rows:
+        counts[csv_type] = counts.get(csv_type, 0) + 1
+    result = dict(changed=bool(rows), rows=counts)
+    if module.check_mode or not rows:
+        module.exit_json(**result)
+
+    wapi = WapiModule(module)
+    if not hasattr(wapi.connector, 'upload_file'):
+        module.fail_json(msg='nios_csv_import needs the connection details in provider, '
+                             'the httpapi connection cannot upload files')
+
+    task = csv_import(wapi, write_csv(rows), operation=module.params['operation'].upper(),
+                      on_error=module.params['on_error'].upper())
+    if module.params['wait']:
+        task, done = wait_csv_import(wapi, task, module.params['timeout'], module.params['poll_interval'])
+        if not done:
+            module.fail_json(msg='CSV import %s did not finish within %d seconds' % (task['import_id'], module.params['timeout']),
+                             task=task, **result)
+        if task.get('lines_failed'):
+            result['errors'] = parse_csv_error_log(fetch_csv_error_log(wapi, task['import_id']), rows)
+    result['task'] = task
+    if result.get('errors') or task.get('status') == 'FAILED':
+        module.fail_json(msg='CSV import %s rejected %s of %s rows' % (task['import_id'], task.get('lines_failed'), len(rows)),
+                         **result)
+    module.exit_json(**result)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,187 @@
+#!/usr/bin/python
+# Copyright (c) 2020 Infoblox, Inc.
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+DOCUMENTATION = '''
+---
+module: nios_drift_report
+author: "Infoblox Inc. (@infobloxopen)"
+short_description: Report the drift between Infoblox NIOS objects and a desired state
+version_added: "1.10.0"
+description:
+  - Compares a list of desired objects to a snapshot of the grid and
+    reports the objects that are missing or whose fields differ, without
+    one WAPI request per object.
+  - The snapshot is read from a file written by
+    M(infoblox.nios_modules.nios_export), or fetched with one paged WAPI
+    search per desired object type.
+  - Objects are compared with the same normalization as the C(nios_*)
+    modules use to decide whether an object needs an update, so an object
+    reported in sync would not be changed by its module.
+  - The module never changes the grid.
+requirements:
+  - infoblox-client
+extends_documentation_fragment: infoblox.nios_modules.nios
+notes:
+    - This module supports C(check_mode).
+    - I(provider) is only used when I(snapshot) is not set.
+options:
+  desired:
+    description:
+      - The desired objects. Every item is a dict with the WAPI object
+        C(type) and the WAPI fields of the object, C(extattrs) being given
+        as key/value pairs like in the C(nios_*) modules.
+      - Only the fields given are compared.
+    required: true
+    type: list
+    elements: dict
+  snapshot:
+    description:
+      - Path of a file written by M(infoblox.nios_modules.nios_export).
+      - The export only holds the default fields of every object type and
+        C(extattrs), unless its I(objects) list the C(return_fields) to
+        read. Every field compared, like C(ttl), C(use_ttl), C(members) or
+        C(options), must be in the C(return_fields) of its object type.
+        A desired field missing from the exported object is reported as
+        unverified rather than drifted.
+      - When not set, the objects of the desired object types are fetched
+        from WAPI, returning only the fields compared.
+    type: path
+  keys:
+    description:
+      - The fields identifying the objects of an object type, keyed by
+        object type. They default to the fields identifying the objects in
+        the C(nios_*) modules, C(name) for other object types.
+    type: dict
+  report_unmanaged:
+    description:
+      - Also report the objects of the desired object types that no desired
+        object matches.
+    type: bool
+    default: false
+  page_size:
+    description:
+      - Number of objects requested per WAPI page when fetching the snapshot.
+    type: int
+    default: 1000
+'''
+
+EXAMPLES = '''
+- name: Compare host records and networks to the nightly snapshot
+  infoblox.nios_modules.nios_drift_report:
+    snapshot: /var/backups/nios/grid.jsonl.gz
+    desired:
+      - type: record:host
+        name: host1.ansible.com
+        ipv4addrs:
+          - ipv4addr: 192.168.10.1
+        extattrs:
+          Site: east
+      - type: network
+        network: 192.168.10.0/24
+        comment: lab
+  connection: local
+  register: drift
+
+- name: Compare the A records of a zone to the grid, listing the unmanaged ones
+  infoblox.nios_modules.nios_drift_report:
+    desired: "{{ a_records }}"
+    report_unmanaged: true
+    provider:
+      host: "{{ inventory_hostname_short }}"
+      username: admin
+      password: admin
+  connection: local
+'''
+
+RETURN = '''
+summary:
+  description: The number of objects per status, C(in_sync), C(drifted),
+    C(unverified), C(missing) and C(unmanaged).
+  returned: always
+  type: dict
+drift:
+  description: The objects that are not in sync.
+  returned: always
+  type: list
+  elements: dict
+  contains:
+    status:
+      description: C(drifted), C(unverified), C(missing) or C(unmanaged).
+        C(unverified) is an object of I(snapshot) that matches all of the
+        desired fields it holds, but lacks some of them.
+      type: str
+    type:
+      description: The object type.
+      type: str
+    key:
+      description: The values of the fields identifying the object.
+      type: dict
+    index:
+      description: The position of the desired object in I(desired).
+      type: int
+    ref:
+      description: The reference of the object on the grid.
+      type: str
+    diff:
+      description: The C(current) and C(desired) value of every field that
+        differs, for a drifted object.
+      type: dict
+    unverified:
+      description: The desired fields missing from the object of
+        I(snapshot), which were not compared.
+      type: list
+      elements: str
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.common.text.converters import to_native, to_text
+from ..module_utils.api import WapiModule
+from ..module_utils.api import normalize_ib_spec
+from ..module_utils.drift import DriftReport, fetch_snapshot
+from ..module_utils.export import iter_export
+
+
+def main():
+    ''' Main entry point for module execution
+    '''
+
+    ib_spec = dict(
+        desired=dict(type='list', elements='dict', required=True),
+        snapshot=dict(type='path'),
+        keys=dict(type='dict'),
+        report_unmanaged=dict(type='bool', default=False),
+        page_size=dict(type='int', default=1000),
+    )
+
+    argument_spec = normalize_ib_spec(ib_spec)
+    argument_spec.update(WapiModule.provider_spec)
+
+    module = AnsibleModule(argument_spec=argument_spec,
+                           supports_check_mode=True)
+
+    try:
+        report = DriftReport(module.params['desired'], keys=module.params['keys'])
+    except ValueError as exc:
+        module.fail_json(msg=to_text(exc))
+
+    snapshot = module.params['snapshot']
+    report_unmanaged = module.params['report_unmanaged']
+    if snapshot:
+        try:
+            result = report.run(iter_export(snapshot), report_unmanaged=report_unmanaged, partial=True)
+        except (IOError, OSError, ValueError) as exc:
+            module.fail_json(msg='unable to read %s: %s' % (snapshot, to_native(exc)))
+    else:
+        wapi = WapiModule(module)
+        result = report.run(fetch_snapshot(wapi, report, page_size=module.params['page_size']),
+                            report_unmanaged=report_unmanaged)
+
+    module.exit_json(changed=False, **result)
+
+
+if __name__ == '__main__':
+    main()
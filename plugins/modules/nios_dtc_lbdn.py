@@ -208,8 +208,9 @@ def main():
                 module.fail_json(msg=f"Invalid auth_zone format: {zone}. Must contain FQDN.")
             fqdn_counter[fqdn] = fqdn_counter.get(fqdn, 0) + 1
 
-        # Process zones and build reference list
-        refs = []
+        # Validate zones and build one query per zone
+        queries = []
+        displays = []
         for zone in auth_zones:
             # Extract zone information
             if isinstance(zone, dict):
@@ -240,29 +241,31 @@ def main():
                 if fqdn_counter[fqdn] > 1:
                     module.fail_json(msg=f"Multiple '{fqdn}' zones require view specification.")
 
-            try:
-                # Get zone object
-                zone_obj = wapi.get_object('zone_auth', query)
-                if not zone_obj:
-                    module.fail_json(msg=f"Zone '{display}' not found.")
+            queries.append(('zone_auth', query))
+            displays.append(display)
 
-                refs.append(zone_obj[0]['_ref'])
+        # Resolve every zone reference in one round trip
+        try:
+            refs = wapi.resolve_refs(queries)
+        except Exception as e:
+            module.fail_json(msg=f"Error processing zones '{', '.join(displays)}': {e}")
 
-            except Exception as e:
-                module.fail_json(msg=f"Error processing zone '{display}': {e}")
+        for ref, display in zip(refs, displays):
+            if not ref:
+                module.fail_json(msg=f"Zone '{display}' not found.")
 
         return refs
 
     def pools_transform(module):
         pool_list = list()
         if module.params['pools']:
-            for pool in module.params['pools']:
-                pool_obj = wapi.get_object('dtc:pool',
-                                           {'name': pool['pool']})
+            pools = module.params['pools']
+            refs = wapi.resolve_refs([('dtc:pool', {'name': pool['pool']}) for pool in pools])
+            for pool, ref in zip(pools, refs):
                 if 'ratio' not in pool:
                     pool['ratio'] = 1
-                if pool_obj:
-                    pool_list.append({'pool': pool_obj[0]['_ref'],
+                if ref:
+                    pool_list.append({'pool': ref,
                                       'ratio': pool['ratio']})
                 else:
                     module.fail_json(msg='pool %s cannot be found.' % pool)
@@ -271,9 +274,9 @@ def main():
     def topology_transform(module):
         topology = module.params['topology']
         if topology:
-            topo_obj = wapi.get_object('dtc:topology', {'name': topology})
-            if topo_obj:
-                return topo_obj[0]['_ref']
+            topo_ref = wapi.resolve_ref('dtc:topology', {'name': topology})
+            if topo_ref:
+                return topo_ref
             else:
                 module.fail_json(
                     msg='topology %s cannot be found.' % topology)
@@ -173,11 +173,11 @@ def main():
     def servers_transform(module):
         server_list = list()
         if module.params['servers']:
-            for server in module.params['servers']:
-                server_obj = wapi.get_object('dtc:server',
-                                             {'name': server['server']})
-                if server_obj:
-                    server_list.append({'server': server_obj[0]['_ref'],
+            servers = module.params['servers']
+            refs = wapi.resolve_refs([('dtc:server', {'name': server['server']}) for server in servers])
+            for server, ref in zip(servers, refs):
+                if ref:
+                    server_list.append({'server': ref,
                                         'ratio': server['ratio']})
                 else:
                     module.fail_json(msg='Server %s cannot be found.' % server)
@@ -186,11 +186,12 @@ def main():
     def monitors_transform(module):
         monitor_list = list()
         if module.params['monitors']:
-            for monitor in module.params['monitors']:
-                monitor_obj = wapi.get_object('dtc:monitor:' + monitor['type'],
-                                              {'name': monitor['name']})
-                if monitor_obj:
-                    monitor_list.append(monitor_obj[0]['_ref'])
+            monitors = module.params['monitors']
+            refs = wapi.resolve_refs([('dtc:monitor:' + monitor['type'], {'name': monitor['name']})
+                                      for monitor in monitors])
+            for monitor, ref in zip(monitors, refs):
+                if ref:
+                    monitor_list.append(ref)
                 else:
                     module.fail_json(
                         msg='monitor %s cannot be found.' % monitor)
@@ -199,9 +200,9 @@ def main():
     def topology_transform(module):
         topology = module.params['lb_preferred_topology']
         if topology:
-            topo_obj = wapi.get_object('dtc:topology', {'name': topology})
-            if topo_obj:
-                return topo_obj[0]['_ref']
+            topo_ref = wapi.resolve_ref('dtc:topology', {'name': topology})
+            if topo_ref:
+                return topo_ref
             else:
                 module.fail_json(
                     msg='topology %s cannot be found.' % topology)
@@ -0,0 +1,185 @@
+#!/usr/bin/python
+# Copyright (c) 2020 Infoblox, Inc.
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+DOCUMENTATION = '''
+---
+module: nios_export
+author: "Infoblox Inc. (@infobloxopen)"
+short_description: Export Infoblox NIOS objects to a compressed JSON lines file
+version_added: "1.10.0"
+description:
+  - Snapshots the objects of a list of WAPI object types to a gzip
+    compressed JSON lines file, for backups and drift detection.
+  - Every object type is read with a WAPI paged search, so the export is
+    not capped by C(max_results). Several object types are read
+    concurrently and every page is written to disk as it arrives, so
+    memory use does not grow with the size of the grid.
+  - Every line of the file is a JSON object with the C(type) of the object
+    and the C(object) as returned by WAPI.
+requirements:
+  - infoblox-client
+extends_documentation_fragment: infoblox.nios_modules.nios
+notes:
+    - This module supports C(check_mode). The objects are still read from
+      WAPI and written to temporary files in the system temporary
+      directory, to tell whether I(dest) would change.
+options:
+  dest:
+    description:
+      - Path of the file to write. The file is only replaced when its
+        content changes.
+    required: true
+    type: path
+  objects:
+    description:
+      - The searches to export, in the order they are written to I(dest).
+      - Defaults to the network views, DNS views, IPv4 and IPv6 networks and
+        network containers, ranges, fixed addresses, authoritative zones,
+        host records and A, AAAA, CNAME, MX, PTR, SRV and TXT records, with
+        their default fields and extensible attributes.
+    type: list
+    elements: dict
+    suboptions:
+      type:
+        description:
+          - The WAPI object type to export.
+        required: true
+        type: str
+      return_fields:
+        description:
+          - The fields to export. C(default) stands for the default fields
+            of the object type. Defaults to C(default) and C(extattrs).
+        type: list
+        elements: str
+      filters:
+        description:
+          - WAPI search filters restricting the objects exported.
+        type: dict
+  workers:
+    description:
+      - Number of searches run concurrently. Every worker opens its own
+        WAPI connection.
+    type: int
+    default: 4
+  page_size:
+    description:
+      - Number of objects requested per WAPI page.
+    type: int
+    default: 1000
+'''
+
+EXAMPLES = '''
+- name: Snapshot the grid
+  infoblox.nios_modules.nios_export:
+    dest: /var/backups/nios/grid.jsonl.gz
+    provider:
+      host: "{{ inventory_hostname_short }}"
+      username: admin
+      password: admin
+  connection: local
+
+- name: Export the networks and host records of a network view with selected fields
+  infoblox.nios_modules.nios_export:
+    dest: /var/backups/nios/lab.jsonl.gz
+    objects:
+      - type: network
+        return_fields: [network, network_view, comment, extattrs]
+        filters:
+          network_view: lab
+      - type: record:host
+        return_fields: [name, view, ipv4addrs, extattrs]
+        filters:
+          view: lab
+    workers: 2
+    provider:
+      host: "{{ inventory_hostname_short }}"
+      username: admin
+      password: admin
+  connection: local
+'''
+
+RETURN = '''
+dest:
+  description: The path of the export file.
+  returned: always
+  type: str
+counts:
+  description: The number of objects exported per object type.
+  returned: always
+  type: dict
+object_type:
+  description: The object type whose search failed.
+  returned: failed
+  type: str
+'''
+
+import os
+import tempfile
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.common.text.converters import to_native
+from ..module_utils.api import WapiModule
+from ..module_utils.api import normalize_ib_spec
+from ..module_utils.export import NIOS_EXPORT_OBJECT_TYPES, ExportError, export_objects
+
+
+def main():
+    ''' Main entry point for module execution
+    '''
+    object_spec = dict(
+        type=dict(required=True),
+        return_fields=dict(type='list', elements='str'),
+        filters=dict(type='dict'),
+    )
+
+    ib_spec = dict(
+        dest=dict(type='path', required=True),
+        objects=dict(type='list', elements='dict', options=object_spec),
+        workers=dict(type='int', default=4),
+        page_size=dict(type='int', default=1000),
+    )
+
+    argument_spec = dict(
+        provider=dict(required=True),
+    )
+
+    argument_spec.update(normalize_ib_spec(ib_spec))
+    argument_spec.update(WapiModule.provider_spec)
+
+    module = AnsibleModule(argument_spec=argument_spec,
+                           supports_check_mode=True)
+
+    dest = module.params['dest']
+    searches = module.params['objects'] or [dict(type=obj_type) for obj_type in NIOS_EXPORT_OBJECT_TYPES]
+    workers = max(module.params['workers'], 1)
+    wapi = WapiModule(module)
+
+    # the export is written next to dest first, so that dest is replaced
+    # atomically and only when the content changed. In check mode dest is
+    # never replaced and the system temporary directory is used instead.
+    tmp_dir = None if module.check_mode else os.path.dirname(os.path.abspath(dest))
+    fd, tmp = tempfile.mkstemp(prefix='.nios_export.', dir=tmp_dir)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            counts = export_objects(wapi, searches, f, workers=workers,
+                                    page_size=module.params['page_size'], tmpdir=tmp_dir)
+        changed = not os.path.exists(dest) or module.sha1(tmp) != module.sha1(dest)
+        if changed and not module.check_mode:
+            module.atomic_move(tmp, dest)
+    except ExportError as exc:
+        module.fail_json(msg='unable to export %s' % to_native(exc), object_type=exc.obj_type)
+    except (IOError, OSError) as exc:
+        module.fail_json(msg='unable to write %s: %s' % (dest, to_native(exc)))
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+    module.exit_json(changed=changed, dest=dest, counts=counts)
+
+
+if __name__ == '__main__':
+    main()
@@ -18,7 +18,9 @@ description:
     using the Infoblox WAPI interface over REST.
 requirements:
   - infoblox-client
-extends_documentation_fragment: infoblox.nios_modules.nios
+extends_documentation_fragment:
+  - infoblox.nios_modules.nios
+  - infoblox.nios_modules.nios.bulk
 notes:
     - This module supports C(check_mode).
 options:
@@ -27,8 +29,8 @@ options:
       - Specifies the fully qualified hostname to add or remove from
         the system. Users can also update the name as it is possible
         to pass a dict containing I(new_name), I(old_name). See examples.
+      - Required unless I(items) is given.
     type: str
-    required: true
   view:
     description:
       - Sets the DNS view to associate this a record with.  The DNS
@@ -40,15 +42,15 @@ options:
   mail_exchanger:
     description:
       - Configures the mail exchanger FQDN for this MX record.
+      - Required unless I(items) is given.
     type: str
-    required: true
     aliases:
       - mx
   preference:
     description:
       - Configures the preference (0-65535) for this MX record.
+      - Required unless I(items) is given.
     type: int
-    required: true
   ttl:
     description:
       - Configures the TTL to be associated with this host record.
@@ -134,7 +136,7 @@ RETURN = ''' # '''
 from ansible.module_utils.basic import AnsibleModule
 from ..module_utils.api import WapiModule
 from ..module_utils.api import NIOS_MX_RECORD
-from ..module_utils.api import normalize_ib_spec
+from ..module_utils.api import bulk_argument_spec, bulk_required_one_of
 
 
 def main():
@@ -159,10 +161,11 @@ def main():
         state=dict(default='present', choices=['present', 'absent'])
     )
 
-    argument_spec.update(normalize_ib_spec(ib_spec))
+    argument_spec.update(bulk_argument_spec(ib_spec))
     argument_spec.update(WapiModule.provider_spec)
 
     module = AnsibleModule(argument_spec=argument_spec,
+                           required_one_of=bulk_required_one_of(ib_spec),
                            supports_check_mode=True)
 
     wapi = WapiModule(module)
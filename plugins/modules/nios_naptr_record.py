@@ -18,7 +18,9 @@ description:
     using the Infoblox WAPI interface over REST.
 requirements:
   - infoblox_client
-extends_documentation_fragment: infoblox.nios_modules.nios
+extends_documentation_fragment:
+  - infoblox.nios_modules.nios
+  - infoblox.nios_modules.nios.bulk
 notes:
     - This module supports C(check_mode).
 options:
@@ -26,8 +28,8 @@ options:
     description:
       - Specifies the fully qualified hostname to add or remove from
         the system.
+      - Required unless I(items) is given.
     type: str
-    required: true
   view:
     description:
       - Sets the DNS view to associate this a record with. The DNS
@@ -149,7 +151,7 @@ RETURN = ''' # '''
 
 from ansible.module_utils.basic import AnsibleModule
 from ..module_utils.api import WapiModule
-from ..module_utils.api import normalize_ib_spec
+from ..module_utils.api import bulk_argument_spec, bulk_required_one_of
 
 
 def main():
@@ -178,10 +180,11 @@ def main():
         state=dict(default='present', choices=['present', 'absent'])
     )
 
-    argument_spec.update(normalize_ib_spec(ib_spec))
+    argument_spec.update(bulk_argument_spec(ib_spec))
     argument_spec.update(WapiModule.provider_spec)
 
     module = AnsibleModule(argument_spec=argument_spec,
+                           required_one_of=bulk_required_one_of(ib_spec),
                            supports_check_mode=True)
 
     wapi = WapiModule(module)
@@ -451,26 +451,29 @@ def main():
     def vlans(module):
         vlans_list = list()
         if module.params['vlans']:
+            vlans_filtered = list()
             for vlan in module.params['vlans']:
 
                 vlan_filtered = dict((k, v) for k, v in vlan.items() if v is not None)
                 if 'name' not in vlan_filtered and 'id' not in vlan_filtered:
                     module.fail_json(msg='one of `name` or `id` is required for vlans value')
-
-                if 'parent' in vlan_filtered:
-                    obj_vlanview = wapi.get_object('vlanview', {'name': vlan_filtered['parent']})
-                    obj_vlanrange = wapi.get_object('vlanrange', {'name': vlan_filtered['parent']})
-                if obj_vlanrange:
-                    vlan_filtered['parent'] = obj_vlanrange[0]['_ref']
-                elif obj_vlanview:
-                    vlan_filtered['parent'] = obj_vlanview[0]['_ref']
-                else:
+                vlans_filtered.append(vlan_filtered)
+
+            # a VLAN range takes precedence over a VLAN view of the same name;
+            # both are resolved for every parent in a single round trip
+            parents = [vlan_filtered['parent'] for vlan_filtered in vlans_filtered]
+            parent_refs = wapi.resolve_refs([(obj_type, {'name': parent})
+                                             for parent in parents for obj_type in ('vlanrange', 'vlanview')])
+            for index, vlan_filtered in enumerate(vlans_filtered):
+                parent_ref = parent_refs[2 * index] or parent_refs[2 * index + 1]
+                if not parent_ref:
                     module.fail_json(msg='VLAN View/Range \'%s\' cannot be found.' % vlan_filtered['parent'])
+                vlan_filtered['parent'] = parent_ref
 
-                obj_vlan = wapi.get_object('vlan', vlan_filtered)
-
-                if obj_vlan:
-                    vlans_list.append({'vlan': obj_vlan[0]['_ref']})
+            vlan_refs = wapi.resolve_refs([('vlan', vlan_filtered) for vlan_filtered in vlans_filtered])
+            for vlan, vlan_ref in zip(module.params['vlans'], vlan_refs):
+                if vlan_ref:
+                    vlans_list.append({'vlan': vlan_ref})
                 else:
                     module.fail_json(msg='VLAN  `%s` cannot be found.' % vlan)
 
@@ -18,7 +18,9 @@ description:
     using the Infoblox WAPI interface over REST.
 requirements:
   - infoblox_client
-extends_documentation_fragment: infoblox.nios_modules.nios
+extends_documentation_fragment:
+  - infoblox.nios_modules.nios
+  - infoblox.nios_modules.nios.bulk
 notes:
     - This module supports C(check_mode).
 options:
@@ -51,7 +53,7 @@ options:
   ptrdname:
     description:
       - The domain name of the DNS PTR record in FQDN format.
-    required: true
+      - Required unless I(items) is given.
     type: str
   ttl:
     description:
@@ -113,7 +115,7 @@ RETURN = ''' # '''
 from ansible.module_utils.basic import AnsibleModule
 from ..module_utils.api import WapiModule
 from ..module_utils.api import NIOS_PTR_RECORD
-from ..module_utils.api import normalize_ib_spec
+from ..module_utils.api import bulk_argument_spec, bulk_required_one_of
 
 
 def main():
@@ -136,13 +138,13 @@ def main():
         state=dict(default='present', choices=['present', 'absent'])
     )
 
-    argument_spec.update(normalize_ib_spec(ib_spec))
+    argument_spec.update(bulk_argument_spec(ib_spec))
     argument_spec.update(WapiModule.provider_spec)
 
     mutually_exclusive = [('ipv4addr', 'ipv6addr')]
     required_one_of = [
-        ['ipv4addr', 'ipv6addr']
-    ]
+        ['ipv4addr', 'ipv6addr', 'items']
+    ] + bulk_required_one_of(ib_spec)
 
     module = AnsibleModule(argument_spec=argument_spec,
                            mutually_exclusive=mutually_exclusive,
@@ -131,10 +131,12 @@ def main():
         del restart_params['members']
     if restart_params['mode'] is None:
         del restart_params['mode']
-    grid_obj = wapi.get_object('grid')
-    if grid_obj is None:
+    grid_ref = wapi.resolve_ref('grid', {})
+    if grid_ref is None:
         module.fail_json(msg='Failed to get NIOS grid information.')
-    result = wapi.call_func('restartservices', grid_obj[0]['_ref'], restart_params)
+    result = wapi.call_func('restartservices', grid_ref, restart_params)
+    if wapi.ref_cache:
+        result['ref_cache'] = wapi.ref_cache.stats()
 
     module.exit_json(**result)
 
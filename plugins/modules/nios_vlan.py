@@ -192,12 +192,12 @@ def main():
     def parent_transform(module):
         parent_ref = str()
         if module.params['parent']:
-            parent_obj_vlanview = wapi.get_object('vlanview', {'name': module.params['parent']})
-            parent_obj_vlanrange = wapi.get_object('vlanrange', {'name': module.params['parent']})
-            if parent_obj_vlanrange:
-                parent_ref = parent_obj_vlanrange[0]['_ref']
-            elif parent_obj_vlanview:
-                parent_ref = parent_obj_vlanview[0]['_ref']
+            parent_vlanrange, parent_vlanview = wapi.resolve_refs([('vlanrange', {'name': module.params['parent']}),
+                                                                  ('vlanview', {'name': module.params['parent']})])
+            if parent_vlanrange:
+                parent_ref = parent_vlanrange
+            elif parent_vlanview:
+                parent_ref = parent_vlanview
             else:
                 module.fail_json(msg='VLAN View/Range \'%s\' cannot be found.' % module.params['parent'])
         return parent_ref
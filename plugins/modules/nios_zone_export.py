@@ -0,0 +1,162 @@
+#!/usr/bin/python
+# Copyright (c) 2020 Infoblox, Inc.
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+DOCUMENTATION = '''
+---
+module: nios_zone_export
+author: "Infoblox Inc. (@infobloxopen)"
+short_description: Export the DNS records of an Infoblox NIOS zone to a zone file
+version_added: "1.10.0"
+description:
+  - Writes the A, AAAA, CNAME, MX, NAPTR, PTR, SRV and TXT records of an
+    authoritative zone to an RFC 1035 master file.
+  - Records are fetched with one paged WAPI search per record type and
+    written as every page arrives, so only one page is held in memory
+    whatever the size of the zone.
+  - The file can be imported again with the I(src) option of
+    M(infoblox.nios_modules.nios_zone_records).
+requirements:
+  - infoblox-client
+extends_documentation_fragment: infoblox.nios_modules.nios
+notes:
+    - This module supports C(check_mode).
+options:
+  zone:
+    description:
+      - The fully qualified name of the C(zone_auth) to export.
+    required: true
+    aliases:
+      - fqdn
+    type: str
+  view:
+    description:
+      - The DNS view of the zone.
+    default: default
+    aliases:
+      - dns_view
+    type: str
+  dest:
+    description:
+      - Path of the zone file to write. The file is only replaced when its
+        content changes.
+    required: true
+    type: path
+  record_types:
+    description:
+      - The record types to export.
+    type: list
+    elements: str
+    choices: [A, AAAA, CNAME, MX, NAPTR, PTR, SRV, TXT]
+    default: [A, AAAA, CNAME, MX, NAPTR, PTR, SRV, TXT]
+  relative_names:
+    description:
+      - Write owner names relative to the zone. Names in record data are
+        always written fully qualified.
+    type: bool
+    default: true
+  page_size:
+    description:
+      - Number of records requested per WAPI page.
+    type: int
+    default: 1000
+'''
+
+EXAMPLES = '''
+- name: Export a zone to a zone file
+  infoblox.nios_modules.nios_zone_export:
+    zone: ansible.com
+    dest: /tmp/db.ansible.com
+    provider:
+      host: "{{ inventory_hostname_short }}"
+      username: admin
+      password: admin
+  connection: local
+
+- name: Export the address records of a zone of a non-default view
+  infoblox.nios_modules.nios_zone_export:
+    zone: ansible.com
+    view: internal
+    dest: /tmp/db.ansible.com.addresses
+    record_types: [A, AAAA]
+    provider:
+      host: "{{ inventory_hostname_short }}"
+      username: admin
+      password: admin
+  connection: local
+'''
+
+RETURN = '''
+dest:
+  description: The path of the zone file.
+  returned: always
+  type: str
+counts:
+  description: The number of records written per record type.
+  returned: always
+  type: dict
+'''
+
+import os
+import tempfile
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.common.text.converters import to_native
+from ..module_utils.api import WapiModule
+from ..module_utils.api import normalize_ib_spec
+from ..module_utils.zone import ZONE_RECORD_TYPES, export_zone_file
+
+
+def main():
+    ''' Main entry point for module execution
+    '''
+
+    ib_spec = dict(
+        zone=dict(required=True, aliases=['fqdn']),
+        view=dict(default='default', aliases=['dns_view']),
+        dest=dict(type='path', required=True),
+        record_types=dict(type='list', elements='str', choices=sorted(ZONE_RECORD_TYPES),
+                          default=sorted(ZONE_RECORD_TYPES)),
+        relative_names=dict(type='bool', default=True),
+        page_size=dict(type='int', default=1000),
+    )
+
+    argument_spec = dict(
+        provider=dict(required=True),
+    )
+
+    argument_spec.update(normalize_ib_spec(ib_spec))
+    argument_spec.update(WapiModule.provider_spec)
+
+    module = AnsibleModule(argument_spec=argument_spec,
+                           supports_check_mode=True)
+
+    dest = module.params['dest']
+    wapi = WapiModule(module)
+
+    # the zone is written next to dest first, so that dest is replaced
+    # atomically and only when the content changed
+    fd, tmp = tempfile.mkstemp(prefix='.nios_zone_export.', dir=os.path.dirname(os.path.abspath(dest)))
+    try:
+        with os.fdopen(fd, 'w') as f:
+            counts = export_zone_file(wapi, module.params['zone'], module.params['view'], f,
+                                      record_types=module.params['record_types'],
+                                      relative=module.params['relative_names'],
+                                      page_size=module.params['page_size'])
+        changed = not os.path.exists(dest) or module.sha1(tmp) != module.sha1(dest)
+        if changed and not module.check_mode:
+            module.atomic_move(tmp, dest)
+    except (IOError, OSError) as exc:
+        module.fail_json(msg='unable to write %s: %s' % (dest, to_native(exc)))
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+    module.exit_json(changed=changed, dest=dest, counts=counts)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,254 @@
+#!/usr/bin/python
+# Copyright (c) 2020 Infoblox, Inc.
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+DOCUMENTATION = '''
+---
+module: nios_zone_records
+author: "Infoblox Inc. (@infobloxopen)"
+short_description: Reconcile the DNS records of an Infoblox NIOS zone
+version_added: "1.10.0"
+description:
+  - Makes the A, AAAA, CNAME, MX, NAPTR, PTR, SRV and TXT records of an
+    authoritative zone match a desired record set in one task.
+  - The existing records are fetched with one paged WAPI search per record
+    type, the changes are computed locally and applied in chunked WAPI
+    multi-requests, instead of one module run per record.
+  - The desired records and the existing records of the managed types are
+    held in memory to compute the changes, so memory use grows with the
+    size of the zone.
+  - Every multi-request is applied by WAPI as one transaction. The records
+    deleted from a name and the records created for it are always sent in
+    the same multi-request. When a multi-request fails, the changes applied
+    by the earlier ones are returned in C(applied).
+requirements:
+  - infoblox-client
+extends_documentation_fragment: infoblox.nios_modules.nios
+notes:
+    - This module supports C(check_mode).
+options:
+  zone:
+    description:
+      - The fully qualified name of the C(zone_auth) holding the records.
+    required: true
+    aliases:
+      - fqdn
+    type: str
+  view:
+    description:
+      - The DNS view of the zone.
+    default: default
+    aliases:
+      - dns_view
+    type: str
+  records:
+    description:
+      - The desired records. Each entry is a dict with a C(type) and the
+        WAPI fields of that record type, C(name) being the owner name.
+      - C(name) is relative to I(zone) unless it ends with a dot or already
+        ends with the zone name, C(@) or no name stands for the zone apex.
+      - "Record types and their fields: C(A): C(ipv4addr); C(AAAA): C(ipv6addr);
+        C(CNAME): C(canonical); C(MX): C(mail_exchanger), C(preference);
+        C(NAPTR): C(order), C(preference), C(flags), C(services), C(regexp),
+        C(replacement); C(PTR): C(ptrdname); C(SRV): C(target), C(port), C(priority), C(weight);
+        C(TXT): C(text)."
+      - Every type also accepts C(ttl) and C(comment), which are left
+        untouched on existing records when omitted.
+    type: list
+    elements: dict
+  src:
+    description:
+      - Path of a file holding more desired records.
+      - A YAML or JSON file holds a list of records, or a dict with a
+        C(records) key, in the format of I(records). YAML files need PyYAML
+        on the host running the module, JSON files do not.
+      - A zone file is an RFC 1035 master file, such as the output of
+        M(infoblox.nios_modules.nios_zone_export). C($ORIGIN) is honored and
+        relative names are taken relative to I(zone). Only the entries with
+        an explicit TTL get a C(ttl), the others are left to inherit the zone
+        TTL, which C($TTL) sets. Entries of other record types (SOA, NS...)
+        are skipped and counted in C(skipped).
+    type: path
+  src_format:
+    description:
+      - The format of I(src). C(auto) reads files named C(*.yml), C(*.yaml)
+        or C(*.json) as YAML and any other file as a zone file.
+    type: str
+    choices:
+      - auto
+      - yaml
+      - zone
+    default: auto
+    version_added: "1.10.0"
+  purge:
+    description:
+      - Delete the records of the types listed above that are not in the
+        desired record set. Other record types are never deleted.
+    type: bool
+    default: false
+'''
+
+EXAMPLES = '''
+- name: Reconcile the records of a zone
+  infoblox.nios_modules.nios_zone_records:
+    zone: ansible.com
+    records:
+      - {type: A, name: www, ipv4addr: 192.168.10.10}
+      - {type: A, name: www, ipv4addr: 192.168.10.11, ttl: 300}
+      - {type: CNAME, name: web, canonical: www.ansible.com}
+      - {type: MX, name: '@', mail_exchanger: mail.ansible.com, preference: 10}
+      - {type: TXT, name: '@', text: v=spf1 mx -all}
+    purge: true
+    provider:
+      host: "{{ inventory_hostname_short }}"
+      username: admin
+      password: admin
+  connection: local
+
+- name: Import a zone file into a zone, deleting the records it does not list
+  infoblox.nios_modules.nios_zone_records:
+    zone: ansible.com
+    src: files/db.ansible.com
+    src_format: zone
+    purge: true
+    provider:
+      host: "{{ inventory_hostname_short }}"
+      username: admin
+      password: admin
+  connection: local
+
+- name: Add the records listed in a file, keeping all other records
+  infoblox.nios_modules.nios_zone_records:
+    zone: ansible.com
+    view: internal
+    src: files/ansible.com.yml
+    provider:
+      host: "{{ inventory_hostname_short }}"
+      username: admin
+      password: admin
+  connection: local
+'''
+
+RETURN = '''
+changes:
+  description: The records created, updated and deleted.
+  returned: always
+  type: dict
+  contains:
+    create:
+      description: The records created.
+      type: list
+    update:
+      description: The reference, name, type and changed fields of every record updated.
+      type: list
+    delete:
+      description: The records deleted.
+      type: list
+skipped:
+  description: The number of zone file entries skipped, per record type.
+  returned: when I(src) is a zone file
+  type: dict
+'''
+
+import json
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.common.text.converters import to_native, to_text
+from ..module_utils.api import WapiModule
+from ..module_utils.api import normalize_ib_spec
+from ..module_utils.zone import ZoneSyncError, iter_zone_file, sync_zone_records
+
+try:
+    import yaml
+    HAS_YAML = True
+except ImportError:
+    HAS_YAML = False
+
+
+def load_records(module, path):
+    ''' Reads the desired records from a YAML or JSON file '''
+    try:
+        with open(path) as f:
+            content = f.read()
+    except (IOError, OSError) as exc:
+        module.fail_json(msg='unable to read %s: %s' % (path, to_native(exc)))
+
+    try:
+        data = yaml.safe_load(content) if HAS_YAML else json.loads(content)
+    except Exception as exc:
+        module.fail_json(msg='unable to parse %s: %s' % (path, to_native(exc)))
+
+    if isinstance(data, dict):
+        data = data.get('records')
+    if not isinstance(data, list) or not all(isinstance(record, dict) for record in data):
+        module.fail_json(msg='%s must hold a list of records' % path)
+    return data
+
+
+def load_zone_file(module, path, skipped):
+    ''' Reads the desired records from an RFC 1035 master file '''
+    try:
+        with open(path) as f:
+            return list(iter_zone_file(f, module.params['zone'], skipped))
+    except (IOError, OSError) as exc:
+        module.fail_json(msg='unable to read %s: %s' % (path, to_native(exc)))
+    except ValueError as exc:
+        module.fail_json(msg='unable to parse %s: %s' % (path, to_native(exc)))
+
+
+def main():
+    ''' Main entry point for module execution
+    '''
+
+    ib_spec = dict(
+        zone=dict(required=True, aliases=['fqdn']),
+        view=dict(default='default', aliases=['dns_view']),
+        records=dict(type='list', elements='dict'),
+        src=dict(type='path'),
+        src_format=dict(default='auto', choices=['auto', 'yaml', 'zone']),
+        purge=dict(type='bool', default=False),
+    )
+
+    argument_spec = dict(
+        provider=dict(required=True),
+    )
+
+    argument_spec.update(normalize_ib_spec(ib_spec))
+    argument_spec.update(WapiModule.provider_spec)
+
+    module = AnsibleModule(argument_spec=argument_spec,
+                           required_one_of=[['records', 'src']],
+                           supports_check_mode=True)
+
+    records = list(module.params['records'] or [])
+    skipped = None
+    src = module.params['src']
+    if src:
+        src_format = module.params['src_format']
+        if src_format == 'auto':
+            src_format = 'yaml' if src.lower().endswith(('.yml', '.yaml', '.json')) else 'zone'
+        if src_format == 'zone':
+            skipped = {}
+            records.extend(load_zone_file(module, src, skipped))
+        else:
+            records.extend(load_records(module, src))
+
+    wapi = WapiModule(module)
+    try:
+        result = sync_zone_records(wapi, module.params['zone'], module.params['view'], records,
+                                   purge=module.params['purge'], check_mode=module.check_mode)
+    except ValueError as exc:
+        module.fail_json(msg=to_text(exc))
+    except ZoneSyncError as exc:
+        module.fail_json(msg=to_text(exc), applied=exc.applied)
+    if skipped is not None:
+        result['skipped'] = skipped
+
+    module.exit_json(**result)
+
+
+if __name__ == '__main__':
+    main()
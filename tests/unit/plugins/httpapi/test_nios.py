@@ -0,0 +1,82 @@
+# Copyright (c) 2020 Infoblox, Inc.
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import json
+from io import BytesIO
+
+try:
+    from ansible_collections.infoblox.nios_modules.tests.unit.compat import unittest
+except ImportError:
+    import unittest
+from urllib.error import HTTPError
+from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import MagicMock
+from ansible_collections.infoblox.nios_modules.plugins.httpapi.nios import HttpApi
+
+
+class TestNiosHttpApi(unittest.TestCase):
+
+    def setUp(self):
+        self.connection = MagicMock(name='connection')
+        self.connection._auth = None
+        self.plugin = HttpApi(self.connection)
+        self.plugin.get_option = lambda name: '2.12.3'
+
+    def _reply(self, code, body):
+        response = MagicMock(name='response')
+        response.getcode.return_value = code
+        self.connection.send.return_value = (response, BytesIO(json.dumps(body).encode('utf-8')))
+
+    def test_send_request_builds_wapi_url(self):
+        self._reply(200, [{'_ref': 'record:a/abc:a.ansible.com/default'}])
+        code, response = self.plugin.send_request(
+            None, 'record:a', params={'name': 'a.ansible.com', '_return_fields': 'name,view'})
+
+        self.assertEqual(code, 200)
+        self.assertEqual(response, [{'_ref': 'record:a/abc:a.ansible.com/default'}])
+        url, data = self.connection.send.call_args[0]
+        self.assertTrue(url.startswith('/wapi/v2.12.3/record%3Aa?'))
+        self.assertIn('name=a.ansible.com', url)
+        self.assertIsNone(data)
+        self.assertEqual(self.connection.send.call_args[1]['method'], 'GET')
+
+    def test_send_request_serializes_payload(self):
+        self._reply(201, 'record:a/abc:a.ansible.com/default')
+        code, response = self.plugin.send_request({'name': 'a.ansible.com'}, 'record:a', method='POST')
+
+        self.assertEqual(code, 201)
+        self.assertEqual(response, 'record:a/abc:a.ansible.com/default')
+        self.assertEqual(json.loads(self.connection.send.call_args[0][1]), {'name': 'a.ansible.com'})
+
+    def test_send_request_empty_body(self):
+        response = MagicMock(name='response')
+        response.getcode.return_value = 200
+        self.connection.send.return_value = (response, BytesIO(b''))
+
+        self.assertEqual(self.plugin.send_request(None, 'logout', method='POST'), (200, None))
+
+    def test_handle_httperror_returns_wapi_error(self):
+        exc = HTTPError('https://nios01/wapi/v2.12.3/record:a', 400, 'Bad Request', {}, None)
+        self.assertIs(self.plugin.handle_httperror(exc), exc)
+
+    def test_handle_httperror_unauthorized_without_session_fails(self):
+        exc = HTTPError('https://nios01/wapi/v2.12.3/record:a', 401, 'Unauthorized', {}, None)
+        self.assertFalse(self.plugin.handle_httperror(exc))
+
+    def test_handle_httperror_expired_cookie_is_retried(self):
+        self.connection._auth = {'Cookie': 'ibapauth="ctime=1,timeout=600"'}
+        exc = HTTPError('https://nios01/wapi/v2.12.3/record:a', 401, 'Unauthorized', {}, None)
+
+        self.assertTrue(self.plugin.handle_httperror(exc))
+        self.assertIsNone(self.connection._auth)
+
+    def test_logout_only_with_session(self):
+        self.plugin.logout()
+        self.connection.send.assert_not_called()
+
+        self.connection._auth = {'Cookie': 'ibapauth="ctime=1,timeout=600"'}
+        self._reply(200, {})
+        self.plugin.logout()
+        self.assertTrue(self.connection.send.call_args[0][0].startswith('/wapi/v2.12.3/logout'))
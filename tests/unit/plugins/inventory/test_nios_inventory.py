@@ -10,6 +10,14 @@ except ImportError:
     import unittest
 from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import patch, MagicMock
 from ansible.errors import AnsibleError
+from ansible.inventory.data import InventoryData
+from ansible.parsing.dataloader import DataLoader
+try:
+    from ansible.template import trust_as_template
+except ImportError:
+    # ansible-core < 2.19 trusts every template
+    def trust_as_template(value):
+        return value
 from infoblox_client.exceptions import InfobloxException, InfobloxConnectionError
 from ansible_collections.infoblox.nios_modules.plugins.inventory import nios_inventory
 
@@ -32,12 +40,24 @@ class TestNiosInventoryParse(unittest.TestCase):
             'password': 'secret',
             'hostfilter': {},
             'extattrs': {},
+            'page_size': 1000,
+            'cache': False,
+            'incremental_refresh': False,
+            'shard_by': None,
+            'shard_extattr': None,
+            'shard_workers': 4,
+            'return_fields': [],
+            'strict': False,
+            'compose': {},
+            'groups': {},
+            'keyed_groups': [],
         }
+        self.plugin._cache = {}
         self.plugin.get_option = lambda name: self._options[name]
 
-    def _run_parse(self, get_object_side_effect):
+    def _run_parse(self, iter_objects_side_effect):
         wapi = MagicMock(name='WapiInventory')
-        wapi.get_object.side_effect = get_object_side_effect
+        wapi.iter_objects.side_effect = iter_objects_side_effect
         with patch.object(nios_inventory.BaseInventoryPlugin, 'parse'), \
                 patch.object(nios_inventory, 'WapiInventory', return_value=wapi):
             self.plugin.parse(MagicMock(), MagicMock(), '/path/to/inventory.yml')
@@ -87,3 +107,348 @@ class TestNiosInventoryParse(unittest.TestCase):
         with self.assertRaises(AnsibleError) as cm:
             self._run_parse(exc)
         self.assertIn('original ansible error', str(cm.exception))
+
+    def test_hosts_are_fetched_with_paging(self):
+        '''Host records are streamed through the paging iterator.'''
+        hosts = [
+            {'name': 'h%d.ansible.com' % i, 'view': 'default', 'extattrs': {},
+             'ipv4addrs': [{'ipv4addr': '192.168.10.%d' % i}]}
+            for i in range(3)
+        ]
+        self._options['page_size'] = 2
+        wapi = MagicMock(name='WapiInventory')
+        wapi.iter_objects.return_value = iter(hosts)
+        with patch.object(nios_inventory.BaseInventoryPlugin, 'parse'), \
+                patch.object(nios_inventory, 'WapiInventory', return_value=wapi):
+            self.plugin.parse(MagicMock(), MagicMock(), '/path/to/inventory.yml')
+
+        self.assertEqual(wapi.iter_objects.call_args[1]['page_size'], 2)
+        self.assertEqual(self.plugin.inventory.add_host.call_count, 3)
+
+
+class TestNiosInventoryCache(unittest.TestCase):
+
+    def setUp(self):
+        super(TestNiosInventoryCache, self).setUp()
+        self.plugin = nios_inventory.InventoryModule()
+        self.plugin._read_config_data = MagicMock(name='_read_config_data')
+        self.plugin.inventory = MagicMock(name='inventory')
+        self.plugin._cache = {}
+        self._options = {
+            'host': 'blox.example.com',
+            'username': 'admin',
+            'password': 'secret',
+            'hostfilter': {'view': 'default'},
+            'extattrs': {},
+            'page_size': 1000,
+            'cache': True,
+            'incremental_refresh': False,
+            'shard_by': None,
+            'shard_extattr': None,
+            'shard_workers': 4,
+            'return_fields': [],
+            'strict': False,
+            'compose': {},
+            'groups': {},
+            'keyed_groups': [],
+        }
+        self.plugin.get_option = lambda name: self._options[name]
+        self.hosts = [{'_ref': 'record:host/h1', 'name': 'h1.ansible.com', 'view': 'default', 'extattrs': {},
+                       'ipv4addrs': [{'ipv4addr': '192.168.10.1'}]}]
+
+    def _run_parse(self, cache=True):
+        wapi = MagicMock(name='WapiInventory')
+        wapi.iter_objects.side_effect = lambda *args, **kwargs: iter(self.hosts)
+        with patch.object(nios_inventory.BaseInventoryPlugin, 'parse'), \
+                patch.object(nios_inventory, 'WapiInventory', return_value=wapi):
+            self.plugin.parse(MagicMock(), MagicMock(), '/path/to/inventory.yml', cache=cache)
+        return wapi
+
+    def test_cache_hit_skips_wapi(self):
+        wapi = self._run_parse()
+        self.assertEqual(wapi.iter_objects.call_count, 1)
+        self.assertEqual(list(self.plugin._cache.values()), [{'hosts': self.hosts, 'sequence_id': None}])
+
+        wapi = self._run_parse()
+        wapi.iter_objects.assert_not_called()
+        self.assertEqual(self.plugin.inventory.add_host.call_count, 2)
+
+    def test_flush_cache_refreshes_from_wapi(self):
+        self._run_parse()
+        self.hosts = self.hosts + [{'_ref': 'record:host/h2', 'name': 'h2.ansible.com', 'view': 'default', 'extattrs': {},
+                                    'ipv4addrs': [{'ipv4addr': '192.168.10.2'}]}]
+
+        wapi = self._run_parse(cache=False)
+
+        self.assertEqual(wapi.iter_objects.call_count, 1)
+        self.assertEqual(list(self.plugin._cache.values()), [{'hosts': self.hosts, 'sequence_id': None}])
+
+    def test_cache_key_depends_on_filters(self):
+        key = self.plugin._get_nios_cache_key()
+        self._options['extattrs'] = {'Site': 'HQ'}
+        self.assertNotEqual(key, self.plugin._get_nios_cache_key())
+        self._options['extattrs'] = {}
+        self._options['host'] = 'other.example.com'
+        self.assertNotEqual(key, self.plugin._get_nios_cache_key())
+        self._options['host'] = 'blox.example.com'
+        self.assertEqual(key, self.plugin._get_nios_cache_key())
+        self._options['shard_by'] = 'extattr'
+        self._options['shard_extattr'] = 'Site'
+        sharded = self.plugin._get_nios_cache_key()
+        self.assertNotEqual(key, sharded)
+        self._options['shard_extattr'] = 'Region'
+        self.assertNotEqual(sharded, self.plugin._get_nios_cache_key())
+
+    def test_cache_disabled_does_not_store(self):
+        self._options['cache'] = False
+        self._run_parse()
+        wapi = self._run_parse()
+        self.assertEqual(wapi.iter_objects.call_count, 1)
+        self.assertEqual(self.plugin._cache, {})
+
+
+class TestNiosInventoryIncrementalRefresh(unittest.TestCase):
+
+    def setUp(self):
+        super(TestNiosInventoryIncrementalRefresh, self).setUp()
+        self.plugin = nios_inventory.InventoryModule()
+        self.plugin._read_config_data = MagicMock(name='_read_config_data')
+        self.plugin.inventory = MagicMock(name='inventory')
+        self.plugin._cache = {}
+        self._options = {
+            'host': 'blox.example.com',
+            'username': 'admin',
+            'password': 'secret',
+            'hostfilter': {},
+            'extattrs': {},
+            'page_size': 1000,
+            'cache': True,
+            'incremental_refresh': True,
+            'shard_by': None,
+            'shard_extattr': None,
+            'shard_workers': 4,
+            'return_fields': [],
+            'strict': False,
+            'compose': {},
+            'groups': {},
+            'keyed_groups': [],
+        }
+        self.plugin.get_option = lambda name: self._options[name]
+
+    def _host(self, name, ip):
+        return {'_ref': 'record:host/%s' % name, 'name': '%s.ansible.com' % name, 'view': 'default',
+                'extattrs': {}, 'ipv4addrs': [{'ipv4addr': ip}]}
+
+    def _run_parse(self, wapi):
+        with patch.object(nios_inventory.BaseInventoryPlugin, 'parse'), \
+                patch.object(nios_inventory, 'WapiInventory', return_value=wapi):
+            self.plugin.parse(MagicMock(), MagicMock(), '/path/to/inventory.yml')
+
+    def test_full_fetch_records_sequence_id(self):
+        wapi = MagicMock(name='WapiInventory')
+        wapi.get_last_sequence_id.return_value = '0:100'
+        wapi.iter_objects.return_value = iter([self._host('h1', '192.168.10.1')])
+
+        self._run_parse(wapi)
+
+        snapshot = list(self.plugin._cache.values())[0]
+        self.assertEqual(snapshot['sequence_id'], '0:100')
+        self.assertEqual([h['name'] for h in snapshot['hosts']], ['h1.ansible.com'])
+
+    def test_refresh_fetches_only_changed_and_prunes_deleted(self):
+        key = self.plugin._get_nios_cache_key()
+        self.plugin._cache[key] = {
+            'sequence_id': '0:100',
+            'hosts': [self._host('h1', '192.168.10.1'), self._host('h2', '192.168.10.2'),
+                      self._host('h3', '192.168.10.3')],
+        }
+        wapi = MagicMock(name='WapiInventory')
+        wapi.get_changed_refs.return_value = ({'record:host/h2'}, '0:120')
+        # h3 was deleted, h4 is new and h2 changed
+        wapi.iter_objects.return_value = iter([{'_ref': 'record:host/h1'}, {'_ref': 'record:host/h2'},
+                                               {'_ref': 'record:host/h4'}])
+        wapi.multi_request.return_value = [self._host('h2', '192.168.10.22'), self._host('h4', '192.168.10.4')]
+
+        self._run_parse(wapi)
+
+        wapi.get_changed_refs.assert_called_once_with('record:host', '0:100')
+        self.assertEqual(wapi.iter_objects.call_args[1]['return_fields'], [])
+        requests = wapi.multi_request.call_args[0][0]
+        self.assertEqual([r['object'] for r in requests], ['record:host/h2', 'record:host/h4'])
+        self.assertEqual(requests[0]['method'], 'GET')
+
+        snapshot = self.plugin._cache[key]
+        self.assertEqual(snapshot['sequence_id'], '0:120')
+        self.assertEqual([h['name'] for h in snapshot['hosts']],
+                         ['h1.ansible.com', 'h2.ansible.com', 'h4.ansible.com'])
+        self.assertEqual(snapshot['hosts'][1]['ipv4addrs'], [{'ipv4addr': '192.168.10.22'}])
+        self.assertEqual(self.plugin.inventory.add_host.call_count, 3)
+
+    def test_too_many_changes_triggers_full_refresh(self):
+        key = self.plugin._get_nios_cache_key()
+        self.plugin._cache[key] = {'sequence_id': '0:100', 'hosts': [self._host('h1', '192.168.10.1')]}
+        wapi = MagicMock(name='WapiInventory')
+        wapi.get_changed_refs.return_value = (None, None)
+        wapi.get_last_sequence_id.return_value = '0:900'
+        wapi.iter_objects.return_value = iter([self._host('h9', '192.168.10.9')])
+
+        self._run_parse(wapi)
+
+        wapi.multi_request.assert_not_called()
+        self.assertEqual(self.plugin._cache[key]['sequence_id'], '0:900')
+        self.assertEqual([h['name'] for h in self.plugin._cache[key]['hosts']], ['h9.ansible.com'])
+
+
+class TestNiosInventorySharding(unittest.TestCase):
+
+    def setUp(self):
+        super(TestNiosInventorySharding, self).setUp()
+        self.plugin = nios_inventory.InventoryModule()
+        self.plugin._read_config_data = MagicMock(name='_read_config_data')
+        self.plugin.inventory = MagicMock(name='inventory')
+        self.plugin._cache = {}
+        self._options = {
+            'host': 'blox.example.com',
+            'username': 'admin',
+            'password': 'secret',
+            'hostfilter': {},
+            'extattrs': {},
+            'page_size': 1000,
+            'cache': False,
+            'incremental_refresh': False,
+            'shard_by': 'view',
+            'shard_extattr': None,
+            'shard_workers': 2,
+            'return_fields': [],
+            'strict': False,
+            'compose': {},
+            'groups': {},
+            'keyed_groups': [],
+        }
+        self.plugin.get_option = lambda name: self._options[name]
+        self.records = {
+            'default': [{'name': 'h1.ansible.com', 'view': 'default', 'extattrs': {},
+                         'ipv4addrs': [{'ipv4addr': '192.168.10.1'}]}],
+            'internal': [{'name': 'h2.ansible.com', 'view': 'internal', 'extattrs': {},
+                          'ipv4addrs': [{'ipv4addr': '10.0.0.2'}]}],
+            ' ': [{'name': 'h3.ansible.com', 'view': ' ', 'extattrs': {},
+                   'ipv4addrs': [{'ipv4addr': '10.0.0.3'}]}],
+        }
+
+    def _iter_objects(self, obj_type, payload=None, **kwargs):
+        if obj_type == 'view':
+            return iter([{'name': 'default'}, {'name': 'internal'}])
+        if obj_type == 'zone_auth':
+            return iter([{'fqdn': 'ansible.com', 'view': 'default'}])
+        return iter(self.records.get((payload or {}).get('view'), []))
+
+    def _run_parse(self, wapi):
+        with patch.object(nios_inventory.BaseInventoryPlugin, 'parse'), \
+                patch.object(nios_inventory, 'WapiInventory', return_value=wapi) as wapi_cls:
+            self.plugin.parse(MagicMock(), MagicMock(), '/path/to/inventory.yml')
+        return wapi_cls
+
+    def test_shard_by_view(self):
+        wapi = MagicMock(name='WapiInventory')
+        wapi.iter_objects.side_effect = self._iter_objects
+
+        wapi_cls = self._run_parse(wapi)
+
+        # every worker thread has its own connection
+        self.assertGreaterEqual(wapi_cls.call_count, 2)
+        self.assertNotIn('http_pool_maxsize', wapi_cls.call_args[0][0])
+        host_queries = [c for c in wapi.iter_objects.call_args_list if c[0][0] == 'record:host']
+        self.assertEqual(sorted(c[0][1]['view'] for c in host_queries), [' ', 'default', 'internal'])
+        added = sorted(c[0][0] for c in self.plugin.inventory.add_host.call_args_list)
+        self.assertEqual(added, ['h1.ansible.com', 'h2.ansible.com', 'h3.ansible.com'])
+
+    def test_shard_by_zone(self):
+        self._options['shard_by'] = 'zone'
+        wapi = MagicMock(name='WapiInventory')
+        wapi.iter_objects.side_effect = self._iter_objects
+
+        self._run_parse(wapi)
+
+        zone_query = wapi.iter_objects.call_args_list[0]
+        self.assertEqual(zone_query[0][:2], ('zone_auth', {'zone_format': 'FORWARD'}))
+        host_query = wapi.iter_objects.call_args_list[1]
+        self.assertEqual(host_query[0][1], {'zone': 'ansible.com', 'view': 'default'})
+
+    def test_shard_by_extattr(self):
+        self._options['shard_by'] = 'extattr'
+        self._options['shard_extattr'] = 'Site'
+        wapi = MagicMock(name='WapiInventory')
+        wapi.get_object.return_value = [{'list_values': [{'value': 'HQ'}, {'value': 'DC'}]}]
+        wapi.iter_objects.side_effect = lambda *args, **kwargs: iter(self.records['default'])
+
+        self._run_parse(wapi)
+
+        shard_extattrs = sorted(c[1]['extattrs']['Site']['value'] for c in wapi.iter_objects.call_args_list)
+        self.assertEqual(shard_extattrs, ['DC', 'HQ'])
+
+    def test_view_filter_disables_view_sharding(self):
+        self._options['hostfilter'] = {'view': 'default'}
+        wapi = MagicMock(name='WapiInventory')
+        wapi.iter_objects.side_effect = self._iter_objects
+
+        self._run_parse(wapi)
+
+        self.assertEqual([c[0][0] for c in wapi.iter_objects.call_args_list], ['record:host'])
+
+
+class TestNiosInventoryConstructed(unittest.TestCase):
+
+    def setUp(self):
+        super(TestNiosInventoryConstructed, self).setUp()
+        self.plugin = nios_inventory.InventoryModule()
+        self.plugin._read_config_data = MagicMock(name='_read_config_data')
+        self.plugin._cache = {}
+        self._options = {
+            'host': 'blox.example.com',
+            'username': 'admin',
+            'password': 'secret',
+            'hostfilter': {},
+            'extattrs': {},
+            'page_size': 1000,
+            'cache': False,
+            'incremental_refresh': False,
+            'shard_by': None,
+            'shard_extattr': None,
+            'shard_workers': 4,
+            'return_fields': ['zone', 'comment'],
+            'strict': True,
+            'compose': {'ansible_host': trust_as_template('ipv4addrs[0]')},
+            'groups': {'production': trust_as_template("'prod' in comment")},
+            'keyed_groups': [{'key': trust_as_template('zone'), 'prefix': 'zone'},
+                             {'key': trust_as_template('Site'), 'prefix': 'site'}],
+        }
+        self.plugin.get_option = lambda name: self._options[name]
+        self.hosts = [
+            {'name': 'h1.ansible.com', 'view': 'default', 'zone': 'ansible.com', 'comment': 'prod web',
+             'extattrs': {'Site': {'value': 'HQ'}}, 'ipv4addrs': [{'ipv4addr': '192.168.10.1'}]},
+            {'name': 'h2.lab.com', 'view': 'default', 'zone': 'lab.com', 'comment': 'lab',
+             'extattrs': {'Site': {'value': 'DC'}}, 'ipv4addrs': [{'ipv4addr': '192.168.20.1'}]},
+        ]
+
+    def test_groups_are_built_from_the_fetched_records(self):
+        wapi = MagicMock(name='WapiInventory')
+        wapi.iter_objects.return_value = iter(self.hosts)
+        inventory = InventoryData()
+
+        def base_parse(inventory, loader, path, cache=True):
+            self.plugin.inventory = inventory
+            self.plugin.loader = loader
+
+        with patch.object(nios_inventory.BaseInventoryPlugin, 'parse', side_effect=base_parse), \
+                patch.object(nios_inventory, 'WapiInventory', return_value=wapi):
+            self.plugin.parse(inventory, DataLoader(), '/path/to/inventory.yml')
+
+        self.assertEqual(wapi.iter_objects.call_count, 1)
+        self.assertEqual(wapi.iter_objects.call_args[1]['return_fields'],
+                         ['name', 'view', 'extattrs', 'ipv4addrs', 'comment', 'zone'])
+        self.assertEqual(sorted(h.name for h in inventory.groups['zone_ansible_com'].get_hosts()), ['h1.ansible.com'])
+        self.assertEqual(sorted(h.name for h in inventory.groups['site_DC'].get_hosts()), ['h2.lab.com'])
+        self.assertEqual(sorted(h.name for h in inventory.groups['production'].get_hosts()), ['h1.ansible.com'])
+        host_vars = inventory.get_host('h1.ansible.com').get_vars()
+        self.assertEqual(host_vars['ansible_host'], '192.168.10.1')
+        self.assertEqual(host_vars['zone'], 'ansible.com')
@@ -0,0 +1,64 @@
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import patch, MagicMock
+from ansible_collections.infoblox.nios_modules.plugins.lookup import nios_lookup
+
+
+class TestNiosLookup(unittest.TestCase):
+
+    def setUp(self):
+        self.lookup = nios_lookup.LookupModule()
+        self.pages = [
+            {'result': [{'_ref': 'record:host/1', 'name': 'h1', 'extattrs': {'Site': {'value': 'HQ'}}},
+                        {'_ref': 'record:host/2', 'name': 'h2'}],
+             'next_page_id': 'page2'},
+            {'result': [{'_ref': 'record:host/3', 'name': 'h3', 'extattrs': {'Site': {'value': 'DC'}}}]},
+        ]
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _run(self, terms, **kwargs):
+        get_page = MagicMock(side_effect=self.pages)
+        with patch('ansible_collections.infoblox.nios_modules.plugins.module_utils.api.get_connector'), \
+                patch('ansible_collections.infoblox.nios_modules.plugins.module_utils.api.connector_get_page', get_page):
+            return self.lookup.run(terms, **kwargs), get_page
+
+    def test_default_uses_single_get_object(self):
+        wapi = MagicMock()
+        wapi.get_object.return_value = [{'name': 'h1', 'extattrs': {'Site': {'value': 'HQ'}}}]
+        with patch.object(nios_lookup, 'WapiLookup', return_value=wapi):
+            res = self.lookup.run(['record:host'])
+
+        self.assertEqual(res, [{'name': 'h1', 'extattrs': {'Site': 'HQ'}}])
+        wapi.get_flattened_pages.assert_not_called()
+
+    def test_page_size_walks_every_page(self):
+        res, get_page = self._run(['record:host'], page_size=2)
+
+        self.assertEqual([obj['name'] for obj in res], ['h1', 'h2', 'h3'])
+        self.assertEqual(res[0]['extattrs'], {'Site': 'HQ'})
+        self.assertEqual(get_page.call_count, 2)
+        self.assertEqual(get_page.call_args_list[0][0][2]['_max_results'], 2)
+
+    def test_output_file_writes_json_lines(self):
+        path = os.path.join(self.tmpdir, 'hosts.jsonl')
+        res, get_page = self._run(['record:host'], output_file=path)
+
+        self.assertEqual(res, [{'output_file': path, 'count': 3}])
+        self.assertEqual(get_page.call_args_list[0][0][2]['_max_results'], 1000)
+        with open(path) as f:
+            lines = [json.loads(line) for line in f]
+        self.assertEqual([obj['name'] for obj in lines], ['h1', 'h2', 'h3'])
+        self.assertEqual(lines[2]['extattrs'], {'Site': 'DC'})
@@ -0,0 +1,79 @@
+# This file is part of Ansible
+#
+# Ansible is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Ansible is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Ansible.  If not, see <http://www.gnu.org/licenses/>.
+
+# Make coding more python3-ish
+
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+import unittest
+
+from ansible.errors import AnsibleError
+from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import patch, MagicMock
+from ansible_collections.infoblox.nios_modules.plugins.lookup import nios_network_utilization
+
+
+class TestNiosNetworkUtilizationLookup(unittest.TestCase):
+
+    def setUp(self):
+        self.lookup = nios_network_utilization.LookupModule()
+
+    @staticmethod
+    def _wapi():
+        objects = {
+            'network': [{'network': '192.168.10.0/24'}, {'network': '192.168.11.0/24'}],
+            'range': [{'start_addr': '192.168.10.100', 'end_addr': '192.168.10.199'}],
+            'fixedaddress': [{'ipv4addr': '192.168.10.5'}],
+            'record:host': [{'ipv4addrs': [{'ipv4addr': '192.168.10.6'}, {'ipv4addr': '192.168.11.6'}]}, {}],
+        }
+        wapi = MagicMock()
+        wapi.iter_objects.side_effect = lambda obj_type, payload, return_fields=None, page_size=None: iter(objects[obj_type])
+        return wapi
+
+    @patch.object(nios_network_utilization, 'WapiLookup')
+    def test_usage_of_every_network(self, mock_wapi_cls):
+        wapi = self._wapi()
+        mock_wapi_cls.return_value = wapi
+
+        result = self.lookup.run([], network_view='ansible')
+
+        self.assertEqual(result, [
+            {'network': '192.168.10.0/24', 'total': 254, 'used': 102, 'free': 152},
+            {'network': '192.168.11.0/24', 'total': 254, 'used': 1, 'free': 253},
+        ])
+        self.assertEqual(wapi.iter_objects.call_count, 4)
+        for call in wapi.iter_objects.call_args_list:
+            self.assertEqual(call[0][1], {'network_view': 'ansible'})
+
+    @patch.object(nios_network_utilization, 'WapiLookup')
+    def test_min_free_and_overlap_filter(self, mock_wapi_cls):
+        mock_wapi_cls.return_value = self._wapi()
+
+        self.assertEqual([usage['network'] for usage in self.lookup.run([], min_free=200)], ['192.168.11.0/24'])
+        self.assertEqual([usage['network'] for usage in self.lookup.run(['192.168.10.128/25'])], ['192.168.10.0/24'])
+
+    def test_invalid_network(self):
+        with self.assertRaises(AnsibleError) as ctx:
+            self.lookup.run(['not-a-network'])
+        self.assertIn('network argument is invalid', str(ctx.exception))
+        with self.assertRaises(AnsibleError) as ctx:
+            self.lookup.run(['2001:db8::/64'])
+        self.assertIn('only IPv4 networks are supported', str(ctx.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()
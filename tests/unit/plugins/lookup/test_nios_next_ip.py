@@ -0,0 +1,176 @@
+# This file is part of Ansible
+#
+# Ansible is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Ansible is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Ansible.  If not, see <http://www.gnu.org/licenses/>.
+
+# Make coding more python3-ish
+
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+import unittest
+
+from ansible.errors import AnsibleError
+from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import patch, MagicMock
+from ansible_collections.infoblox.nios_modules.plugins.lookup import nios_next_ip
+from ansible_collections.infoblox.nios_modules.plugins.module_utils.api import InfobloxException
+
+
+def _wapi_error(text):
+    return InfobloxException(response={'Error': 'AdmConProtoError: %s' % text, 'text': text})
+
+
+def _raise(exc):
+    raise exc
+
+
+class TestNiosNextIpLookup(unittest.TestCase):
+
+    def setUp(self):
+        self.lookup = nios_next_ip.LookupModule()
+
+    def _run(self, terms, **kwargs):
+        return self.lookup.run(terms, **kwargs)
+
+    @staticmethod
+    def _wapi(candidates, free):
+        def call_func(func, ref, payload):
+            # like WAPI, fail rather than return fewer addresses than asked
+            if payload['num'] > len(free[ref]):
+                raise _wapi_error('Cannot find %d available IP address(es) in this range' % payload['num'])
+            return {'ips': free[ref][:payload['num']]}
+
+        wapi = MagicMock()
+        wapi.get_object.return_value = candidates
+        wapi.connector.call_func.side_effect = call_func
+        wapi.handle_exception.side_effect = lambda method, exc: _raise(Exception(exc.response['text']))
+        return wapi
+
+    def _ranges(self):
+        return [
+            {'_ref': 'range/1', 'network': '192.168.10.0/24', 'network_view': 'default',
+             'start_addr': '192.168.10.10', 'end_addr': '192.168.10.19'},
+            {'_ref': 'range/2', 'network': '192.168.10.0/24', 'network_view': 'default',
+             'start_addr': '192.168.10.20', 'end_addr': '192.168.10.29'},
+        ]
+
+    def test_missing_network_raises(self):
+        with self.assertRaises(AnsibleError) as ctx:
+            self._run([])
+        self.assertIn('missing argument', str(ctx.exception))
+
+    @patch.object(nios_next_ip, 'WapiLookup')
+    def test_first_candidate_with_enough_ips(self, mock_wapi_cls):
+        wapi = self._wapi(self._ranges(), {'range/1': ['192.168.10.10'],
+                                           'range/2': ['192.168.10.20', '192.168.10.21']})
+        mock_wapi_cls.return_value = wapi
+
+        result = self._run(['192.168.10.0/24'], num=2, use_range=True)
+
+        self.assertEqual(result, [['192.168.10.20', '192.168.10.21']])
+        wapi.get_object.assert_called_once_with('range', {'network': '192.168.10.0/24', 'network_view': 'default'})
+
+    @patch.object(nios_next_ip, 'WapiLookup')
+    def test_sequential_probe_stops_at_first_match(self, mock_wapi_cls):
+        wapi = self._wapi(self._ranges(), {'range/1': ['192.168.10.10'], 'range/2': ['192.168.10.20']})
+        mock_wapi_cls.return_value = wapi
+
+        self._run(['192.168.10.0/24'], use_range=True)
+
+        self.assertEqual(wapi.connector.call_func.call_count, 1)
+
+    @patch.object(nios_next_ip, 'WapiLookup')
+    def test_parallel_probe_keeps_candidate_order(self, mock_wapi_cls):
+        wapi = self._wapi(self._ranges(), {'range/1': ['192.168.10.10'], 'range/2': ['192.168.10.20']})
+        mock_wapi_cls.return_value = wapi
+
+        result = self._run(['192.168.10.0/24'], use_range=True, workers=4,
+                           provider={'host': 'nios01'})
+
+        self.assertEqual(result, [['192.168.10.10']])
+        self.assertEqual(wapi.connector.call_func.call_count, 2)
+        provider = mock_wapi_cls.call_args[0][0]
+        self.assertEqual(provider['http_pool_maxsize'], 4)
+
+    @patch.object(nios_next_ip, 'WapiLookup')
+    def test_not_enough_ips_raises_without_aggregate(self, mock_wapi_cls):
+        mock_wapi_cls.return_value = self._wapi(self._ranges(), {'range/1': ['192.168.10.10'],
+                                                                 'range/2': ['192.168.10.20']})
+
+        with self.assertRaises(AnsibleError) as ctx:
+            self._run(['192.168.10.0/24'], num=2, use_range=True)
+        self.assertIn('unable to find the required number of IPs', str(ctx.exception))
+
+    @patch.object(nios_next_ip, 'WapiLookup')
+    def test_aggregate_with_details(self, mock_wapi_cls):
+        mock_wapi_cls.return_value = self._wapi(self._ranges(), {'range/1': ['192.168.10.10'],
+                                                                 'range/2': ['192.168.10.20', '192.168.10.21']})
+
+        result = self._run(['192.168.10.0/24'], num=3, use_range=True, workers=2, aggregate=True, details=True)
+
+        self.assertEqual([entry['ip'] for entry in result[0]], ['192.168.10.10', '192.168.10.20', '192.168.10.21'])
+        self.assertEqual([entry['ref'] for entry in result[0]], ['range/1', 'range/2', 'range/2'])
+        self.assertEqual(result[0][0]['start_addr'], '192.168.10.10')
+        self.assertEqual(result[0][0]['network'], '192.168.10.0/24')
+
+    @patch.object(nios_next_ip, 'WapiLookup')
+    def test_aggregate_takes_partial_counts(self, mock_wapi_cls):
+        free = {'range/1': ['192.168.10.%d' % i for i in range(10, 13)],
+                'range/2': ['192.168.10.%d' % i for i in range(20, 26)]}
+        wapi = self._wapi(self._ranges(), free)
+        mock_wapi_cls.return_value = wapi
+
+        result = self._run(['192.168.10.0/24'], num=8, use_range=True, aggregate=True)
+
+        self.assertEqual(result, [free['range/1'] + free['range/2'][:5]])
+        # range/2 is only asked for the addresses still needed
+        nums = [c[0][2]['num'] for c in wapi.connector.call_func.call_args_list if c[0][1] == 'range/2']
+        self.assertEqual(nums, [8, 5])
+
+    @patch.object(nios_next_ip, 'WapiLookup')
+    def test_aggregate_not_enough_ips_raises(self, mock_wapi_cls):
+        mock_wapi_cls.return_value = self._wapi(self._ranges(), {'range/1': ['192.168.10.10'],
+                                                                 'range/2': ['192.168.10.20']})
+
+        with self.assertRaises(AnsibleError):
+            self._run(['192.168.10.0/24'], num=3, use_range=True, aggregate=True)
+
+    @patch.object(nios_next_ip, 'WapiLookup')
+    def test_other_wapi_errors_are_raised(self, mock_wapi_cls):
+        wapi = self._wapi(self._ranges(), {})
+        wapi.connector.call_func.side_effect = _wapi_error('Authorization required')
+        mock_wapi_cls.return_value = wapi
+
+        with self.assertRaises(Exception) as ctx:
+            self._run(['192.168.10.0/24'], use_range=True, aggregate=True)
+        self.assertEqual(str(ctx.exception), 'Authorization required')
+        self.assertEqual(wapi.connector.call_func.call_count, 1)
+
+    @patch.object(nios_next_ip, 'WapiLookup')
+    def test_several_networks_are_candidates(self, mock_wapi_cls):
+        wapi = self._wapi([], {'network/10': [], 'network/11': ['192.168.11.5']})
+        wapi.get_object.side_effect = [
+            [{'_ref': 'network/10', 'network': '192.168.10.0/24', 'network_view': 'default'}],
+            [{'_ref': 'network/11', 'network': '192.168.11.0/24', 'network_view': 'default'}],
+        ]
+        mock_wapi_cls.return_value = wapi
+
+        result = self._run(['192.168.10.0/24', '192.168.11.0/24'])
+
+        self.assertEqual(result, [['192.168.11.5']])
+
+
+if __name__ == '__main__':
+    unittest.main()
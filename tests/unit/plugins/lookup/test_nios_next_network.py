@@ -135,6 +135,106 @@ class TestNiosNextNetworkLookup(unittest.TestCase):
             self._run(['192.168.10.0/24'], cidr=25, network_view='other')
         self.assertIn('no records found', str(ctx.exception))
 
+    # ---- planning mode ---------------------------------------------------
+
+    @staticmethod
+    def _plan_wapi(container, networks=(), containers=()):
+        wapi = MagicMock()
+        wapi.get_object.return_value = container
+        wapi.children = {'network': list(networks), 'networkcontainer': list(containers)}
+        wapi.iter_objects.side_effect = lambda obj_type, payload, return_fields=None: iter(list(wapi.children[obj_type]))
+        return wapi
+
+    @patch.object(nios_next_network, 'WapiLookup')
+    def test_plan_verifies_by_listing_children_again(self, mock_wapi_cls):
+        wapi = self._plan_wapi([{'_ref': 'ref1', 'network': '192.168.10.0/24'}],
+                               networks=[{'_ref': 'net1', 'network': '192.168.10.0/26'}],
+                               containers=[{'_ref': 'cont1', 'network': '192.168.10.128/26'}])
+        mock_wapi_cls.return_value = wapi
+
+        result = self._run(['192.168.10.0/24'], plan=[27, '26'], exclude=['192.168.10.64/27'])
+
+        self.assertEqual(result, [['192.168.10.96/27', '192.168.10.192/26']])
+        wapi.call_func.assert_not_called()
+        # the children are listed with paged searches, whatever their number
+        wapi.iter_objects.assert_any_call('network', {'network_container': '192.168.10.0/24', 'network_view': 'default'},
+                                          return_fields=['network'])
+        self.assertEqual(wapi.iter_objects.call_count, 4)
+        wapi.multi_request.assert_not_called()
+
+    @patch.object(nios_next_network, 'WapiLookup')
+    def test_plan_reserve_creates_networks(self, mock_wapi_cls):
+        wapi = self._plan_wapi([{'_ref': 'ref1'}])
+        wapi.multi_request.return_value = ['network/1', 'network/2']
+        mock_wapi_cls.return_value = wapi
+
+        result = self._run(['192.168.10.0/24'], plan=[25, 25], reserve=True, network_view='ansible')
+
+        self.assertEqual(result, [['192.168.10.0/25', '192.168.10.128/25']])
+        reserve = wapi.multi_request.call_args[0][0]
+        self.assertEqual(reserve, [
+            {'method': 'POST', 'object': 'network', 'data': {'network': '192.168.10.0/25', 'network_view': 'ansible'}},
+            {'method': 'POST', 'object': 'network', 'data': {'network': '192.168.10.128/25', 'network_view': 'ansible'}},
+        ])
+
+    @patch.object(nios_next_network, 'WapiLookup')
+    def test_plan_detects_overlapping_network(self, mock_wapi_cls):
+        wapi = self._plan_wapi([{'_ref': 'ref1'}])
+        mock_wapi_cls.return_value = wapi
+        listings = []
+
+        def iter_objects(obj_type, payload, return_fields=None):
+            listings.append(obj_type)
+            # a smaller network is created inside the planned one meanwhile
+            if len(listings) > 2 and obj_type == 'network':
+                return iter([{'network': '192.168.10.64/28'}])
+            return iter([])
+        wapi.iter_objects.side_effect = iter_objects
+
+        with self.assertRaises(AnsibleError) as ctx:
+            self._run(['192.168.10.0/24'], plan=[25])
+        self.assertIn('planned network 192.168.10.0/25 is already in use by network 192.168.10.64/28', str(ctx.exception))
+
+    @patch.object(nios_next_network, 'WapiLookup')
+    def test_plan_detects_enclosing_container(self, mock_wapi_cls):
+        wapi = self._plan_wapi([{'_ref': 'ref1'}], networks=[{'network': '192.168.10.0/26'}])
+        mock_wapi_cls.return_value = wapi
+        listings = []
+
+        def iter_objects(obj_type, payload, return_fields=None):
+            listings.append(obj_type)
+            if len(listings) > 2 and obj_type == 'networkcontainer':
+                return iter([{'network': '192.168.10.64/26'}])
+            return iter(wapi.children[obj_type])
+        wapi.iter_objects.side_effect = iter_objects
+
+        with self.assertRaises(AnsibleError) as ctx:
+            self._run(['192.168.10.0/24'], plan=[27])
+        self.assertIn('planned network 192.168.10.64/27 is already in use by networkcontainer 192.168.10.64/26', str(ctx.exception))
+
+    @patch.object(nios_next_network, 'WapiLookup')
+    def test_plan_without_enough_space(self, mock_wapi_cls):
+        mock_wapi_cls.return_value = self._plan_wapi([{'_ref': 'ref1'}], networks=[{'network': '192.168.10.0/25'}])
+
+        with self.assertRaises(AnsibleError) as ctx:
+            self._run(['192.168.10.0/24'], plan=[26, 26, 26])
+        self.assertIn('no free /26 network left', str(ctx.exception))
+
+    @patch.object(nios_next_network, 'WapiLookup')
+    def test_plan_container_not_found(self, mock_wapi_cls):
+        wapi = self._plan_wapi([])
+        mock_wapi_cls.return_value = wapi
+
+        with self.assertRaises(AnsibleError) as ctx:
+            self._run(['192.168.10.0/24'], plan=[25])
+        self.assertIn('unable to find network-container object', str(ctx.exception))
+        wapi.iter_objects.assert_not_called()
+
+    def test_plan_validates_every_cidr(self):
+        with self.assertRaises(AnsibleError) as ctx:
+            self._run(['192.168.10.0/24'], plan=[25, 24])
+        self.assertIn('must be greater than parent network cidr', str(ctx.exception))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -5,11 +5,15 @@ from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
 import copy
+import json
+import os
+import shutil
+import tempfile
 try:
     from ansible_collections.infoblox.nios_modules.tests.unit.compat import unittest
 except ImportError:
     import unittest
-from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import patch, MagicMock, Mock
+from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import patch, MagicMock, Mock, ANY, call
 from ansible_collections.infoblox.nios_modules.plugins.module_utils import api
 
 
@@ -36,7 +40,8 @@ class TestNiosApi(unittest.TestCase):
     def test_get_provider_spec(self):
         provider_options = ['host', 'username', 'password', 'cert', 'key', 'validate_certs', 'silent_ssl_warnings',
                             'http_request_timeout', 'http_pool_connections',
-                            'http_pool_maxsize', 'max_retries', 'wapi_version', 'max_results']
+                            'http_pool_maxsize', 'max_retries', 'wapi_version', 'max_results',
+                            'ref_cache', 'ref_cache_ttl']
         res = api.WapiBase.provider_spec
         self.assertIsNotNone(res)
         self.assertIn('provider', res)
@@ -99,7 +104,7 @@ class TestNiosApi(unittest.TestCase):
         res = wapi.run('testobject', test_spec)
 
         self.assertTrue(res['changed'])
-        wapi.update_object.assert_called_once_with(ref, {'comment': 'updated comment', 'name': 'default'})
+        wapi.update_object.assert_called_once_with(ref, {'comment': 'updated comment', 'name': 'default'}, return_fields=ANY)
 
     def test_wapi_change_false(self):
         self.module.params = {'provider': None, 'state': 'present', 'name': 'default',
@@ -126,7 +131,7 @@ class TestNiosApi(unittest.TestCase):
 
         self.assertTrue(res['changed'])
         wapi.update_object.assert_called_once_with(
-            ref, {'comment': 'updated comment', 'name': 'default'}
+            ref, {'comment': 'updated comment', 'name': 'default'}, return_fields=ANY
         )
 
     def test_wapi_extattrs_change(self):
@@ -157,7 +162,7 @@ class TestNiosApi(unittest.TestCase):
         res = wapi.run('testobject', test_spec)
 
         self.assertTrue(res['changed'])
-        wapi.update_object.assert_called_once_with(ref, kwargs)
+        wapi.update_object.assert_called_once_with(ref, kwargs, return_fields=ANY)
 
     def test_wapi_extattrs_nochange(self):
         self.module.params = {'provider': None, 'state': 'present', 'name': 'default',
@@ -199,7 +204,7 @@ class TestNiosApi(unittest.TestCase):
         res = wapi.run('testobject', test_spec)
 
         self.assertTrue(res['changed'])
-        wapi.create_object.assert_called_once_with('testobject', {'name': 'ansible'})
+        wapi.create_object.assert_called_once_with('testobject', {'name': 'ansible'}, return_fields=ANY)
 
     def test_wapi_delete(self):
         self.module.params = {'provider': None, 'state': 'absent', 'name': 'ansible',
@@ -257,7 +262,7 @@ class TestNiosApi(unittest.TestCase):
         res = wapi.run('testobject', test_spec)
 
         self.assertTrue(res['changed'])
-        wapi.update_object.assert_called_once_with(ref, kwargs)
+        wapi.update_object.assert_called_once_with(ref, kwargs, return_fields=ANY)
 
     # ------------------------------------------------------------------
     # Issue #300: IPAM-only (non-DNS) host records carry view=' ' in WAPI.
@@ -317,7 +322,8 @@ class TestNiosApi(unittest.TestCase):
             'ipv4addrs': None, 'comment': None, 'extattrs': None,
         }
         wapi = api.WapiModule(self.module)
-        wapi.get_object = Mock(side_effect=responses)
+        wapi.get_object = Mock()
+        wapi.multi_request = Mock(return_value=responses)
         wapi.create_object = Mock()
         wapi.update_object = Mock()
         wapi.delete_object = Mock()
@@ -326,6 +332,11 @@ class TestNiosApi(unittest.TestCase):
 
         self.assertTrue(res['changed'])
         wapi.delete_object.assert_called_once_with(ref)
+        # both searches are sent in a single round trip
+        wapi.get_object.assert_not_called()
+        requests = wapi.multi_request.call_args[0][0]
+        self.assertEqual([req['data'] for req in requests],
+                         [{'name': 'ipso-host', 'view': 'default'}, {'name': 'ipso-host'}])
 
     def test_host_record_default_view_retry_ignores_other_dns_views(self):
         # The retry path must NOT match records that live in a non-default
@@ -344,7 +355,7 @@ class TestNiosApi(unittest.TestCase):
             'ipv4addrs': None, 'comment': None, 'extattrs': None,
         }
         wapi = api.WapiModule(self.module)
-        wapi.get_object = Mock(side_effect=responses)
+        wapi.multi_request = Mock(return_value=responses)
         wapi.create_object = Mock()
         wapi.update_object = Mock()
         wapi.delete_object = Mock()
@@ -437,15 +448,16 @@ class TestNiosApi(unittest.TestCase):
 
         wapi = self._get_wapi(None)
         # First lookup in default view misses, fallback without network_view finds object.
-        wapi.get_object.side_effect = [[], [{'_ref': ref, 'network': '192.0.2.0/24'}]]
+        wapi.multi_request = Mock(return_value=[[], [{'_ref': ref, 'network': '192.0.2.0/24'}]])
 
         res = wapi.run(api.NIOS_IPV4_NETWORK, test_spec)
 
         self.assertTrue(res['changed'])
         wapi.delete_object.assert_called_once_with(ref)
-        self.assertEqual(wapi.get_object.call_count, 2)
-        first_filter = wapi.get_object.call_args_list[0][0][1]
-        second_filter = wapi.get_object.call_args_list[1][0][1]
+        # both lookups are sent in a single round trip
+        wapi.get_object.assert_not_called()
+        wapi.multi_request.assert_called_once()
+        first_filter, second_filter = [req['data'] for req in wapi.multi_request.call_args[0][0]]
         self.assertIn('network_view', first_filter)
         self.assertNotIn('network_view', second_filter)
 
@@ -464,13 +476,13 @@ class TestNiosApi(unittest.TestCase):
         }
 
         wapi = self._get_wapi(None)
-        wapi.get_object.side_effect = [
+        wapi.multi_request = Mock(return_value=[
             [],
             [
                 {'_ref': 'network/view1/false', 'network': '192.0.2.0/24', 'network_view': 'view1'},
                 {'_ref': 'network/view2/false', 'network': '192.0.2.0/24', 'network_view': 'view2'},
             ],
-        ]
+        ])
 
         wapi.run(api.NIOS_IPV4_NETWORK, test_spec)
 
@@ -481,6 +493,113 @@ class TestNiosApi(unittest.TestCase):
         )
         wapi.delete_object.assert_not_called()
 
+    def test_range_update_already_applied_is_idempotent(self):
+        # The lookup of the original range and of the target range are sent
+        # in one round trip; when only the target exists the previous run
+        # already moved the range and nothing changes.
+        self.module.params = {
+            'provider': None, 'state': 'present', 'network': '192.168.10.0/24',
+            'network_view': 'default', 'start_addr': '192.168.10.10', 'end_addr': '192.168.10.20',
+            'new_start_addr': '192.168.10.30', 'new_end_addr': '192.168.10.40', 'comment': None,
+        }
+        test_spec = {
+            'network': {},
+            'network_view': {'ib_req': True},
+            'start_addr': {'ib_req': True},
+            'new_start_addr': {'type': 'str'},
+            'end_addr': {'ib_req': True},
+            'new_end_addr': {'type': 'str'},
+            'comment': {},
+        }
+        moved = {'_ref': 'range/ZG5z:192.168.10.30/192.168.10.40/default', 'network': '192.168.10.0/24',
+                 'network_view': 'default', 'start_addr': '192.168.10.30', 'end_addr': '192.168.10.40'}
+
+        wapi = self._get_wapi(None)
+        wapi.multi_request = Mock(return_value=[[], [moved]])
+
+        res = wapi.run(api.NIOS_RANGE, test_spec)
+
+        self.assertFalse(res['changed'])
+        wapi.get_object.assert_not_called()
+        wapi.update_object.assert_not_called()
+        filters = [req['data'] for req in wapi.multi_request.call_args[0][0]]
+        self.assertEqual([(f['start_addr'], f['end_addr']) for f in filters],
+                         [('192.168.10.10', '192.168.10.20'), ('192.168.10.30', '192.168.10.40')])
+
+    def test_lookup_return_fields_absent_only_requests_search_fields(self):
+        self.module.params = {'provider': None, 'state': 'absent', 'network': '192.168.10.0/24',
+                              'network_view': 'default', 'options': [{'name': 'routers', 'value': '192.168.10.1'}],
+                              'members': None, 'extattrs': {'Site': 'test'}, 'comment': None}
+        test_spec = {
+            'network': {'ib_req': True},
+            'network_view': {'ib_req': True},
+            'options': {'transform': Mock()},
+            'members': {},
+            'extattrs': {},
+            'comment': {},
+        }
+        wapi = api.WapiModule(self.module)
+
+        self.assertEqual(wapi.get_lookup_return_fields(api.NIOS_IPV4_NETWORK, test_spec), ['network', 'network_view'])
+
+    def test_lookup_return_fields_present_requests_fields_set(self):
+        self.module.params = {'provider': None, 'state': 'present', 'network': '192.168.10.0/24',
+                              'network_view': 'default', 'options': None, 'members': None,
+                              'extattrs': {'Site': 'test'}, 'comment': None}
+        test_spec = {
+            'network': {'ib_req': True},
+            'network_view': {'ib_req': True},
+            'options': {'transform': Mock()},
+            'members': {},
+            'extattrs': {},
+            'comment': {},
+        }
+        wapi = api.WapiModule(self.module)
+
+        self.assertEqual(wapi.get_lookup_return_fields(api.NIOS_IPV4_NETWORK, test_spec),
+                         ['network', 'network_view', 'options', 'extattrs'])
+
+    def test_host_record_delete_lookup_keeps_disambiguation_fields(self):
+        ref = "record:host/ZG5zLmhvc3QkLl9kZWZhdWx0Lmlwc28x:ipso-host/%20"
+        ipam_only = {
+            "_ref": ref, "name": "ipso-host", "view": " ",
+            "configure_for_dns": False,
+        }
+        self.module.params = {
+            'provider': None, 'state': 'absent', 'name': 'ipso-host',
+            'view': ' ', 'configure_for_dns': False,
+            'ipv4addrs': None, 'comment': 'test', 'extattrs': {'Site': 'test'},
+        }
+        wapi = self._get_wapi([ipam_only])
+
+        res = wapi.run(api.NIOS_HOST_RECORD, self._host_record_spec())
+
+        self.assertTrue(res['changed'])
+        wapi.delete_object.assert_called_once_with(ref)
+        self.assertEqual(wapi.get_object.call_args[1]['return_fields'], ['name', 'view', 'configure_for_dns'])
+
+    def test_get_objects_single_filter_uses_get(self):
+        wapi = self._get_wapi([{'_ref': 'a'}])
+        wapi.multi_request = Mock()
+
+        res = wapi.get_objects('testobject', [{'name': 'a'}], return_fields=['name'])
+
+        self.assertEqual(res, [[{'_ref': 'a'}]])
+        wapi.get_object.assert_called_once_with('testobject', {'name': 'a'}, return_fields=['name'])
+        wapi.multi_request.assert_not_called()
+
+    def test_get_objects_several_filters_use_one_multi_request(self):
+        wapi = self._get_wapi(None)
+        wapi.multi_request = Mock(return_value=[[], [{'_ref': 'b'}]])
+
+        res = wapi.get_objects('testobject', [{'name': 'a'}, {'name': 'b'}], return_fields=['name', 'comment'])
+
+        self.assertEqual(res, [[], [{'_ref': 'b'}]])
+        wapi.multi_request.assert_called_once_with([
+            {'method': 'GET', 'object': 'testobject', 'data': {'name': 'a'}, 'args': {'_return_fields': 'name,comment'}},
+            {'method': 'GET', 'object': 'testobject', 'data': {'name': 'b'}, 'args': {'_return_fields': 'name,comment'}},
+        ])
+
     # ------------------------------------------------------------------
     # Issue #139: state=absent should be idempotent when the object is
     # already gone (NIOS returns NotFound). handle_exception must swallow
@@ -698,6 +817,57 @@ class TestNiosApi(unittest.TestCase):
         wapi = api.WapiModule(self.module)
         self.assertFalse(wapi.verify_list_content_equality([1, 2], [1, 2, 3]))
 
+    def test_verify_list_content_equality_current_item_used_once(self):
+        '''each current item can only satisfy one proposed item.'''
+        wapi = api.WapiModule(self.module)
+        proposed = [{'name': 'a'}, {'name': 'a'}]
+        current = [{'name': 'a', '_ref': 'x'}, {'name': 'b', '_ref': 'y'}]
+        self.assertFalse(wapi.verify_list_content_equality(proposed, current))
+
+    def test_verify_list_content_equality_nested_values(self):
+        wapi = api.WapiModule(self.module)
+        proposed = [{'name': 'opt', 'value': ['a', 'b']}, {'name': 'srv', 'tsig': {'key': 'k'}}]
+        current = [{'name': 'srv', 'tsig': {'key': 'k'}, 'stealth': False},
+                   {'name': 'opt', 'value': ['a', 'b'], 'num': 1}]
+        self.assertTrue(wapi.verify_list_content_equality(proposed, current))
+        proposed[0]['value'] = ['b', 'a']
+        self.assertFalse(wapi.verify_list_content_equality(proposed, current))
+
+    def test_verify_list_content_equality_large_lists(self):
+        '''10k element lists are matched without a nested scan.'''
+        wapi = api.WapiModule(self.module)
+        size = 10000
+        current = [{'name': 'option%d' % i, 'num': i, 'value': str(i), 'use_option': True}
+                   for i in range(size)]
+        proposed = [{'name': 'option%d' % i, 'num': i, 'value': str(i)}
+                    for i in reversed(range(size))]
+        self.assertTrue(wapi.verify_list_content_equality(proposed, current))
+        proposed[0]['value'] = 'changed'
+        self.assertFalse(wapi.verify_list_content_equality(proposed, current))
+
+    def test_compare_objects_large_members_list(self):
+        wapi = api.WapiModule(self.module)
+        size = 10000
+        current = {'members': [{'_struct': 'dhcpmember', 'name': 'member%d.ansible.com' % i, 'ipv4addr': '10.0.%d.%d' % (i // 256, i % 256)}
+                               for i in range(size)]}
+        proposed = {'members': [{'_struct': 'dhcpmember', 'name': 'member%d.ansible.com' % i}
+                                for i in reversed(range(size))]}
+        self.assertTrue(wapi.compare_objects(current, proposed))
+        proposed['members'][-1]['name'] = 'unknown.ansible.com'
+        self.assertFalse(wapi.compare_objects(current, proposed))
+
+    def test_issubset_normalizes_mac(self):
+        wapi = api.WapiModule(self.module)
+        objects = [{'ipv4addr': '192.168.10.1', 'mac': 'aa:bb:cc:dd:ee:ff'}]
+        self.assertTrue(wapi.issubset({'mac': 'AA-BB-CC-DD-EE-FF'}, objects))
+        self.assertIsNone(wapi.issubset({'mac': 'AA-BB-CC-DD-EE-00'}, objects))
+
+    def test_freeze_value(self):
+        self.assertEqual(api.freeze_value({'a': [1, {'b': 2}]}), api.freeze_value({'a': [1, {'b': 2}]}))
+        self.assertNotEqual(api.freeze_value({'a': [1, 2]}), api.freeze_value({'a': [2, 1]}))
+        self.assertNotEqual(api.freeze_value({'a': 1}), api.freeze_value([('a', 1)]))
+        hash(api.freeze_value({'a': [1, {'b': [2, 3]}]}))
+
     def test_compare_objects_auth_zones_reorder_returns_true(self):
         '''auth_zones reorder must NOT register as a change (covered by verify_list_content_equality).'''
         wapi = api.WapiModule(self.module)
@@ -837,21 +1007,135 @@ class TestNiosApi(unittest.TestCase):
         }
 
         wapi = self._get_wapi(None)
-        wapi.get_object.side_effect = [[], [{'_ref': ref, 'network': '2001:db8::/64'}]]
+        wapi.multi_request = Mock(return_value=[[], [{'_ref': ref, 'network': '2001:db8::/64'}]])
 
         res = wapi.run(api.NIOS_IPV6_NETWORK, test_spec)
 
         self.assertTrue(res['changed'])
         wapi.delete_object.assert_called_once_with(ref)
-        self.assertEqual(wapi.get_object.call_count, 2)
-        first_filter = wapi.get_object.call_args_list[0][0][1]
-        second_filter = wapi.get_object.call_args_list[1][0][1]
+        wapi.get_object.assert_not_called()
+        first_filter, second_filter = [req['data'] for req in wapi.multi_request.call_args[0][0]]
         self.assertIn('network_view', first_filter)
         self.assertNotIn('network_view', second_filter)
 
+    def test_write_returns_object_without_refetch(self):
+        # The created object is requested through _return_fields on the POST
+        # itself, so no separate GET is made to expose it (issue #305).
+        self.module.params = {
+            'provider': {}, 'state': 'present',
+            'name': 'new-obj', 'comment': 'test', 'extattrs': None,
+        }
+        test_spec = {
+            'name': {'ib_req': True},
+            'comment': {},
+            'extattrs': {},
+        }
+
+        wapi = api.WapiModule(self.module)
+        wapi.get_object = Mock(return_value=None)
+        created = {'_ref': 'testobject/new-ref', 'name': 'new-obj', 'comment': 'test', 'extattrs': {}}
+        wapi.create_object = Mock(return_value=created)
+        wapi.connector.get_object = Mock()
+
+        res = wapi.run('testobject', test_spec)
+
+        self.assertTrue(res['changed'])
+        self.assertEqual(res['object'], created)
+        wapi.create_object.assert_called_once_with('testobject', {'name': 'new-obj', 'comment': 'test'},
+                                                   return_fields=['comment', 'extattrs', 'name'])
+        wapi.connector.get_object.assert_not_called()
+
+    def test_update_returns_object_without_refetch(self):
+        self.module.params = {
+            'provider': {}, 'state': 'present',
+            'name': 'obj', 'comment': 'updated', 'extattrs': None,
+        }
+        test_spec = {
+            'name': {'ib_req': True},
+            'comment': {},
+            'extattrs': {},
+        }
+        ref = 'testobject/obj-ref'
+
+        wapi = api.WapiModule(self.module)
+        wapi.get_object = Mock(return_value=[{'_ref': ref, 'name': 'obj', 'comment': 'old'}])
+        updated = {'_ref': ref, 'name': 'obj', 'comment': 'updated'}
+        wapi.update_object = Mock(return_value=updated)
+        wapi.connector.get_object = Mock()
+
+        res = wapi.run('testobject', test_spec)
+
+        self.assertTrue(res['changed'])
+        self.assertEqual(res['object'], updated)
+        self.assertEqual(wapi.update_object.call_args.kwargs['return_fields'], ['comment', 'extattrs', 'name'])
+        wapi.connector.get_object.assert_not_called()
+
+    def test_write_rejected_return_field_falls_back_to_read_back(self):
+        # A return field the object type cannot return must not fail the
+        # write itself: it is sent again without _return_fields and the
+        # object is read back on a best-effort basis.
+        self.module.params = {
+            'provider': {}, 'state': 'present',
+            'name': 'new-obj', 'comment': 'test', 'extattrs': None,
+        }
+        test_spec = {
+            'name': {'ib_req': True},
+            'comment': {},
+            'extattrs': {},
+        }
+
+        wapi = api.WapiModule(self.module)
+        wapi.get_object = Mock(return_value=None)
+        error = api.InfobloxException(response={
+            'Error': "AdmConProtoError: Unknown argument/field: 'extattrs'",
+            'text': "Unknown argument/field: 'extattrs'"})
+        wapi.connector.create_object = Mock(side_effect=[error, 'testobject/new-ref'])
+        fetched = {'_ref': 'testobject/new-ref', 'name': 'new-obj', 'comment': 'test'}
+        wapi.connector.get_object = Mock(return_value=fetched)
+
+        res = wapi.run('testobject', test_spec)
+
+        self.assertTrue(res['changed'])
+        self.assertEqual(res['object'], fetched)
+        first, second = wapi.connector.create_object.call_args_list
+        self.assertEqual(first.kwargs['return_fields'], ['comment', 'extattrs', 'name'])
+        self.assertEqual(second, call('testobject', {'name': 'new-obj', 'comment': 'test'}))
+        self.module.fail_json.assert_not_called()
+
+    def test_write_other_errors_are_not_retried(self):
+        self.module.params = {
+            'provider': {}, 'state': 'present',
+            'name': 'obj', 'comment': 'updated', 'extattrs': None,
+        }
+        test_spec = {
+            'name': {'ib_req': True},
+            'comment': {},
+            'extattrs': {},
+        }
+        ref = 'testobject/obj-ref'
+
+        wapi = api.WapiModule(self.module)
+        wapi.get_object = Mock(return_value=[{'_ref': ref, 'name': 'obj', 'comment': 'old'}])
+        wapi.connector.update_object = Mock(side_effect=api.InfobloxException(response={
+            'Error': 'AdmConDataError: None (IBDataConflictError: IB.Data.Conflict:Duplicate object)',
+            'text': 'Duplicate object'}))
+        self.module.fail_json.side_effect = Exception('fail_json')
+
+        with self.assertRaises(Exception):
+            wapi.run('testobject', test_spec)
+
+        wapi.connector.update_object.assert_called_once()
+        self.assertEqual(self.module.fail_json.call_args[1]['operation'], 'update_object')
+
+    def test_write_return_fields_excluded_object_type(self):
+        wapi = api.WapiModule(self.module)
+        self.assertIsNone(wapi.get_write_return_fields(api.NIOS_MEMBER, {'host_name': {}}))
+        self.assertEqual(wapi.get_write_return_fields('testobject', {'name': {}, 'template': {}, 'comment': {}}),
+                         ['comment', 'name'])
+
     def test_post_fetch_filters_password_for_adminuser(self):
-        # Post-write re-fetch should never request password in return_fields
-        # because WAPI rejects adminuser GETs with return_fields+=password.
+        # The write and the fallback re-fetch should never request password in
+        # return_fields because WAPI rejects it for adminuser.
         self.module.params = {
             'provider': {}, 'state': 'present',
             'name': 'api-user', 'password': 'secret',
@@ -872,6 +1156,7 @@ class TestNiosApi(unittest.TestCase):
 
         self.assertTrue(res['changed'])
         self.assertIn('object', res)
+        self.assertNotIn('password', wapi.create_object.call_args.kwargs['return_fields'])
         called_kwargs = wapi.connector.get_object.call_args.kwargs
         self.assertIn('return_fields', called_kwargs)
         self.assertNotIn('password', called_kwargs['return_fields'])
@@ -996,7 +1281,7 @@ class TestNiosApi(unittest.TestCase):
         }
 
         wapi = api.WapiModule(self.module)
-        wapi.get_object = Mock(return_value=existing)
+        wapi.multi_request = Mock(return_value=[existing, existing])
         wapi.create_object = Mock()
         wapi.update_object = Mock()
         wapi.delete_object = Mock()
@@ -1035,7 +1320,7 @@ class TestNiosApi(unittest.TestCase):
         }
 
         wapi = api.WapiModule(self.module)
-        wapi.get_object = Mock(return_value=existing)
+        wapi.multi_request = Mock(return_value=[existing, existing])
         wapi.create_object = Mock()
         wapi.update_object = Mock()
         wapi.delete_object = Mock()
@@ -1044,3 +1329,686 @@ class TestNiosApi(unittest.TestCase):
 
         self.assertTrue(res['changed'])
         wapi.update_object.assert_not_called()
+
+    def test_wapi_module_routes_through_httpapi_connection(self):
+        # With a persistent connection socket and no provider host, the module
+        # must reuse the httpapi session instead of building a new Connector.
+        self.module._socket_path = '/tmp/nios-socket'
+        self.module.params = {'provider': None}
+        with patch('ansible_collections.infoblox.nios_modules.plugins.module_utils.api.Connection') as connection:
+            wapi = api.WapiModule(self.module)
+
+        connection.assert_called_once_with('/tmp/nios-socket')
+        self.assertIsInstance(wapi.connector, api.WapiHttpApiConnector)
+        self.assertEqual(wapi.connector.max_results, 1000)
+
+    def test_wapi_module_provider_host_overrides_httpapi(self):
+        self.module._socket_path = '/tmp/nios-socket'
+        self.module.params = {'provider': {'host': 'nios01'}}
+        with patch('ansible_collections.infoblox.nios_modules.plugins.module_utils.api.Connection') as connection:
+            wapi = api.WapiModule(self.module)
+
+        connection.assert_not_called()
+        self.assertNotIsInstance(wapi.connector, api.WapiHttpApiConnector)
+
+    def test_httpapi_connector_get_object(self):
+        connection = Mock()
+        connection.send_request.return_value = (200, [{'_ref': 'record:a/abc', 'name': 'a.ansible.com'}])
+        connector = api.WapiHttpApiConnector(connection, max_results=1000)
+
+        res = connector.get_object('record:a', {'name': 'a.ansible.com'}, return_fields=['name'],
+                                   extattrs={'Site': {'value': 'HQ'}})
+
+        self.assertEqual(res, [{'_ref': 'record:a/abc', 'name': 'a.ansible.com'}])
+        connection.send_request.assert_called_once_with(
+            None, path='record:a', method='GET',
+            params={'name': 'a.ansible.com', '_return_fields': 'name', '_max_results': 1000, '*Site': 'HQ'})
+
+    def test_httpapi_connector_get_object_follows_pages(self):
+        connection = Mock()
+        connection.send_request.side_effect = [
+            (200, {'result': [{'_ref': 'a'}], 'next_page_id': 'page2'}),
+            (200, {'result': [{'_ref': 'b'}]}),
+        ]
+        connector = api.WapiHttpApiConnector(connection)
+
+        res = connector.get_object('record:a', max_results=1, paging=True)
+
+        self.assertEqual(res, [{'_ref': 'a'}, {'_ref': 'b'}])
+        self.assertEqual(connection.send_request.call_args[1]['params']['_page_id'], 'page2')
+
+    def test_httpapi_connector_writes(self):
+        connection = Mock()
+        connection.send_request.return_value = (201, 'record:a/abc')
+        connector = api.WapiHttpApiConnector(connection)
+
+        self.assertEqual(connector.create_object('record:a', {'name': 'a'}), 'record:a/abc')
+        connection.send_request.assert_called_with({'name': 'a'}, path='record:a', method='POST', params={})
+        connector.update_object('record:a/abc', {'comment': 'x'}, return_fields=['comment'])
+        connection.send_request.assert_called_with(
+            {'comment': 'x'}, path='record:a/abc', method='PUT', params={'_return_fields': 'comment'})
+        connector.delete_object('record:a/abc')
+        connection.send_request.assert_called_with(None, path='record:a/abc', method='DELETE', params=None)
+        connector.call_func('next_available_ip', 'network/abc', {'num': 2})
+        connection.send_request.assert_called_with(
+            {'num': 2}, path='network/abc', method='POST', params={'_function': 'next_available_ip'})
+
+    def test_httpapi_connector_error_reaches_handle_exception(self):
+        self.module._socket_path = '/tmp/nios-socket'
+        self.module.params = {'provider': None, 'state': 'present'}
+        self.module.fail_json.side_effect = Exception('fail_json')
+        with patch('ansible_collections.infoblox.nios_modules.plugins.module_utils.api.Connection') as connection:
+            connection.return_value.send_request.return_value = (
+                400, {'Error': 'AdmConProtoError: Unknown argument/field', 'code': 'Client.Ibap.Proto', 'text': 'Unknown argument/field'})
+            wapi = api.WapiModule(self.module)
+            with self.assertRaises(Exception):
+                wapi.create_object('record:a', {'bogus': 1})
+
+        self.module.fail_json.assert_called_once_with(
+            msg='Unknown argument/field', type='AdmConProtoError', code='Client.Ibap.Proto', operation='create_object')
+
+    def _bulk_spec(self):
+        return {
+            'name': {'ib_req': True, 'required': True},
+            'view': {'ib_req': True, 'default': 'default'},
+            'ipv4addr': {'ib_req': True, 'required': True, 'aliases': ['ipv4']},
+            'ttl': {'type': 'int'},
+            'comment': {},
+            'extattrs': {'type': 'dict'},
+        }
+
+    def test_bulk_argument_spec_relaxes_required(self):
+        spec = api.bulk_argument_spec(self._bulk_spec())
+
+        self.assertNotIn('required', spec['name'])
+        self.assertNotIn('ib_req', spec['name'])
+        self.assertEqual(spec['items'], {'type': 'list', 'elements': 'dict'})
+        self.assertEqual(api.bulk_required_one_of(self._bulk_spec()), [['items', 'name'], ['items', 'ipv4addr']])
+
+    def test_wapi_bulk_items_use_transforms_and_match_of_run(self):
+        self.module.params = {
+            'provider': None, 'state': 'present', 'name': None, 'view': 'default', 'ipv4addr': None,
+            'ttl': None, 'comment': None, 'extattrs': None,
+            'items': [
+                {'name': 'a.ansible.com', 'ipv4addr': '192.168.10.1', 'comment': ' Web '},
+                {'name': 'b.ansible.com', 'ipv4addr': '192.168.10.2', 'comment': 'web'},
+            ],
+        }
+        spec = self._bulk_spec()
+        # the transform sees the values of the item, not of the task
+        spec['comment']['transform'] = lambda module: module.params['comment'].strip().lower()
+        existing = [
+            [{'_ref': 'record:a/a', 'name': 'a.ansible.com', 'view': 'default',
+              'ipv4addr': '192.168.10.1', 'comment': 'web'}],
+            # several matches: the one holding the item address is managed
+            [{'_ref': 'record:a/other', 'name': 'b.ansible.com', 'view': 'default',
+              'ipv4addr': '192.168.10.9', 'comment': 'other'},
+             {'_ref': 'record:a/b', 'name': 'b.ansible.com', 'view': 'default',
+              'ipv4addr': '192.168.10.2', 'comment': 'web'}],
+        ]
+        wapi = api.WapiModule(self.module)
+        wapi.multi_request = Mock(return_value=existing)
+        wapi._send_multi_request = Mock()
+
+        res = wapi.run(api.NIOS_A_RECORD, spec)
+
+        self.assertFalse(res['changed'])
+        self.assertEqual([item['ref'] for item in res['results']], ['record:a/a', 'record:a/b'])
+        wapi._send_multi_request.assert_not_called()
+
+    def test_wapi_bulk_resolves_and_writes_in_multi_requests(self):
+        self.module.params = {
+            'provider': None, 'state': 'present', 'name': None, 'view': 'default', 'ipv4addr': None,
+            'ttl': None, 'comment': 'bulk', 'extattrs': None,
+            'items': [
+                {'name': 'New.ansible.com', 'ipv4': '192.168.10.1'},
+                {'name': 'same.ansible.com', 'ipv4addr': '192.168.10.2'},
+                {'name': 'upd.ansible.com', 'ipv4addr': '192.168.10.3', 'ttl': '300'},
+                {'name': 'del.ansible.com', 'ipv4addr': '192.168.10.4', 'state': 'absent'},
+                {'name': 'gone.ansible.com', 'ipv4addr': '192.168.10.5', 'state': 'absent'},
+            ],
+        }
+        existing = [
+            [],
+            [{'_ref': 'record:a/same', 'name': 'same.ansible.com', 'view': 'default',
+              'ipv4addr': '192.168.10.2', 'comment': 'bulk'}],
+            [{'_ref': 'record:a/upd', 'name': 'upd.ansible.com', 'view': 'default',
+              'ipv4addr': '192.168.10.3', 'comment': 'bulk', 'ttl': 60}],
+            [{'_ref': 'record:a/del', 'name': 'del.ansible.com', 'view': 'default', 'ipv4addr': '192.168.10.4'}],
+            [],
+        ]
+        wapi = api.WapiModule(self.module)
+        wapi.multi_request = Mock(return_value=existing)
+        wapi._send_multi_request = Mock(return_value=['record:a/new', 'record:a/upd', 'record:a/del'])
+        wapi.get_object = Mock()
+
+        res = wapi.run(api.NIOS_A_RECORD, self._bulk_spec())
+
+        self.assertTrue(res['changed'])
+        self.assertEqual([r['changed'] for r in res['results']], [True, False, True, True, False])
+        self.assertEqual([r.get('action') for r in res['results']], ['create', None, 'update', 'delete', None])
+        wapi.get_object.assert_not_called()
+        wapi.multi_request.assert_called_once()
+        wapi._send_multi_request.assert_called_once()
+
+        lookups = wapi.multi_request.call_args_list[0][0][0]
+        self.assertEqual(len(lookups), 5)
+        self.assertEqual(lookups[0]['method'], 'GET')
+        self.assertEqual(lookups[0]['data'], {'name': 'new.ansible.com', 'view': 'default', 'ipv4addr': '192.168.10.1'})
+
+        writes = wapi._send_multi_request.call_args[0][0]
+        self.assertEqual(writes, [
+            {'method': 'POST', 'object': api.NIOS_A_RECORD,
+             'data': {'name': 'New.ansible.com', 'view': 'default', 'ipv4addr': '192.168.10.1', 'comment': 'bulk'}},
+            {'method': 'PUT', 'object': 'record:a/upd',
+             'data': {'name': 'upd.ansible.com', 'ipv4addr': '192.168.10.3', 'ttl': 300, 'comment': 'bulk'}},
+            {'method': 'DELETE', 'object': 'record:a/del'},
+        ])
+        self.assertEqual(res['results'][0]['ref'], 'record:a/new')
+        self.assertEqual(res['results'][2]['diff']['before']['ttl'], 60)
+
+    def _next_ip_wapi(self, count, allocated):
+        self.module.params = {
+            'provider': None, 'state': 'present', 'name': None, 'view': 'default', 'ipv4addr': None,
+            'ttl': None, 'comment': None, 'extattrs': None,
+            'items': [{'name': 'vm%d.ansible.com' % i, 'ipv4addr': {'nios_next_ip': '192.168.10.0/24'}}
+                      for i in range(count)],
+        }
+
+        def get_object(obj_type, obj_filter, return_fields=None):
+            if obj_type == 'view':
+                return [{'_ref': 'view/default', 'network_view': 'default'}]
+            return [{'_ref': 'network/ZG5z:192.168.10.0/24/default'}]
+
+        wapi = api.WapiModule(self.module)
+        wapi.get_object = Mock(side_effect=get_object)
+        wapi.multi_request = Mock(return_value=[[] for i in range(count)])
+        wapi.call_func = Mock(side_effect=[{'ips': ips} for ips in allocated])
+        return wapi
+
+    def test_wapi_bulk_next_ip_allocates_once_per_network(self):
+        wapi = self._next_ip_wapi(3, [['192.168.10.5', '192.168.10.6', '192.168.10.7']])
+        wapi._send_multi_request = Mock(return_value=['record:a/1', 'record:a/2', 'record:a/3'])
+
+        res = wapi.run(api.NIOS_A_RECORD, self._bulk_spec())
+
+        self.assertTrue(res['changed'])
+        # the lookups do not filter on the address that is still to be allocated
+        lookups = wapi.multi_request.call_args[0][0]
+        self.assertEqual(lookups[0]['data'], {'name': 'vm0.ansible.com', 'view': 'default'})
+        wapi.call_func.assert_called_once_with('next_available_ip', 'network/ZG5z:192.168.10.0/24/default', {'num': 3})
+        writes = wapi._send_multi_request.call_args[0][0]
+        self.assertEqual([w['data']['ipv4addr'] for w in writes], ['192.168.10.5', '192.168.10.6', '192.168.10.7'])
+        self.assertEqual([r['item']['ipv4addr'] for r in res['results']], ['192.168.10.5', '192.168.10.6', '192.168.10.7'])
+
+    def test_wapi_bulk_next_ip_retries_with_fresh_addresses(self):
+        wapi = self._next_ip_wapi(2, [['192.168.10.5', '192.168.10.6'], ['192.168.10.8', '192.168.10.9']])
+        sent = []
+
+        def send(requests):
+            sent.append([w['data']['ipv4addr'] for w in requests])
+            if len(sent) == 1:
+                raise api.WapiMultiRequestError(response={'text': 'The IP address 192.168.10.5 is already in use'},
+                                                content='in use', code=400)
+            return ['record:a/1', 'record:a/2']
+        wapi._send_multi_request = Mock(side_effect=send)
+
+        res = wapi.run(api.NIOS_A_RECORD, self._bulk_spec())
+
+        self.assertTrue(res['changed'])
+        self.assertEqual(sent, [['192.168.10.5', '192.168.10.6'], ['192.168.10.8', '192.168.10.9']])
+        self.assertEqual(wapi.call_func.call_args_list[1][0][2],
+                         {'num': 2, 'exclude': ['192.168.10.5', '192.168.10.6']})
+        self.assertEqual([r['ref'] for r in res['results']], ['record:a/1', 'record:a/2'])
+
+    def test_wapi_bulk_next_ip_other_errors_are_not_retried(self):
+        wapi = self._next_ip_wapi(2, [['192.168.10.5', '192.168.10.6']])
+        wapi._send_multi_request = Mock(side_effect=api.WapiMultiRequestError(
+            response={'text': 'Authorization failed'}, content='denied', code=401))
+
+        self.module.fail_json.side_effect = Exception('fail_json')
+
+        with self.assertRaises(Exception):
+            wapi.run(api.NIOS_A_RECORD, self._bulk_spec())
+
+        self.assertEqual(self.module.fail_json.call_args[1]['msg'], 'Authorization failed')
+        wapi._send_multi_request.assert_called_once()
+        wapi.call_func.assert_called_once()
+
+    def test_wapi_bulk_next_ip_existing_record_is_not_reallocated(self):
+        wapi = self._next_ip_wapi(1, [])
+        wapi.multi_request = Mock(return_value=[[{'_ref': 'record:a/vm0', 'name': 'vm0.ansible.com', 'view': 'default',
+                                                  'ipv4addr': '192.168.10.5'}]])
+        wapi._send_multi_request = Mock()
+
+        res = wapi.run(api.NIOS_A_RECORD, self._bulk_spec())
+
+        self.assertFalse(res['changed'])
+        wapi.call_func.assert_not_called()
+        wapi._send_multi_request.assert_not_called()
+
+    def test_wapi_bulk_check_mode_skips_writes(self):
+        self.module.check_mode = True
+        self.module.params = {
+            'provider': None, 'state': 'present', 'name': None, 'view': 'default', 'ipv4addr': None,
+            'ttl': None, 'comment': None, 'extattrs': None,
+            'items': [{'name': 'new.ansible.com', 'ipv4addr': '192.168.10.1'}],
+        }
+        wapi = api.WapiModule(self.module)
+        wapi.multi_request = Mock(return_value=[[]])
+
+        res = wapi.run(api.NIOS_A_RECORD, self._bulk_spec())
+
+        self.assertTrue(res['changed'])
+        wapi.multi_request.assert_called_once()
+
+    def _check_mode_wapi(self, **params):
+        self.module.check_mode = True
+        self.module.params = {
+            'provider': None, 'state': 'present', 'name': 'a.ansible.com', 'view': 'default',
+            'ipv4addr': '192.168.10.1', 'ttl': None, 'comment': None, 'extattrs': None, 'items': None,
+        }
+        self.module.params.update(params)
+        wapi = api.WapiModule(self.module)
+        wapi.create_object = Mock()
+        wapi.update_object = Mock()
+        wapi.delete_object = Mock()
+        return wapi
+
+    def _assert_no_writes(self, wapi):
+        wapi.create_object.assert_not_called()
+        wapi.update_object.assert_not_called()
+        wapi.delete_object.assert_not_called()
+
+    def test_wapi_check_mode_plans_single_record(self):
+        current = {'_ref': 'record:a/a', 'name': 'a.ansible.com', 'view': 'default',
+                   'ipv4addr': '192.168.10.1', 'comment': 'old comment'}
+        for comment, action in (('old comment', 'none'), ('new comment', 'update')):
+            wapi = self._check_mode_wapi(comment=comment)
+            wapi.get_object_ref = Mock(return_value=([copy.deepcopy(current)], False, None))
+
+            res = wapi.run(api.NIOS_A_RECORD, self._bulk_spec())
+
+            self.assertEqual((res['changed'], res['action']), (action != 'none', action))
+            wapi.get_object_ref.assert_called_once()
+            self._assert_no_writes(wapi)
+        self.assertEqual(res['ref'], 'record:a/a')
+        self.assertEqual(res['diff']['before']['comment'], 'old comment')
+        self.assertEqual(res['diff']['after']['comment'], 'new comment')
+
+    def test_wapi_check_mode_plans_delete_and_next_ip_create(self):
+        current = {'_ref': 'record:a/a', 'name': 'a.ansible.com', 'view': 'default', 'ipv4addr': '192.168.10.1'}
+        wapi = self._check_mode_wapi(state='absent')
+        wapi.get_object_ref = Mock(return_value=([copy.deepcopy(current)], False, None))
+        res = wapi.run(api.NIOS_A_RECORD, self._bulk_spec())
+        self.assertEqual((res['changed'], res['action']), (True, 'delete'))
+        self.assertEqual(res['diff']['after'], {})
+
+        wapi = self._check_mode_wapi(ipv4addr="{'nios_next_ip': '192.168.10.0/24'}")
+        wapi.get_object_ref = Mock(return_value=([], False, None))
+        wapi.get_network_view = Mock()
+        res = wapi.run(api.NIOS_A_RECORD, self._bulk_spec())
+        self.assertEqual((res['changed'], res['action']), (True, 'create'))
+        # the network view of the allocation is not looked up
+        wapi.get_network_view.assert_not_called()
+        self._assert_no_writes(wapi)
+
+    def test_wapi_check_mode_plans_host_address_add(self):
+        current = {'_ref': 'record:host/h', 'name': 'h.ansible.com', 'view': 'default',
+                   'ipv4addrs': [{'ipv4addr': '192.168.10.1'}]}
+        wapi = api.WapiModule(self.module)
+        for ipv4addr, changed in (('192.168.10.1', False), ('192.168.10.2', True)):
+            res = wapi.plan_run(api.NIOS_HOST_RECORD, 'present', 'record:host/h', current,
+                                {'name': 'h.ansible.com', 'ipv4addrs': [{'ipv4addr': ipv4addr, 'add': True}]}, True)
+            self.assertEqual(res['changed'], changed)
+
+    def test_wapi_check_mode_plans_items_from_one_read(self):
+        wapi = self._check_mode_wapi(items=[
+            {'name': 'a.ansible.com', 'ipv4addr': '192.168.10.1', 'comment': 'new comment'},
+            {'name': 'b.ansible.com', 'ipv4addr': '192.168.10.2'},
+            {'name': 'c.ansible.com', 'ipv4addr': "{'nios_next_ip': '192.168.10.0/24'}"},
+        ])
+        wapi.multi_request = Mock(return_value=[
+            [{'_ref': 'record:a/a', 'name': 'a.ansible.com', 'view': 'default',
+              'ipv4addr': '192.168.10.1', 'comment': 'old comment'}],
+            [{'_ref': 'record:a/b', 'name': 'b.ansible.com', 'view': 'default', 'ipv4addr': '192.168.10.2'}],
+            [],
+        ])
+        wapi.call_func = Mock()
+        wapi.get_object = Mock()
+
+        res = wapi.run(api.NIOS_A_RECORD, self._bulk_spec())
+
+        update, unchanged, create = res['results']
+        self.assertEqual((update['action'], update['ref']), ('update', 'record:a/a'))
+        self.assertEqual(update['diff']['before']['comment'], 'old comment')
+        self.assertEqual(update['diff']['after']['comment'], 'new comment')
+        self.assertFalse(unchanged['changed'])
+        self.assertNotIn('diff', unchanged)
+        self.assertEqual(create['action'], 'create')
+        wapi.multi_request.assert_called_once()
+        wapi.call_func.assert_not_called()
+        # neither the network view of the DNS view nor an address is looked up
+        wapi.get_object.assert_not_called()
+        self._assert_no_writes(wapi)
+
+    def test_wapi_bulk_missing_required_fails(self):
+        self.module.params = {
+            'provider': None, 'state': 'present', 'name': None, 'view': 'default', 'ipv4addr': None,
+            'ttl': None, 'comment': None, 'extattrs': None,
+            'items': [{'name': 'new.ansible.com'}],
+        }
+        self.module.fail_json.side_effect = Exception('fail_json')
+        wapi = api.WapiModule(self.module)
+        wapi.multi_request = Mock()
+
+        with self.assertRaises(Exception):
+            wapi.run(api.NIOS_A_RECORD, self._bulk_spec())
+
+        self.module.fail_json.assert_called_once_with(msg='items[0]: missing required arguments: ipv4addr')
+        wapi.multi_request.assert_not_called()
+
+    def test_wapi_bulk_rejects_rename(self):
+        self.module.params = {
+            'provider': None, 'state': 'present', 'name': None, 'view': 'default', 'ipv4addr': None,
+            'ttl': None, 'comment': None, 'extattrs': None,
+            'items': [{'name': "{'old_name': 'a', 'new_name': 'b'}", 'ipv4addr': '192.168.10.1'}],
+        }
+        self.module.fail_json.side_effect = Exception('fail_json')
+        wapi = api.WapiModule(self.module)
+
+        with self.assertRaises(Exception):
+            wapi.run(api.NIOS_A_RECORD, self._bulk_spec())
+        self.assertIn('not supported in bulk mode', self.module.fail_json.call_args[1]['msg'])
+
+    def test_multi_request_chunks_requests(self):
+        wapi = api.WapiModule(self.module)
+        requests = [api.wapi_request('DELETE', 'record:a/%d' % i) for i in range(5)]
+        with patch('ansible_collections.infoblox.nios_modules.plugins.module_utils.api.connector_multi_request',
+                   side_effect=lambda connector, chunk: [r['object'] for r in chunk]) as multi_request:
+            res = wapi.multi_request(requests, chunk_size=2)
+
+        self.assertEqual(multi_request.call_count, 3)
+        self.assertEqual(res, ['record:a/%d' % i for i in range(5)])
+
+    def test_get_object_pages_is_lazy(self):
+        wapi = api.WapiModule(self.module)
+        pages = [
+            {'result': [{'_ref': 'record:host/1'}, {'_ref': 'record:host/2'}], 'next_page_id': 'page2'},
+            {'result': [{'_ref': 'record:host/3'}]},
+        ]
+        sent = []
+
+        def get_page(connector, obj_type, query_params, extattrs=None):
+            sent.append(dict(query_params))
+            return pages[len(sent) - 1]
+
+        with patch('ansible_collections.infoblox.nios_modules.plugins.module_utils.api.connector_get_page',
+                   side_effect=get_page):
+            it = wapi.get_object_pages('record:host', {'view': 'default'}, return_fields=['default', 'name'], page_size=2)
+            self.assertEqual(sent, [])
+            self.assertEqual(next(it), pages[0]['result'])
+            self.assertEqual(len(sent), 1)
+            self.assertEqual(list(it), [pages[1]['result']])
+
+        self.assertEqual(sent[0], {'view': 'default', '_return_fields+': 'name', '_paging': 1,
+                                   '_return_as_object': 1, '_max_results': 2})
+        self.assertEqual(sent[1]['_page_id'], 'page2')
+
+    def test_iter_objects_over_httpapi(self):
+        self.module._socket_path = '/tmp/nios-socket'
+        self.module.params = {'provider': None}
+        with patch('ansible_collections.infoblox.nios_modules.plugins.module_utils.api.Connection') as connection:
+            connection.return_value.send_request.side_effect = [
+                (200, {'result': [{'_ref': 'a'}], 'next_page_id': 'page2'}),
+                (200, {'result': [{'_ref': 'b'}]}),
+            ]
+            wapi = api.WapiModule(self.module)
+            res = list(wapi.iter_objects('record:host', extattrs={'Site': {'value': 'HQ'}}, page_size=1))
+
+        self.assertEqual(res, [{'_ref': 'a'}, {'_ref': 'b'}])
+        params = connection.return_value.send_request.call_args[1]['params']
+        self.assertEqual(params, {'_paging': 1, '_return_as_object': 1, '_max_results': 1,
+                                  '_page_id': 'page2', '*Site': 'HQ'})
+
+    def test_get_object_pages_error_reaches_handle_exception(self):
+        self.module.fail_json.side_effect = Exception('fail_json')
+        wapi = api.WapiModule(self.module)
+        exc = api.WapiPagingError(response={'text': 'Result set too large'}, content='Result set too large', code=400)
+        with patch('ansible_collections.infoblox.nios_modules.plugins.module_utils.api.connector_get_page',
+                   side_effect=exc):
+            with self.assertRaises(Exception):
+                list(wapi.get_object_pages('record:host'))
+
+        self.assertEqual(self.module.fail_json.call_args[1]['operation'], 'get_object_pages')
+
+    def test_get_changed_refs(self):
+        wapi = api.WapiInventory(None)
+        wapi.get_object = Mock(return_value=[
+            {'last_sequence_id': '0:101', 'object': 'record:host/h1'},
+            {'last_sequence_id': '0:102', 'object': {'_ref': 'record:host/h2'}},
+            {'last_sequence_id': '0:103', 'object': None},
+        ])
+
+        refs, sequence_id = wapi.get_changed_refs('record:host', '0:100')
+
+        self.assertEqual(refs, {'record:host/h1', 'record:host/h2'})
+        self.assertEqual(sequence_id, '0:103')
+        self.assertEqual(wapi.get_object.call_args[0][1],
+                         {'start_sequence_id': '0:100', 'object_types': 'record:host', 'all_events': False})
+
+    def test_get_changed_refs_overflow(self):
+        wapi = api.WapiInventory(None)
+        wapi.get_object = Mock(return_value=[{'last_sequence_id': '0:1', 'object': 'record:host/h1'}] * 2)
+
+        self.assertEqual(wapi.get_changed_refs('record:host', '0:0', max_results=2), (None, None))
+
+    def test_resolve_refs_batches_and_memoizes(self):
+        wapi = api.WapiModule(self.module)
+        wapi.get_object = Mock()
+        wapi.multi_request = Mock(return_value=[[{'_ref': 'dtc:pool/p1'}], [], [{'_ref': 'dtc:topology/t1'}]])
+
+        refs = wapi.resolve_refs([('dtc:pool', {'name': 'p1'}), ('dtc:pool', {'name': 'missing'}),
+                                  ('dtc:pool', {'name': 'p1'}), ('dtc:topology', {'name': 't1'})])
+
+        self.assertEqual(refs, ['dtc:pool/p1', None, 'dtc:pool/p1', 'dtc:topology/t1'])
+        wapi.multi_request.assert_called_once_with([
+            {'method': 'GET', 'object': 'dtc:pool', 'data': {'name': 'p1'}},
+            {'method': 'GET', 'object': 'dtc:pool', 'data': {'name': 'missing'}},
+            {'method': 'GET', 'object': 'dtc:topology', 'data': {'name': 't1'}},
+        ])
+        wapi.get_object.assert_not_called()
+
+        # cached lookups, including misses, do not hit WAPI again
+        self.assertEqual(wapi.resolve_ref('dtc:pool', {'name': 'missing'}), None)
+        self.assertEqual(wapi.resolve_refs([('dtc:topology', {'name': 't1'})]), ['dtc:topology/t1'])
+        wapi.multi_request.assert_called_once()
+        wapi.get_object.assert_not_called()
+
+    def test_resolve_ref_single_lookup_uses_get_object(self):
+        wapi = api.WapiModule(self.module)
+        wapi.get_object = Mock(return_value=[{'_ref': 'vlanview/default'}])
+        wapi.multi_request = Mock()
+
+        self.assertEqual(wapi.resolve_ref('vlanview', {'name': 'default'}), 'vlanview/default')
+        wapi.get_object.assert_called_once_with('vlanview', {'name': 'default'})
+        wapi.multi_request.assert_not_called()
+
+
+class FakeWapiConnection(object):
+    ''' Stands in for the httpapi connection and records every WAPI round
+    trip made through a WapiHttpApiConnector '''
+
+    def __init__(self, host):
+        self.host = host
+        self.calls = []
+
+    def send_request(self, data, path, method='GET', params=None):
+        self.calls.append((method, path, data, params))
+        if path == 'request':
+            return 200, [[copy.deepcopy(self.host)] if req['method'] == 'GET' else req['object'] for req in data]
+        if method == 'PUT':
+            return 200, copy.deepcopy(self.host)
+        return 200, [copy.deepcopy(self.host)]
+
+
+class TestNiosHostEaInheritance(unittest.TestCase):
+
+    def setUp(self):
+        self.module = MagicMock(name='AnsibleModule')
+        self.module.check_mode = False
+        self.mock_connector = patch('ansible_collections.infoblox.nios_modules.plugins.module_utils.api.get_connector')
+        self.mock_connector.start()
+
+    def tearDown(self):
+        self.mock_connector.stop()
+
+    def test_ea_inheritance_flags_set_in_one_round_trip(self):
+        ref = 'record:host/ZG5z:ansible.com/default'
+        addresses = ['192.168.10.%d' % i for i in range(1, 9)]
+        host = {
+            '_ref': ref, 'name': 'ansible.com', 'view': 'default',
+            'ipv4addrs': [{'_ref': 'record:host_ipv4addr/%d' % i, 'ipv4addr': ip, 'configure_for_dhcp': False}
+                          for i, ip in enumerate(addresses)],
+        }
+        proposed = [{'ipv4addr': ip, 'use_for_ea_inheritance': ip == addresses[3]} for ip in addresses]
+        self.module.params = {'provider': None, 'state': 'present', 'name': 'ansible.com',
+                              'view': 'default', 'configure_for_dns': True, 'ipv4addrs': proposed,
+                              'comment': 'updated'}
+        test_spec = {
+            'name': {'ib_req': True},
+            'view': {'ib_req': True},
+            'configure_for_dns': {'ib_req': True},
+            'ipv4addrs': {},
+            'comment': {},
+        }
+
+        connection = FakeWapiConnection(host)
+        wapi = api.WapiModule(self.module)
+        wapi.connector = api.WapiHttpApiConnector(connection)
+
+        res = wapi.run(api.NIOS_HOST_RECORD, test_spec)
+
+        self.assertTrue(res['changed'])
+        # the lookup, one PUT of the host returning its addresses, then one
+        # multi-request for all the flags
+        self.assertEqual([(method, path) for method, path, data, params in connection.calls],
+                         [('POST', 'request'), ('PUT', ref), ('POST', 'request')])
+        ea_requests = connection.calls[2][2]
+        self.assertEqual(len(ea_requests), 8)
+        # the flag is cleared everywhere before the inheriting address is set
+        self.assertEqual(ea_requests[-1], {'method': 'PUT', 'object': 'record:host_ipv4addr/3',
+                                           'data': {'use_for_ea_inheritance': True}})
+        self.assertTrue(all(req['data'] == {'use_for_ea_inheritance': False} for req in ea_requests[:-1]))
+        flags = dict((addr['ipv4addr'], addr['use_for_ea_inheritance']) for addr in res['object']['ipv4addrs'])
+        self.assertEqual(flags[addresses[3]], True)
+        self.assertEqual(flags[addresses[0]], False)
+
+
+class TestNiosRefCache(unittest.TestCase):
+
+    def setUp(self):
+        super(TestNiosRefCache, self).setUp()
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'cache', 'refs.json')
+        self.provider = {'host': 'nios01', 'username': 'admin', 'wapi_version': '2.12.3', 'ref_cache': self.path,
+                         'ref_cache_ttl': 300}
+
+        self.module = MagicMock(name='AnsibleModule')
+        self.module.check_mode = False
+        self.module.params = {'provider': self.provider}
+        self.mock_connector = patch('ansible_collections.infoblox.nios_modules.plugins.module_utils.api.get_connector')
+        self.mock_connector.start()
+
+    def tearDown(self):
+        super(TestNiosRefCache, self).tearDown()
+        self.mock_connector.stop()
+        shutil.rmtree(self.tmpdir)
+
+    def test_disabled_without_path(self):
+        self.assertIsNone(api.NiosRefCache.from_provider({'host': 'nios01', 'ref_cache': None}))
+        self.assertIsNone(api.NiosRefCache.from_provider(None))
+
+    def test_refs_are_shared_across_invocations(self):
+        wapi = api.WapiModule(self.module)
+        wapi.get_object = Mock(return_value=[{'_ref': 'grid/b25lLmNsdXN0ZXIkMA:Infoblox'}])
+        self.assertEqual(wapi.resolve_ref('grid', {}), 'grid/b25lLmNsdXN0ZXIkMA:Infoblox')
+        self.assertEqual(wapi.ref_cache.stats(), {'hits': 0, 'misses': 1})
+
+        # a later module invocation reads the reference from disk
+        wapi = api.WapiModule(self.module)
+        wapi.get_object = Mock()
+        self.assertEqual(wapi.resolve_ref('grid', {}), 'grid/b25lLmNsdXN0ZXIkMA:Infoblox')
+        wapi.get_object.assert_not_called()
+        self.assertEqual(wapi.ref_cache.stats(), {'hits': 1, 'misses': 0})
+
+    def test_misses_are_not_persisted(self):
+        wapi = api.WapiModule(self.module)
+        wapi.get_object = Mock(return_value=[])
+        self.assertIsNone(wapi.resolve_ref('dtc:pool', {'name': 'missing'}))
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_entries_expire(self):
+        cache = api.NiosRefCache(self.path, 300, 'nios01/2.12.3')
+        cache.set(cache.key('grid', {}), 'grid/abc', 'grid/abc')
+        cache.save()
+
+        with patch('ansible_collections.infoblox.nios_modules.plugins.module_utils.api.time.time',
+                   return_value=api.time.time() + 301):
+            cache = api.NiosRefCache(self.path, 300, 'nios01/2.12.3')
+            self.assertIsNone(cache.get(cache.key('grid', {})))
+        self.assertEqual(cache.stats(), {'hits': 0, 'misses': 1})
+
+    def test_namespaces_are_isolated(self):
+        cache = api.NiosRefCache(self.path, 300, 'nios01/2.12.3')
+        cache.set(cache.key('grid', {}), 'grid/abc', 'grid/abc')
+        cache.save()
+
+        other = api.NiosRefCache(self.path, 300, 'nios02/2.12.3')
+        self.assertIsNone(other.get(other.key('grid', {})))
+
+    def test_delete_invalidates_cached_ref(self):
+        cache = api.NiosRefCache(self.path, 300, 'admin@nios01/2.12.3')
+        cache.set(cache.key('zone_auth', {'fqdn': 'ansible.com'}), 'zone_auth/abc', 'zone_auth/abc')
+        cache.set(cache.key('dtc:pool', {'name': 'pool1'}), 'dtc:pool/def', 'dtc:pool/def')
+        cache.save()
+
+        self.module.params = {'provider': self.provider, 'state': 'absent', 'name': 'pool1',
+                              'comment': None, 'extattrs': None}
+        wapi = api.WapiModule(self.module)
+        wapi.get_object = Mock(return_value=[{'_ref': 'dtc:pool/def', 'name': 'pool1'}])
+        wapi.delete_object = Mock()
+
+        res = wapi.run('dtc:pool', {'name': {'ib_req': True}, 'comment': {}, 'extattrs': {}})
+
+        self.assertTrue(res['changed'])
+        self.assertIn('ref_cache', res)
+        with open(self.path) as f:
+            entries = json.load(f)['admin@nios01/2.12.3']
+        self.assertEqual([v['ref'] for v in entries.values()], ['zone_auth/abc'])
+
+    def test_users_do_not_share_refs(self):
+        cache = api.NiosRefCache.from_provider(self.provider)
+        cache.set(cache.key('grid', {}), 'grid/abc', 'grid/abc')
+        cache.save()
+
+        other = api.NiosRefCache.from_provider(dict(self.provider, username='readonly'))
+        self.assertIsNone(other.get(other.key('grid', {})))
+        self.assertEqual(api.NiosRefCache.from_provider(self.provider).get(cache.key('grid', {})), 'grid/abc')
+
+    def test_network_view_change_invalidates_network_views(self):
+        self.module.params = {'provider': self.provider, 'view': 'internal'}
+        wapi = api.WapiModule(self.module)
+        wapi.get_object = Mock(return_value=[{'_ref': 'view/internal', 'network_view': 'lab'}])
+        self.assertEqual(wapi.get_network_view({'view': 'internal'}), 'lab')
+        wapi.ref_cache.set(wapi.ref_cache.key('grid', {}), 'grid/abc', 'grid/abc')
+
+        # the network view is renamed, the cached entry points to the DNS view
+        wapi.ref_cache.invalidate('networkview/lab')
+        wapi.ref_cache.save()
+
+        wapi = api.WapiModule(self.module)
+        wapi.get_object = Mock(return_value=[{'_ref': 'view/internal', 'network_view': 'lab2'}])
+        self.assertEqual(wapi.get_network_view({'view': 'internal'}), 'lab2')
+        wapi.get_object.assert_called_once()
+        self.assertEqual(wapi.ref_cache.get(wapi.ref_cache.key('grid', {})), 'grid/abc')
@@ -0,0 +1,133 @@
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+try:
+    from ansible_collections.infoblox.nios_modules.tests.unit.compat import unittest
+except ImportError:
+    import unittest
+from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import MagicMock, patch
+from ansible_collections.infoblox.nios_modules.plugins.module_utils import csv_import
+
+
+class TestCsvImport(unittest.TestCase):
+
+    def _rows(self, **params):
+        return csv_import.build_csv_rows(params)
+
+    def test_host_record_row(self):
+        rows = self._rows(host_records=[{'name': 'Host1.Ansible.com.', 'ipv4': [{'address': '192.168.10.1'}, {'ipv4addr': '192.168.10.2'}],
+                                         'ipv6addrs': [{'ipv6addr': '2001:db8::1'}], 'aliases': ['www.ansible.com'],
+                                         'ttl': 300, 'extattrs': {'Site': 'east'}}])
+
+        self.assertEqual(rows, [('host_records', 0, 'hostrecord', {
+            'fqdn*': 'host1.ansible.com', 'view': 'default', 'addresses': '192.168.10.1,192.168.10.2',
+            'ipv6_addresses': '2001:db8::1', 'aliases': 'www.ansible.com', 'configure_for_dns': 'True',
+            'comment': None, 'ttl': 300, 'EA-Site': 'east'})])
+
+    def test_fixed_address_rows(self):
+        rows = self._rows(fixed_addresses=[{'name': 'printer1', 'ipaddr': '192.168.10.50', 'mac': '08:6D:41:E8:FD:E8'},
+                                           {'name': 'v6', 'ipaddr': '2001:db8::50', 'duid': 'AB:CD', 'network_view': 'lab'}])
+
+        self.assertEqual([(r[2], r[3].get('ip_address*') or r[3].get('address*')) for r in rows],
+                         [('fixedaddress', '192.168.10.50'), ('ipv6fixedaddress', '2001:db8::50')])
+        self.assertEqual(rows[0][3]['mac_address'], '08:6d:41:e8:fd:e8')
+        self.assertEqual(rows[1][3]['duid'], 'ab:cd')
+        self.assertEqual(rows[1][3]['network_view'], 'lab')
+
+    def test_network_and_single_value_extattrs(self):
+        rows = self._rows(fixed_addresses=[{'name': 'printer1', 'ipaddr': '192.168.10.50', 'mac': '08:6D:41:E8:FD:E8',
+                                            'network': '192.168.10.0/24', 'extattrs': {'Site': ['east'], 'Rack': 4}}])
+
+        self.assertNotIn('network', rows[0][3])
+        self.assertEqual(rows[0][3]['EA-Site'], 'east')
+        self.assertEqual(rows[0][3]['EA-Rack'], 4)
+
+    def test_invalid_items_name_the_item(self):
+        cases = [
+            (dict(host_records=[{'name': 'a.ansible.com', 'ipv4addrs': [{'ipv4addr': '192.168.10.1'}]}, {'ipv4addrs': []}]),
+             'host_records[1]: missing required arguments: name'),
+            (dict(host_records=[{'name': 'a.ansible.com'}]), 'host_records[0]: one of ipv4addrs or ipv6addrs is required'),
+            (dict(host_records=[{'name': 'a.ansible.com', 'ipv4addrs': [{'ipv4addr': '192.168.10.1', 'mac': '08:6d:41:e8:fd:e8'}]}]),
+             'host_records[0]: ipv4addrs: mac not supported by CSV import'),
+            (dict(host_records=[{'name': 'a.ansible.com', 'ipv4addrs': [{'ipv4addr': 'func:nextavailableip:192.168.10.0/24'}]}]),
+             'host_records[0]: ipv4addrs: next available addresses are not supported by CSV import'),
+            (dict(fixed_addresses=[{'name': 'a', 'ipaddr': '192.168.10.1'}]),
+             "fixed_addresses[0]: the 'mac' of an IPv4 fixed address must be specified"),
+            (dict(fixed_addresses=[{'name': 'a', 'ipaddr': 'printer', 'mac': '08:6d:41:e8:fd:e8'}]),
+             'fixed_addresses[0]: ipaddr: printer is not a valid IP address'),
+            (dict(fixed_addresses=[{'name': 'a', 'ipaddr': '192.168.11.1', 'mac': '08:6d:41:e8:fd:e8', 'network': '192.168.10.0/24'}]),
+             'fixed_addresses[0]: network: 192.168.11.1 is not in network 192.168.10.0/24'),
+            (dict(host_records=[{'name': 'a.ansible.com', 'ipv4addrs': [{'ipv4addr': '192.168.10.1'}],
+                                 'extattrs': {'Site': ['east', 'west']}}]),
+             'host_records[0]: extattrs: Site has several values, which are not supported by CSV import'),
+        ]
+        for params, msg in cases:
+            with self.assertRaises(ValueError) as ctx:
+                self._rows(**params)
+            self.assertEqual(str(ctx.exception), msg)
+
+    def test_write_csv(self):
+        rows = self._rows(host_records=[{'name': 'a.ansible.com', 'ipv4addrs': [{'ipv4addr': '192.168.10.1'}],
+                                         'comment': 'rack 1, unit 2'},
+                                        {'name': 'b.ansible.com', 'ipv4addrs': [{'ipv4addr': '192.168.10.2'}],
+                                         'extattrs': {'Site': 'east'}}],
+                          fixed_addresses=[{'name': 'p', 'ipaddr': '192.168.10.50', 'mac': '08:6d:41:e8:fd:e8'}])
+
+        self.assertEqual(csv_import.write_csv(rows).splitlines(), [
+            'header-fixedaddress,ip_address*,network_view,mac_address,match_option,name,comment',
+            'fixedaddress,192.168.10.50,default,08:6d:41:e8:fd:e8,MAC,p,',
+            'header-hostrecord,fqdn*,view,addresses,ipv6_addresses,aliases,configure_for_dns,comment,ttl,EA-Site',
+            'hostrecord,a.ansible.com,default,192.168.10.1,,,True,"rack 1, unit 2",,',
+            'hostrecord,b.ansible.com,default,192.168.10.2,,,True,,,east',
+        ])
+
+    def test_parse_csv_error_log(self):
+        rows = self._rows(host_records=[{'name': 'a.ansible.com', 'ipv4addrs': [{'ipv4addr': '192.168.10.1'}]},
+                                        {'name': 'b.ansible.com', 'view': 'internal', 'ipv4addrs': [{'ipv4addr': '192.168.10.2'}]}],
+                          fixed_addresses=[{'name': 'p', 'ipaddr': '192.168.10.50', 'mac': '08:6d:41:e8:fd:e8'}])
+        log = ('header-HostRecord,FQDN*,VIEW,ADDRESSES\n'
+               'HostRecord,B.ansible.com,internal,192.168.10.2,"The record already exists."\n'
+               'header-fixedaddress,ip_address*,network_view\n'
+               'fixedaddress,192.168.10.50,default,Network not found,in network view default\n'
+               'fixedaddress,192.168.99.1,default,Unknown\n')
+
+        self.assertEqual(csv_import.parse_csv_error_log(log, rows), [
+            {'option': 'host_records', 'index': 1, 'msg': 'The record already exists.'},
+            {'option': 'fixed_addresses', 'index': 0, 'msg': 'Network not found in network view default'},
+            {'option': None, 'index': None, 'msg': 'Unknown'},
+        ])
+
+    def test_large_load_is_one_import(self):
+        items = [{'name': 'host%d.ansible.com' % i, 'ipv4addrs': [{'ipv4addr': '10.%d.%d.%d' % (i >> 16, (i >> 8) & 255, i & 255)}]}
+                 for i in range(20000)]
+        rows = self._rows(host_records=items)
+        content = csv_import.write_csv(rows)
+        self.assertEqual(content.count('\n'), 20001)
+
+        wapi = MagicMock()
+        wapi.call_func.side_effect = [{'token': 't1', 'url': 'https://nios01/upload/1'},
+                                      {'csv_import_task': {'import_id': 7, 'status': 'PENDING'}}]
+        task = csv_import.csv_import(wapi, content, operation='MERGE')
+
+        self.assertEqual(task, {'import_id': 7, 'status': 'PENDING'})
+        self.assertEqual(wapi.upload_file.call_count, 1)
+        self.assertEqual(wapi.call_func.call_args_list[1][0][2],
+                         {'token': 't1', 'action': 'START', 'doimport': True, 'operation': 'MERGE', 'on_error': 'CONTINUE'})
+
+    @patch.object(csv_import, 'time')
+    def test_wait_csv_import(self, mock_time):
+        mock_time.time.side_effect = [0, 1, 2, 3]
+        wapi = MagicMock()
+        wapi.get_object.side_effect = [[{'import_id': 7, 'status': 'RUNNING'}], [{'import_id': 7, 'status': 'COMPLETED'}]]
+
+        task, done = csv_import.wait_csv_import(wapi, {'import_id': 7, 'status': 'PENDING'}, 10, 5)
+
+        self.assertTrue(done)
+        self.assertEqual(task['status'], 'COMPLETED')
+        self.assertEqual(mock_time.sleep.call_count, 2)
+
+        mock_time.time.side_effect = [0, 20]
+        task, done = csv_import.wait_csv_import(wapi, {'import_id': 8, 'status': 'PENDING'}, 10, 5)
+        self.assertFalse(done)
@@ -0,0 +1,115 @@
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+try:
+    from ansible_collections.infoblox.nios_modules.tests.unit.compat import unittest
+except ImportError:
+    import unittest
+from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import MagicMock
+from ansible_collections.infoblox.nios_modules.plugins.module_utils import drift
+
+
+class TestDriftReport(unittest.TestCase):
+
+    def setUp(self):
+        self.snapshot = [
+            ('record:host', {'_ref': 'record:host/1', 'name': 'host1.ansible.com', 'view': 'default',
+                             'ipv4addrs': [{'_ref': 'record:host_ipv4addr/1', 'ipv4addr': '192.168.10.1',
+                                            'host': 'host1.ansible.com', 'configure_for_dhcp': False}],
+                             'extattrs': {'Site': {'value': 'east'}}}),
+            ('record:host', {'_ref': 'record:host/2', 'name': 'host2.ansible.com', 'view': 'default',
+                             'ipv4addrs': [{'ipv4addr': '192.168.10.2', 'configure_for_dhcp': False}]}),
+            ('network', {'_ref': 'network/1', 'network': '192.168.10.0/24', 'network_view': 'default', 'comment': 'lab',
+                         'members': [{'_struct': 'dhcpmember', 'name': 'm1.ansible.com', 'ipv4addr': '10.0.0.1'}]}),
+            ('record:a', {'_ref': 'record:a/1', 'name': 'www.ansible.com', 'view': 'default', 'ipv4addr': '192.168.10.10'}),
+        ]
+
+    def test_report(self):
+        report = drift.DriftReport([
+            {'type': 'record:host', 'name': 'HOST1.ansible.com.', 'ipv4addrs': [{'ipv4addr': '192.168.10.1'}],
+             'extattrs': {'Site': 'east'}},
+            {'type': 'record:host', 'name': 'host2.ansible.com', 'ipv4addrs': [{'ipv4addr': '192.168.10.2'}],
+             'comment': 'web', 'extattrs': {'Site': 'west'}},
+            {'type': 'network', 'network': '192.168.10.0/24', 'comment': 'lab', 'members': [{'name': 'm1.ansible.com'}]},
+            {'type': 'network', 'network': '192.168.11.0/24', 'network_view': 'lab'},
+        ])
+
+        result = report.run(iter(self.snapshot))
+
+        self.assertEqual(result['summary'], {'in_sync': 2, 'drifted': 1, 'unverified': 0, 'missing': 1, 'unmanaged': 0})
+        self.assertEqual(result['drift'], [
+            {'index': 1, 'type': 'record:host', 'key': {'name': 'host2.ansible.com', 'view': 'default'},
+             'status': 'drifted', 'ref': 'record:host/2',
+             'diff': {'comment': {'current': None, 'desired': 'web'},
+                      'extattrs': {'current': None, 'desired': {'Site': 'west'}}}},
+            {'index': 3, 'type': 'network', 'key': {'network': '192.168.11.0/24', 'network_view': 'lab'},
+             'status': 'missing'},
+        ])
+
+    def test_report_unmanaged_and_keys(self):
+        report = drift.DriftReport([{'type': 'record:host', 'name': 'host1.ansible.com', 'view': 'default'},
+                                    {'type': 'record:a', 'name': 'www.ansible.com', 'ipv4addr': '192.168.10.11'}],
+                                   keys={'record:a': ['name', 'view']})
+
+        result = report.run(iter(self.snapshot), report_unmanaged=True)
+
+        self.assertEqual(result['summary'], {'in_sync': 1, 'drifted': 1, 'unverified': 0, 'missing': 0, 'unmanaged': 1})
+        self.assertEqual(result['drift'][0]['diff'], {'ipv4addr': {'current': '192.168.10.10', 'desired': '192.168.10.11'}})
+        self.assertEqual(result['drift'][1], {'type': 'record:host', 'key': {'name': 'host2.ansible.com', 'view': 'default'},
+                                              'status': 'unmanaged', 'ref': 'record:host/2'})
+
+    def test_partial_snapshot_fields_unverified(self):
+        report = drift.DriftReport([
+            {'type': 'record:a', 'name': 'www.ansible.com', 'ipv4addr': '192.168.10.10', 'ttl': 300},
+            {'type': 'network', 'network': '192.168.10.0/24', 'comment': 'prod', 'options': [{'name': 'routers', 'value': '10.0.0.1'}]},
+        ])
+
+        result = report.run(iter(self.snapshot), partial=True)
+
+        self.assertEqual(result['summary'], {'in_sync': 0, 'drifted': 1, 'unverified': 1, 'missing': 0, 'unmanaged': 0})
+        self.assertEqual(result['drift'], [
+            {'index': 0, 'type': 'record:a', 'key': {'name': 'www.ansible.com', 'view': 'default', 'ipv4addr': '192.168.10.10'},
+             'status': 'unverified', 'ref': 'record:a/1', 'unverified': ['ttl']},
+            {'index': 1, 'type': 'network', 'key': {'network': '192.168.10.0/24', 'network_view': 'default'},
+             'status': 'drifted', 'ref': 'network/1', 'diff': {'comment': {'current': 'lab', 'desired': 'prod'}},
+             'unverified': ['options']},
+        ])
+
+        # fetched objects hold every field asked for, a missing one drifted
+        result = report.run(iter(self.snapshot))
+        self.assertEqual(result['drift'][0]['diff'], {'ttl': {'current': None, 'desired': 300}})
+
+    def test_invalid_desired(self):
+        with self.assertRaises(ValueError) as ctx:
+            drift.DriftReport([{'type': 'network', 'network': '192.168.10.0/24'}, {'name': 'a'}])
+        self.assertEqual(str(ctx.exception), 'desired[1]: type is required')
+        with self.assertRaises(ValueError) as ctx:
+            drift.DriftReport([{'type': 'record:a', 'comment': 'a'}])
+        self.assertEqual(str(ctx.exception), 'desired[0]: missing key fields: name, ipv4addr')
+
+    def test_fetch_snapshot_reads_compared_fields(self):
+        report = drift.DriftReport([{'type': 'network', 'network': '192.168.10.0/24', 'comment': 'lab'},
+                                    {'type': 'record:a', 'name': 'www.ansible.com', 'ipv4addr': '192.168.10.10', 'ttl': 60}])
+        wapi = MagicMock()
+        wapi.iter_objects.side_effect = lambda obj_type, **kwargs: iter(o for t, o in self.snapshot if t == obj_type)
+
+        snapshot = list(drift.fetch_snapshot(wapi, report, page_size=500))
+
+        self.assertEqual([t for t, o in snapshot], ['network', 'record:a'])
+        self.assertEqual(wapi.iter_objects.call_args_list[0][1],
+                         {'return_fields': ['comment', 'network', 'network_view'], 'page_size': 500})
+        self.assertEqual(wapi.iter_objects.call_args_list[1][1]['return_fields'], ['ipv4addr', 'name', 'ttl', 'view'])
+
+    def test_many_objects_in_one_pass(self):
+        size = 20000
+        snapshot = [('record:a', {'_ref': 'record:a/%d' % i, 'name': 'a%d.ansible.com' % i, 'view': 'default',
+                                  'ipv4addr': '10.0.%d.%d' % (i // 256, i % 256), 'comment': 'c%d' % i})
+                    for i in range(size)]
+        desired = [{'type': 'record:a', 'name': 'a%d.ansible.com' % i, 'ipv4addr': '10.0.%d.%d' % (i // 256, i % 256),
+                    'comment': 'c%d' % (i if i % 100 else -1)} for i in reversed(range(size))]
+
+        result = drift.DriftReport(desired).run(iter(snapshot))
+
+        self.assertEqual(result['summary'], {'in_sync': size - size // 100, 'drifted': size // 100, 'unverified': 0, 'missing': 0, 'unmanaged': 0})
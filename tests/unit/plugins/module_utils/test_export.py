@@ -0,0 +1,105 @@
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import gzip
+import io
+import os
+import shutil
+import tempfile
+import threading
+
+try:
+    from ansible_collections.infoblox.nios_modules.tests.unit.compat import unittest
+except ImportError:
+    import unittest
+from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import MagicMock, patch
+from ansible_collections.infoblox.nios_modules.plugins.module_utils import api, export
+
+
+def fake_pages(objects, requests=None, fail=None):
+    ''' Returns a connector_get_page replacement paging through objects '''
+    lock = threading.Lock()
+
+    def get_page(connector, obj_type, query_params, extattrs=None):
+        if obj_type == fail:
+            raise api.InfobloxException(response={'text': 'search failed'})
+        with lock:
+            if requests is not None:
+                requests.append((obj_type, dict(query_params)))
+        start = int(query_params.get('_page_id', 0))
+        size = query_params['_max_results']
+        response = {'result': objects.get(obj_type, [])[start:start + size]}
+        if start + size < len(objects.get(obj_type, [])):
+            response['next_page_id'] = str(start + size)
+        return response
+    return get_page
+
+
+class TestExport(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.wapi = MagicMock()
+        self.objects = {
+            'network': [{'_ref': 'network/%d' % i, 'network': '10.0.%d.0/24' % i} for i in range(5)],
+            'record:host': [{'_ref': 'record:host/1', 'name': 'host1.ansible.com', 'extattrs': {'Site': {'value': 'east'}}}],
+        }
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _export(self, searches, **kwargs):
+        stream = io.BytesIO()
+        counts = export.export_objects(self.wapi, searches, stream, tmpdir=self.tmpdir, **kwargs)
+        path = os.path.join(self.tmpdir, 'export.jsonl.gz')
+        with open(path, 'wb') as f:
+            f.write(stream.getvalue())
+        return counts, path, stream.getvalue()
+
+    def test_export_objects(self):
+        requests = []
+        with patch.object(api, 'connector_get_page', side_effect=fake_pages(self.objects, requests)):
+            counts, path, content = self._export([{'type': 'network', 'return_fields': ['network']},
+                                                  {'type': 'record:host', 'filters': {'view': 'default'}}],
+                                                 workers=2, page_size=2)
+
+        self.assertEqual(counts, {'network': 5, 'record:host': 1})
+        self.assertEqual(list(export.iter_export(path)),
+                         [('network', obj) for obj in self.objects['network']] + [('record:host', self.objects['record:host'][0])])
+        self.assertEqual(len([r for r in requests if r[0] == 'network']), 3)
+        host_query = [q for t, q in requests if t == 'record:host'][0]
+        self.assertEqual(host_query['view'], 'default')
+        self.assertEqual(host_query['_return_fields+'], 'extattrs')
+        with gzip.open(path, 'rt') as f:
+            self.assertEqual(f.readline(), '{"object":{"_ref":"network/0","network":"10.0.0.0/24"},"type":"network"}\n')
+        self.assertEqual(os.listdir(self.tmpdir), ['export.jsonl.gz'])
+
+        # the same objects give the same bytes, whatever the concurrency
+        with patch.object(api, 'connector_get_page', side_effect=fake_pages(self.objects)):
+            self.assertEqual(self._export([{'type': 'network', 'return_fields': ['network']},
+                                           {'type': 'record:host', 'filters': {'view': 'default'}}])[2], content)
+
+    def test_export_error_is_raised(self):
+        with patch.object(api, 'connector_get_page', side_effect=fake_pages(self.objects, fail='record:host')):
+            with self.assertRaises(export.ExportError) as ctx:
+                self._export([{'type': 'network'}, {'type': 'record:host'}], workers=2)
+        self.assertEqual(ctx.exception.obj_type, 'record:host')
+        self.assertEqual(str(ctx.exception), 'record:host: search failed')
+        self.assertEqual(os.listdir(self.tmpdir), [])
+
+    def test_export_workers_use_own_connectors(self):
+        with patch.object(api, 'connector_get_page', side_effect=fake_pages(self.objects)) as get_page:
+            self._export([{'type': 'network'}, {'type': 'record:host'}], workers=2)
+
+        self.assertEqual(set(c[0][0] for c in get_page.call_args_list), set([self.wapi.new_connector.return_value]))
+        self.assertFalse(any(c[0][0] is self.wapi.connector for c in get_page.call_args_list))
+
+    def test_export_many_objects(self):
+        self.objects['record:a'] = [{'_ref': 'record:a/%d' % i, 'name': 'a%d.ansible.com' % i} for i in range(50000)]
+        with patch.object(api, 'connector_get_page', side_effect=fake_pages(self.objects)):
+            counts, path, dummy = self._export([{'type': t} for t in ('record:a', 'network', 'record:host')], workers=3)
+
+        self.assertEqual(counts, {'record:a': 50000, 'network': 5, 'record:host': 1})
+        self.assertEqual(sum(1 for dummy in export.iter_export(path)), 50006)
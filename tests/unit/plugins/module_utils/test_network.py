@@ -0,0 +1,91 @@
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import ipaddress
+try:
+    from ansible_collections.infoblox.nios_modules.tests.unit.compat import unittest
+except ImportError:
+    import unittest
+from ansible_collections.infoblox.nios_modules.plugins.module_utils.network import IpamIndex, SubnetAllocator
+
+
+class TestSubnetAllocator(unittest.TestCase):
+
+    def test_allocates_lowest_free_block(self):
+        allocator = SubnetAllocator('192.168.10.0/24')
+        self.assertEqual(str(allocator.allocate(26)), '192.168.10.0/26')
+        self.assertEqual(str(allocator.allocate(26)), '192.168.10.64/26')
+        self.assertEqual(str(allocator.allocate(25)), '192.168.10.128/25')
+        with self.assertRaises(ValueError):
+            allocator.allocate(30)
+
+    def test_skips_used_networks(self):
+        allocator = SubnetAllocator('192.168.10.0/24', ['192.168.10.0/26', '192.168.10.128/27', '10.0.0.0/8'])
+        self.assertEqual([str(net) for net in allocator.plan([26, 28, 28])],
+                         ['192.168.10.64/26', '192.168.10.160/28', '192.168.10.176/28'])
+
+    def test_best_fit_keeps_large_blocks_whole(self):
+        # the /28 is carved from the free /27, not from the free /25
+        allocator = SubnetAllocator('192.168.10.0/24', ['192.168.10.0/26', '192.168.10.64/27'])
+        self.assertEqual(str(allocator.allocate(28)), '192.168.10.96/28')
+        self.assertEqual(str(allocator.allocate(25)), '192.168.10.128/25')
+
+    def test_plan_allocates_largest_first_in_request_order(self):
+        allocator = SubnetAllocator('192.168.10.0/24')
+        self.assertEqual([str(net) for net in allocator.plan([27, 25, 26, 27])],
+                         ['192.168.10.192/27', '192.168.10.0/25', '192.168.10.128/26', '192.168.10.224/27'])
+
+    def test_ipv6(self):
+        allocator = SubnetAllocator('2001:db8::/64', ['2001:db8::/66'])
+        self.assertEqual([str(net) for net in allocator.plan([65, 66])],
+                         ['2001:db8:0:0:8000::/65', '2001:db8:0:0:4000::/66'])
+
+    def test_many_used_networks(self):
+        used = [str(net) for net in list(ipaddress.ip_network('10.0.0.0/8').subnets(new_prefix=24))[:20000:2]]
+        allocator = SubnetAllocator('10.0.0.0/8', used)
+        self.assertEqual(str(allocator.allocate(24)), '10.0.1.0/24')
+        self.assertEqual(str(allocator.allocate(16)), '10.79.0.0/16')
+
+
+class TestIpamIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = IpamIndex(
+            ['192.168.10.0/24', '192.168.11.0/25', '10.0.0.0/30', '192.168.11.128/31'],
+            [('192.168.10.10', '192.168.10.19'), ('192.168.10.15', '192.168.10.25'),
+             ('192.168.10.26', '192.168.10.26'), ('192.168.10.200', '192.168.10.200'),
+             ('192.168.11.1', '192.168.11.1'), ('10.0.0.1', '10.0.0.2')])
+
+    def test_usage_merges_overlapping_intervals(self):
+        self.assertEqual(self.index.usage('192.168.10.0/24'),
+                         {'network': '192.168.10.0/24', 'total': 254, 'used': 18, 'free': 236})
+        self.assertEqual(self.index.usage('10.0.0.0/30')['free'], 0)
+        self.assertEqual(self.index.usage('192.168.11.128/31'),
+                         {'network': '192.168.11.128/31', 'total': 2, 'used': 0, 'free': 2})
+
+    def test_used_count_clips_partial_intervals(self):
+        first = int(ipaddress.ip_address('192.168.10.20'))
+        last = int(ipaddress.ip_address('192.168.10.199'))
+        self.assertEqual(self.index.used_count(first, last), 7)
+        self.assertEqual(self.index.used_count(first + 100, last), 0)
+
+    def test_overlapping(self):
+        self.assertEqual([str(net) for net in self.index.overlapping('192.168.11.0/24')],
+                         ['192.168.11.0/25', '192.168.11.128/31'])
+        self.assertEqual([str(net) for net in self.index.overlapping('192.168.10.64/26')], ['192.168.10.0/24'])
+        self.assertEqual(self.index.overlapping('172.16.0.0/12'), [])
+
+    def test_free_networks(self):
+        self.assertEqual([usage['network'] for usage in self.index.free_networks(100)],
+                         ['192.168.10.0/24', '192.168.11.0/25'])
+        self.assertEqual([usage['network'] for usage in self.index.free_networks(1, ['192.168.11.0/24', '10.0.0.0/8'])],
+                         ['192.168.11.0/25', '192.168.11.128/31'])
+
+    def test_many_networks(self):
+        networks = list(ipaddress.ip_network('10.0.0.0/8').subnets(new_prefix=24))[:20000]
+        used = [(str(net[1]), str(net[100])) for net in networks[::2]]
+        index = IpamIndex(networks, used)
+        self.assertEqual(len(index.free_networks(200)), 10000)
+        self.assertEqual(index.usage('10.0.2.0/24')['free'], 154)
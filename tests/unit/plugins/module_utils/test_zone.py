@@ -0,0 +1,285 @@
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import io
+import itertools
+
+try:
+    from ansible_collections.infoblox.nios_modules.tests.unit.compat import unittest
+except ImportError:
+    import unittest
+from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import MagicMock, patch
+from ansible_collections.infoblox.nios_modules.plugins.module_utils import zone
+from ansible_collections.infoblox.nios_modules.plugins.module_utils.api import InfobloxException
+
+
+class TestZoneRecords(unittest.TestCase):
+
+    def test_qualify_name(self):
+        self.assertEqual(zone.qualify_name('@', 'ansible.com'), 'ansible.com')
+        self.assertEqual(zone.qualify_name('WWW', 'ansible.com'), 'www.ansible.com')
+        self.assertEqual(zone.qualify_name('www.ansible.com', 'ansible.com'), 'www.ansible.com')
+        self.assertEqual(zone.qualify_name('www.example.com.', 'ansible.com'), 'www.example.com')
+        self.assertEqual(zone.qualify_name('sub.example', 'ansible.com'), 'sub.example.ansible.com')
+
+    def test_normalize_record(self):
+        self.assertEqual(zone.normalize_record({'type': 'aaaa', 'name': 'v6', 'ipv6addr': '2001:DB8:0::1', 'ttl': '60'},
+                                               'ansible.com'),
+                         ('AAAA', {'name': 'v6.ansible.com', 'ipv6addr': '2001:db8::1', 'ttl': 60}))
+        self.assertEqual(zone.normalize_record({'type': 'MX', 'mail_exchanger': 'Mail.Ansible.com.', 'preference': '10'},
+                                               'ansible.com'),
+                         ('MX', {'name': 'ansible.com', 'mail_exchanger': 'mail.ansible.com', 'preference': 10}))
+
+    def test_normalize_record_errors(self):
+        with self.assertRaises(ValueError) as ctx:
+            zone.normalize_record({'type': 'NS', 'name': 'a'}, 'ansible.com')
+        self.assertIn('unsupported record type', str(ctx.exception))
+        with self.assertRaises(ValueError) as ctx:
+            zone.normalize_record({'type': 'SRV', 'name': '_sip._tcp', 'target': 'a', 'port': 5060, 'priority': 0},
+                                  'ansible.com')
+        self.assertIn('missing weight', str(ctx.exception))
+        with self.assertRaises(ValueError) as ctx:
+            zone.normalize_record({'type': 'A', 'name': 'a', 'ipv4addr': '192.168.10.1', 'canonical': 'b'}, 'ansible.com')
+        self.assertIn('unsupported A record fields: canonical', str(ctx.exception))
+
+    def _existing(self):
+        return [
+            ('A', {'_ref': 'record:a/1', 'name': 'www.ansible.com', 'ipv4addr': '192.168.10.10', 'ttl': 300, 'use_ttl': True}),
+            ('A', {'_ref': 'record:a/2', 'name': 'www.ansible.com', 'ipv4addr': '192.168.10.11', 'use_ttl': False}),
+            ('A', {'_ref': 'record:a/3', 'name': 'old.ansible.com', 'ipv4addr': '192.168.10.12'}),
+            ('A', {'_ref': 'record:a/4', 'name': 'old.ansible.com', 'ipv4addr': '192.168.10.12'}),
+            ('CNAME', {'_ref': 'record:cname/1', 'name': 'web.ansible.com', 'canonical': 'www.ansible.com', 'comment': 'web'}),
+        ]
+
+    def _desired(self):
+        return [zone.normalize_record(record, 'ansible.com') for record in [
+            {'type': 'A', 'name': 'www', 'ipv4addr': '192.168.10.10', 'ttl': 300},
+            {'type': 'A', 'name': 'www', 'ipv4addr': '192.168.10.11', 'ttl': 300},
+            {'type': 'A', 'name': 'new', 'ipv4addr': '192.168.10.13'},
+            {'type': 'CNAME', 'name': 'web', 'canonical': 'new.ansible.com', 'comment': 'web'},
+        ]]
+
+    def test_plan_zone_records(self):
+        plan = zone.plan_zone_records(self._desired(), self._existing())
+
+        self.assertEqual(plan['create'], [('A', {'name': 'new.ansible.com', 'ipv4addr': '192.168.10.13'})])
+        self.assertEqual([(obj['_ref'], changes) for record_type, obj, changes in plan['update']], [
+            ('record:a/2', {'ttl': 300, 'use_ttl': True}),
+            ('record:cname/1', {'canonical': 'new.ansible.com'}),
+        ])
+        self.assertEqual(plan['delete'], [])
+
+    def test_plan_zone_records_purge(self):
+        plan = zone.plan_zone_records(self._desired(), self._existing(), purge=True)
+
+        self.assertEqual(sorted(obj['_ref'] for record_type, obj in plan['delete']), ['record:a/3', 'record:a/4'])
+
+    def test_plan_zone_records_rejects_duplicates(self):
+        desired = self._desired()
+        with self.assertRaises(ValueError):
+            zone.plan_zone_records(desired + desired[:1], [])
+
+    def test_plan_zone_records_large_zone(self):
+        existing = [('A', {'_ref': 'record:a/%d' % i, 'name': 'h%d.ansible.com' % i,
+                           'ipv4addr': '10.%d.%d.%d' % (i >> 16, (i >> 8) & 255, i & 255)}) for i in range(20000)]
+        desired = [('A', {'name': obj['name'], 'ipv4addr': obj['ipv4addr']}) for record_type, obj in existing[1:]]
+
+        plan = zone.plan_zone_records(desired, existing, purge=True)
+
+        self.assertEqual((len(plan['create']), len(plan['update'])), (0, 0))
+        self.assertEqual([obj['_ref'] for record_type, obj in plan['delete']], ['record:a/0'])
+
+    def test_sync_zone_records(self):
+        existing = self._existing()
+        wapi = MagicMock()
+        wapi.iter_objects.side_effect = lambda obj_type, payload, **kwargs: iter(
+            [obj for record_type, obj in existing if zone.ZONE_RECORD_TYPES[record_type][0] == obj_type])
+        records = [
+            {'type': 'A', 'name': 'www', 'ipv4addr': '192.168.10.10'},
+            {'type': 'TXT', 'name': '@', 'text': 'v=spf1 -all', 'ttl': 60},
+        ]
+
+        result = zone.sync_zone_records(wapi, 'Ansible.com.', 'internal', records, purge=True)
+
+        self.assertTrue(result['changed'])
+        self.assertEqual(wapi.iter_objects.call_count, len(zone.ZONE_RECORD_TYPES))
+        self.assertEqual(wapi.iter_objects.call_args_list[0][0][1], {'zone': 'ansible.com', 'view': 'internal'})
+        wapi._send_multi_request.assert_called_once()
+        requests = wapi._send_multi_request.call_args[0][0]
+        self.assertEqual([request['method'] for request in requests], ['DELETE'] * 4 + ['POST'])
+        self.assertEqual(requests[-1], {'method': 'POST', 'object': 'record:txt', 'data': {
+            'name': 'ansible.com', 'text': 'v=spf1 -all', 'ttl': 60, 'use_ttl': True, 'view': 'internal'}})
+        self.assertEqual(len(result['changes']['delete']), 4)
+
+    def test_zone_plan_requests_pairs_deletes_with_creates(self):
+        plan = {
+            'delete': [('A', {'_ref': 'record:a/1', 'name': 'www.ansible.com', 'ipv4addr': '192.168.10.10'}),
+                       ('A', {'_ref': 'record:a/2', 'name': 'old.ansible.com', 'ipv4addr': '192.168.10.11'})],
+            'create': [('CNAME', {'name': 'www.ansible.com', 'canonical': 'web.ansible.com'})],
+            'update': [('TXT', {'_ref': 'record:txt/1', 'name': 'ansible.com'}, {'ttl': 60, 'use_ttl': True})],
+        }
+
+        groups = zone.zone_plan_requests(plan, 'default')
+
+        self.assertEqual([[(kind, request['method']) for kind, change, request in group] for group in groups], [
+            [('delete', 'DELETE'), ('create', 'POST')],
+            [('delete', 'DELETE')],
+            [('update', 'PUT')],
+        ])
+        # a group is never split across chunks
+        chunks = zone.chunk_request_groups(groups, chunk_size=2)
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 2])
+
+    def test_sync_zone_records_reports_applied_changes(self):
+        # a renamed CNAME on every name: the old A record and its CNAME
+        # replacement must be applied together
+        existing = [('A', {'_ref': 'record:a/%d' % i, 'name': 'h%d.ansible.com' % i,
+                           'ipv4addr': '192.168.10.%d' % i}) for i in range(3)]
+        records = [{'type': 'CNAME', 'name': 'h%d' % i, 'canonical': 'www.ansible.com'} for i in range(3)]
+        wapi = MagicMock()
+        wapi.iter_objects.side_effect = lambda obj_type, payload, **kwargs: iter(
+            [obj for record_type, obj in existing if zone.ZONE_RECORD_TYPES[record_type][0] == obj_type])
+        wapi._send_multi_request.side_effect = [[], InfobloxException(response={'text': 'Duplicate object'})]
+
+        with patch.object(zone, 'NIOS_MULTI_REQUEST_CHUNK_SIZE', 4):
+            with self.assertRaises(zone.ZoneSyncError) as ctx:
+                zone.sync_zone_records(wapi, 'ansible.com', 'default', records, purge=True)
+
+        chunks = [c[0][0] for c in wapi._send_multi_request.call_args_list]
+        self.assertEqual([[request['method'] for request in chunk] for chunk in chunks],
+                         [['DELETE', 'POST'] * 2, ['DELETE', 'POST']])
+        self.assertIn('Duplicate object', str(ctx.exception))
+        self.assertIn('2 created, 0 updated, 2 deleted', str(ctx.exception))
+        self.assertEqual([change['name'] for change in ctx.exception.applied['create']],
+                         ['h0.ansible.com', 'h1.ansible.com'])
+        self.assertEqual([change['_ref'] for change in ctx.exception.applied['delete']], ['record:a/0', 'record:a/1'])
+
+    def test_sync_zone_records_check_mode(self):
+        wapi = MagicMock()
+        wapi.iter_objects.return_value = iter([])
+
+        result = zone.sync_zone_records(wapi, 'ansible.com', 'default',
+                                        [{'type': 'A', 'name': 'www', 'ipv4addr': '192.168.10.10'}], check_mode=True)
+
+        self.assertTrue(result['changed'])
+        self.assertEqual(result['changes']['create'], [{'type': 'A', 'name': 'www.ansible.com', 'ipv4addr': '192.168.10.10'}])
+        # without purge only the record types of the desired set are read
+        self.assertEqual(wapi.iter_objects.call_count, 1)
+        wapi._send_multi_request.assert_not_called()
+
+    def test_sync_zone_records_reports_record_index(self):
+        with self.assertRaises(ValueError) as ctx:
+            zone.sync_zone_records(MagicMock(), 'ansible.com', 'default', [{'type': 'A', 'name': 'www'}])
+        self.assertIn('records[0]: A record www.ansible.com is missing ipv4addr', str(ctx.exception))
+
+
+ZONE_FILE = """$ORIGIN ansible.com.
+$TTL 1h
+@       IN SOA ns1 hostmaster ( 2024010101 ; serial
+                3600 900 604800 86400 )
+        IN NS  ns1
+www     300 IN A 192.168.10.10
+        IN 1d AAAA 2001:db8::1
+web     CNAME www
+@       MX 10 mail.example.net.
+txt     TXT "v=spf1 \\"quoted\\"" "second part"
+_sip._tcp SRV 0 5 5060 sip ; trailing comment
+naptr   NAPTR 100 10 "S" "SIP+D2U" "" _sip._udp
+$ORIGIN sub
+host    A 192.168.10.11
+"""
+
+
+class TestZoneFile(unittest.TestCase):
+
+    def test_parse_ttl(self):
+        self.assertEqual(zone.parse_ttl('300'), 300)
+        self.assertEqual(zone.parse_ttl('1h30m'), 5400)
+        self.assertEqual(zone.parse_ttl('1W'), 604800)
+        self.assertIsNone(zone.parse_ttl('MX'))
+        self.assertIsNone(zone.parse_ttl('10x'))
+
+    def test_iter_zone_file(self):
+        skipped = {}
+        records = list(zone.iter_zone_file(io.StringIO(ZONE_FILE), 'ansible.com', skipped))
+
+        self.assertEqual(skipped, {'SOA': 1, 'NS': 1})
+        self.assertEqual(records, [
+            {'type': 'A', 'name': 'www.ansible.com.', 'ipv4addr': '192.168.10.10', 'ttl': 300},
+            {'type': 'AAAA', 'name': 'www.ansible.com.', 'ipv6addr': '2001:db8::1', 'ttl': 86400},
+            {'type': 'CNAME', 'name': 'web.ansible.com.', 'canonical': 'www.ansible.com.'},
+            {'type': 'MX', 'name': 'ansible.com.', 'preference': '10', 'mail_exchanger': 'mail.example.net.'},
+            {'type': 'TXT', 'name': 'txt.ansible.com.', 'text': '"v=spf1 \\"quoted\\"" "second part"'},
+            {'type': 'SRV', 'name': '_sip._tcp.ansible.com.', 'priority': '0', 'weight': '5', 'port': '5060',
+             'target': 'sip.ansible.com.'},
+            {'type': 'NAPTR', 'name': 'naptr.ansible.com.', 'order': '100', 'preference': '10', 'flags': 'S',
+             'services': 'SIP+D2U', 'regexp': '', 'replacement': '_sip._udp.ansible.com.'},
+            {'type': 'A', 'name': 'host.sub.ansible.com.', 'ipv4addr': '192.168.10.11'},
+        ])
+        # every parsed record is accepted by nios_zone_records
+        desired = [zone.normalize_record(record, 'ansible.com') for record in records]
+
+        # records without an explicit TTL keep inheriting the zone TTL
+        existing = [('CNAME', {'_ref': 'record:cname/1', 'name': 'web.ansible.com', 'canonical': 'www.ansible.com',
+                               'ttl': 28800, 'use_ttl': False})]
+        plan = zone.plan_zone_records([r for r in desired if r[0] == 'CNAME'], existing)
+        self.assertEqual(plan, {'create': [], 'update': [], 'delete': []})
+
+    def test_iter_zone_file_errors(self):
+        for text, message in (
+                ('$INCLUDE other.zone\n', 'line 1: unsupported directive'),
+                ('www A\n', 'line 1: A record needs 1 values, got 0'),
+                ('www IN A (\n 192.168.10.10\n', 'line 1: unbalanced parentheses'),
+                (' A 192.168.10.10\n', 'line 1: no owner name')):
+            with self.assertRaises(ValueError) as ctx:
+                list(zone.iter_zone_file(io.StringIO(text), 'ansible.com'))
+            self.assertIn(message, str(ctx.exception))
+
+    def test_iter_zone_file_is_lazy(self):
+        lines = ('h%d A 10.0.0.1\n' % i for i in itertools.count())
+        records = zone.iter_zone_file(lines, 'ansible.com')
+        self.assertEqual([record['name'] for record in itertools.islice(records, 3)],
+                         ['h0.ansible.com.', 'h1.ansible.com.', 'h2.ansible.com.'])
+
+    def test_format_zone_record(self):
+        self.assertEqual(zone.format_zone_record('A', {'name': 'www.ansible.com', 'ipv4addr': '192.168.10.10',
+                                                       'ttl': 300, 'use_ttl': True}, 'ansible.com'),
+                         'www\t300\tIN\tA\t192.168.10.10')
+        self.assertEqual(zone.format_zone_record('MX', {'name': 'ansible.com', 'preference': 10, 'mail_exchanger': 'mail.ansible.com',
+                                                        'ttl': 300, 'use_ttl': False}, 'ansible.com'),
+                         '@\t\tIN\tMX\t10 mail.ansible.com.')
+        self.assertEqual(zone.format_zone_record('TXT', {'name': 'txt.ansible.com', 'text': 'say "hi"'}),
+                         'txt.ansible.com.\t\tIN\tTXT\t"say \\"hi\\""')
+
+    def test_export_and_parse_round_trip(self):
+        objects = {
+            'record:a': [{'_ref': 'record:a/1', 'name': 'www.ansible.com', 'ipv4addr': '192.168.10.10',
+                          'ttl': 300, 'use_ttl': True}],
+            'record:naptr': [{'_ref': 'record:naptr/1', 'name': 'ansible.com', 'order': 100, 'preference': 10,
+                              'flags': 'U', 'services': 'E2U+sip', 'regexp': '!^.*$!sip:info@ansible.com!',
+                              'replacement': '.'}],
+            'record:txt': [{'_ref': 'record:txt/1', 'name': 'ansible.com', 'text': '"part one" "part two"'}],
+        }
+        wapi = MagicMock()
+        wapi.iter_objects.side_effect = lambda obj_type, payload, **kwargs: iter(objects.get(obj_type, []))
+        stream = io.StringIO()
+
+        counts = zone.export_zone_file(wapi, 'ansible.com', 'default', stream, page_size=500)
+
+        self.assertEqual(counts, {'A': 1, 'AAAA': 0, 'CNAME': 0, 'MX': 0, 'NAPTR': 1, 'PTR': 0, 'SRV': 0, 'TXT': 1})
+        self.assertEqual(wapi.iter_objects.call_args[1]['page_size'], 500)
+        desired = [zone.normalize_record(record, 'ansible.com')
+                   for record in zone.iter_zone_file(io.StringIO(stream.getvalue()), 'ansible.com')]
+        existing = [(record_type, obj) for record_type, (obj_type, key, update) in zone.ZONE_RECORD_TYPES.items()
+                    for obj in objects.get(obj_type, [])]
+        plan = zone.plan_zone_records(desired, existing, purge=True)
+        self.assertEqual(plan, {'create': [], 'update': [], 'delete': []})
+
+    def test_large_zone_file(self):
+        lines = ('h%d 300 IN A 10.%d.%d.%d\n' % (i, i >> 16, (i >> 8) & 255, i & 255) for i in range(50000))
+        count = 0
+        for record in zone.iter_zone_file(lines, 'ansible.com'):
+            count += 1
+        self.assertEqual(count, 50000)
@@ -22,7 +22,7 @@ __metaclass__ = type
 
 from ansible_collections.infoblox.nios_modules.plugins.modules import nios_adminuser
 from ansible_collections.infoblox.nios_modules.plugins.module_utils import api
-from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import patch, MagicMock, Mock
+from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import patch, MagicMock, Mock, ANY
 from .test_nios_module import TestNiosModule, load_fixture
 
 
@@ -86,7 +86,7 @@ class TestNiosAdminUserModule(TestNiosModule):
                 'name': 'ansible_user',
                 'admin_groups': ['admin-group'],
                 'password': 'Pwd@1234'
-            }
+            }, return_fields=ANY
         )
 
     def test_nios_adminuser_update_comment(self):
@@ -116,7 +116,7 @@ class TestNiosAdminUserModule(TestNiosModule):
         res = wapi.run('NIOS_ADMINUSER', test_spec)
         self.assertTrue(res['changed'])
         wapi.update_object.assert_called_once_with(
-            ref, {'comment': 'updated comment', 'admin_groups': ['admin-group'], 'name': 'ansible_user'}
+            ref, {'comment': 'updated comment', 'admin_groups': ['admin-group'], 'name': 'ansible_user'}, return_fields=ANY
         )
 
     def test_nios_adminuser_remove(self):
@@ -172,7 +172,7 @@ class TestNiosAdminUserModule(TestNiosModule):
 
         self.assertTrue(res['changed'])
         wapi.update_object.assert_called_once_with(ref, {'name': 'ansible_new_user', 'admin_groups': ['admin-group'],
-                                                         'comment': 'comment'})
+                                                         'comment': 'comment'}, return_fields=ANY)
 
     def test_nios_adminuser_create_with_ssh_keys(self):
         self.module.params = {'provider': None, 'state': 'present', 'name': 'ansible_user', 'admin_groups': ['admin-group'],
@@ -217,7 +217,7 @@ class TestNiosAdminUserModule(TestNiosModule):
                 ],
                 'email': 'example@email.com',
                 'disable': False
-            }
+            }, return_fields=ANY
         )
 
     def test_nios_adminuser_create_with_ca_cert(self):
@@ -257,7 +257,7 @@ class TestNiosAdminUserModule(TestNiosModule):
                 'client_certificate_serial_number': '123456789',
                 'use_time_zone': True,
                 'time_zone': 'UTC'
-            }
+            }, return_fields=ANY
         )
 
     def test_nios_adminuser_password_idempotent_re_run(self):
@@ -22,7 +22,7 @@ __metaclass__ = type
 
 from ansible_collections.infoblox.nios_modules.plugins.modules import nios_extensible_attribute
 from ansible_collections.infoblox.nios_modules.plugins.module_utils import api
-from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import patch, MagicMock, Mock
+from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import patch, MagicMock, Mock, ANY
 from .test_nios_module import TestNiosModule, load_fixture
 
 
@@ -84,7 +84,7 @@ class TestNiosExtensibleAttributeModule(TestNiosModule):
         self.assertEqual(res['changed'], True)
         wapi.create_object.assert_called_once_with('testobject', {'name': 'my_string',
                                                                   'type': 'STRING',
-                                                                  'comment': 'Created by ansible'})
+                                                                  'comment': 'Created by ansible'}, return_fields=ANY)
 
     def test_nios_ea_update_comment(self):
         self.module.params = {
@@ -122,7 +122,7 @@ class TestNiosExtensibleAttributeModule(TestNiosModule):
         res = wapi.run('testobject', test_spec)
         self.assertTrue(res['changed'])
         wapi.update_object.assert_called_once_with(
-            ref, {'comment': 'Update comment', 'type': 'STRING', 'name': 'testStringEA', 'flag': 'I', 'default_value': 'test'}
+            ref, {'comment': 'Update comment', 'type': 'STRING', 'name': 'testStringEA', 'flag': 'I', 'default_value': 'test'}, return_fields=ANY
         )
 
     def test_remove_extensible_attribute(self):
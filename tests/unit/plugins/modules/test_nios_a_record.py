@@ -22,7 +22,7 @@ __metaclass__ = type
 
 from ansible_collections.infoblox.nios_modules.plugins.modules import nios_a_record
 from ansible_collections.infoblox.nios_modules.plugins.module_utils import api
-from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import patch, MagicMock, Mock
+from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import patch, MagicMock, Mock, ANY
 from .test_nios_module import TestNiosModule, load_fixture
 
 
@@ -79,7 +79,7 @@ class TestNiosARecordModule(TestNiosModule):
 
         self.assertTrue(res['changed'])
         wapi.create_object.assert_called_once_with('testobject', {'name': 'a.ansible.com',
-                                                                  'ipv4': '192.168.10.1'})
+                                                                  'ipv4': '192.168.10.1'}, return_fields=ANY)
 
     def test_nios_a_record_update_comment(self):
         self.module.params = {'provider': None, 'state': 'present', 'name': 'a.ansible.com', 'ipv4': '192.168.10.1',
@@ -107,7 +107,7 @@ class TestNiosARecordModule(TestNiosModule):
         res = wapi.run('testobject', test_spec)
         self.assertTrue(res['changed'])
         wapi.update_object.assert_called_once_with(
-            ref, {'comment': 'updated comment', 'ipv4': '192.168.10.1', 'name': 'a.ansible.com'}
+            ref, {'comment': 'updated comment', 'ipv4': '192.168.10.1', 'name': 'a.ansible.com'}, return_fields=ANY
         )
 
     def test_nios_a_record_remove(self):
@@ -161,4 +161,4 @@ class TestNiosARecordModule(TestNiosModule):
         res = wapi.run('testobject', test_spec)
 
         self.assertTrue(res['changed'])
-        wapi.update_object.assert_called_once_with(ref, {'name': 'a_new.ansible.com', 'comment': 'comment'})
+        wapi.update_object.assert_called_once_with(ref, {'name': 'a_new.ansible.com', 'comment': 'comment'}, return_fields=ANY)
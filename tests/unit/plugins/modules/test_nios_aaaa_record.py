@@ -22,7 +22,7 @@ __metaclass__ = type
 
 from ansible_collections.infoblox.nios_modules.plugins.modules import nios_aaaa_record
 from ansible_collections.infoblox.nios_modules.plugins.module_utils import api
-from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import patch, MagicMock, Mock
+from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import patch, MagicMock, Mock, ANY
 from .test_nios_module import TestNiosModule, load_fixture
 
 
@@ -79,7 +79,7 @@ class TestNiosAAAARecordModule(TestNiosModule):
 
         self.assertTrue(res['changed'])
         wapi.create_object.assert_called_once_with('testobject', {'name': 'aaaa.ansible.com',
-                                                                  'ipv6': '2001:0db8:85a3:0000:0000:8a2e:0370:7334'})
+                                                                  'ipv6': '2001:0db8:85a3:0000:0000:8a2e:0370:7334'}, return_fields=ANY)
 
     def test_nios_aaaa_record_update_comment(self):
         self.module.params = {'provider': None, 'state': 'present', 'name': 'aaaa.ansible.com',
@@ -109,7 +109,7 @@ class TestNiosAAAARecordModule(TestNiosModule):
         self.assertTrue(res['changed'])
         wapi.update_object.assert_called_once_with(
             ref,
-            {'comment': 'updated comment', 'ipv6': '2001:0db8:85a3:0000:0000:8a2e:0370:7334', 'name': 'aaaa.ansible.com'}
+            {'comment': 'updated comment', 'ipv6': '2001:0db8:85a3:0000:0000:8a2e:0370:7334', 'name': 'aaaa.ansible.com'}, return_fields=ANY
         )
 
     def test_nios_aaaa_record_remove(self):
@@ -164,5 +164,5 @@ class TestNiosAAAARecordModule(TestNiosModule):
         self.assertTrue(res['changed'])
         wapi.update_object.assert_called_once_with(
             ref,
-            {'comment': 'comment', 'name': 'aaaa_new.ansible.com'}
+            {'comment': 'comment', 'name': 'aaaa_new.ansible.com'}, return_fields=ANY
         )
@@ -22,7 +22,7 @@ __metaclass__ = type
 
 from ansible_collections.infoblox.nios_modules.plugins.modules import nios_cname_record
 from ansible_collections.infoblox.nios_modules.plugins.module_utils import api
-from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import patch, MagicMock, Mock
+from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import patch, MagicMock, Mock, ANY
 from .test_nios_module import TestNiosModule, load_fixture
 
 
@@ -79,7 +79,7 @@ class TestNiosCNameRecordModule(TestNiosModule):
 
         self.assertTrue(res['changed'])
         wapi.create_object.assert_called_once_with('testobject', {'name': 'cname.ansible.com',
-                                                                  'canonical': 'realhost.ansible.com'})
+                                                                  'canonical': 'realhost.ansible.com'}, return_fields=ANY)
 
     def test_nios_cname_record_update_comment(self):
         self.module.params = {'provider': None, 'state': 'present', 'name': 'cname.ansible.com',
@@ -108,7 +108,7 @@ class TestNiosCNameRecordModule(TestNiosModule):
         self.assertTrue(res['changed'])
         wapi.update_object.assert_called_once_with(
             ref,
-            {'comment': 'updated comment', 'name': 'cname.ansible.com', 'canonical': 'realhost.ansible.com'}
+            {'comment': 'updated comment', 'name': 'cname.ansible.com', 'canonical': 'realhost.ansible.com'}, return_fields=ANY
         )
 
     def test_nios_cname_record_remove(self):
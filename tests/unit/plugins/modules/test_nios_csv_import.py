@@ -0,0 +1,72 @@
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+from ansible_collections.infoblox.nios_modules.plugins.modules import nios_csv_import
+from ansible_collections.infoblox.nios_modules.plugins.module_utils import csv_import
+from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import MagicMock, patch
+from .test_nios_module import TestNiosModuleMain
+
+
+class TestNiosCsvImportModule(TestNiosModuleMain):
+
+    module = nios_csv_import
+
+    def setUp(self):
+        super(TestNiosCsvImportModule, self).setUp()
+        self.mock_time = patch.object(csv_import, 'time')
+        self.mock_time.start().time.return_value = 0
+        self.addCleanup(self.mock_time.stop)
+        self.wapi.call_func.side_effect = self._call_func
+        self.wapi.get_object.return_value = [{'import_id': 7, 'status': 'COMPLETED', 'lines_processed': 3, 'lines_failed': 0}]
+        self.error_log = ''
+        self.module_args = dict(self.module_args, host_records=[
+            {'name': 'host1.ansible.com', 'ipv4addrs': [{'ipv4addr': '192.168.10.1'}]},
+            {'name': 'host2.ansible.com', 'ipv4addrs': [{'ipv4addr': '192.168.10.2'}]},
+        ], fixed_addresses=[{'name': 'printer1', 'ipaddr': '192.168.10.50', 'mac': '08:6d:41:e8:fd:e8'}])
+
+    def _call_func(self, func_name, ref, payload):
+        if func_name == 'uploadinit':
+            return {'token': 'up', 'url': 'https://nios01/upload'}
+        if func_name == 'csv_import':
+            return {'csv_import_task': {'import_id': 7, 'status': 'PENDING'}}
+        if func_name == 'csv_error_log':
+            self.wapi.download_file.return_value = MagicMock(content=self.error_log.encode())
+            return {'token': 'down', 'url': 'https://nios01/download'}
+        return {}
+
+    def test_import(self):
+        result = self.run_module()
+
+        self.assertTrue(result['changed'])
+        self.assertEqual(result['rows'], {'hostrecord': 2, 'fixedaddress': 1})
+        self.assertEqual(result['task']['status'], 'COMPLETED')
+        url, files = self.wapi.upload_file.call_args[0]
+        self.assertEqual(url, 'https://nios01/upload')
+        self.assertIn(b'hostrecord,host2.ansible.com,default,192.168.10.2', files['file'][1])
+        self.assertEqual([c[0][0] for c in self.wapi.call_func.call_args_list], ['uploadinit', 'csv_import'])
+
+    def test_import_check_mode(self):
+        result = self.run_module(_ansible_check_mode=True)
+
+        self.assertTrue(result['changed'])
+        self.assertEqual(result['rows'], {'hostrecord': 2, 'fixedaddress': 1})
+        self.assertFalse(self.wapi.call_func.called)
+
+    def test_import_maps_errors_to_items(self):
+        self.wapi.get_object.return_value = [{'import_id': 7, 'status': 'COMPLETED', 'lines_processed': 3, 'lines_failed': 1}]
+        self.error_log = ('header-hostrecord,fqdn*,view,addresses\n'
+                          'hostrecord,host2.ansible.com,default,192.168.10.2,The record already exists.\n')
+
+        result = self.run_module(failed=True)
+
+        self.assertEqual(result['msg'], 'CSV import 7 rejected 1 of 3 rows')
+        self.assertEqual(result['errors'], [{'option': 'host_records', 'index': 1, 'msg': 'The record already exists.'}])
+        self.assertEqual(self.wapi.call_func.call_args_list[-1][0], ('downloadcomplete', 'fileop', {'token': 'down'}))
+
+    def test_import_invalid_item(self):
+        result = self.run_module(failed=True, fixed_addresses=[{'name': 'printer1', 'ipaddr': '192.168.10.50'}])
+
+        self.assertEqual(result['msg'], "fixed_addresses[0]: the 'mac' of an IPv4 fixed address must be specified")
+        self.assertFalse(self.wapi.call_func.called)
@@ -0,0 +1,54 @@
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import io
+import os
+
+from ansible_collections.infoblox.nios_modules.plugins.modules import nios_drift_report
+from ansible_collections.infoblox.nios_modules.plugins.module_utils import export
+from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import MagicMock, patch
+from .test_nios_module import TestNiosModuleMain
+
+
+class TestNiosDriftReportModule(TestNiosModuleMain):
+
+    module = nios_drift_report
+
+    def setUp(self):
+        super(TestNiosDriftReportModule, self).setUp()
+        self.objects = {'network': [{'_ref': 'network/1', 'network': '192.168.10.0/24', 'network_view': 'default', 'comment': 'lab'}]}
+        self.wapi.iter_objects.side_effect = lambda obj_type, **kwargs: iter(self.objects.get(obj_type, []))
+        # provider is only declared by the patched WapiModule.provider_spec
+        self.module_args = {'desired': [{'type': 'network', 'network': '192.168.10.0/24', 'comment': 'prod'},
+                                        {'type': 'network', 'network': '192.168.11.0/24'}]}
+
+    def _check(self, result):
+        self.assertFalse(result['changed'])
+        self.assertEqual(result['summary'], {'in_sync': 0, 'drifted': 1, 'unverified': 0, 'missing': 1, 'unmanaged': 0})
+        self.assertEqual(result['drift'][0]['diff'], {'comment': {'current': 'lab', 'desired': 'prod'}})
+        self.assertEqual(result['drift'][1]['status'], 'missing')
+
+    def test_report_from_snapshot(self):
+        path = os.path.join(self.tmpdir, 'grid.jsonl.gz')
+        wapi = MagicMock()
+        with patch.object(export, 'WapiPageReader') as reader:
+            reader.return_value.get_object_pages.side_effect = lambda obj_type, *args, **kwargs: iter([self.objects[obj_type]])
+            with open(path, 'wb') as f:
+                export.export_objects(wapi, [{'type': 'network'}], f, tmpdir=self.tmpdir)
+
+        self._check(self.run_module(snapshot=path))
+        self.assertFalse(self.wapi.iter_objects.called)
+
+    def test_report_from_wapi(self):
+        self._check(self.run_module())
+        self.assertEqual(self.wapi.iter_objects.call_count, 1)
+
+    def test_report_unreadable_snapshot(self):
+        path = os.path.join(self.tmpdir, 'grid.jsonl.gz')
+        with io.open(path, 'w') as f:
+            f.write(u'not gzip')
+
+        result = self.run_module(failed=True, snapshot=path)
+        self.assertTrue(result['msg'].startswith('unable to read %s' % path))
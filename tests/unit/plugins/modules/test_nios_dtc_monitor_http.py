@@ -20,7 +20,7 @@ __metaclass__ = type
 
 from ansible_collections.infoblox.nios_modules.plugins.modules import nios_dtc_monitor_http
 from ansible_collections.infoblox.nios_modules.plugins.module_utils import api
-from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import patch, MagicMock, Mock
+from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import patch, MagicMock, Mock, ANY
 from .test_nios_module import TestNiosModule, load_fixture
 
 
@@ -77,7 +77,7 @@ class TestNiosDtcHttpMonitorModule(TestNiosModule):
 
         self.assertTrue(res['changed'])
         wapi.create_object.assert_called_once_with('testobject', {'name': 'https_monitor',
-                                                                  'port': 443, 'secure': True})
+                                                                  'port': 443, 'secure': True}, return_fields=ANY)
 
     def test_nios_dtc_monitor_http_update_comment(self):
         self.module.params = {'provider': None, 'state': 'present', 'name': 'https_monitor',
@@ -105,7 +105,7 @@ class TestNiosDtcHttpMonitorModule(TestNiosModule):
         res = wapi.run('testobject', test_spec)
 
         self.assertTrue(res['changed'])
-        wapi.update_object.assert_called_once_with(ref, {'comment': 'updated comment', 'name': 'https_monitor'})
+        wapi.update_object.assert_called_once_with(ref, {'comment': 'updated comment', 'name': 'https_monitor'}, return_fields=ANY)
 
     def test_nios_dtc_monitor_http_remove(self):
         self.module.params = {'provider': None, 'state': 'absent', 'name': 'https_monitor',
@@ -20,7 +20,7 @@ __metaclass__ = type
 
 from ansible_collections.infoblox.nios_modules.plugins.modules import nios_dtc_monitor_icmp
 from ansible_collections.infoblox.nios_modules.plugins.module_utils import api
-from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import patch, MagicMock, Mock
+from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import patch, MagicMock, Mock, ANY
 from .test_nios_module import TestNiosModule, load_fixture
 
 
@@ -74,7 +74,7 @@ class TestNiosDtcIcmpMonitorModule(TestNiosModule):
         res = wapi.run('testobject', test_spec)
 
         self.assertTrue(res['changed'])
-        wapi.create_object.assert_called_once_with('testobject', {'name': 'icmp_monitor'})
+        wapi.create_object.assert_called_once_with('testobject', {'name': 'icmp_monitor'}, return_fields=ANY)
 
     def test_nios_dtc_monitor_icmp_update_comment(self):
         self.module.params = {'provider': None, 'state': 'present', 'name': 'icmp_monitor',
@@ -100,7 +100,7 @@ class TestNiosDtcIcmpMonitorModule(TestNiosModule):
         res = wapi.run('testobject', test_spec)
 
         self.assertTrue(res['changed'])
-        wapi.update_object.assert_called_once_with(ref, {'comment': 'updated comment', 'name': 'icmp_monitor'})
+        wapi.update_object.assert_called_once_with(ref, {'comment': 'updated comment', 'name': 'icmp_monitor'}, return_fields=ANY)
 
     def test_nios_dtc_monitor_icmp_remove(self):
         self.module.params = {'provider': None, 'state': 'absent', 'name': 'icmp_monitor',
@@ -20,7 +20,7 @@ __metaclass__ = type
 
 from ansible_collections.infoblox.nios_modules.plugins.modules import nios_dtc_monitor_sip
 from ansible_collections.infoblox.nios_modules.plugins.module_utils import api
-from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import patch, MagicMock, Mock
+from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import patch, MagicMock, Mock, ANY
 from .test_nios_module import TestNiosModule, load_fixture
 
 
@@ -74,7 +74,7 @@ class TestNiosDtcSipMonitorModule(TestNiosModule):
         res = wapi.run('testobject', test_spec)
 
         self.assertTrue(res['changed'])
-        wapi.create_object.assert_called_once_with('testobject', {'name': 'sip_monitor'})
+        wapi.create_object.assert_called_once_with('testobject', {'name': 'sip_monitor'}, return_fields=ANY)
 
     def test_nios_dtc_monitor_sip_update_comment(self):
         self.module.params = {'provider': None, 'state': 'present', 'name': 'sip_monitor',
@@ -99,7 +99,7 @@ class TestNiosDtcSipMonitorModule(TestNiosModule):
         res = wapi.run('testobject', test_spec)
 
         self.assertTrue(res['changed'])
-        wapi.update_object.assert_called_once_with(ref, {'comment': 'updated comment', 'name': 'sip_monitor'})
+        wapi.update_object.assert_called_once_with(ref, {'comment': 'updated comment', 'name': 'sip_monitor'}, return_fields=ANY)
 
     def test_nios_dtc_monitor_sip_remove(self):
         self.module.params = {'provider': None, 'state': 'absent', 'name': 'sip_monitor',
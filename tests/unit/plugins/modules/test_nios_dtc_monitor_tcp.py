@@ -20,7 +20,7 @@ __metaclass__ = type
 
 from ansible_collections.infoblox.nios_modules.plugins.modules import nios_dtc_monitor_tcp
 from ansible_collections.infoblox.nios_modules.plugins.module_utils import api
-from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import patch, MagicMock, Mock
+from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import patch, MagicMock, Mock, ANY
 from .test_nios_module import TestNiosModule, load_fixture
 from .utils import set_module_args
 from ansible_collections.infoblox.nios_modules.tests.unit.plugins.modules.utils import AnsibleFailJson
@@ -78,7 +78,7 @@ class TestNiosDtcTcpMonitorModule(TestNiosModule):
 
         self.assertTrue(res['changed'])
         wapi.create_object.assert_called_once_with('testobject', {'name': 'tcp_monitor',
-                                                                  'port': 8080})
+                                                                  'port': 8080}, return_fields=ANY)
 
     def test_nios_dtc_monitor_tcp_update_comment(self):
         self.module.params = {'provider': None, 'state': 'present', 'name': 'tcp_monitor',
@@ -105,7 +105,7 @@ class TestNiosDtcTcpMonitorModule(TestNiosModule):
         res = wapi.run('testobject', test_spec)
 
         self.assertTrue(res['changed'])
-        wapi.update_object.assert_called_once_with(ref, {'comment': 'updated comment', 'name': 'tcp_monitor'})
+        wapi.update_object.assert_called_once_with(ref, {'comment': 'updated comment', 'name': 'tcp_monitor'}, return_fields=ANY)
 
     def test_nios_dtc_monitor_tcp_remove(self):
         self.module.params = {'provider': None, 'state': 'absent', 'name': 'tcp_monitor',
@@ -20,7 +20,7 @@ __metaclass__ = type
 
 from ansible_collections.infoblox.nios_modules.plugins.modules import nios_dtc_topology
 from ansible_collections.infoblox.nios_modules.plugins.module_utils import api
-from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import patch, MagicMock, Mock
+from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import patch, MagicMock, Mock, ANY
 from .test_nios_module import TestNiosModule, load_fixture
 
 
@@ -94,7 +94,7 @@ class TestNiosDtcTopologyModule(TestNiosModule):
                     'destination_link': 'web_pool',
                     'return_type': 'REGULAR'
                 }]
-            }
+            }, return_fields=ANY
         )
 
     def test_nios_dtc_topology_update_comment(self):
@@ -123,7 +123,7 @@ class TestNiosDtcTopologyModule(TestNiosModule):
         res = wapi.run('testobject', test_spec)
 
         self.assertTrue(res['changed'])
-        wapi.update_object.assert_called_once_with(ref, {'comment': 'updated comment', 'name': 'a_topology'})
+        wapi.update_object.assert_called_once_with(ref, {'comment': 'updated comment', 'name': 'a_topology'}, return_fields=ANY)
 
     def test_nios_dtc_topology_remove(self):
         self.module.params = {'provider': None, 'state': 'absent', 'name': 'a_topology',
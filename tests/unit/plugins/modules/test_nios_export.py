@@ -0,0 +1,58 @@
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import os
+
+import requests
+
+from ansible_collections.infoblox.nios_modules.plugins.modules import nios_export
+from ansible_collections.infoblox.nios_modules.plugins.module_utils import api, export
+from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import patch
+from ..module_utils.test_export import fake_pages
+from .test_nios_module import TestNiosModuleMain
+
+
+class TestNiosExportModule(TestNiosModuleMain):
+
+    module = nios_export
+
+    def setUp(self):
+        super(TestNiosExportModule, self).setUp()
+        self.objects = {'network': [{'_ref': 'network/1', 'network': '10.0.0.0/24', 'network_view': 'default'}]}
+        self.mock_page = patch.object(api, 'connector_get_page', side_effect=fake_pages(self.objects))
+        self.mock_page.start()
+        self.addCleanup(self.mock_page.stop)
+        self.dest = os.path.join(self.tmpdir, 'grid.jsonl.gz')
+        self.module_args = dict(self.module_args, dest=self.dest)
+
+    def test_export_default_objects_is_idempotent(self):
+        result = self.run_module(workers=16)
+
+        self.assertTrue(result['changed'])
+        self.assertEqual(result['counts']['network'], 1)
+        self.assertEqual(result['counts']['record:host'], 0)
+        self.assertEqual(set(result['counts']), set(export.NIOS_EXPORT_OBJECT_TYPES))
+        self.assertEqual(list(export.iter_export(self.dest)), [('network', self.objects['network'][0])])
+
+        self.assertFalse(self.run_module()['changed'])
+        self.assertEqual(os.listdir(self.tmpdir), ['grid.jsonl.gz'])
+
+    def test_export_check_mode(self):
+        result = self.run_module(objects=[{'type': 'network', 'return_fields': ['network']}], _ansible_check_mode=True)
+
+        self.assertTrue(result['changed'])
+        self.assertEqual(result['counts'], {'network': 1})
+        self.assertFalse(os.path.exists(self.dest))
+        self.assertEqual(os.listdir(self.tmpdir), [])
+
+    def test_export_connection_error(self):
+        self.mock_page.stop()
+        with patch.object(api, 'connector_get_page', side_effect=requests.exceptions.ConnectTimeout('timed out')):
+            result = self.run_module(failed=True, objects=[{'type': 'network'}])
+        self.mock_page.start()
+
+        self.assertEqual(result['msg'], 'unable to export network: timed out')
+        self.assertEqual(result['object_type'], 'network')
+        self.assertEqual(os.listdir(self.tmpdir), [])
@@ -20,7 +20,7 @@ __metaclass__ = type
 
 from ansible_collections.infoblox.nios_modules.plugins.modules import nios_fixed_address
 from ansible_collections.infoblox.nios_modules.plugins.module_utils import api
-from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import patch, MagicMock, Mock
+from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import patch, MagicMock, Mock, ANY
 from .test_nios_module import TestNiosModule, load_fixture
 
 
@@ -75,7 +75,7 @@ class TestNiosFixedAddressModule(TestNiosModule):
 
         self.assertTrue(res['changed'])
         wapi.create_object.assert_called_once_with('testobject', {'name': 'test_fa', 'ipaddr': '192.168.10.1', 'mac': '08:6d:41:e8:fd:e8',
-                                                                  'network': '192.168.10.0/24', 'network_view': 'default'})
+                                                                  'network': '192.168.10.0/24', 'network_view': 'default'}, return_fields=ANY)
 
     def test_nios_fixed_address_ipv4_dhcp_update(self):
         self.module.params = {'provider': None, 'state': 'present', 'name': 'test_fa', 'ipaddr': '192.168.10.1', 'mac': '08:6d:41:e8:fd:e8',
@@ -117,7 +117,7 @@ class TestNiosFixedAddressModule(TestNiosModule):
                 'ipaddr': '192.168.10.1',
                 'mac': '08:6d:41:e8:fd:e8',
                 'network': '192.168.10.0/24',
-            }
+            }, return_fields=ANY
         )
 
     def test_nios_fixed_address_ipv4_remove(self):
@@ -347,7 +347,7 @@ class TestNiosFixedAddressModule(TestNiosModule):
 
         self.assertTrue(res['changed'])
         wapi.create_object.assert_called_once_with('testobject', {'name': 'test_fa', 'ipaddr': 'fe80::1/10', 'mac': '08:6d:41:e8:fd:e8',
-                                                                  'network': 'fe80::/64', 'network_view': 'default'})
+                                                                  'network': 'fe80::/64', 'network_view': 'default'}, return_fields=ANY)
 
     def test_nios_fixed_address_ipv6_remove(self):
         self.module.params = {'provider': None, 'state': 'absent', 'name': 'test_fa', 'ipaddr': 'fe80::1/10', 'mac': '08:6d:41:e8:fd:e8',
@@ -20,7 +20,7 @@ __metaclass__ = type
 
 from ansible_collections.infoblox.nios_modules.plugins.modules import nios_host_record
 from ansible_collections.infoblox.nios_modules.plugins.module_utils import api
-from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import patch, MagicMock, Mock
+from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import patch, MagicMock, Mock, ANY
 from .test_nios_module import TestNiosModule, load_fixture
 from .utils import set_module_args
 from ansible_collections.infoblox.nios_modules.tests.unit.plugins.modules.utils import AnsibleExitJson
@@ -78,7 +78,7 @@ class TestNiosHostRecordModule(TestNiosModule):
         res = wapi.run('testobject', test_spec)
 
         self.assertTrue(res['changed'])
-        wapi.create_object.assert_called_once_with('testobject', {'name': 'ansible'})
+        wapi.create_object.assert_called_once_with('testobject', {'name': 'ansible'}, return_fields=ANY)
 
     def test_nios_host_record_remove(self):
         self.module.params = {'provider': None, 'state': 'absent', 'name': 'ansible',
@@ -129,7 +129,7 @@ class TestNiosHostRecordModule(TestNiosModule):
 
         self.assertTrue(res['changed'])
         wapi.update_object.assert_called_once_with(
-            ref, {'comment': 'updated comment', 'name': 'default'}
+            ref, {'comment': 'updated comment', 'name': 'default'}, return_fields=ANY
         )
 
     def test_nios_host_record_update_record_name(self):
@@ -157,7 +157,7 @@ class TestNiosHostRecordModule(TestNiosModule):
 
         self.assertTrue(res['changed'])
         wapi.update_object.assert_called_once_with(
-            ref, {'comment': 'comment', 'name': 'default'}
+            ref, {'comment': 'comment', 'name': 'default'}, return_fields=ANY
         )
 
     def test_main_excludes_dns_ea_inheritance_for_unsupported_wapi(self):
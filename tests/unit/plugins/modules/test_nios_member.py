@@ -20,7 +20,7 @@ __metaclass__ = type
 
 from ansible_collections.infoblox.nios_modules.plugins.modules import nios_member
 from ansible_collections.infoblox.nios_modules.plugins.module_utils import api
-from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import patch, MagicMock, Mock
+from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import patch, MagicMock, Mock, ANY
 from .test_nios_module import TestNiosModule, load_fixture
 
 
@@ -77,7 +77,7 @@ class TestNiosMemberModule(TestNiosModule):
         wapi.create_object.assert_called_once_with('testobject', {'host_name': 'test_member',
                                                                   'vip_setting': {'address': '192.168.1.110', 'subnet_mask': '255.255.255.0',
                                                                                   'gateway': '192.168.1.1'},
-                                                                  'config_addr_type': 'IPV4', 'platform': 'VNIOS'})
+                                                                  'config_addr_type': 'IPV4', 'platform': 'VNIOS'}, return_fields=ANY)
 
     def test_nios_member_update(self):
         self.module.params = {'provider': None, 'state': 'present', 'host_name': 'test_member',
@@ -121,7 +121,7 @@ class TestNiosMemberModule(TestNiosModule):
             ref,
             {'comment': 'updated comment', 'host_name': 'test_member',
              'vip_setting': {'address': '192.168.1.110', 'subnet_mask': '255.255.255.0', 'gateway': '192.168.1.1'},
-             'config_addr_type': 'IPV4', 'platform': 'VNIOS'}
+             'config_addr_type': 'IPV4', 'platform': 'VNIOS'}, return_fields=ANY
         )
 
     def test_nios_member_remove(self):
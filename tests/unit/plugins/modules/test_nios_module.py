@@ -19,10 +19,15 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
+import copy
 import os
 import json
+import shutil
+import tempfile
 
+from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import patch
 from ansible_collections.infoblox.nios_modules.tests.unit.plugins.modules.utils import AnsibleExitJson, AnsibleFailJson, ModuleTestCase
+from ansible_collections.infoblox.nios_modules.tests.unit.plugins.modules.utils import set_module_args
 
 
 fixture_path = os.path.join(os.path.dirname(__file__), 'fixtures')
@@ -86,3 +91,35 @@ class TestNiosModule(ModuleTestCase):
 
     def load_fixtures(self, commands=None):
         pass
+
+
+class TestNiosModuleMain(TestNiosModule):
+    ''' Runs the main() of `module` with its WapiModule patched, for the
+    modules that do more than call WapiModule.run(). `self.wapi` is the
+    patched WapiModule instance and `self.tmpdir` a scratch directory
+    removed after every test.
+    '''
+    module = None
+    module_args = {'provider': {'host': 'nios01'}}
+
+    def setUp(self):
+        super(TestNiosModuleMain, self).setUp()
+        self.mock_wapi = patch.object(self.module, 'WapiModule')
+        self.wapi = self.mock_wapi.start().return_value
+        self.addCleanup(self.mock_wapi.stop)
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+
+    def run_module(self, failed=False, **args):
+        ''' Runs main() with module_args updated with args
+        :returns: the result given to exit_json(), or to fail_json() when
+            failed is set
+        '''
+        module_args = copy.deepcopy(self.module_args)
+        module_args.update(args)
+        set_module_args(module_args)
+        if failed:
+            return self.failed()
+        with self.assertRaises(AnsibleExitJson) as exc:
+            self.module.main()
+        return exc.exception.args[0]
@@ -22,7 +22,7 @@ __metaclass__ = type
 
 from ansible_collections.infoblox.nios_modules.plugins.modules import nios_mx_record
 from ansible_collections.infoblox.nios_modules.plugins.module_utils import api
-from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import patch, MagicMock, Mock
+from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import patch, MagicMock, Mock, ANY
 from .test_nios_module import TestNiosModule, load_fixture
 
 
@@ -80,7 +80,7 @@ class TestNiosMXRecordModule(TestNiosModule):
 
         self.assertTrue(res['changed'])
         wapi.create_object.assert_called_once_with('testobject', {'name': 'ansible.com',
-                                                   'mx': 'mailhost.ansible.com', 'preference': 0})
+                                                   'mx': 'mailhost.ansible.com', 'preference': 0}, return_fields=ANY)
 
     def test_nios_mx_record_update_comment(self):
         self.module.params = {'provider': None, 'state': 'present', 'name': 'ansible.com', 'mx': 'mailhost.ansible.com',
@@ -110,7 +110,7 @@ class TestNiosMXRecordModule(TestNiosModule):
 
         self.assertTrue(res['changed'])
         wapi.update_object.assert_called_once_with(ref, {'comment': 'updated comment', 'name': 'ansible.com',
-                                                         'mx': 'mailhost.ansible.com', 'preference': 0})
+                                                         'mx': 'mailhost.ansible.com', 'preference': 0}, return_fields=ANY)
 
     def test_nios_mx_record_remove(self):
         self.module.params = {'provider': None, 'state': 'absent', 'name': 'ansible.com', 'mx': 'mailhost.ansible.com',
@@ -22,7 +22,7 @@ __metaclass__ = type
 
 from ansible_collections.infoblox.nios_modules.plugins.modules import nios_naptr_record
 from ansible_collections.infoblox.nios_modules.plugins.module_utils import api
-from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import patch, MagicMock, Mock
+from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import patch, MagicMock, Mock, ANY
 from .test_nios_module import TestNiosModule, load_fixture
 
 
@@ -83,7 +83,7 @@ class TestNiosNAPTRRecordModule(TestNiosModule):
         self.assertTrue(res['changed'])
         wapi.create_object.assert_called_once_with('testobject', {'name': '*.subscriber-100.ansiblezone.com',
                                                                   'order': '1000', 'preference': '10',
-                                                                  'replacement': 'replacement1.network.ansiblezone.com'})
+                                                                  'replacement': 'replacement1.network.ansiblezone.com'}, return_fields=ANY)
 
     def test_nios_naptr_record_update_comment(self):
         self.module.params = {'provider': None, 'state': 'present', 'name': '*.subscriber-100.ansiblezone.com',
@@ -117,7 +117,8 @@ class TestNiosNAPTRRecordModule(TestNiosModule):
 
         self.assertTrue(res['changed'])
         wapi.update_object.assert_called_once_with(ref, {'comment': 'updated comment', 'name': '*.subscriber-100.ansiblezone.com',
-                                                         'order': '1000', 'preference': '10', 'replacement': 'replacement1.network.ansiblezone.com'})
+                                                         'order': '1000', 'preference': '10', 'replacement': 'replacement1.network.ansiblezone.com'},
+                                                   return_fields=ANY)
 
     def test_nios_naptr_record_remove(self):
         self.module.params = {'provider': None, 'state': 'absent', 'name': '*.subscriber-100.ansiblezone.com',
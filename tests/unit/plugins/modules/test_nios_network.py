@@ -20,7 +20,7 @@ __metaclass__ = type
 
 from ansible_collections.infoblox.nios_modules.plugins.modules import nios_network
 from ansible_collections.infoblox.nios_modules.plugins.module_utils import api
-from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import patch, MagicMock, Mock
+from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import patch, MagicMock, Mock, ANY
 from .test_nios_module import TestNiosModule, load_fixture
 
 
@@ -76,7 +76,7 @@ class TestNiosNetworkModule(TestNiosModule):
         res = wapi.run('testobject', test_spec)
 
         self.assertTrue(res['changed'])
-        wapi.create_object.assert_called_once_with('testobject', {'network': '192.168.10.0/24'})
+        wapi.create_object.assert_called_once_with('testobject', {'network': '192.168.10.0/24'}, return_fields=ANY)
 
     def test_nios_network_ipv4_dhcp_update(self):
         self.module.params = {'provider': None, 'state': 'present', 'network': '192.168.10.0/24',
@@ -102,7 +102,7 @@ class TestNiosNetworkModule(TestNiosModule):
         res = wapi.run('testobject', test_spec)
 
         self.assertTrue(res['changed'])
-        wapi.update_object.assert_called_once_with(ref, {'comment': 'updated comment', 'network': '192.168.10.0/24'})
+        wapi.update_object.assert_called_once_with(ref, {'comment': 'updated comment', 'network': '192.168.10.0/24'}, return_fields=ANY)
 
     def test_nios_network_ipv6_dhcp_update(self):
         self.module.params = {'provider': None, 'state': 'present', 'ipv6network': 'fe80::/64',
@@ -127,7 +127,7 @@ class TestNiosNetworkModule(TestNiosModule):
         wapi = self._get_wapi(test_object)
         res = wapi.run('testobject', test_spec)
         self.assertTrue(res['changed'])
-        wapi.update_object.assert_called_once_with(ref, {'comment': 'updated comment', 'ipv6network': 'fe80::/64'})
+        wapi.update_object.assert_called_once_with(ref, {'comment': 'updated comment', 'ipv6network': 'fe80::/64'}, return_fields=ANY)
 
     def test_nios_network_ipv4_remove(self):
         self.module.params = {'provider': None, 'state': 'absent', 'network': '192.168.10.0/24',
@@ -170,7 +170,7 @@ class TestNiosNetworkModule(TestNiosModule):
         res = wapi.run('testobject', test_spec)
 
         self.assertTrue(res['changed'])
-        wapi.create_object.assert_called_once_with('testobject', {'ipv6network': 'fe80::/64'})
+        wapi.create_object.assert_called_once_with('testobject', {'ipv6network': 'fe80::/64'}, return_fields=ANY)
 
     def test_nios_network_ipv6_remove(self):
         self.module.params = {'provider': None, 'state': 'absent', 'ipv6network': 'fe80::/64',
@@ -212,7 +212,7 @@ class TestNiosNetworkModule(TestNiosModule):
         res = wapi.run('testobject', test_spec)
 
         self.assertTrue(res['changed'])
-        wapi.create_object.assert_called_once_with('testobject', {'networkcontainer': '192.168.10.0/24'})
+        wapi.create_object.assert_called_once_with('testobject', {'networkcontainer': '192.168.10.0/24'}, return_fields=ANY)
 
     def test_nios_networkcontainer_ipv4_remove(self):
         self.module.params = {'provider': None, 'state': 'absent', 'networkcontainer': '192.168.10.0/24',
@@ -253,7 +253,7 @@ class TestNiosNetworkModule(TestNiosModule):
         res = wapi.run('testobject', test_spec)
 
         self.assertTrue(res['changed'])
-        wapi.create_object.assert_called_once_with('testobject', {'ipv6networkcontainer': 'fe80::/64'})
+        wapi.create_object.assert_called_once_with('testobject', {'ipv6networkcontainer': 'fe80::/64'}, return_fields=ANY)
 
     def test_nios_network_ipv4_create_with_use_logic_filter_rules(self):
         self.module.params = {'provider': None, 'state': 'present', 'network': '192.168.10.0/24',
@@ -276,7 +276,7 @@ class TestNiosNetworkModule(TestNiosModule):
         wapi.create_object.assert_called_once_with('testobject', {'network': '192.168.10.0/24',
                                                                   'use_logic_filter_rules': True,
                                                                   'logic_filter_rules': []
-                                                                  }
+                                                                  }, return_fields=ANY
                                                    )
 
     def test_nios_network_ipv4_update_with_use_logic_filter_rules(self):
@@ -311,7 +311,7 @@ class TestNiosNetworkModule(TestNiosModule):
         wapi.update_object.assert_called_once_with(ref, {'network': '192.168.10.0/24',
                                                          'comment': 'updated comment',
                                                          'use_logic_filter_rules': True,
-                                                         'logic_filter_rules': []}
+                                                         'logic_filter_rules': []}, return_fields=ANY
                                                    )
 
     def test_nios_network_ipv4_create_with_vlan(self):
@@ -342,7 +342,7 @@ class TestNiosNetworkModule(TestNiosModule):
                         'id': '10'
                     }
                 ]
-            }
+            }, return_fields=ANY
         )
 
     def test_nios_network_ipv4_update_vlan(self):
@@ -389,7 +389,7 @@ class TestNiosNetworkModule(TestNiosModule):
                         'id': '20'
                     }
                 ]
-            }
+            }, return_fields=ANY
         )
 
     def test_nios_network_ipv4_remove_vlan(self):
@@ -423,7 +423,7 @@ class TestNiosNetworkModule(TestNiosModule):
             {
                 'network': '192.168.10.0/24',
                 'vlans': []
-            }
+            }, return_fields=ANY
         )
 
     # ------------------------------------------------------------------
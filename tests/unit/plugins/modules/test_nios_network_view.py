@@ -22,7 +22,7 @@ __metaclass__ = type
 
 from ansible_collections.infoblox.nios_modules.plugins.modules import nios_network_view
 from ansible_collections.infoblox.nios_modules.plugins.module_utils import api
-from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import patch, MagicMock, Mock
+from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import patch, MagicMock, Mock, ANY
 from .test_nios_module import TestNiosModule, load_fixture
 
 
@@ -77,7 +77,7 @@ class TestNiosNetworkViewModule(TestNiosModule):
         res = wapi.run('testobject', test_spec)
 
         self.assertTrue(res['changed'])
-        wapi.create_object.assert_called_once_with('testobject', {'name': 'ansible'})
+        wapi.create_object.assert_called_once_with('testobject', {'name': 'ansible'}, return_fields=ANY)
 
     def test_nios_network_view_update_comment(self):
         self.module.params = {'provider': None, 'state': 'present', 'name': 'default',
@@ -105,7 +105,7 @@ class TestNiosNetworkViewModule(TestNiosModule):
         self.assertTrue(res['changed'])
         wapi.update_object.assert_called_once_with(
             ref,
-            {'comment': 'updated comment', 'name': 'default'}
+            {'comment': 'updated comment', 'name': 'default'}, return_fields=ANY
         )
 
     def test_nios_network_view_update_name(self):
@@ -134,7 +134,7 @@ class TestNiosNetworkViewModule(TestNiosModule):
         self.assertTrue(res['changed'])
         wapi.update_object.assert_called_once_with(
             ref,
-            {'comment': 'updated comment', 'name': 'default'}
+            {'comment': 'updated comment', 'name': 'default'}, return_fields=ANY
         )
 
     def test_nios_network_view_remove(self):
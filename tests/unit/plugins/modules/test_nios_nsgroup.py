@@ -20,7 +20,7 @@ __metaclass__ = type
 
 from ansible_collections.infoblox.nios_modules.plugins.modules import nios_nsgroup
 from ansible_collections.infoblox.nios_modules.plugins.module_utils import api
-from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import patch, MagicMock, Mock
+from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import patch, MagicMock, Mock, ANY
 from ansible_collections.infoblox.nios_modules.tests.unit.plugins.modules.utils import AnsibleExitJson
 from .test_nios_module import TestNiosModule, load_fixture
 from .utils import set_module_args
@@ -78,7 +78,7 @@ class TestNiosNSGroupModule(TestNiosModule):
         res = wapi.run('testobject', test_spec)
 
         self.assertTrue(res['changed'])
-        wapi.create_object.assert_called_once_with('testobject', {'name': 'my-simple-group'})
+        wapi.create_object.assert_called_once_with('testobject', {'name': 'my-simple-group'}, return_fields=ANY)
 
     def test_nios_nsgroup_remove(self):
         self.module.params = {'provider': None, 'state': 'absent', 'name': 'my-simple-group',
@@ -129,7 +129,7 @@ class TestNiosNSGroupModule(TestNiosModule):
 
         self.assertTrue(res['changed'])
         wapi.update_object.assert_called_once_with(
-            ref, {'comment': 'updated comment', 'name': 'default'}
+            ref, {'comment': 'updated comment', 'name': 'default'}, return_fields=ANY
         )
 
     # ------------------------------------------------------------------
@@ -176,7 +176,7 @@ class TestNiosNSGroupModule(TestNiosModule):
                 'external_secondaries': [
                     {'address': '1.1.1.1', 'name': 'server1.example.com', 'stealth': False},
                 ],
-            },
+            }, return_fields=ANY,
         )
 
     def test_nios_nsgroup_external_secondaries_no_change_not_updated(self):
@@ -265,7 +265,7 @@ class TestNiosNSGroupModule(TestNiosModule):
                 'external_secondaries': [
                     {'address': '192.168.1.1', 'name': 'server.example.com', 'stealth': False},
                 ],
-            },
+            }, return_fields=ANY,
         )
 
     def test_nios_nsgroup_external_secondary_without_tsig_passes_arg_validation(self):
@@ -0,0 +1,34 @@
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+from ansible_collections.infoblox.nios_modules.plugins.modules import nios_restartservices
+from .test_nios_module import TestNiosModuleMain
+
+
+class TestNiosRestartServicesModule(TestNiosModuleMain):
+
+    module = nios_restartservices
+    module_args = dict(TestNiosModuleMain.module_args, services=['DNS'])
+
+    def setUp(self):
+        super(TestNiosRestartServicesModule, self).setUp()
+        self.wapi.resolve_ref.return_value = 'grid/b25lLmNsdXN0ZXIkMA:Infoblox'
+        self.wapi.call_func.return_value = {}
+
+    def test_restart_returns_ref_cache_counters(self):
+        self.wapi.ref_cache.stats.return_value = {'hits': 1, 'misses': 0}
+
+        result = self.run_module()
+
+        self.wapi.resolve_ref.assert_called_once_with('grid', {})
+        self.assertEqual(self.wapi.call_func.call_args[0][:2], ('restartservices', 'grid/b25lLmNsdXN0ZXIkMA:Infoblox'))
+        self.assertEqual(result['ref_cache'], {'hits': 1, 'misses': 0})
+
+    def test_restart_without_ref_cache(self):
+        self.wapi.ref_cache = None
+
+        result = self.run_module()
+
+        self.assertNotIn('ref_cache', result)
@@ -22,7 +22,7 @@ __metaclass__ = type
 
 from ansible_collections.infoblox.nios_modules.plugins.modules import nios_srv_record
 from ansible_collections.infoblox.nios_modules.plugins.module_utils import api
-from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import patch, MagicMock, Mock
+from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import patch, MagicMock, Mock, ANY
 from .test_nios_module import TestNiosModule, load_fixture
 
 
@@ -83,7 +83,8 @@ class TestNiosSRVRecordModule(TestNiosModule):
 
         self.assertTrue(res['changed'])
         wapi.create_object.assert_called_once_with('testobject', {'name': '_sip._tcp.service.ansible.com',
-                                                                  'port': 5080, 'target': 'service1.ansible.com', 'priority': 10, 'weight': 10})
+                                                                  'port': 5080, 'target': 'service1.ansible.com', 'priority': 10, 'weight': 10},
+                                                   return_fields=ANY)
 
     def test_nios_srv_record_update_comment(self):
         self.module.params = {'provider': None, 'state': 'present', 'name': '_sip._tcp.service.ansible.com',
@@ -118,7 +119,7 @@ class TestNiosSRVRecordModule(TestNiosModule):
 
         self.assertTrue(res['changed'])
         wapi.update_object.assert_called_once_with(ref, {'name': '_sip._tcp.service.ansible.com',
-                                                         'port': 5080, 'target': 'service1.ansible.com', 'priority': 10, 'weight': 10})
+                                                         'port': 5080, 'target': 'service1.ansible.com', 'priority': 10, 'weight': 10}, return_fields=ANY)
 
     def test_nios_srv_record_remove(self):
         self.module.params = {'provider': None, 'state': 'absent', 'name': '_sip._tcp.service.ansible.com',
@@ -22,7 +22,7 @@ __metaclass__ = type
 
 from ansible_collections.infoblox.nios_modules.plugins.modules import nios_vlan
 from ansible_collections.infoblox.nios_modules.plugins.module_utils import api
-from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import patch, MagicMock, Mock
+from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import patch, MagicMock, Mock, ANY
 from .test_nios_module import TestNiosModule, load_fixture
 
 
@@ -85,7 +85,7 @@ class TestNiosVlanModule(TestNiosModule):
                 'name': 'ansible_vlan',
                 'parent': 'default',
                 'id': '10'
-            }
+            }, return_fields=ANY
         )
 
     def test_nios_vlan_update_comment(self):
@@ -123,7 +123,7 @@ class TestNiosVlanModule(TestNiosModule):
         self.assertTrue(res['changed'])
         wapi.update_object.assert_called_once_with(
             ref, {'comment': 'updated comment', 'parent': 'default', 'id': '10', 'name': 'ansible_vlan',
-                  'contact': 'contact@email.com', 'department': 'IT', 'description': 'test', 'reserved': True}
+                  'contact': 'contact@email.com', 'department': 'IT', 'description': 'test', 'reserved': True}, return_fields=ANY
         )
 
     def test_nios_vlan_remove(self):
@@ -182,4 +182,4 @@ class TestNiosVlanModule(TestNiosModule):
 
         self.assertTrue(res['changed'])
         wapi.update_object.assert_called_once_with(ref, {'name': 'ansible_new_vlan', 'parent': 'default', 'id': '10',
-                                                         'comment': 'comment'})
+                                                         'comment': 'comment'}, return_fields=ANY)
@@ -22,7 +22,7 @@ __metaclass__ = type
 
 from ansible_collections.infoblox.nios_modules.plugins.modules import nios_zone
 from ansible_collections.infoblox.nios_modules.plugins.module_utils import api
-from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import patch, MagicMock, Mock
+from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import patch, MagicMock, Mock, ANY
 from .test_nios_module import TestNiosModule, load_fixture
 
 
@@ -74,7 +74,7 @@ class TestNiosZoneModule(TestNiosModule):
         res = wapi.run('testobject', test_spec)
 
         self.assertTrue(res['changed'])
-        wapi.create_object.assert_called_once_with('testobject', {'fqdn': 'ansible.com'})
+        wapi.create_object.assert_called_once_with('testobject', {'fqdn': 'ansible.com'}, return_fields=ANY)
 
     def test_nios_zone_remove(self):
         self.module.params = {'provider': None, 'state': 'absent', 'fqdn': 'ansible.com',
@@ -123,7 +123,7 @@ class TestNiosZoneModule(TestNiosModule):
         res = wapi.run('testobject', test_spec)
 
         self.assertTrue(res['changed'])
-        wapi.update_object.assert_called_once_with(ref, {'comment': 'updated comment', 'fqdn': 'ansible.com'})
+        wapi.update_object.assert_called_once_with(ref, {'comment': 'updated comment', 'fqdn': 'ansible.com'}, return_fields=ANY)
 
     def test_nios_zone_create_using_grid_primary_secondaries(self):
         self.module.params = {'provider': None, 'state': 'present', 'fqdn': 'ansible.com',
@@ -156,7 +156,7 @@ class TestNiosZoneModule(TestNiosModule):
                                                                   "grid_secondaries": [{"name": "gridsecondary1.grid.com"},
                                                                                        {"name": "gridsecondary2.grid.com"}],
                                                                   "restart_if_needed": True
-                                                                  })
+                                                                  }, return_fields=ANY)
 
     def test_nios_zone_remove_using_grid_primary_secondaries(self):
         self.module.params = {'provider': None, 'state': 'absent', 'fqdn': 'ansible.com',
@@ -211,7 +211,7 @@ class TestNiosZoneModule(TestNiosModule):
 
         self.assertTrue(res['changed'])
         wapi.create_object.assert_called_once_with('testobject', {'fqdn': 'ansible.com',
-                                                                  'ns_group': 'examplensg'})
+                                                                  'ns_group': 'examplensg'}, return_fields=ANY)
 
     def test_nios_zone_remove_using_name_server_group(self):
         self.module.params = {'provider': None, 'state': 'absent', 'fqdn': 'ansible.com',
@@ -258,7 +258,7 @@ class TestNiosZoneModule(TestNiosModule):
 
         self.assertTrue(res['changed'])
         wapi.create_object.assert_called_once_with('testobject', {'fqdn': '10.10.10.in-addr.arpa',
-                                                                  'zone_format': 'IPV4'})
+                                                                  'zone_format': 'IPV4'}, return_fields=ANY)
 
     def test_nios_zone_remove_using_using_zone_format(self):
         self.module.params = {'provider': None, 'state': 'absent', 'fqdn': 'ansible.com',
@@ -0,0 +1,47 @@
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import os
+
+from ansible_collections.infoblox.nios_modules.plugins.modules import nios_zone_export
+from .test_nios_module import TestNiosModuleMain
+
+
+class TestNiosZoneExportModule(TestNiosModuleMain):
+
+    module = nios_zone_export
+
+    def setUp(self):
+        super(TestNiosZoneExportModule, self).setUp()
+        self.objects = {
+            'record:a': [{'_ref': 'record:a/1', 'name': 'www.ansible.com', 'ipv4addr': '192.168.10.10'}],
+            'record:cname': [{'_ref': 'record:cname/1', 'name': 'web.ansible.com', 'canonical': 'www.ansible.com',
+                              'ttl': 60, 'use_ttl': True}],
+        }
+        self.wapi.iter_objects.side_effect = lambda obj_type, payload, **kwargs: iter(self.objects.get(obj_type, []))
+        self.dest = os.path.join(self.tmpdir, 'db.ansible.com')
+        self.module_args = dict(self.module_args, zone='ansible.com', dest=self.dest)
+
+    def test_export_is_idempotent(self):
+        result = self.run_module()
+
+        self.assertTrue(result['changed'])
+        self.assertEqual(result['counts']['A'], 1)
+        self.assertEqual(result['counts']['CNAME'], 1)
+        with open(self.dest) as f:
+            self.assertEqual(f.read(), '$ORIGIN ansible.com.\n'
+                                       'www\t\tIN\tA\t192.168.10.10\n'
+                                       'web\t60\tIN\tCNAME\twww.ansible.com.\n')
+
+        self.assertFalse(self.run_module()['changed'])
+        self.assertEqual(os.listdir(self.tmpdir), ['db.ansible.com'])
+
+    def test_export_selected_types_in_check_mode(self):
+        result = self.run_module(record_types=['CNAME'], relative_names=False, _ansible_check_mode=True)
+
+        self.assertTrue(result['changed'])
+        self.assertEqual(result['counts'], {'CNAME': 1})
+        self.assertEqual(self.wapi.iter_objects.call_count, 1)
+        self.assertFalse(os.path.exists(self.dest))
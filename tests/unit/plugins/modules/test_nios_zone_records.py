@@ -0,0 +1,77 @@
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import json
+import os
+
+from ansible_collections.infoblox.nios_modules.plugins.modules import nios_zone_records
+from ansible_collections.infoblox.nios_modules.tests.unit.compat.mock import patch
+from .test_nios_module import TestNiosModuleMain
+
+
+class TestNiosZoneRecordsModule(TestNiosModuleMain):
+
+    module = nios_zone_records
+
+    def setUp(self):
+        super(TestNiosZoneRecordsModule, self).setUp()
+        self.mock_sync = patch.object(nios_zone_records, 'sync_zone_records')
+        self.sync = self.mock_sync.start()
+        self.addCleanup(self.mock_sync.stop)
+        self.sync.return_value = {'changed': True, 'changes': {'create': [], 'update': [], 'delete': []}}
+
+    def test_inline_and_file_records(self):
+        path = os.path.join(self.tmpdir, 'records.json')
+        with open(path, 'w') as f:
+            json.dump({'records': [{'type': 'TXT', 'name': '@', 'text': 'hello'}]}, f)
+
+        result = self.run_module(zone='ansible.com', records=[{'type': 'A', 'name': 'www', 'ipv4addr': '192.168.10.10'}],
+                                 src=path, purge=True)
+
+        self.assertTrue(result['changed'])
+        args, kwargs = self.sync.call_args
+        self.assertEqual(args[1:3], ('ansible.com', 'default'))
+        self.assertEqual([record['type'] for record in args[3]], ['A', 'TXT'])
+        self.assertEqual(kwargs, {'purge': True, 'check_mode': False})
+
+    def test_zone_file_records(self):
+        path = os.path.join(self.tmpdir, 'db.ansible.com')
+        with open(path, 'w') as f:
+            f.write('@ IN NS ns1\nwww IN A 192.168.10.10\n')
+
+        result = self.run_module(zone='ansible.com', src=path)
+
+        self.assertEqual(result['skipped'], {'NS': 1})
+        self.assertEqual(self.sync.call_args[0][3], [{'type': 'A', 'name': 'www.ansible.com.', 'ipv4addr': '192.168.10.10'}])
+
+    def test_invalid_zone_file(self):
+        path = os.path.join(self.tmpdir, 'records.txt')
+        with open(path, 'w') as f:
+            f.write('$INCLUDE other\n')
+
+        result = self.run_module(failed=True, zone='ansible.com', src=path, src_format='zone')
+        self.assertIn('line 1: unsupported directive', result['msg'])
+
+    def test_invalid_file(self):
+        path = os.path.join(self.tmpdir, 'records.yml')
+        with open(path, 'w') as f:
+            f.write('just a string')
+
+        result = self.run_module(failed=True, zone='ansible.com', src=path)
+        self.assertIn('must hold a list of records', result['msg'])
+
+    def test_invalid_record_fails(self):
+        self.sync.side_effect = ValueError('records[0]: unsupported record type')
+
+        result = self.run_module(failed=True, zone='ansible.com', records=[{'type': 'NS'}])
+        self.assertEqual(result['msg'], 'records[0]: unsupported record type')
+
+    def test_partial_sync_returns_applied_changes(self):
+        applied = {'create': [{'type': 'CNAME', 'name': 'www.ansible.com'}], 'update': [], 'delete': []}
+        self.sync.side_effect = nios_zone_records.ZoneSyncError('Duplicate object', applied)
+
+        result = self.run_module(failed=True, zone='ansible.com', records=[{'type': 'A'}])
+        self.assertEqual(result['msg'], 'Duplicate object')
+        self.assertEqual(result['applied'], applied)